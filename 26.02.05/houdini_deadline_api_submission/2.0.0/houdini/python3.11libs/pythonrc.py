@@ -0,0 +1,6 @@
+"""Apply the scene overrides of Deadline jobs rendering a scene snapshot."""
+
+# Import local modules
+from houdini_deadline_api_submission import scene_snapshot
+
+scene_snapshot.register_scene_overrides()
@@ -2,7 +2,7 @@
 
 name = 'houdini_deadline_api_submission'
 
-version = '1.0.0'
+version = '2.0.0'
 
 description = \
     """
@@ -16,14 +16,14 @@ tools = []
 plugin_for = ['houdini']
 
 requires = [
-    'deadline_api-10',
     'farm_environment-2',
-    'houdini-17..22',
+    'houdini-18.5..22',
     'hal_config-2',
     'hal_naming-3',
     # 'hal_ontrack-0',
     # 'hal_shotgun-1',
-    'python-2.7..4'
+    # concurrent.futures is used to submit jobs and stat files in parallel.
+    'python-3.7..4'
 ]
 
 build_requires = []
@@ -1,61 +1,472 @@
-"""Cleanup script utils."""
+"""Delete the intermediate files of a job listed in a cleanup manifest.
+
+The manifest is written during the submission by `houdini_deadline_api_
+submission.job.utility.CleanUpJob` and lists the exact files the cache job
+(.ifd, .ass, ...) creates for each of its frames, with its wedge applied.
+On the farm, this module checks which of these files exist by scanning
+their folders once, deletes them through a pool of threads and reports how
+many bytes got reclaimed. Streamed jobs clean up each frame in its own task,
+right after the frame is rendered. The last of these tasks also deletes the
+files shared between frames and the manifest. This module doesn't need Houdini.
+
+Examples:
+    $ python -m houdini_deadline_api_submission.cleanup manifest.json --dry-run
+    $ python -m houdini_deadline_api_submission.cleanup manifest.json --start 5
+
+"""
 
 # Import built-in modules
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import json
+import logging
 import os
+import shutil
+import time
+
+# Version of the manifest format, increased on every incompatible change.
+MANIFEST_VERSION = 1
+
+# Files with these extensions are never deleted.
+PROTECTED_EXTENSIONS = (".hip", ".hipnc", ".hiplc")
 
+# Maximum amount of files deleted at the same time.
+DEFAULT_WORKERS = 16
+# Minimum amount of files deleted by a single thread.
+MIN_CHUNK_SIZE = 64
 
-def create_cleanup_script(identifier, dir_path):
-    """Create a python script that cleans up the given folder on execution.
+
+def write_manifest(path, files, node=None, frame_files=None, job_frames=None):
+    """Write a cleanup manifest listing the given files.
 
     Args:
-        identifier (str): Identifier used by all outputs in this folder.
-        dir_path (str): Path to the directory that should be cleaned up by the
-            script.
+        path (str): Path of the manifest.
+        files (iterable of str): Absolute paths of the files to delete.
+        node (str, optional): Path of the ROP creating the files, for the
+            report of the cleanup.
+        frame_files (dict, optional): Path of the file created by each
+            frame, to clean up single frames.
+        job_frames (iterable of int, optional): Frames of the cleanup job, to
+            find the frames of each of its tasks. Defaults to the frames of
+            `frame_files`.
 
-    Returns:
-        str: Path to the generated cleanup script.
+    Raises:
+        OSError: If the manifest can't be written.
 
     """
-    # Ensure the directory exists.
-    if not os.path.isdir(dir_path):
+    folder = os.path.dirname(path)
+    if folder and not os.path.isdir(folder):
         try:
-            os.makedirs(dir_path)
+            os.makedirs(folder)
         except (IOError, OSError):
             raise OSError(
                 'Missing permissions to create folder "{}". Please make sure '
-                "you are assigned to the project on Shotgun.".format(dir_path)
+                "you are assigned to the project on Shotgun.".format(folder)
             )
 
-    script_path = os.path.join(dir_path, "{}__{}.py".format(identifier, "cleanup"))
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "node": node,
+        "files": sorted(set(files)),
+        "frames": dict(
+            (str(frame), path) for frame, path in (frame_files or {}).items()
+        ),
+    }
+    if job_frames is not None:
+        manifest["job_frames"] = sorted(set(int(frame) for frame in job_frames))
+    try:
+        with open(path, "w") as manifest_file:
+            json.dump(manifest, manifest_file, indent=4)
+    except (IOError, OSError):
+        raise OSError(
+            'Missing permissions to write file "{}". Please make sure you '
+            "are assigned to the project on Shotgun.".format(path)
+        )
+
+
+def read_manifest(path):
+    """Read a manifest written by `write_manifest`.
+
+    Args:
+        path (str): Path of the manifest.
+
+    Returns:
+        dict: The manifest.
+
+    Raises:
+        ValueError: If the manifest was written in a different version.
+
+    """
+    with open(path) as manifest_file:
+        manifest = json.load(manifest_file)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(
+            "Unsupported cleanup manifest version {} in {}.".format(
+                manifest.get("version"), path
+            )
+        )
+    return manifest
+
+
+def get_job_frames(manifest):
+    """Return the frames of the cleanup job of a manifest.
+
+    Args:
+        manifest (dict): Manifest as returned by `read_manifest`.
+
+    Returns:
+        list of int: Ascending frames of the job.
+
+    """
+    frames = manifest.get("job_frames")
+    if frames is None:
+        frames = manifest.get("frames", {})
+    return sorted(int(frame) for frame in frames)
+
+
+def get_task_frames(manifest, start, end=None):
+    """Return the frames of the task rendering the given frame range.
+
+    Deadline splits the ascending frames of a job into its tasks, so a task
+    renders exactly the frames of the job from its first to its last frame.
+    Frames in between that the job doesn't render belong to no task.
+
+    Args:
+        manifest (dict): Manifest as returned by `read_manifest`.
+        start (int): First frame of the task.
+        end (int, optional): Last frame of the task, defaults to the first
+            frame.
+
+    Returns:
+        list of int: Frames of the task.
+
+    """
+    end = start if end is None else end
+    return [frame for frame in get_job_frames(manifest) if start <= frame <= end]
 
-    expression = """# Import future modules
-from __future__ import print_function
-# Import built-in modules
-import os
 
-identifier = {identifier!r}
-dir_path = {dir_path!r}
+def get_frame_files(manifest, frames, include_shared=False):
+    """Return the files of the given frames of a manifest.
 
-for root, _, files in os.walk(dir_path):
-    for file_name in files:
-        # Skip hip files.
-        if file_name.endswith(".hip"):
+    Files shared with other frames, for example an output without a frame
+    number, are left out by default, since other frames still need them.
+
+    Args:
+        manifest (dict): Manifest as returned by `read_manifest`.
+        frames (iterable of int): Frames to return the files of.
+        include_shared (bool, optional): If True, return the files shared with
+            other frames as well.
+
+    Returns:
+        list of str: Paths of the files created by the given frames.
+
+    """
+    frames = set(frames)
+    files = set()
+    shared_files = set()
+    for frame, path in manifest.get("frames", {}).items():
+        if int(frame) in frames:
+            files.add(path)
+        else:
+            shared_files.add(path)
+    if include_shared:
+        return sorted(files)
+    return sorted(files - shared_files)
+
+
+def get_task_folder(manifest_path):
+    """Return the folder in which the tasks of a job mark their frames done.
+
+    Args:
+        manifest_path (str): Path of the manifest.
+
+    Returns:
+        str: Path of the folder, next to the manifest.
+
+    """
+    return os.path.splitext(manifest_path)[0] + "_tasks"
+
+
+def finish_task(manifest_path, manifest, start, end=None):
+    """Mark the frames of a task as cleaned up.
+
+    Each task writes an empty file named after its frame range into the task
+    folder of the manifest. Tasks run in any order and at the same time, so
+    the files of all finished tasks tell whether this was the last one.
+
+    Args:
+        manifest_path (str): Path of the manifest.
+        manifest (dict): Manifest as returned by `read_manifest`.
+        start (int): First frame of the task.
+        end (int, optional): Last frame of the task, defaults to the first
+            frame.
+
+    Returns:
+        bool: True if the frames of all tasks of the job are cleaned up.
+
+    """
+    end = start if end is None else end
+    folder = get_task_folder(manifest_path)
+    os.makedirs(folder, exist_ok=True)
+    open(os.path.join(folder, "{}_{}".format(start, end)), "w").close()
+
+    finished_frames = set()
+    for name in os.listdir(folder):
+        try:
+            task_start, task_end = (int(frame) for frame in name.split("_"))
+        except ValueError:
             continue
-        if identifier in file_name:
-            file_path = os.path.join(root, file_name)
-            print("Deleting {{}}...".format(file_path))
-            os.remove(os.path.join(root, file_name))
-""".format(
-        identifier=identifier, dir_path=dir_path
-    )
+        finished_frames.update(get_task_frames(manifest, task_start, task_end))
+    return finished_frames.issuperset(get_job_frames(manifest))
+
+
+def _get_folder_sizes(folder, names):
+    """Return the size of the given files inside of a folder.
+
+    Args:
+        folder (str): Folder to scan.
+        names (set of str): Names of the files to look for.
+
+    Returns:
+        dict: Size in bytes of each existing file, keyed by its name. Empty if
+            the folder doesn't exist.
+
+    """
+    sizes = {}
+    try:
+        for entry in os.scandir(folder):
+            if entry.name in names and entry.is_file(follow_symlinks=False):
+                sizes[entry.name] = entry.stat(follow_symlinks=False).st_size
+    except OSError:
+        pass
+    return sizes
+
 
-    with open(script_path, "w") as script_file:
+def get_existing_files(files):
+    """Return the given files that exist, with their size.
+
+    Each folder is scanned once, instead of checking every file on its own.
+
+    Args:
+        files (iterable of str): Absolute paths of files.
+
+    Returns:
+        dict: Size in bytes of each existing file, keyed by its path.
+
+    """
+    folders = {}
+    for path in files:
+        folders.setdefault(os.path.dirname(path), set()).add(os.path.basename(path))
+
+    existing_files = {}
+    for folder, names in folders.items():
+        for name, size in _get_folder_sizes(folder, names).items():
+            existing_files[os.path.join(folder, name)] = size
+    return existing_files
+
+
+def _remove_files(paths):
+    """Delete the given files.
+
+    Args:
+        paths (list of str): Paths of the files.
+
+    Returns:
+        dict: Error message of each file that couldn't be deleted.
+
+    """
+    errors = {}
+    for path in paths:
         try:
-            script_file.write(expression)
-        except (IOError, OSError):
-            raise OSError(
-                'Missing permissions to write file "{}". Please make sure you '
-                "are assigned to the project on Shotgun.".format(script_path)
+            os.remove(path)
+        except OSError as error:
+            errors[path] = str(error)
+    return errors
+
+
+def remove_files(paths, max_workers=DEFAULT_WORKERS):
+    """Delete the given files through a pool of threads.
+
+    Each thread deletes a whole chunk of files, since starting a thread task
+    takes longer than deleting a single file on local storage.
+
+    Args:
+        paths (list of str): Paths of the files.
+        max_workers (int, optional): Maximum amount of threads.
+
+    Returns:
+        dict: Error message of each file that couldn't be deleted.
+
+    """
+    chunk_size = max(MIN_CHUNK_SIZE, -(-len(paths) // max(1, max_workers)))
+    chunks = [
+        paths[index : index + chunk_size]
+        for index in range(0, len(paths), chunk_size)
+    ]
+    if len(chunks) <= 1:
+        return _remove_files(paths)
+
+    errors = {}
+    executor = ThreadPoolExecutor(max_workers=len(chunks))
+    try:
+        for chunk_errors in executor.map(_remove_files, chunks):
+            errors.update(chunk_errors)
+    finally:
+        executor.shutdown(wait=True)
+    return errors
+
+
+def _delete_files(files, dry_run=False, max_workers=DEFAULT_WORKERS):
+    """Delete the given files that exist, apart from protected ones.
+
+    Args:
+        files (iterable of str): Absolute paths of the files.
+        dry_run (bool, optional): If True, only log which files would be
+            deleted.
+        max_workers (int, optional): Maximum amount of files deleted at the
+            same time.
+
+    Returns:
+        tuple: Size in bytes of each existing file keyed by its path, and the
+            error message of each file that couldn't be deleted.
+
+    """
+    logger = logging.getLogger(__name__)
+    files = [path for path in files if not path.lower().endswith(PROTECTED_EXTENSIONS)]
+    existing_files = get_existing_files(files)
+    paths = sorted(existing_files)
+
+    errors = {}
+    if dry_run:
+        for path in paths:
+            logger.info("Would delete %s.", path)
+    else:
+        errors = remove_files(paths, max_workers=max_workers)
+        for path, error in sorted(errors.items()):
+            logger.warning("Could not delete %s: %s", path, error)
+    return existing_files, errors
+
+
+def run_cleanup(
+    manifest_path, dry_run=False, max_workers=DEFAULT_WORKERS, start=None, end=None
+):
+    """Delete the files listed in the given manifest.
+
+    The manifest is deleted as well once all of its files are deleted. When
+    cleaning up the frames of a single task, the last task of the job deletes
+    the files shared between frames and the manifest, see `finish_task`.
+
+    Args:
+        manifest_path (str): Path of the manifest.
+        dry_run (bool, optional): If True, only report which files would be
+            deleted.
+        max_workers (int, optional): Maximum amount of files deleted at the
+            same time.
+        start (int, optional): First frame of the task to delete the files
+            of, see `get_task_frames`.
+        end (int, optional): Last frame of the task, defaults to the start
+            frame.
+
+    Returns:
+        dict: Report with the amount of listed, existing, deleted and failed
+            files, the reclaimed bytes and the elapsed seconds.
+
+    """
+    start_time = time.time()
+    manifest = read_manifest(manifest_path)
+    if start is None:
+        listed = manifest["files"]
+    else:
+        listed = get_frame_files(manifest, get_task_frames(manifest, start, end))
+    existing_files, errors = _delete_files(listed, dry_run, max_workers)
+
+    is_finished = start is None
+    if not is_finished and not dry_run and not errors:
+        is_finished = finish_task(manifest_path, manifest, start, end)
+        if is_finished:
+            shared_files = [
+                path
+                for path in get_frame_files(
+                    manifest, get_job_frames(manifest), include_shared=True
+                )
+                if path not in listed
+            ]
+            listed = listed + shared_files
+            shared_existing_files, errors = _delete_files(
+                shared_files, dry_run, max_workers
             )
+            existing_files.update(shared_existing_files)
+
+    paths = sorted(existing_files)
+    deleted = [path for path in paths if path not in errors]
+    report = {
+        "node": manifest.get("node"),
+        "dry_run": dry_run,
+        "listed": len(listed),
+        "existing": len(paths),
+        "deleted": 0 if dry_run else len(deleted),
+        "failed": len(errors),
+        "bytes": sum(existing_files[path] for path in deleted),
+        "seconds": time.time() - start_time,
+    }
+    if is_finished and not dry_run and not errors:
+        _remove_files([manifest_path])
+        shutil.rmtree(get_task_folder(manifest_path), ignore_errors=True)
+    return report
+
+
+def format_report(report):
+    """Return a readable summary of a cleanup.
+
+    Args:
+        report (dict): Report as returned by `run_cleanup`.
+
+    Returns:
+        str: Summary of the cleanup.
+
+    """
+    action = "Would reclaim" if report["dry_run"] else "Reclaimed"
+    return (
+        "{action} {megabytes:.1f} MB of {node}: {existing} of {listed} listed "
+        "files exist, {deleted} deleted, {failed} failed in {seconds:.2f}s.".format(
+            action=action, megabytes=report["bytes"] / 1024.0 / 1024.0, **report
+        )
+    )
+
+
+def main(argv=None):
+    """Run the cleanup of the manifest given on the command line.
+
+    Args:
+        argv (list of str, optional): Command line arguments.
+
+    Returns:
+        int: Exit code, 1 if any file couldn't be deleted.
+
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("manifest", help="Path of the cleanup manifest.")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only report the files to delete."
+    )
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument(
+        "--start", type=int, help="First frame of the task to delete the files of."
+    )
+    parser.add_argument("--end", type=int, help="Last frame of the task.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    report = run_cleanup(
+        args.manifest,
+        dry_run=args.dry_run,
+        max_workers=args.workers,
+        start=args.start,
+        end=args.end,
+    )
+    print(format_report(report))
+    return 1 if report["failed"] else 0
+
 
-    return script_path
+if __name__ == "__main__":
+    raise SystemExit(main())
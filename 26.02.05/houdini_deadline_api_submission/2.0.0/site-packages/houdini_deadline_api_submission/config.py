@@ -1,4 +1,17 @@
-"""Functions to retrieve configuration of this package."""
+"""Functions to retrieve configuration of this package.
+
+The configuration is loaded once per process and every queried value is
+cached by its name and query arguments. hal_config doesn't tell which files it
+reads, so the cache can only watch the files listed in the environment
+variable named in `constants.CONFIG_FILES_ENV` and is invalidated as soon as
+one of them changes on disk. Without any listed files, the cached values
+expire after `constants.CONFIG_CACHE_TTL` seconds instead.
+"""
+
+# Import built-in modules
+import copy
+import os
+import time
 
 # Import third-party modules
 import hal_config
@@ -6,6 +19,107 @@ import hal_config
 # Import local modules
 from houdini_deadline_api_submission import constants
 
+# Configuration values used while creating jobs, loaded by preload.
+PRELOADED_VALUES = ("job_info", "plugin_info", "special_output_parms")
+
+
+class ConfigCache(object):
+    """Memoized access to the configuration of this package."""
+
+    def __init__(self, files=None, ttl=constants.CONFIG_CACHE_TTL):
+        """Initialize an empty cache.
+
+        Args:
+            files (list of str, optional): Configuration files whose
+                modification will invalidate the cache. Defaults to the files
+                listed in the environment variable named in
+                constants.CONFIG_FILES_ENV.
+            ttl (float, optional): Seconds after which the cache is
+                invalidated if no files are watched. None keeps the values
+                until `clear` is called.
+
+        """
+        if files is None:
+            files = os.environ.get(constants.CONFIG_FILES_ENV, "").split(os.pathsep)
+        self.files = [path for path in files if path]
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._configuration = None
+        self._values = {}
+        self._mtimes = self.get_mtimes()
+        self._loaded = time.time()
+
+    def get_mtimes(self):
+        """Return the modification time of each watched configuration file.
+
+        Returns:
+            tuple: Modification time of each file, None for missing files.
+
+        """
+        mtimes = []
+        for path in self.files:
+            try:
+                mtimes.append(os.path.getmtime(path))
+            except OSError:
+                mtimes.append(None)
+        return tuple(mtimes)
+
+    def is_outdated(self):
+        """Return True if a watched file changed since the cache was filled.
+
+        If no files are watched, the cache is outdated once it is older than
+        its ttl.
+
+        Returns:
+            bool: True if the cached values need to be loaded again.
+
+        """
+        if self.files:
+            return self.get_mtimes() != self._mtimes
+        if self.ttl is None:
+            return False
+        return time.time() - self._loaded > self.ttl
+
+    def clear(self):
+        """Remove all cached values and the loaded configuration."""
+        self._configuration = None
+        self._values = {}
+        self._mtimes = self.get_mtimes()
+        self._loaded = time.time()
+
+    def query(self, value, **kwargs):
+        """Return the given configuration value of this package.
+
+        Args:
+            value (str): Name of the value to query from the configuration.
+            **kwargs: Keyword arguments passed down to
+                hal_config.Configuration.query.
+
+        Returns:
+            object: Copy of the queried configuration value, so callers can
+                safely modify it.
+
+        """
+        if self.is_outdated():
+            self.clear()
+
+        key = (value, tuple(sorted(kwargs.items())))
+        if key in self._values:
+            self.hits += 1
+        else:
+            self.misses += 1
+            if self._configuration is None:
+                self._configuration = hal_config.Configuration()
+            self._values[key] = self._configuration.query(
+                constants.PACKAGE_NAME, value, **kwargs
+            )
+        return copy.deepcopy(self._values[key])
+
+
+# Configuration cache shared by the whole process.
+_CONFIG_CACHE = ConfigCache()
+
 
 def get_config(value, **kwargs):
     """Return given configuration of this package.
@@ -19,5 +133,34 @@ def get_config(value, **kwargs):
         dict: Value of the queried configuration.
 
     """
-    config = hal_config.Configuration()
-    return config.query(constants.PACKAGE_NAME, value, **kwargs)
+    return _CONFIG_CACHE.query(value, **kwargs)
+
+
+def preload(values=PRELOADED_VALUES):
+    """Load the given configuration values into the cache.
+
+    This is called when the submitter HDA gets created, so the first
+    submission doesn't need to load the configuration anymore.
+
+    Args:
+        values (list of str, optional): Names of the values to load. Defaults
+            to the values used while creating jobs.
+
+    """
+    for value in values:
+        _CONFIG_CACHE.query(value)
+
+
+def clear_config_cache():
+    """Remove all cached configuration values."""
+    _CONFIG_CACHE.clear()
+
+
+def get_config_cache_stats():
+    """Return how often a configuration value was served from the cache.
+
+    Returns:
+        dict: Amount of hits and misses of the configuration cache.
+
+    """
+    return {"hits": _CONFIG_CACHE.hits, "misses": _CONFIG_CACHE.misses}
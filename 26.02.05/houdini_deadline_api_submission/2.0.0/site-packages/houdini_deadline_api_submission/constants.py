@@ -15,6 +15,11 @@ CMD_LINE_PLUGIN = "hal_commandline"
 # Logging parameters.
 LOG_FOLDER = "HAL Log"  # Name of the parameter folder parent to the log parm.
 LOG_PARM = "hal_submission_log"  # Name of the parameter that stores logs.
+# Maximum amount of lines kept in the log parameter, older lines are dropped.
+LOG_MAX_LINES = 1000
+# Folder inside of the _deadline folder next to the hip file holding the
+# machine-readable log of each submission.
+LOG_SIDECAR_FOLDER = "logs"
 
 # Wedging parameters.
 # Name of the folder where wedging parameters will be added to.
@@ -35,6 +40,18 @@ WEDGE_RANGE = "hal_wedge_range{id}"
 # Parameter for the amount of steps between the given range.
 # {id} needs to be given since this will be replaced with the MultiParm id.
 WEDGE_STEPS = "hal_wedge_steps{id}"
+# Checkbox parameter that submits all wedges of a ROP as a single job, where
+# each task renders the wedge matching its task index.
+WEDGE_AS_TASKS = "hal_wedge_as_tasks"
+# Module run by each task of a job submitted with WEDGE_AS_TASKS.
+WEDGE_TASK_MODULE = "houdini_deadline_api_submission.wedge_task"
+
+# Cleanup of render caches.
+# Module run by cleanup jobs, deleting the files listed in their manifest.
+CLEANUP_MODULE = "houdini_deadline_api_submission.cleanup"
+# Checkbox parameter on the submitter HDA that only reports the files the
+# cleanup jobs would delete.
+CLEANUP_DRY_RUN = "hal_cleanup_dry_run"
 
 # Override parameters.
 # Prefix for Job Info override parameters.
@@ -59,3 +76,128 @@ RENDER_MODE_CACHE_RENDER = 0
 RENDER_MODE_CACHE_ONLY = 1
 # Index of the Render Only value inside the Render Mode drop-down.
 RENDER_MODE_RENDER_ONLY = 2
+# Index of the streamed Cache & Render value inside the Render Mode drop-down,
+# rendering and cleaning up each frame as soon as its render cache exists.
+RENDER_MODE_STREAM = 3
+# Name of the Frame Order drop-down parameter, which indicates in which order
+# the frames of a ROP are rendered.
+FRAME_ORDER = "hal_frame_order"
+# Index of the Ascending value inside the Frame Order drop-down.
+FRAME_ORDER_ASCENDING = 0
+# Index of the First, Last, Middle value inside the Frame Order drop-down.
+FRAME_ORDER_FIRST_LAST_MIDDLE = 1
+
+# Submission parameters.
+# Name of the Submission Mode drop-down parameter on the submitter HDA, which
+# indicates how the created jobs are sent to Deadline.
+SUBMISSION_MODE = "hal_submission_mode"
+# Index of the Sequential value inside the Submission Mode drop-down.
+SUBMISSION_MODE_SEQUENTIAL = 0
+# Index of the Concurrent value inside the Submission Mode drop-down.
+SUBMISSION_MODE_CONCURRENT = 1
+# Parameter that limits how many jobs are sent to Deadline at the same time
+# when submitting concurrently.
+SUBMISSION_WORKERS = "hal_submission_workers"
+# Amount of workers used if the submitter doesn't define SUBMISSION_WORKERS.
+DEFAULT_SUBMISSION_WORKERS = 8
+
+# Scene snapshot parameters.
+# Checkbox parameter on the submitter HDA that saves the scene only once per
+# submission into a content addressed snapshot store, instead of saving a copy
+# for every job.
+SCENE_SNAPSHOT = "hal_scene_snapshot"
+# Checkbox parameter that hardlinks the snapshot into the output folder of each
+# job.
+SCENE_SNAPSHOT_LINKS = "hal_scene_snapshot_links"
+# Parameter for the amount of days after which unused snapshots get deleted by
+# the "Delete Old Snapshots" button.
+SCENE_SNAPSHOT_MAX_AGE = "hal_scene_snapshot_max_age"
+# Amount of days used if the submitter doesn't define SCENE_SNAPSHOT_MAX_AGE.
+DEFAULT_SCENE_SNAPSHOT_MAX_AGE = 14
+# Folder inside of the _deadline folder next to the hip file holding the
+# snapshots.
+SCENE_SNAPSHOT_FOLDER = "snapshots"
+# Environment variable holding the parameter values set for a single job,
+# which are applied on the farm once the snapshot is loaded.
+SCENE_OVERRIDES_ENV = "HAL_SCENE_OVERRIDES"
+
+# Submission plan.
+# Checkbox parameter on the submitter HDA that writes a submission plan and
+# sends it to Deadline from a separate process, so the Houdini session is
+# available again as soon as the plan is written.
+SUBMIT_IN_BACKGROUND = "hal_submit_in_background"
+# Folder inside of the _deadline folder next to the hip file holding the plans.
+PLAN_FOLDER = "plans"
+# Module submitting a written plan, run outside of Houdini.
+PLAN_MODULE = "houdini_deadline_api_submission.plan"
+
+# Deadline Web Service.
+# Seconds to wait for the Web Service before a request fails.
+DEFAULT_WEBSERVICE_TIMEOUT = 30
+# Amount of times a failed idempotent request is sent again.
+DEFAULT_WEBSERVICE_RETRIES = 3
+# Seconds to wait before the first retry, doubled for each further retry.
+DEFAULT_WEBSERVICE_BACKOFF = 0.5
+# Maximum amount of idle keep-alive connections to the Web Service.
+DEFAULT_WEBSERVICE_POOL_SIZE = DEFAULT_SUBMISSION_WORKERS
+
+# Cached Deadline pools and groups.
+# Seconds after which the cached pools and groups get refreshed.
+DEADLINE_LIST_TTL = 300
+# Seconds to wait before trying again to refresh the pools and groups after
+# the Web Service couldn't be reached.
+DEADLINE_LIST_RETRY = 30
+# Environment variable overriding the folder that stores the cached pools and
+# groups.
+DEADLINE_CACHE_FOLDER_ENV = "HAL_DEADLINE_CACHE_FOLDER"
+
+# Submission timings.
+# Checkbox parameter on the submitter HDA that records how long each phase of
+# the submission takes, logs a summary and writes a Chrome trace file.
+TRACE_SUBMISSION = "hal_trace_submission"
+# Environment variable enabling the timings regardless of the submitter.
+TRACE_SUBMISSION_ENV = "HAL_TRACE_SUBMISSION"
+# Folder inside of the _deadline folder next to the hip file holding the
+# trace files.
+TRACE_FOLDER = "traces"
+
+# Incremental resubmission.
+# Checkbox parameter on the submitter HDA that only submits the frames whose
+# output files are missing.
+SKIP_EXISTING = "hal_skip_existing"
+# Integer parameter on the submitter HDA, output files smaller than this
+# amount of bytes are rendered again.
+SKIP_EXISTING_MIN_SIZE = "hal_skip_existing_min_size"
+# Checkbox parameter on the submitter HDA that renders output files again if
+# they are older than the saved hip file.
+SKIP_EXISTING_NEWER_THAN_HIP = "hal_skip_existing_newer_than_hip"
+# Maximum amount of output files checked at the same time.
+DEFAULT_STAT_WORKERS = 16
+
+# Adaptive chunk sizes.
+# Checkbox parameter on the submitter HDA that picks the chunk size of render
+# and cache jobs from the recorded durations of their previous tasks.
+ADAPTIVE_CHUNKS = "hal_adaptive_chunks"
+# Float parameter on the submitter HDA, minutes a single task should take.
+CHUNK_TARGET_DURATION = "hal_chunk_target_duration"
+# Minutes a task should take if the submitter doesn't define
+# CHUNK_TARGET_DURATION.
+DEFAULT_CHUNK_TARGET_DURATION = 10.0
+# Maximum amount of cache tasks (.ifd, .ass, ...) a worker runs at the same
+# time, if their startup takes longer than their frames.
+MAX_CONCURRENT_CACHE_TASKS = 4
+# Amount of the last tasks of a ROP the durations are based on.
+JOB_STATS_SAMPLES = 20
+# Seconds after which a submitted job that didn't finish is not waited for
+# anymore.
+JOB_STATS_PENDING_TTL = 7 * 24 * 60 * 60
+
+# Configuration.
+# Environment variable listing the configuration files of this package,
+# separated by os.pathsep. Changes to these files invalidate the cached
+# configuration.
+CONFIG_FILES_ENV = "HAL_DEADLINE_SUBMISSION_CONFIG_FILES"
+# Seconds the cached configuration is kept if no configuration files are
+# listed in CONFIG_FILES_ENV, since hal_config doesn't tell which files it
+# reads.
+CONFIG_CACHE_TTL = 60
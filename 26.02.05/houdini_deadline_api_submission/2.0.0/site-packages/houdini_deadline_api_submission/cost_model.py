@@ -0,0 +1,441 @@
+"""Chunk sizes based on how long the frames of a ROP took on the farm.
+
+Each submitted job using adaptive chunks is stored as pending in a local
+stats store. Once its tasks are finished, their durations are split into the
+startup of a task (loading the scene, licenses, ...) and the time per frame,
+and stored per ROP and output. The next submission of the same ROP picks a
+chunk size, so a task takes about as long as the target duration of the
+submitter. Caches with a slow startup compared to their frames can run
+multiple tasks on a worker at the same time.
+
+The stats are refreshed in a background thread, so a submission never waits
+for the Deadline Web Service. This module doesn't use hou, so the separate
+process sending a submission plan to Deadline records its jobs as well.
+
+Examples:
+    >>> cost = Cost(frame_seconds=100.0, startup_seconds=60.0, samples=10)
+    >>> get_chunk_settings(cost, frames=100, target_seconds=600)
+    (5, 1)
+
+"""
+
+# Import built-in modules
+import calendar
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+# Import local modules
+from houdini_deadline_api_submission import constants
+from houdini_deadline_api_submission import deadline_cache
+from houdini_deadline_api_submission import deadline_utils
+from houdini_deadline_api_submission import frame_order
+
+# Version of the stats file, increased on every incompatible change.
+STATS_VERSION = 1
+
+# Status of a completed Deadline task.
+TASK_COMPLETED = 5
+# Status of Deadline tasks that can still be rendered (queued, rendering and
+# pending).
+TASK_ACTIVE_STATES = (2, 4, 8)
+
+# Pattern of a date of the Deadline Web Service, without fractions and time
+# zone, which are the same for all dates of a task.
+_DATE_PATTERN = re.compile(r"^(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})")
+# Version token of a scene name, for example "_v012".
+_VERSION_PATTERN = re.compile(r"[._-]?v\d+$", re.IGNORECASE)
+
+
+class Cost(object):
+    """Duration of the tasks of a ROP.
+
+    Args:
+        frame_seconds (float): Seconds a single frame takes.
+        startup_seconds (float): Seconds a task takes before it renders.
+        samples (int): Amount of tasks the cost is based on.
+
+    """
+
+    def __init__(self, frame_seconds, startup_seconds, samples):
+        """Initialize the cost."""
+        self.frame_seconds = frame_seconds
+        self.startup_seconds = startup_seconds
+        self.samples = samples
+
+    def __repr__(self):
+        """Return a string representation of this cost."""
+        return (
+            "Cost(frame_seconds={:.2f}, startup_seconds={:.2f}, "
+            "samples={})".format(self.frame_seconds, self.startup_seconds, self.samples)
+        )
+
+
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2.0
+
+
+class JobStatsStore(object):
+    """Durations of the frames of each ROP, stored as JSON on disk.
+
+    Args:
+        path (str): Path of the stats file.
+
+    """
+
+    def __init__(self, path):
+        """Initialize the store, the stats file is only read when needed."""
+        self.path = path
+        self.pending = None
+        self.costs = None
+        self._lock = threading.RLock()
+        self._refresh_thread = None
+
+    def load(self):
+        """Read the stats file, starting without stats if it can't be read."""
+        with self._lock:
+            try:
+                with open(self.path) as stats_file:
+                    data = json.load(stats_file)
+                if data.get("version") != STATS_VERSION:
+                    raise ValueError("Unsupported stats version.")
+                self.pending = dict(data["pending"])
+                self.costs = dict(data["costs"])
+            except (IOError, OSError, ValueError, KeyError, TypeError):
+                self.pending = {}
+                self.costs = {}
+
+    def _ensure_loaded(self):
+        if self.costs is None:
+            self.load()
+
+    def save(self):
+        """Write the stats to disk, so other sessions can use them."""
+        with self._lock:
+            self._ensure_loaded()
+            data = {
+                "version": STATS_VERSION,
+                "pending": self.pending,
+                "costs": self.costs,
+            }
+            temp_path = "{}.{}.tmp".format(self.path, os.getpid())
+            try:
+                folder = os.path.dirname(self.path)
+                if folder and not os.path.isdir(folder):
+                    os.makedirs(folder)
+                with open(temp_path, "w") as stats_file:
+                    json.dump(data, stats_file, indent=4, sort_keys=True)
+                # Other sessions never read partly written stats.
+                os.replace(temp_path, self.path)
+            except (IOError, OSError):
+                logger = logging.getLogger(__name__)
+                logger.debug("Could not write the job stats to %s.", self.path)
+
+    def get_cost(self, key):
+        """Return the cost of the tasks of a ROP.
+
+        Args:
+            key (str): Key of the ROP, see `get_cost_key`.
+
+        Returns:
+            Cost: Median durations of the recorded tasks, None if no task was
+                recorded yet.
+
+        """
+        with self._lock:
+            self._ensure_loaded()
+            entry = self.costs.get(key)
+        if not entry or not entry.get("frame"):
+            return None
+        return Cost(
+            _median(entry["frame"]), _median(entry["startup"]), len(entry["frame"])
+        )
+
+    def record(self, key, frame_seconds, startup_seconds):
+        """Add the durations of finished tasks of a ROP.
+
+        Only the last constants.JOB_STATS_SAMPLES tasks are kept, so the cost
+        follows changes to the ROP.
+
+        Args:
+            key (str): Key of the ROP, see `get_cost_key`.
+            frame_seconds (list of float): Seconds per frame of each task.
+            startup_seconds (list of float): Startup seconds of each task.
+
+        """
+        if not frame_seconds:
+            return
+        with self._lock:
+            self._ensure_loaded()
+            entry = self.costs.setdefault(key, {"frame": [], "startup": []})
+            entry["frame"] = (entry["frame"] + list(frame_seconds))[
+                -constants.JOB_STATS_SAMPLES :
+            ]
+            entry["startup"] = (entry["startup"] + list(startup_seconds))[
+                -constants.JOB_STATS_SAMPLES :
+            ]
+            entry["updated"] = time.time()
+
+    def add_pending(self, deadline_id, key):
+        """Remember a submitted job, to record its durations once it's done.
+
+        Args:
+            deadline_id (str): Deadline ID of the job.
+            key (str): Key of the ROP of the job, see `get_cost_key`.
+
+        """
+        with self._lock:
+            self._ensure_loaded()
+            self.pending[deadline_id] = {"key": key, "submitted": time.time()}
+
+    def refresh(self, deadline_con=None):
+        """Record the durations of all pending jobs that are finished.
+
+        Jobs that are still rendering stay pending, unless they were submitted
+        more than constants.JOB_STATS_PENDING_TTL seconds ago.
+
+        Args:
+            deadline_con (houdini_deadline_api_submission.webservice.
+                WebServiceClient, optional): Connection to the Deadline Web
+                Service. Defaults to the connection of the process.
+
+        Returns:
+            int: Amount of jobs whose durations got recorded.
+
+        """
+        logger = logging.getLogger(__name__)
+        with self._lock:
+            self._ensure_loaded()
+            pending = dict(self.pending)
+        if not pending:
+            return 0
+
+        deadline_con = deadline_con or deadline_utils.get_deadline_connect()
+        recorded = 0
+        for deadline_id, job in sorted(pending.items()):
+            try:
+                tasks = get_job_tasks(deadline_con, deadline_id)
+            except Exception:  # pylint: disable=broad-except
+                logger.debug("Could not query the tasks of %s.", deadline_id)
+                continue
+
+            expired = time.time() - job["submitted"] > constants.JOB_STATS_PENDING_TTL
+            if not expired and any(
+                task.get("Stat") in TASK_ACTIVE_STATES for task in tasks
+            ):
+                continue
+            frame_seconds, startup_seconds = get_task_durations(tasks)
+            with self._lock:
+                self.record(job["key"], frame_seconds, startup_seconds)
+                self.pending.pop(deadline_id, None)
+            recorded += bool(frame_seconds)
+        self.save()
+        return recorded
+
+    def refresh_in_background(self):
+        """Refresh the pending jobs in a background thread, unless one runs."""
+        with self._lock:
+            if self._refresh_thread and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(target=self._refresh_safely)
+            self._refresh_thread.daemon = True
+            self._refresh_thread.start()
+
+    def _refresh_safely(self):
+        try:
+            self.refresh()
+        except Exception:  # pylint: disable=broad-except
+            logger = logging.getLogger(__name__)
+            logger.debug("Could not refresh the job stats.", exc_info=True)
+
+
+def _parse_date(value):
+    """Return the seconds since the epoch of a Web Service date.
+
+    Args:
+        value (str): Date as returned by the Deadline Web Service.
+
+    Returns:
+        float: Seconds since the epoch, None if the date can't be parsed.
+
+    """
+    match = _DATE_PATTERN.match(str(value or ""))
+    if not match:
+        return None
+    date = tuple(int(group) for group in match.groups())
+    if date[0] < 1970:
+        # Tasks that didn't start yet use the minimum date.
+        return None
+    return float(calendar.timegm(date + (0, 0, 0)))
+
+
+def get_job_tasks(deadline_con, deadline_id):
+    """Return the tasks of a Deadline job.
+
+    Args:
+        deadline_con (houdini_deadline_api_submission.webservice.
+            WebServiceClient): Connection to the Deadline Web Service.
+        deadline_id (str): Deadline ID of the job.
+
+    Returns:
+        list of dict: Tasks of the job.
+
+    """
+    result = deadline_con.Tasks.GetJobTasks(deadline_id)
+    if isinstance(result, dict):
+        return list(result.get("Tasks") or [])
+    return list(result or [])
+
+
+def get_task_durations(tasks):
+    """Return the durations of the completed tasks.
+
+    Args:
+        tasks (list of dict): Tasks as returned by the Deadline Web Service.
+
+    Returns:
+        tuple: Seconds per frame and startup seconds of each completed task.
+
+    """
+    frame_seconds = []
+    startup_seconds = []
+    for task in tasks:
+        if task.get("Stat") != TASK_COMPLETED:
+            continue
+        start = _parse_date(task.get("Start"))
+        render_start = _parse_date(task.get("StartRen"))
+        end = _parse_date(task.get("Comp"))
+        if None in (start, render_start, end) or end < render_start:
+            continue
+        try:
+            frames = len(frame_order.parse_framestring(task.get("Frames", "")))
+        except ValueError:
+            continue
+        if not frames:
+            continue
+        frame_seconds.append((end - render_start) / float(frames))
+        startup_seconds.append(max(0.0, render_start - start))
+    return frame_seconds, startup_seconds
+
+
+def get_chunk_settings(cost, frames, target_seconds, max_concurrent_tasks=1):
+    """Return the chunk size and concurrent tasks of a job.
+
+    The chunk size is picked so a task, including its startup, takes about
+    the target duration. If the startup still takes longer than rendering the
+    frames of a task, a worker can run multiple tasks at the same time.
+
+    Args:
+        cost (Cost): Cost of the tasks of the ROP.
+        frames (int): Amount of frames of the job.
+        target_seconds (float): Seconds a task should take.
+        max_concurrent_tasks (int, optional): Maximum amount of tasks a
+            worker runs at the same time.
+
+    Returns:
+        tuple: Chunk size and amount of concurrent tasks.
+
+    """
+    frames = max(1, frames)
+    if cost.frame_seconds <= 0:
+        chunk_size = frames
+    else:
+        chunk_size = int((target_seconds - cost.startup_seconds) // cost.frame_seconds)
+        chunk_size = min(frames, max(1, chunk_size))
+
+    render_seconds = chunk_size * cost.frame_seconds
+    concurrent_tasks = 1
+    if render_seconds > 0:
+        concurrent_tasks = int(cost.startup_seconds // render_seconds) + 1
+    return chunk_size, max(1, min(max_concurrent_tasks, concurrent_tasks))
+
+
+def get_cost_key(node, output_parm, hip_name):
+    """Return the key the costs of a ROP are stored with.
+
+    The version of the scene name is left out, so new versions of a scene
+    use the costs of the previous ones.
+
+    Args:
+        node (hou.Node): The ROP.
+        output_parm (hou.Parm): Output parameter of the job, which tells
+            different jobs of a ROP apart (cache and render).
+        hip_name (str): File name of the scene.
+
+    Returns:
+        str: Key of the ROP.
+
+    """
+    scene_name = os.path.splitext(hip_name)[0]
+    return "{}:{}:{}".format(
+        _VERSION_PATTERN.sub("", scene_name),
+        node.path(),
+        output_parm.name() if output_parm else "",
+    )
+
+
+def get_stats_path():
+    """Return the path of the stats file.
+
+    Returns:
+        str: Path inside of the folder of the cached Deadline lists.
+
+    """
+    return os.path.join(deadline_cache.get_cache_folder(), "job_stats.json")
+
+
+# Store shared by the whole process.
+_STORE = None
+
+
+def get_store():
+    """Return the stats store of this process.
+
+    Returns:
+        JobStatsStore: The shared store.
+
+    """
+    global _STORE
+    if _STORE is None:
+        _STORE = JobStatsStore(get_stats_path())
+    return _STORE
+
+
+def record_submitted_jobs(jobs):
+    """Remember the submitted jobs using adaptive chunks as pending.
+
+    Args:
+        jobs (:obj:`list` of :obj:`houdini_deadline_api_submission.job.base.
+            BaseDeadlineJob`): Submitted singular jobs.
+
+    """
+    record_pending_jobs(
+        [
+            (job.deadline_id, job.cost_key)
+            for job in jobs
+            if job.cost_key and job.deadline_id and not job.is_pre_pass
+        ]
+    )
+
+
+def record_pending_jobs(pending_jobs):
+    """Remember the given submitted jobs as pending.
+
+    Args:
+        pending_jobs (list of tuple): Deadline ID and key of the ROP of each
+            job, see `get_cost_key`.
+
+    """
+    if not pending_jobs:
+        return
+    store = get_store()
+    for deadline_id, key in pending_jobs:
+        store.add_pending(deadline_id, key)
+    store.save()
@@ -0,0 +1,228 @@
+"""Cached lists of Deadline pools and groups for the submitter menus.
+
+Building a menu never waits for the Deadline Web Service. The lists are kept
+in memory and on disk, so they are available right away in a new session
+and while the Web Service is unreachable. Once a list is older than its time
+to live, it gets refreshed in a background thread while the menu keeps
+showing the last known list.
+"""
+
+# Import built-in modules
+import json
+import logging
+import os
+import threading
+import time
+
+# Import local modules
+from houdini_deadline_api_submission import constants
+from houdini_deadline_api_submission import deadline_utils
+
+
+class DeadlineListCache(object):
+    """Cache of a single list queried from Deadline.
+
+    Args:
+        name (str): Name of the list, used as the name of the cache file.
+        fetch (callable): Function returning the current list from Deadline.
+        ttl (float, optional): Seconds after which the list gets refreshed.
+        folder (str, optional): Folder of the cache file. Defaults to
+            `get_cache_folder()`.
+
+    """
+
+    def __init__(self, name, fetch, ttl=constants.DEADLINE_LIST_TTL, folder=None):
+        """Initialize the cache, the cache file is only read when needed."""
+        self.name = name
+        self.fetch = fetch
+        self.ttl = ttl
+        self.folder = folder
+        self.values = None
+        self.updated = 0.0
+        self.last_attempt = 0.0
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+
+    @property
+    def path(self):
+        """str: Path of the file storing the last known list."""
+        folder = self.folder or get_cache_folder()
+        return os.path.join(folder, "{}.json".format(self.name))
+
+    def load(self):
+        """Read the last known list from disk.
+
+        Returns:
+            bool: True if a list was found.
+
+        """
+        try:
+            with open(self.path) as cache_file:
+                data = json.load(cache_file)
+            self.values = list(data["values"])
+            self.updated = float(data["updated"])
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            return False
+        return True
+
+    def save(self):
+        """Write the current list to disk, so other sessions can use it."""
+        path = self.path
+        temp_path = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            folder = os.path.dirname(path)
+            if not os.path.isdir(folder):
+                os.makedirs(folder)
+            with open(temp_path, "w") as cache_file:
+                json.dump({"values": self.values, "updated": self.updated}, cache_file)
+            # Other sessions never read a partly written list.
+            os.replace(temp_path, path)
+        except (IOError, OSError):
+            logger = logging.getLogger(__name__)
+            logger.debug("Could not write the %s cache to %s.", self.name, path)
+
+    def is_outdated(self):
+        """Return True if the list is older than its time to live.
+
+        Returns:
+            bool: True if the list needs to be refreshed.
+
+        """
+        return time.time() - self.updated > self.ttl
+
+    def refresh(self):
+        """Query the list from Deadline right away.
+
+        If Deadline can't be reached, the last known list is kept.
+
+        Returns:
+            list of str: The current list.
+
+        """
+        with self._lock:
+            self.last_attempt = time.time()
+        try:
+            values = self.fetch()
+        except Exception:  # pylint: disable=broad-except
+            logger = logging.getLogger(__name__)
+            logger.warning(
+                "Could not refresh the Deadline %s, using the last known ones.",
+                self.name,
+                exc_info=True,
+            )
+            if self.values is None:
+                self.load()
+            return list(self.values or [])
+
+        with self._lock:
+            self.values = list(values)
+            self.updated = time.time()
+            self.save()
+            return list(self.values)
+
+    def refresh_in_background(self):
+        """Refresh the list in a background thread, unless one is running.
+
+        A failed attempt is only repeated after constants.DEADLINE_LIST_RETRY
+        seconds, so an unreachable Web Service isn't asked on every call.
+
+        """
+        with self._lock:
+            if self._refresh_thread and self._refresh_thread.is_alive():
+                return
+            if time.time() - self.last_attempt < constants.DEADLINE_LIST_RETRY:
+                return
+            self.last_attempt = time.time()
+            self._refresh_thread = threading.Thread(target=self.refresh)
+            self._refresh_thread.daemon = True
+            self._refresh_thread.start()
+
+    def get(self):
+        """Return the list without waiting for Deadline if possible.
+
+        Only if there is no list in memory or on disk, it is queried right
+        away (at most once per constants.DEADLINE_LIST_RETRY seconds).
+        Outdated lists are returned as they are and refreshed in the
+        background.
+
+        Returns:
+            list of str: The cached list.
+
+        """
+        if self.values is None and not self.load():
+            if time.time() - self.last_attempt < constants.DEADLINE_LIST_RETRY:
+                return []
+            return self.refresh()
+        if self.is_outdated():
+            self.refresh_in_background()
+        return list(self.values)
+
+    def invalidate(self):
+        """Mark the list as outdated, so the next call to `get` refreshes it.
+
+        The last known list is kept until the refresh succeeded.
+
+        """
+        with self._lock:
+            self.updated = 0.0
+            self.last_attempt = 0.0
+
+
+def get_cache_folder():
+    """Return the folder storing the cached lists.
+
+    Returns:
+        str: Value of constants.DEADLINE_CACHE_FOLDER_ENV, or a folder in the
+            home directory of the user.
+
+    """
+    return os.environ.get(constants.DEADLINE_CACHE_FOLDER_ENV) or os.path.join(
+        os.path.expanduser("~"), ".hal", constants.PACKAGE_NAME
+    )
+
+
+# Caches shared by the whole process.
+_POOLS = DeadlineListCache("pools", deadline_utils.get_deadline_pools)
+_GROUPS = DeadlineListCache("groups", deadline_utils.get_deadline_groups)
+
+
+def get_pools():
+    """Return the cached names of all Deadline pools.
+
+    Returns:
+        list of str: Sorted pool names, without the "none" pool.
+
+    """
+    return _POOLS.get()
+
+
+def get_groups():
+    """Return the cached names of all Deadline groups.
+
+    Returns:
+        list of str: Sorted group names, without the "none" group.
+
+    """
+    return _GROUPS.get()
+
+
+def refresh_pools():
+    """Invalidate the cached pools and query them from Deadline right away.
+
+    Returns:
+        list of str: Sorted pool names, without the "none" pool.
+
+    """
+    _POOLS.invalidate()
+    return _POOLS.refresh()
+
+
+def refresh_groups():
+    """Invalidate the cached groups and query them from Deadline right away.
+
+    Returns:
+        list of str: Sorted group names, without the "none" group.
+
+    """
+    _GROUPS.invalidate()
+    return _GROUPS.refresh()
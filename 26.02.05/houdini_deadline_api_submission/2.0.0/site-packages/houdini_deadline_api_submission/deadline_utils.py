@@ -1,36 +1,64 @@
 """Utility functions for various Deadline related operations."""
 
 # Import built-in modules
+import contextlib
 import logging
 import os
 
 # Import third-party modules
-from Deadline.DeadlineConnect import DeadlineCon
 from farm_environment import FarmEnvironment
 from hal_config import Configuration
 
 # Import local modules
-from houdini_deadline_api_submission.singleton import Singleton
+from houdini_deadline_api_submission import constants
+from houdini_deadline_api_submission import frame_order
+from houdini_deadline_api_submission import tracing
+from houdini_deadline_api_submission import webservice
+from houdini_deadline_api_submission.singleton import SingletonBase
 
 
-class DeadlineConnection(object):
-    """Singleton class to retrieve a DeadlineCon object."""
+class DeadlineConnection(SingletonBase):
+    """Singleton class to retrieve a Deadline Web Service client.
 
-    __metaclass__ = Singleton
+    Besides the hostname and port, the Web Service configuration can define
+    a "timeout", the amount of "retries" and their "backoff", the "pool_size"
+    and if it should "use_ssl". HTTPS connections are verified with the
+    "ca_cert" file, unless they are "insecure". If a "username" is given, it
+    authenticates with the "password", like `DeadlineCon.
+    SetAuthenticationCredentials`.
+
+    """
 
     def __init__(self):
         """Initialize the Deadline connection."""
         config = Configuration()
         deadline_info = config.query("deadline_api", "webservice")
-        self.connection = DeadlineCon(deadline_info["hostname"], deadline_info["port"])
+        self.connection = webservice.WebServiceClient(
+            deadline_info["hostname"],
+            deadline_info["port"],
+            timeout=deadline_info.get("timeout", constants.DEFAULT_WEBSERVICE_TIMEOUT),
+            retries=deadline_info.get("retries", constants.DEFAULT_WEBSERVICE_RETRIES),
+            backoff=deadline_info.get("backoff", constants.DEFAULT_WEBSERVICE_BACKOFF),
+            pool_size=deadline_info.get(
+                "pool_size", constants.DEFAULT_WEBSERVICE_POOL_SIZE
+            ),
+            use_ssl=deadline_info.get("use_ssl", False),
+            ca_cert=deadline_info.get("ca_cert"),
+            insecure=deadline_info.get("insecure", False),
+            username=deadline_info.get("username"),
+            password=deadline_info.get("password"),
+        )
 
 
 def get_deadline_connect():
     """Return a Deadline Connect object.
 
+    The client is shared by the whole process and can be used by multiple
+    threads at the same time.
+
     Returns:
-        Deadline.DeadlineConnect.DeadlineCon: Connection object to the
-            Deadline API.
+        houdini_deadline_api_submission.webservice.WebServiceClient:
+            Connection object to the Deadline API.
 
     """
     connection = DeadlineConnection()
@@ -109,14 +137,233 @@ def get_framestring(start, end, inc=1, use_first_last_middle=False):
         str: Deadline compatible framestring.
 
     """
+    if use_first_last_middle:
+        return get_frame_list_string(
+            frame_order.get_frame_range(start, end, inc), use_first_last_middle=True
+        )
     format_string = "{start}-{end}x{inc}"
     if inc == 1:
         format_string = "{start}-{end}"
+    return format_string.format(start=start, end=end, inc=inc)
+
+
+def get_frame_list_string(frames, use_first_last_middle=False, chunk_size=1):
+    """Generate a Deadline frame string of any set of frames.
+
+    This allows to only render some frames of a range, for example the ones
+    that are missing.
+
+    Args:
+        frames (iterable of int): Frames to render.
+        use_first_last_middle (bool, optional): If True, render the first, last
+            and middle frame first, see `frame_order.order_first_last_middle`.
+            Otherwise the frames are rendered in ascending order.
+        chunk_size (int, optional): Amount of frames Deadline renders per
+            task. Tasks of more than one frame are ordered as a whole.
+
+    Returns:
+        str: Deadline compatible framestring, consecutive frames with the same
+            increment are combined into ranges.
+
+    """
     if use_first_last_middle:
-        raise NotImplementedError(
-            "First-Last-Middle Frame string is not yet " "implemented."
+        ordered_frames = frame_order.order_first_last_middle(
+            frames, chunk_size=chunk_size
         )
-    return format_string.format(start=start, end=end, inc=inc)
+    else:
+        ordered_frames = sorted(set(frames))
+    return frame_order.compress_frames(ordered_frames)
+
+
+# Prefix of the job info keys holding the environment of a Deadline job.
+ENVIRONMENT_KEY_PREFIX = "EnvironmentKeyValue"
+
+# Environment shared by all jobs of the running submission, None if it is
+# queried for each job.
+_ACTIVE_ENVIRONMENT = None
+
+
+class EnvironmentBlock(object):
+    """Environment variables of a job, in the order of their Deadline index.
+
+    Each variable keeps the index it got when it was first set, so setting a
+    variable again replaces its value (last writer wins) and new variables
+    are appended in constant time without scanning the job info.
+
+    Args:
+        values (dict, optional): Variables to start with, added in the order
+            of their names.
+
+    Examples:
+        >>> block = EnvironmentBlock({"HAL_ROOT": "U:/"})
+        >>> block.set("WEDGE", "_seed_1")
+        1
+        >>> block.set("HAL_ROOT", "V:/")
+        0
+        >>> block.to_deadline_dict()["EnvironmentKeyValue0"]
+        'HAL_ROOT=V:/'
+
+    """
+
+    def __init__(self, values=None):
+        """Initialize the block with the given variables."""
+        self._keys = []
+        self._indices = {}
+        self._values = {}
+        if values:
+            self.update(values)
+
+    def __len__(self):
+        """Return the amount of variables."""
+        return len(self._keys)
+
+    def __contains__(self, key):
+        """Return True if the given variable is set."""
+        return key in self._values
+
+    def __iter__(self):
+        """Iterate over the variable names, in the order of their index."""
+        return iter(self._keys)
+
+    def get(self, key, default=None):
+        """Return the value of a variable.
+
+        Args:
+            key (str): Name of the variable.
+            default (object, optional): Value if the variable isn't set.
+
+        Returns:
+            object: Value of the variable.
+
+        """
+        return self._values.get(key, default)
+
+    def index(self, key):
+        """Return the Deadline index of a variable.
+
+        Args:
+            key (str): Name of the variable.
+
+        Returns:
+            int: Index of the variable.
+
+        Raises:
+            ValueError: If the variable isn't set.
+
+        """
+        if key not in self._values:
+            raise ValueError("{} is not set in the environment.".format(key))
+        return self._indices[key]
+
+    def set(self, key, value):
+        """Set a variable, keeping its index if it is already set.
+
+        Args:
+            key (str): Name of the variable.
+            value (object): Value of the variable.
+
+        Returns:
+            int: Deadline index of the variable.
+
+        """
+        index = self._indices.get(key)
+        if index is None:
+            index = self._indices[key] = len(self._keys)
+            self._keys.append(key)
+        self._values[key] = value
+        return index
+
+    def update(self, values):
+        """Set multiple variables, new ones are added sorted by their names.
+
+        Args:
+            values (dict or EnvironmentBlock): Variables to set.
+
+        """
+        if isinstance(values, EnvironmentBlock):
+            items = [(key, values.get(key)) for key in values]
+        else:
+            items = sorted(values.items())
+        for key, value in items:
+            self.set(key, value)
+
+    def copy(self):
+        """Return an independent copy of this block.
+
+        Returns:
+            EnvironmentBlock: The copied block.
+
+        """
+        block = EnvironmentBlock()
+        block._keys = list(self._keys)  # pylint: disable=protected-access
+        block._indices = dict(self._indices)  # pylint: disable=protected-access
+        block._values = dict(self._values)  # pylint: disable=protected-access
+        return block
+
+    def overlay(self, values):
+        """Return a copy of this block with the given variables set on top.
+
+        Args:
+            values (dict or EnvironmentBlock): Variables of a single job.
+
+        Returns:
+            EnvironmentBlock: The merged block.
+
+        """
+        block = self.copy()
+        if values:
+            block.update(values)
+        return block
+
+    def to_deadline_dict(self):
+        """Convert the variables to Deadline job info entries.
+
+        Returns:
+            dict: Deadline Submission compatible values.
+
+        """
+        return dict(
+            (get_environment_key(index), "{}={}".format(key, self._values[key]))
+            for index, key in enumerate(self._keys)
+        )
+
+    @classmethod
+    def from_deadline_dict(cls, deadline_dict):
+        """Read the variables of a Deadline job info dictionary.
+
+        Args:
+            deadline_dict (dict): Deadline compatible dictionary.
+
+        Returns:
+            EnvironmentBlock: Variables in the order of their index.
+
+        """
+        entries = []
+        for deadline_key, deadline_val in deadline_dict.items():
+            if not deadline_key.startswith(ENVIRONMENT_KEY_PREFIX):
+                continue
+            index = deadline_key[len(ENVIRONMENT_KEY_PREFIX) :]
+            if not index.isdigit():
+                continue
+            key, _, value = str(deadline_val).partition("=")
+            entries.append((int(index), key, value))
+        block = cls()
+        for _, key, value in sorted(entries):
+            block.set(key, value)
+        return block
+
+
+def get_environment_key(index):
+    """Return the job info key of the environment variable at the given index.
+
+    Args:
+        index (int): Deadline index of the variable.
+
+    Returns:
+        str: Key of the job info entry.
+
+    """
+    return "{}{}".format(ENVIRONMENT_KEY_PREFIX, index)
 
 
 def convert_to_deadline_env(orig):
@@ -129,12 +376,7 @@ def convert_to_deadline_env(orig):
         dict: Deadline Submission compatible values.
 
     """
-    deadline_dict = {}
-    for env_variable_index, (key, val) in enumerate(sorted(orig.items())):
-        deadline_key = "EnvironmentKeyValue{}".format(env_variable_index)
-        deadline_val = "{}={}".format(key, val)
-        deadline_dict[deadline_key] = deadline_val
-    return deadline_dict
+    return EnvironmentBlock(orig).to_deadline_dict()
 
 
 def append_to_deadline_env(deadline_dict, key, value):
@@ -142,6 +384,9 @@ def append_to_deadline_env(deadline_dict, key, value):
 
     If a dictionary was already converted to a Deadline compatible dictionary,
     we need to use this function instead of simply adding to the dictionary.
+    If the variable is already set, its value is replaced. Jobs should use
+    `BaseDeadlineJob.set_environment`, which doesn't need to look through the
+    existing entries.
 
     Args:
         deadline_dict (dict): Deadline compatible dictionary.
@@ -149,12 +394,67 @@ def append_to_deadline_env(deadline_dict, key, value):
         value (str): Value of the environment variable to add.
 
     """
+    prefix = "{}=".format(key)
     index = 0
-    for dl_key in deadline_dict.keys():
-        if dl_key.startswith("EnvironmentKeyValue"):
-            index += 1
+    while get_environment_key(index) in deadline_dict:
+        if str(deadline_dict[get_environment_key(index)]).startswith(prefix):
+            break
+        index += 1
+    deadline_dict[get_environment_key(index)] = "{}{}".format(prefix, value)
+
+
+def query_hal_environment():
+    """Return all environment variables starting with 'HAL_' of the farm.
+
+    Returns:
+        EnvironmentBlock: The variables, sorted by their names.
+
+    """
+    farm_environment = FarmEnvironment(False)
+    return EnvironmentBlock(
+        dict(
+            (key, farm_environment[key])
+            for key in farm_environment
+            if key.startswith("HAL_")
+        )
+    )
 
-    deadline_dict["EnvironmentKeyValue{}".format(index)] = "{}={}".format(key, value)
+
+def get_hal_environment():
+    """Return the 'HAL_' variables of the farm environment.
+
+    Inside of `environment_block`, the variables are only queried once.
+
+    Returns:
+        EnvironmentBlock: The variables, sorted by their names. The block
+            must not be changed, use `EnvironmentBlock.overlay` instead.
+
+    """
+    if _ACTIVE_ENVIRONMENT is not None:
+        return _ACTIVE_ENVIRONMENT
+    return query_hal_environment()
+
+
+@contextlib.contextmanager
+def environment_block():
+    """Query the farm environment once for all jobs created in this context.
+
+    Nested contexts use the environment of the outermost one.
+
+    Yields:
+        EnvironmentBlock: The 'HAL_' variables shared by all jobs.
+
+    """
+    global _ACTIVE_ENVIRONMENT
+    if _ACTIVE_ENVIRONMENT is not None:
+        yield _ACTIVE_ENVIRONMENT
+        return
+
+    _ACTIVE_ENVIRONMENT = query_hal_environment()
+    try:
+        yield _ACTIVE_ENVIRONMENT
+    finally:
+        _ACTIVE_ENVIRONMENT = None
 
 
 def get_hal_environment_dict(extra_dict=None):
@@ -178,25 +478,36 @@ def get_hal_environment_dict(extra_dict=None):
             }
 
     """
-    extra_dict = extra_dict if extra_dict else {}
-    deadline_dict = {}
-    farm_environment = FarmEnvironment(False)
+    return get_hal_environment().overlay(extra_dict).to_deadline_dict()
+
+
+def evaluate_deadline_info(*deadline_infos):
+    """Replace any callable value in the given dictionaries with its result.
 
-    keys = filter(lambda k: k.startswith("HAL_"), farm_environment)
-    for key in keys:
-        deadline_dict[key] = farm_environment[key]
-    deadline_dict.update(extra_dict)
+    If a function is passed as an information, we want to use the return value
+    of the function. This allows us to get information right before sending it
+    to Deadline, for example after wedges have been applied.
 
-    return convert_to_deadline_env(deadline_dict)
+    Args:
+        *deadline_infos (dict): Job or plugin info dictionaries to update in
+            place.
+
+    """
+    for deadline_info in deadline_infos:
+        for key, dl_info_value in deadline_info.items():
+            if callable(dl_info_value):
+                deadline_info[key] = dl_info_value()
 
 
+@tracing.traced("webservice_submit_job", category="webservice")
 def submit_job(job_info, plugin_info, deadline_con=None):
     """Submit a job to Deadline.
 
     Args:
         job_info (dict):
         plugin_info (dict):
-        deadline_con (Deadline.DeadlineConnect.DeadlineCon, optional):
+        deadline_con (houdini_deadline_api_submission.webservice.
+            WebServiceClient, optional):
             Deadline connection object. If not given, a connection will
             automatically be established.
 
@@ -204,12 +515,7 @@ def submit_job(job_info, plugin_info, deadline_con=None):
         int: ID of submitted job.
 
     """
-    # If a function is passed as an information, we want to use the return value of the
-    # function. This allows us to get information right before sending it to Deadline.
-    for deadline_info in (job_info, plugin_info):
-        for key, dl_info_value in deadline_info.items():
-            if callable(dl_info_value):
-                deadline_info[key] = dl_info_value()
+    evaluate_deadline_info(job_info, plugin_info)
 
     if not deadline_con:
         deadline_con = get_deadline_connect()
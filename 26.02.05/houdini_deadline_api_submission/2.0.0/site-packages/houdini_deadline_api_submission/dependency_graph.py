@@ -0,0 +1,217 @@
+"""Indexed graphs used to collapse the ROP dependency tree."""
+
+
+class DependencyGraph(object):
+    """Directed graph of ROPs and the ROPs they depend on.
+
+    Each node gets an index in the order it was added. Edges are stored as
+    sets of indices in both directions, so adding nodes and edges, looking up
+    a node and querying its up- or downstream nodes never need to scan a list.
+
+    Examples:
+        >>> graph = DependencyGraph()
+        >>> graph.add_node(hou.node('/out/geometry1'))
+        0
+        >>> graph.add_dependency(
+        ...     hou.node('/out/mantra1'), hou.node('/out/geometry1')
+        ... )
+        >>> graph.dependency_ids(hou.node('/out/mantra1'))
+        [0]
+
+    """
+
+    def __init__(self):
+        """Initialize an empty graph."""
+        self.nodes = []
+        self._indices = {}
+        self._upstream = []
+        self._downstream = []
+
+    def __len__(self):
+        """Return the amount of nodes in this graph.
+
+        Returns:
+            int: Amount of nodes.
+
+        """
+        return len(self.nodes)
+
+    def __contains__(self, node):
+        """Return True if the given node is part of this graph.
+
+        Args:
+            node (hou.Node): Node to look up.
+
+        Returns:
+            bool: True if the node was added to this graph.
+
+        """
+        return node in self._indices
+
+    def add_node(self, node):
+        """Add a node to the graph, if it isn't part of it yet.
+
+        Args:
+            node (hou.Node): Node to add.
+
+        Returns:
+            int: Index of the node.
+
+        """
+        index = self._indices.get(node)
+        if index is None:
+            index = len(self.nodes)
+            self._indices[node] = index
+            self.nodes.append(node)
+            self._upstream.append(set())
+            self._downstream.append(set())
+        return index
+
+    def index(self, node):
+        """Return the index of the given node.
+
+        Args:
+            node (hou.Node): Node to look up.
+
+        Returns:
+            int: Index of the node.
+
+        Raises:
+            KeyError: If the node is not part of this graph.
+
+        """
+        return self._indices[node]
+
+    def add_dependency(self, node, dependency):
+        """Mark node as dependent on dependency, adding both if needed.
+
+        Args:
+            node (hou.Node): Node that depends on the other node.
+            dependency (hou.Node): Node that needs to be finished first.
+
+        """
+        index = self.add_node(node)
+        dependency_index = self.add_node(dependency)
+        self._upstream[index].add(dependency_index)
+        self._downstream[dependency_index].add(index)
+
+    def remove_self_dependencies(self):
+        """Remove any edge that points from a node to itself."""
+        for index, upstream in enumerate(self._upstream):
+            if index in upstream:
+                upstream.discard(index)
+                self._downstream[index].discard(index)
+
+    def dependency_ids(self, node):
+        """Return the sorted indices of the nodes the given node depends on.
+
+        Args:
+            node (hou.Node): Node to get the dependencies of.
+
+        Returns:
+            list of int: Indices of the dependencies.
+
+        """
+        return sorted(self._upstream[self._indices[node]])
+
+    def dependencies(self, node):
+        """Return the nodes the given node depends on.
+
+        Args:
+            node (hou.Node): Node to get the dependencies of.
+
+        Returns:
+            list of hou.Node: Dependencies, sorted by their index.
+
+        """
+        return [self.nodes[index] for index in self.dependency_ids(node)]
+
+    def dependents(self, node):
+        """Return the nodes that depend on the given node.
+
+        Args:
+            node (hou.Node): Node to get the dependent nodes of.
+
+        Returns:
+            list of hou.Node: Dependent nodes, sorted by their index.
+
+        """
+        indices = sorted(self._downstream[self._indices[node]])
+        return [self.nodes[index] for index in indices]
+
+
+class FetchIndex(object):
+    """Input ancestors of ROPs and the Fetch ROPs fetching other ROPs.
+
+    The ancestors of each node are only queried once and stored as a set,
+    while all Fetch ROPs found in these ancestors are indexed by their source.
+    Checking if a dependency is an input of a ROP and finding the Fetch ROP
+    that fetches it are then simple lookups.
+
+    Args:
+        nodes (list of hou.Node): ROPs whose inputs should be indexed.
+
+    """
+
+    def __init__(self, nodes):
+        """Index the ancestors of the given nodes and the fetches in them."""
+        self._ancestors = {}
+        self._fetches = {}
+
+        all_ancestors = set()
+        for node in nodes:
+            all_ancestors.update(self.ancestors(node))
+        for ancestor in all_ancestors:
+            if ancestor.type().name() != "fetch":
+                continue
+            source_parm = ancestor.parm("source")
+            source = source_parm.evalAsNode() if source_parm else None
+            if source is not None:
+                self._fetches.setdefault(source, []).append(ancestor)
+
+    def ancestors(self, node):
+        """Return all input ancestors of the given node.
+
+        Args:
+            node (hou.Node): Node to get the ancestors of.
+
+        Returns:
+            frozenset of hou.Node: Input ancestors, following subnetworks.
+
+        """
+        ancestors = self._ancestors.get(node)
+        if ancestors is None:
+            ancestors = frozenset(node.inputAncestors(follow_subnets=True))
+            self._ancestors[node] = ancestors
+        return ancestors
+
+    def is_input(self, node, dependency):
+        """Return True if the dependency or one of its parents is an input.
+
+        Args:
+            node (hou.Node): Node whose inputs will be checked.
+            dependency (hou.Node): Dependency of the node.
+
+        Returns:
+            bool: False if the dependency is not connected to the node, which
+                means that it gets fetched.
+
+        """
+        inputs = self.ancestors(node)
+        while dependency:
+            if dependency in inputs:
+                return True
+            dependency = dependency.parent()
+        return False
+
+    def fetches(self, source):
+        """Return the indexed Fetch ROPs that fetch the given source.
+
+        Args:
+            source (hou.Node): Fetched ROP.
+
+        Returns:
+            list of hou.Node: Fetch ROPs whose source is the given ROP.
+
+        """
+        return list(self._fetches.get(source, ()))
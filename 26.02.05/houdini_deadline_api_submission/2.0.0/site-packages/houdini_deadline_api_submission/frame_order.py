@@ -0,0 +1,195 @@
+"""Order frames for Deadline and convert them from and to frame strings.
+
+Deadline renders the frames of a job in the order of its frame list. Ordering
+the frames first-last-middle renders the first, the last and the middle frame
+first and then keeps bisecting the segments in between, so a job gives an
+early preview of the whole range and broken setups fail on the first tasks.
+
+Deadline splits the frame list into tasks of the chunk size in the order of
+the list, and the Houdini plugin renders each task as a range from its first
+to its last frame. Jobs with a chunk size above 1 therefore order whole
+chunks of ascending frames instead of single frames.
+"""
+
+# Import built-in modules
+import re
+
+# Pattern of a single frame string token: a frame, a range or a range with an
+# increment, for example '1001', '1001-1100' or '1001-1100x5'.
+_TOKEN_PATTERN = re.compile(r"^(-?\d+)(?:-(-?\d+)(?:x(\d+))?)?$")
+
+# Segments spanning this many frames or less are not bisected anymore, their
+# remaining frames are rendered in ascending order.
+DEFAULT_MIN_GAP = 10
+
+
+def get_frame_range(start, end, inc=1):
+    """Return the frames of a frame range.
+
+    Args:
+        start (int): Start frame.
+        end (int): End frame, included if the increment reaches it.
+        inc (int, optional): Increment of the frames.
+
+    Returns:
+        list of int: Frames of the range.
+
+    """
+    return list(range(int(start), int(end) + 1, max(int(inc), 1)))
+
+
+def order_first_last_middle(frames, min_gap=DEFAULT_MIN_GAP, chunk_size=1):
+    """Sort frames so the first, last and middle frame come first.
+
+    Afterwards each segment between frames that are already in the list is
+    split in the middle, one level of segments after another, until the
+    segments span at most min_gap frames. The remaining frames follow in
+    ascending order.
+
+    With a chunk size above 1, the ascending frames are split into chunks
+    and the chunks are ordered by their first frame instead. The frames of a
+    chunk stay together in ascending order, so Deadline creates the same
+    tasks as for ascending frames. A last chunk with fewer frames is kept at
+    the end, otherwise Deadline would fill it up with frames of the next one.
+
+    Args:
+        frames (iterable of int): Frames to order, for example only the
+            missing frames of a job. Duplicates are removed.
+        min_gap (int, optional): Segments spanning this many frames or less
+            are not split anymore.
+        chunk_size (int, optional): Amount of frames Deadline renders per
+            task.
+
+    Returns:
+        list of int: Each frame once, in render order.
+
+    Examples:
+        >>> order_first_last_middle(range(1, 10), min_gap=2)
+        [1, 9, 5, 3, 7, 2, 4, 6, 8]
+        >>> order_first_last_middle(range(1, 10), min_gap=2, chunk_size=2)
+        [1, 2, 7, 8, 3, 4, 5, 6, 9]
+
+    """
+    frames = sorted(set(frames))
+    chunk_size = max(1, int(chunk_size))
+    if chunk_size == 1:
+        return [frames[index] for index in _get_order(frames, min_gap)]
+
+    chunks = [
+        frames[index : index + chunk_size]
+        for index in range(0, len(frames), chunk_size)
+    ]
+    last_chunk = []
+    if chunks and len(chunks[-1]) < chunk_size:
+        last_chunk = chunks.pop()
+    order = _get_order([chunk[0] for chunk in chunks], min_gap)
+    return [frame for index in order for frame in chunks[index]] + last_chunk
+
+
+def _get_order(frames, min_gap):
+    """Return the indices of ascending frames in first-last-middle order.
+
+    Args:
+        frames (list of int): Ascending frames without duplicates.
+        min_gap (int): Segments spanning this many frames or less are not
+            split anymore.
+
+    Returns:
+        list of int: Each index of the frames once, in render order.
+
+    """
+    if len(frames) <= 2:
+        return list(range(len(frames)))
+
+    last = len(frames) - 1
+    order = [0, last]
+    segments = [(0, last)]
+    while segments:
+        next_segments = []
+        for low, high in segments:
+            if high - low < 2 or frames[high] - frames[low] <= min_gap:
+                continue
+            middle = (low + high) // 2
+            order.append(middle)
+            next_segments.extend(((low, middle), (middle, high)))
+        segments = next_segments
+
+    ordered = set(order)
+    order.extend(index for index in range(len(frames)) if index not in ordered)
+    return order
+
+
+def compress_frames(frames):
+    """Convert frames to a Deadline frame string, keeping their order.
+
+    Runs of at least three frames with the same increment are written as a
+    single token.
+
+    Args:
+        frames (list of int): Frames in render order.
+
+    Returns:
+        str: Deadline frame string.
+
+    Examples:
+        >>> compress_frames([1, 9, 5, 3, 7, 2, 4, 6, 8])
+        '1,9,5,3,7,2-8x2'
+
+    """
+    frames = [int(frame) for frame in frames]
+    tokens = []
+    index = 0
+    while index < len(frames):
+        end = index
+        if index + 1 < len(frames):
+            inc = frames[index + 1] - frames[index]
+            if inc > 0:
+                end = index + 1
+                while end + 1 < len(frames) and frames[end + 1] - frames[end] == inc:
+                    end += 1
+        if end - index < 2:
+            tokens.append(str(frames[index]))
+            index += 1
+            continue
+        if inc == 1:
+            tokens.append("{}-{}".format(frames[index], frames[end]))
+        else:
+            tokens.append("{}-{}x{}".format(frames[index], frames[end], inc))
+        index = end + 1
+    return ",".join(tokens)
+
+
+def parse_framestring(framestring):
+    """Return the frames of a Deadline frame string.
+
+    Args:
+        framestring (str): Frame string made of frames ('1001'), ranges
+            ('1001-1100', '1100-1001') and ranges with an increment
+            ('1001-1100x5'), separated by commas.
+
+    Returns:
+        list of int: Each frame once, in the order of the frame string.
+
+    Raises:
+        ValueError: If a token of the frame string is invalid.
+
+    """
+    frames = []
+    seen = set()
+    for token in str(framestring).replace(" ", "").split(","):
+        if not token:
+            continue
+        match = _TOKEN_PATTERN.match(token)
+        if not match:
+            raise ValueError("Invalid frame string token: {}".format(token))
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) is not None else start
+        inc = int(match.group(3) or 1)
+        if not inc:
+            raise ValueError("Invalid frame string token: {}".format(token))
+        step = inc if end >= start else -inc
+        for frame in range(start, end + (1 if step > 0 else -1), step):
+            if frame not in seen:
+                seen.add(frame)
+                frames.append(frame)
+    return frames
@@ -0,0 +1,255 @@
+"""Find the frames of a job whose outputs are missing on disk.
+
+When a farm job only partially fails, a resubmission with "Skip Existing
+Frames" turned on only renders the frames whose output files are missing or
+invalid. The output parameter of each job is expanded per frame on the main
+thread, since Houdini can't be evaluated from other threads. Files on
+network storage are checked through a pool of threads, which is where the
+time goes there. On local disks a single thread is faster.
+
+Examples:
+    >>> paths = get_output_paths(hou.parm("/out/geometry1/sopoutput"), [1, 2])
+    >>> get_missing_frames(paths, OutputValidation(min_size=1))
+    [2]
+
+"""
+
+# Import built-in modules
+from concurrent.futures import ThreadPoolExecutor
+import ctypes
+import os
+import sys
+
+# Import third-party modules
+import hou  # pylint: disable=import-error
+
+# Import local modules
+from houdini_deadline_api_submission import constants
+from houdini_deadline_api_submission import utils
+
+# Minimum amount of output files checked by a single thread.
+MIN_CHUNK_SIZE = 64
+# Types of network file systems listed in /proc/mounts.
+NETWORK_FILESYSTEMS = (
+    "afs",
+    "ceph",
+    "cifs",
+    "fuse.sshfs",
+    "glusterfs",
+    "gpfs",
+    "lustre",
+    "nfs",
+    "nfs4",
+    "smb3",
+    "smbfs",
+)
+# Drive type of network drives returned by GetDriveTypeW on Windows.
+_DRIVE_REMOTE = 4
+# Whether each Windows drive is a network drive.
+_NETWORK_DRIVES = {}
+# Mount points and file system types read from /proc/mounts.
+_MOUNTS = None
+
+
+class OutputValidation(object):
+    """Rules deciding if the output file of a frame can be kept.
+
+    Args:
+        min_size (int, optional): Files smaller than this amount of bytes are
+            rendered again.
+        newer_than (float, optional): Files modified before this time, in
+            seconds since the epoch, are rendered again.
+
+    """
+
+    def __init__(self, min_size=0, newer_than=None):
+        """Initialize the validation rules."""
+        self.min_size = min_size
+        self.newer_than = newer_than
+
+    def is_valid(self, path):
+        """Return if the given output file can be kept.
+
+        Args:
+            path (str): Path of the output file.
+
+        Returns:
+            bool: True if the file exists and follows all rules.
+
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if stat.st_size < self.min_size:
+            return False
+        if self.newer_than is not None and stat.st_mtime < self.newer_than:
+            return False
+        return True
+
+    def get_valid_paths(self, paths):
+        """Return the given output files that can be kept.
+
+        Args:
+            paths (list of str): Paths of the output files.
+
+        Returns:
+            list of str: Paths of the valid files.
+
+        """
+        return [path for path in paths if self.is_valid(path)]
+
+
+def get_validation(submitter_node):
+    """Return the validation rules of a submission skipping existing frames.
+
+    Args:
+        submitter_node (hou.Node): HAL Deadline Submit ROP that is being used
+            to drive the submission.
+
+    Returns:
+        OutputValidation: Rules to check the outputs with, None if
+            `constants.SKIP_EXISTING` is turned off.
+
+    """
+    if not utils.get_submitter_value(
+        submitter_node, constants.SKIP_EXISTING, default=False
+    ):
+        return None
+
+    min_size = utils.get_submitter_value(
+        submitter_node, constants.SKIP_EXISTING_MIN_SIZE, default=0
+    )
+    newer_than = None
+    if utils.get_submitter_value(
+        submitter_node, constants.SKIP_EXISTING_NEWER_THAN_HIP, default=False
+    ):
+        try:
+            newer_than = os.path.getmtime(hou.hipFile.path())
+        except OSError:
+            pass
+    return OutputValidation(min_size=int(min_size or 0), newer_than=newer_than)
+
+
+def get_output_paths(output_parm, frames):
+    """Expand the output parameter of a job for each frame.
+
+    Args:
+        output_parm (hou.Parm): Parameter defining the output file path.
+        frames (iterable of int): Frames to expand the path for.
+
+    Returns:
+        dict: Output path of each frame.
+
+    """
+    return dict((frame, output_parm.evalAtFrame(frame)) for frame in frames)
+
+
+def _get_mounts():
+    """Return the mount points and file system types of this machine.
+
+    Returns:
+        list of tuple: Mount point and file system type, longest mount points
+            first. Empty if /proc/mounts can't be read.
+
+    """
+    mounts = []
+    try:
+        with open("/proc/mounts") as mounts_file:
+            for line in mounts_file:
+                fields = line.split()
+                if len(fields) >= 3:
+                    # Spaces in mount points are escaped as octal numbers.
+                    mounts.append((fields[1].replace("\\040", " "), fields[2]))
+    except (IOError, OSError):
+        pass
+    return sorted(mounts, key=lambda mount: len(mount[0]), reverse=True)
+
+
+def is_network_path(path):
+    """Return True if the given path is on network storage.
+
+    UNC paths and mapped network drives are detected on Windows, network file
+    systems listed in /proc/mounts on Linux. The type of each drive and the
+    mounts are only looked up once per process.
+
+    Args:
+        path (str): Path of a file or folder.
+
+    Returns:
+        bool: True if the path is on network storage.
+
+    """
+    global _MOUNTS
+    if path.replace("\\", "/").startswith("//"):
+        return True
+
+    if sys.platform == "win32":
+        drive = os.path.splitdrive(path)[0]
+        if not drive:
+            return False
+        if drive not in _NETWORK_DRIVES:
+            drive_type = ctypes.windll.kernel32.GetDriveTypeW("{}\\".format(drive))
+            _NETWORK_DRIVES[drive] = drive_type == _DRIVE_REMOTE
+        return _NETWORK_DRIVES[drive]
+
+    if _MOUNTS is None:
+        _MOUNTS = _get_mounts()
+    absolute_path = os.path.abspath(path)
+    for mount_point, filesystem in _MOUNTS:
+        prefix = mount_point.rstrip("/") + "/"
+        if absolute_path == mount_point or absolute_path.startswith(prefix):
+            return filesystem in NETWORK_FILESYSTEMS
+    return False
+
+
+def get_missing_frames(paths, validation=None, max_workers=None):
+    """Return the frames whose output files are missing or invalid.
+
+    Frames sharing the same output file, for example because the output
+    doesn't contain $F, are only checked once.
+
+    Args:
+        paths (dict): Output path of each frame, as returned by
+            `get_output_paths`.
+        validation (OutputValidation, optional): Rules the existing files
+            must follow. By default, any existing file is valid.
+        max_workers (int, optional): Maximum amount of files checked at the
+            same time. By default, files on network storage are checked by
+            constants.DEFAULT_STAT_WORKERS threads and files on local disks
+            by a single thread, which is faster there.
+
+    Returns:
+        list of int: Sorted frames to render again.
+
+    """
+    validation = validation or OutputValidation()
+    unique_paths = sorted(set(paths.values()))
+    if max_workers is None:
+        # The output files of a job are all expanded from the same parameter,
+        # so they share their storage.
+        max_workers = 1
+        if len(unique_paths) > MIN_CHUNK_SIZE and is_network_path(
+            os.path.dirname(unique_paths[0])
+        ):
+            max_workers = constants.DEFAULT_STAT_WORKERS
+    # Each worker checks a whole chunk of files, since starting a thread task
+    # takes longer than checking a single file on local storage.
+    chunk_size = max(MIN_CHUNK_SIZE, -(-len(unique_paths) // max(1, max_workers)))
+    chunks = [
+        unique_paths[index : index + chunk_size]
+        for index in range(0, len(unique_paths), chunk_size)
+    ]
+    if len(chunks) > 1:
+        executor = ThreadPoolExecutor(max_workers=len(chunks))
+        try:
+            results = list(executor.map(validation.get_valid_paths, chunks))
+        finally:
+            executor.shutdown(wait=True)
+    else:
+        results = [validation.get_valid_paths(chunk) for chunk in chunks]
+
+    valid_paths = set()
+    for chunk_valid_paths in results:
+        valid_paths.update(chunk_valid_paths)
+    return sorted(frame for frame, path in paths.items() if path not in valid_paths)
@@ -11,10 +11,17 @@ import hou  # pylint: disable=import-error
 # Import local modules
 from houdini_deadline_api_submission import config
 from houdini_deadline_api_submission import constants
+from houdini_deadline_api_submission import cost_model
 from houdini_deadline_api_submission import deadline_utils
+from houdini_deadline_api_submission import frame_order
+from houdini_deadline_api_submission import incremental
+from houdini_deadline_api_submission import log_sink
 from houdini_deadline_api_submission import naming
+from houdini_deadline_api_submission import scene_snapshot
+from houdini_deadline_api_submission import tracing
 from houdini_deadline_api_submission import utils
 from houdini_deadline_api_submission import wedging
+from houdini_deadline_api_submission.job.job_set import JobSet
 import houdini_deadline_api_submission.parm_utils
 
 
@@ -23,6 +30,21 @@ import houdini_deadline_api_submission.parm_utils
 class BaseDeadlineJob(object):
     """Deadline Job generated by Houdini."""
 
+    # Jobs of classes that rebuild their jobs before submitting (Cache &
+    # Render, Fetch, ...) always create one job per wedge.
+    supports_wedge_tasks = True
+
+    # Jobs whose output parameter holds the files rendered per frame only
+    # submit their missing frames when the submitter skips existing frames.
+    supports_skip_existing = True
+
+    # Increased whenever the jobs of any job change, which invalidates the
+    # cached flattened and upstream jobs of all jobs.
+    _jobs_version = 0
+
+    @tracing.traced(
+        "create_job", get_args=lambda job, node, *args, **kwargs: {"node": node}
+    )
     def __init__(
         self,
         node,
@@ -85,20 +107,39 @@ class BaseDeadlineJob(object):
             timestamp = utils.get_timestamp()
 
         # Assign basic parameters.
+        self._flattened_jobs = (None, None)
+        self._wedge_index = (None, None)
         self.node = node
         self.dependencies = dependencies
         self.add_as_dependency = True
-        self.jobs = [self]
+        # No other job can contain this new job yet, so there is nothing to
+        # invalidate.
+        self._jobs = [self]
         self.deadline_id = None
         self.is_submitted = False
+        self.is_complete = False
+        self.cost_key = None
+        # Chunk size picked by apply_adaptive_chunks, None if it wasn't.
+        self.adaptive_chunk_size = None
         self.job_info = {}
         self.plugin_info = {}
+        self._environment = None
         self.tracker = tracker
         self.wedge_values = wedge_values
         self.wedge_index = wedge_index
         self.is_wedge = wedge_values and wedge_index is not None
+        self.task_wedges = None
         self.submitter_node = submitter_node
         self.output_parm = naming.get_output_parm(node, output_parm_name)
+        # Identity of this job, used to compare and hash it. The role tells
+        # apart the jobs created from the same node and wedge, like the cache,
+        # render and cleanup job of a render ROP.
+        role = (
+            self.__class__.__name__,
+            plugin_name,
+            self.output_parm.name() if self.output_parm else None,
+        )
+        self.key = (node.sessionId(), wedge_index, role)
         self.pre_submit_parm_states = {}
         self.submit_parm_overrides = node_parm_overrides if node_parm_overrides else {}
         self.timestamp = timestamp
@@ -144,6 +185,36 @@ class BaseDeadlineJob(object):
         if self.is_pre_pass:
             self.submit_all()
 
+    @property
+    def dependencies(self):
+        """:obj:`JobSet`: Jobs this job depends on, in the order they were added."""
+        return self._dependencies
+
+    @dependencies.setter
+    def dependencies(self, jobs):
+        self._dependencies = JobSet(jobs)
+        self._upstream_leaf_jobs = (None, None)
+
+    @property
+    def jobs(self):
+        """:obj:`list` of :obj:`BaseDeadlineJob`: Jobs created by this job."""
+        return self._jobs
+
+    @jobs.setter
+    def jobs(self, jobs):
+        self._jobs = jobs
+        self.invalidate_graph()
+
+    @staticmethod
+    def invalidate_graph():
+        """Drop the cached flattened and upstream jobs of all jobs.
+
+        Assigning the jobs of a job does this already. Call it after changing
+        the list of jobs of a job in place.
+
+        """
+        BaseDeadlineJob._jobs_version += 1
+
     def set_batch_name(self):
         """Set the batch name of this job."""
         self.job_info["BatchName"] = "{} ({})".format(
@@ -202,12 +273,144 @@ class BaseDeadlineJob(object):
         """
         self.job_info.update(job_info_overrides)
         self.plugin_info.update(plugin_info_overrides)
+        # The overrides might contain environment variables.
+        self._environment = None
+
+    @property
+    def environment(self):
+        """deadline_utils.EnvironmentBlock: Environment of this job.
+
+        The block is read from the job info when it's first needed, change it
+        with `set_environment` to keep the job info up to date.
+
+        """
+        if self._environment is None:
+            self._environment = deadline_utils.EnvironmentBlock.from_deadline_dict(
+                self.job_info
+            )
+        return self._environment
+
+    def set_environment(self, values):
+        """Set environment variables of this job, replacing existing ones.
+
+        Args:
+            values (dict): Names and values of the variables to set.
+
+        """
+        environment = self.environment
+        for key, value in sorted(values.items()):
+            index = environment.set(key, value)
+            self.job_info[deadline_utils.get_environment_key(index)] = "{}={}".format(
+                key, value
+            )
 
     def get_frames(self):
-        """Get the frames from the ROP and set them in the job_dict."""
+        """Get the frames from the ROP and set them in the job_dict.
+
+        The frames are in ascending order until `order_frames` runs.
+
+        """
         start, end, inc = utils.get_frames(self.node)
         self.job_info["Frames"] = deadline_utils.get_framestring(start, end, inc)
 
+    def order_frames(self):
+        """Order the frames first-last-middle if the ROP is configured so.
+
+        See `utils.use_first_last_middle`. This runs right before the job is
+        sent to Deadline, once the chunk size is final, so tasks of more than
+        one frame are ordered as a whole.
+
+        """
+        if self.task_wedges or not utils.use_first_last_middle(self.node):
+            return
+        try:
+            frames = frame_order.parse_framestring(self.job_info["Frames"])
+        except (KeyError, ValueError):
+            return
+        self.job_info["Frames"] = deadline_utils.get_frame_list_string(
+            frames,
+            use_first_last_middle=True,
+            chunk_size=self.job_info.get("ChunkSize") or 1,
+        )
+
+    def apply_adaptive_chunks(self, max_concurrent_tasks=1):
+        """Pick the chunk size from the recorded durations of this ROP.
+
+        This only happens if the submitter uses adaptive chunks, see
+        `utils.get_chunk_target_seconds`. The chunk size is set, so a task
+        takes about the target duration of the submitter. Without recorded
+        durations, the current chunk size is kept and the durations of this
+        job are recorded once it is finished.
+
+        Args:
+            max_concurrent_tasks (int, optional): Maximum amount of tasks a
+                worker runs at the same time.
+
+        """
+        target_seconds = utils.get_chunk_target_seconds(self.submitter_node)
+        if target_seconds is None or self.task_wedges:
+            return
+
+        self.cost_key = cost_model.get_cost_key(
+            self.node, self.output_parm, hou.hipFile.basename()
+        )
+        cost = cost_model.get_store().get_cost(self.cost_key)
+        if cost is None:
+            return
+        try:
+            frames = len(frame_order.parse_framestring(self.job_info["Frames"]))
+        except (KeyError, ValueError):
+            return
+        chunk_size, concurrent_tasks = cost_model.get_chunk_settings(
+            cost, frames, target_seconds, max_concurrent_tasks=max_concurrent_tasks
+        )
+        self.job_info["ChunkSize"] = chunk_size
+        self.job_info["ConcurrentTasks"] = concurrent_tasks
+        self.adaptive_chunk_size = chunk_size
+
+    @tracing.traced("skip_existing_frames", get_args=tracing.get_job_args)
+    def skip_existing_frames(self):
+        """Only render the frames whose output files are missing.
+
+        This only happens if the submitter skips existing frames, see
+        `incremental.get_validation`. It runs while the wedge of this job is
+        applied, so the output paths match the ones rendered on the farm. If
+        all outputs exist, the job is marked as complete and doesn't get
+        submitted.
+
+        """
+        if any(
+            (not self.supports_skip_existing, self.task_wedges, not self.output_parm)
+        ):
+            return
+        validation = incremental.get_validation(self.submitter_node)
+        if validation is None:
+            return
+
+        try:
+            frames = frame_order.parse_framestring(self.job_info["Frames"])
+        except (KeyError, ValueError):
+            return
+        missing_frames = incremental.get_missing_frames(
+            incremental.get_output_paths(self.output_parm, frames), validation
+        )
+        if not missing_frames:
+            self.is_complete = True
+            self.log("Skipped {}, all frames exist.".format(self.job_info["Name"]))
+            return
+        if len(missing_frames) < len(frames):
+            self.job_info["Frames"] = deadline_utils.get_frame_list_string(
+                missing_frames
+            )
+            self.log(
+                "Skipped {} of {} existing frames of {}.".format(
+                    len(frames) - len(missing_frames),
+                    len(frames),
+                    self.job_info["Name"],
+                )
+            )
+
+    @tracing.traced("expand_wedges", get_args=tracing.get_job_args)
     def jobs_from_wedges(self):
         """Create jobs from wedges.
 
@@ -218,6 +421,16 @@ class BaseDeadlineJob(object):
         wedges = wedging.get_wedges(self.node)
         if not wedges:
             return [self]
+
+        if all(
+            (
+                self.supports_wedge_tasks,
+                self.job_info["Plugin"] == constants.HOUDINI_PLUGIN,
+                wedging.use_wedge_tasks(self.node),
+            )
+        ):
+            self.set_wedge_tasks(wedges)
+            return [self]
         wedged_jobs = []
         for wedge_index, wedge in enumerate(wedges):
             wedged_jobs.append(
@@ -236,19 +449,95 @@ class BaseDeadlineJob(object):
             )
         return wedged_jobs
 
+    def set_wedge_tasks(self, wedges):
+        """Render all wedges in this job, with one task per wedge.
+
+        Instead of creating a job for each wedge, the index of a task selects
+        the wedge it renders. The wedge values are written into a wedge table
+        on submission and applied by `houdini_deadline_api_submission.
+        wedge_task` on the farm.
+
+        Args:
+            wedges (houdini_deadline_api_submission.wedging.Wedges): Wedges
+                to render.
+
+        """
+        self.task_wedges = wedges
+        amount = len(wedges)
+        self.job_info["Frames"] = "0-{}".format(amount - 1)
+        self.job_info["ChunkSize"] = 1
+        self.job_info["Name"] = "{} - {} Wedges".format(self.job_info["Name"], amount)
+
+    def write_wedge_table(self):
+        """Write the wedge table and run the wedge tasks through a command line.
+
+        The table is saved next to the scene file of this job, which is loaded
+        by each task before applying its wedge and rendering the full frame
+        range of the ROP.
+
+        """
+        if not self.task_wedges:
+            return
+
+        scene_file = self.plugin_info.get("SceneFile") or hou.hipFile.path()
+        node_name = self.node.path().strip("/").replace("/", "_")
+        table_path = "{}__{}.wedges.json".format(
+            os.path.splitext(scene_file)[0], node_name
+        )
+        if not self.dry_run or self.do_save_copy:
+            wedging.write_wedge_table(
+                table_path,
+                self.node,
+                self.task_wedges,
+                scene_file,
+                utils.get_frames(self.node),
+            )
+
+        command = [
+            "--run-by-tool",
+            "+p",
+            "houdini-{}".format(hou.applicationVersionString()),
+            "+p",
+            constants.PACKAGE_NAME,
+            "run",
+            "hython",
+            "-m",
+            constants.WEDGE_TASK_MODULE,
+            '"{}"'.format(table_path),
+            "<STARTFRAME>",
+        ]
+        self.job_info["Plugin"] = constants.CMD_LINE_PLUGIN
+        self.plugin_info = {"Executable": "hal", "Arguments": " ".join(command)}
+
+    def write_task_files(self):
+        """Write the files the tasks of this job read on the farm.
+
+        This method is designed to be extended via another class. It runs
+        while the wedge of this job is applied, right before the dependencies
+        are baked, and is intended for files depending on the final state of
+        the scene, like the wedge table.
+
+        """
+        self.write_wedge_table()
+
     def add_dependency(self, job):
         """Add a job as a dependency.
 
+        Jobs with the same key as an existing dependency are ignored.
+
         Args:
             job (BaseDeadlineJob): Job to add as a dependency.
 
         """
-        if job not in self.dependencies:
-            self.dependencies.append(job)
+        if self.dependencies.add(job):
+            self._upstream_leaf_jobs = (None, None)
 
     def log(self, message, indent=0, log_parm_name=constants.LOG_PARM):
         """Log a message onto the node.
 
+        During a submission, the message is buffered and written onto the
+        node once the submission is finished.
+
         Args:
             message (str): Message to add to the log.
             indent (int, optional): Indent of the logged message. Defaults to
@@ -258,7 +547,7 @@ class BaseDeadlineJob(object):
 
         """
         try:
-            utils.log_message(
+            log_sink.log_message(
                 self.node, message, indent=indent, log_parm_name=log_parm_name
             )
         except hou.PermissionError:
@@ -272,18 +561,49 @@ class BaseDeadlineJob(object):
     def get_flattened_jobs(self):
         """Return a flattened list of all jobs which will be sent to the farm.
 
+        The list is cached until the jobs of any job change, see
+        `invalidate_graph`, so it must not be modified.
+
         Returns:
             :obj:`list` of :obj:`BaseDeadlineJob`: All jobs coming from this
                 job.
 
         """
+        version, all_jobs = self._flattened_jobs
+        if version == BaseDeadlineJob._jobs_version:
+            return all_jobs
+
         all_jobs = []
-        if len(self.jobs) == 1:
-            return self.jobs
         for job in self.jobs:
-            all_jobs += job.get_flattened_jobs()
+            if job is self:
+                all_jobs.append(job)
+            else:
+                all_jobs += job.get_flattened_jobs()
+        self._flattened_jobs = (BaseDeadlineJob._jobs_version, all_jobs)
         return all_jobs
 
+    def get_wedge_index(self):
+        """Return the wedged jobs coming from this job, indexed by their wedge.
+
+        The index is cached until the jobs of any job change, see
+        `invalidate_graph`.
+
+        Returns:
+            houdini_deadline_api_submission.wedging.WedgeIndex: Flattened jobs
+                of this job that render a single wedge.
+
+        """
+        version, wedge_index = self._wedge_index
+        if version == BaseDeadlineJob._jobs_version:
+            return wedge_index
+
+        wedge_index = wedging.WedgeIndex()
+        for job in self.get_flattened_jobs():
+            if job.is_wedge:
+                wedge_index.add(job.wedge_values, job)
+        self._wedge_index = (BaseDeadlineJob._jobs_version, wedge_index)
+        return wedge_index
+
     @staticmethod
     def correct_pre_pass_dependencies(dependencies):
         """Set dependencies to the first Non-PrePass job found.
@@ -302,36 +622,41 @@ class BaseDeadlineJob(object):
         new_dependencies = []
         for job in dependencies:
             if job.is_pre_pass:
-                new_dependencies.append(
+                new_dependencies.extend(
                     BaseDeadlineJob.correct_pre_pass_dependencies(job.dependencies)
                 )
             else:
                 new_dependencies.append(job)
-
-        # Clear out empty dependencies.
-        return [dep for dep in new_dependencies if dep]
+        return new_dependencies
 
     def correct_wedge_dependencies(self):
         """Set dependencies based on wedge likeness.
 
-        Jobs with the exact same wedge values can depend on only this wedge,
-        rather than every wedge being finished.
+        Wedged jobs only depend on the wedges of each dependency that set the
+        wedged parameters they share to the same values, rather than every
+        wedge being finished. Dependencies without such wedges are kept as
+        they are. Jobs rendering their wedges as tasks become frame dependent
+        instead, if all of their dependencies render the same wedges as tasks.
 
         """
+        if self.task_wedges:
+            # Wedge tasks can wait for the task of the same wedge, as long as
+            # every dependency renders the exact same wedges as tasks.
+            upstream_jobs = self.get_upstream_jobs()
+            if upstream_jobs and all(
+                job.task_wedges == self.task_wedges for job in upstream_jobs
+            ):
+                self.job_info["IsFrameDependent"] = True
+            return
+
         if not self.is_wedge:
             return
 
         new_dependencies = []
         for other_main_job in self.dependencies:
-            for other_job in other_main_job.get_flattened_jobs():
-                if not other_job.is_wedge:
-                    continue
-
-                if self.wedge_values == other_job.wedge_values:
-                    new_dependencies.append(other_job)
-
-        if new_dependencies:
-            self.dependencies = new_dependencies
+            same_wedge_jobs = other_main_job.get_wedge_index().find(self.wedge_values)
+            new_dependencies += same_wedge_jobs or [other_main_job]
+        self.dependencies = new_dependencies
 
     def set_all_dependencies(self):
         """Set dependencies of this job.
@@ -355,22 +680,19 @@ class BaseDeadlineJob(object):
             return
 
         wedging.apply_wedge(self.wedge_values, self.wedge_index)
+        # Wedged parameters can drive the frame range of any ROP.
+        utils.clear_frame_range_cache()
 
         # Add the WEDGE and WEDGENUM variable to the job info dict.
-        deadline_utils.append_to_deadline_env(
-            self.job_info, "WEDGE", hou.getenv("WEDGE")
-        )
-        deadline_utils.append_to_deadline_env(
-            self.job_info, "WEDGENUM", hou.getenv("WEDGENUM")
+        self.set_environment(
+            {"WEDGE": hou.getenv("WEDGE"), "WEDGENUM": hou.getenv("WEDGENUM")}
         )
 
         # Update Comment.
         submitter_dict = houdini_deadline_api_submission.parm_utils.get_job_info(
             self.submitter_node, self.node
         )
-        node_dict = houdini_deadline_api_submission.parm_utils.get_job_info(
-            self.submitter_node, self.node
-        )
+        node_dict = houdini_deadline_api_submission.parm_utils.get_job_info(self.node)
         submitter_dict.update(node_dict)
         if "Comment" in submitter_dict:
             self.job_info["Comment"] = submitter_dict["Comment"]
@@ -384,21 +706,73 @@ class BaseDeadlineJob(object):
         """Reset the wedged parameters to the value they were before."""
         if self.is_wedge:
             wedging.reset_wedging()
+            utils.clear_frame_range_cache()
+
+    def get_copy_folder(self):
+        """Return the folder to save the copy of the file of this job to.
+
+        Returns:
+            str: The _deadline folder next to the output of this job.
+
+        """
+        if self.output_parm:
+            path = os.path.dirname(self.output_parm.evalAsString())
+            return os.path.join(path, "_deadline")
+        path = os.path.dirname(hou.hipFile.path())
+        return os.path.join(path, "_deadline", self.node.name())
 
+    @tracing.traced("save_copy", get_args=tracing.get_job_args)
     def save_copy(self):
-        """Save a copy of the file to the current output path."""
+        """Save a copy of the file to the current output path.
+
+        If the submission uses a scene snapshot store, the shared snapshot of
+        the submission is used instead, optionally hardlinked into the output
+        path.
+
+        """
         if not self.do_save_copy:
             return
 
-        if self.output_parm:
-            path = os.path.dirname(self.output_parm.evalAsString())
-            path = os.path.join(path, "_deadline")
+        store = scene_snapshot.get_active_store()
+        if store is None:
+            path = utils.save_copy(self.get_copy_folder())
         else:
-            path = os.path.dirname(hou.hipFile.path())
-            path = os.path.join(path, "_deadline", self.node.name())
-        path = utils.save_copy(path)
+            path = store.get_snapshot()
+            if store.link:
+                path = store.link_into(path, self.get_copy_folder())
         self.plugin_info["SceneFile"] = path
 
+    def add_scene_overrides(self):
+        """Pass the parameter values changed for this job in its environment.
+
+        A shared scene snapshot holds the scene before any job changed it, so
+        the values set by pre_submit and apply_wedges are applied on the farm
+        once the snapshot is loaded.
+
+        """
+        if not self.do_save_copy or scene_snapshot.get_active_store() is None:
+            return
+
+        overrides = {}
+        for name in set(self.pre_submit_parm_states) | set(["trange"]):
+            parm = self.node.parm(name)
+            if parm is None:
+                continue
+            value = self.submit_parm_overrides.get(name)
+            overrides[parm.path()] = parm.eval() if value is None else value
+        if self.is_wedge:
+            for _, parm, value in self.wedge_values:
+                overrides[parm.path()] = value
+
+        if overrides:
+            self.set_environment(
+                {
+                    constants.SCENE_OVERRIDES_ENV: scene_snapshot.encode_scene_overrides(
+                        overrides
+                    )
+                }
+            )
+
     def submit_all(self):
         """Start the submission process of all the jobs created by this job.
 
@@ -410,9 +784,10 @@ class BaseDeadlineJob(object):
         if self.is_submitted:
             return
 
-        self.pre_submit_all()
-        self._submit()
-        self.post_submit_all()
+        with log_sink.buffered_log():
+            self.pre_submit_all()
+            self._submit()
+            self.post_submit_all()
         self.is_submitted = True
 
     def _submit(self):
@@ -423,6 +798,7 @@ class BaseDeadlineJob(object):
         for job in self.get_flattened_jobs():
             job._submit_job()
 
+    @tracing.traced("submit_job", get_args=tracing.get_job_args)
     def _submit_job(self):
         """Submit this singular job to Deadline."""
         # TODO Save HIP, HIPNAME, HIPFILE, JOB into Deadline Environemnt Variables.
@@ -432,6 +808,34 @@ class BaseDeadlineJob(object):
         #      folder and set the HOME variable to this path. That way, we can make sure that
         #      local overrides like the max size of CHOP operations is also taken into
         #      consideration.
+        if self.prepare_submission():
+            self.deadline_id = deadline_utils.submit_job(
+                self.job_info, self.plugin_info
+            )
+
+    @tracing.traced("prepare_submission", get_args=tracing.get_job_args)
+    def prepare_submission(self):
+        """Prepare this singular job so it can be sent to Deadline.
+
+        Everything touching the Houdini session (parameter overrides, wedges,
+        saving the hip file, ...) happens in here, so the actual call to the
+        Deadline Web Service can happen afterwards, even outside of the main
+        thread. All callables stored in the job and plugin info are resolved
+        while the wedge is still applied.
+
+        Jobs whose outputs all exist are marked as complete instead, if the
+        submitter skips existing frames.
+
+        Returns:
+            bool: True if the job info and plugin info of this job still need
+                to be sent to Deadline.
+
+        """
+        needs_submission = False
+        store = scene_snapshot.get_active_store()
+        if store is not None and self.do_save_copy and not self.is_pre_pass:
+            # Save the shared snapshot before this job changes the scene.
+            store.get_snapshot()
         self.pre_submit()
         self.apply_wedges()
 
@@ -440,17 +844,22 @@ class BaseDeadlineJob(object):
                 self.node.render(ignore_inputs=True)
                 self.deadline_id = "PrePass: {}".format(self.node.path())
         else:
+            self.skip_existing_frames()
+
+        if not self.is_pre_pass and not self.is_complete:
+            self.order_frames()
             self.save_copy()
+            self.add_scene_overrides()
+            self.write_task_files()
+            self.bake_dependencies()
+            deadline_utils.evaluate_deadline_info(self.job_info, self.plugin_info)
             if self.dry_run:
-                self.bake_dependencies()
                 print(str(self))
             else:
-                self.bake_dependencies()
-                self.deadline_id = deadline_utils.submit_job(
-                    self.job_info, self.plugin_info
-                )
+                needs_submission = True
         self.reset_wedging()
         self.post_submit()
+        return needs_submission
 
     def pre_submit_all(self):
         """Store a log entry.
@@ -478,6 +887,27 @@ class BaseDeadlineJob(object):
         """
         self.log("Submission successfully finished: {}".format(utils.get_timestamp()))
 
+    def post_submit_failed(self):
+        """Store a log entry with the jobs submitted before the submission failed.
+
+        Runs instead of post_submit_all, if sending a job of a concurrent
+        submission to Deadline failed.
+
+        Returns:
+            list of str: Deadline IDs of the jobs of this job that were
+                submitted anyway.
+
+        """
+        submitted_ids = [
+            job.deadline_id
+            for job in self.get_flattened_jobs()
+            if job.deadline_id and not job.is_pre_pass
+        ]
+        self.log("Submission failed: {}".format(utils.get_timestamp()))
+        if submitted_ids:
+            self.log("Submitted jobs: {}".format(", ".join(submitted_ids)), indent=1)
+        return submitted_ids
+
     def pre_submit(self):
         """Run functions before submitting a singular job.
 
@@ -498,11 +928,14 @@ class BaseDeadlineJob(object):
                 self.pre_submit_parm_states = old_values
             except hou.OperationFailed:
                 pass
+            # Overrides can drive the frame range of any ROP.
+            utils.clear_frame_range_cache()
 
         try:
             parm = self.node.parm("trange")
             if parm and parm.eval() == 1:
                 parm.set(2)
+                utils.clear_frame_range_cache()
         except hou.OperationFailed:
             pass
 
@@ -521,6 +954,7 @@ class BaseDeadlineJob(object):
                 self.pre_submit_parm_states.update(old_values)
             except hou.OperationFailed:
                 pass
+            utils.clear_frame_range_cache()
 
     def post_submit(self):
         """Run functions after submitting a singular job.
@@ -533,15 +967,49 @@ class BaseDeadlineJob(object):
 
         """
         self.node.setParms(self.pre_submit_parm_states)
+        utils.clear_frame_range_cache()
 
-    def bake_dependencies(self):
-        """Add any job declared as a dependency to the Deadline Job Info."""
-        job_index = 0
+    def get_upstream_jobs(self):
+        """Return the singular jobs whose Deadline ID this job depends on.
+
+        Jobs that are complete because all of their outputs exist are left
+        out, so this job only waits for the frames that are rendered again.
+
+        Returns:
+            :obj:`list` of :obj:`BaseDeadlineJob`: Flattened dependencies of
+                this job that are added as a Deadline dependency.
+
+        """
+        return [job for job in self.get_upstream_leaf_jobs() if not job.is_complete]
+
+    def get_upstream_leaf_jobs(self):
+        """Return the singular jobs of all dependencies added to Deadline.
+
+        Unlike `get_upstream_jobs`, this includes complete jobs. The list is
+        cached until the dependencies of this job or the jobs of any job
+        change, see `invalidate_graph`, so it must not be modified.
+
+        Returns:
+            :obj:`list` of :obj:`BaseDeadlineJob`: Flattened dependencies of
+                this job.
+
+        """
+        version, upstream_jobs = self._upstream_leaf_jobs
+        if version == BaseDeadlineJob._jobs_version:
+            return upstream_jobs
+
+        upstream_jobs = []
         for master_job in self.dependencies:
             for job in master_job.get_flattened_jobs():
                 if job.add_as_dependency:
-                    self.job_info["JobDependency{}".format(job_index)] = job.deadline_id
-                    job_index += 1
+                    upstream_jobs.append(job)
+        self._upstream_leaf_jobs = (BaseDeadlineJob._jobs_version, upstream_jobs)
+        return upstream_jobs
+
+    def bake_dependencies(self):
+        """Add any job declared as a dependency to the Deadline Job Info."""
+        for job_index, job in enumerate(self.get_upstream_jobs()):
+            self.job_info["JobDependency{}".format(job_index)] = job.deadline_id
 
     def __str__(self, indent=0):
         """Return a string representation of this job.
@@ -561,21 +1029,17 @@ class BaseDeadlineJob(object):
             "{dependencies}",
             "{indent}---",
         ]
-        if not self.is_wedge:
+        if not self.is_wedge and not self.task_wedges:
             msg.pop(1)
 
         msg = "\n".join(msg)
 
         str_indent = " " * indent
-        str_wedge = []
-        if self.wedge_values:
-            for wedge_config in self.wedge_values:
-                str_wedge.append(
-                    "{}({}): {}".format(
-                        wedge_config[0], wedge_config[1], wedge_config[2]
-                    )
-                )
-        str_wedge = " - ".join(str_wedge)
+        str_wedge = ""
+        if self.task_wedges:
+            str_wedge = str(self.task_wedges)
+        elif self.wedge_values:
+            str_wedge = wedging.get_wedge_description(self.wedge_values)
         dep_str = "\n".join((job.__str__(indent + 2) for job in self.dependencies))
 
         msg = msg.format(
@@ -618,13 +1082,41 @@ class BaseDeadlineJob(object):
         )
 
     def __eq__(self, other):
-        """Compare two jobs to each other to see if they are equal.
+        """Compare the identity of two jobs, see `key`.
+
+        Use `is_equivalent` to compare the settings of two jobs instead.
+
+        Args:
+            other (BaseDeadlineJob): The job to compare it to.
+
+        Returns:
+            bool: True if both jobs have the same key, False otherwise.
+
+        """
+        if not isinstance(other, BaseDeadlineJob):
+            return False
+        return self.key == other.key
+
+    def __hash__(self):
+        """Return the hash of the identity key of this job.
+
+        Returns:
+            int: Hash of the key of this job.
+
+        """
+        return hash(self.key)
+
+    def is_equivalent(self, other):
+        """Compare the settings of two jobs to each other.
+
+        Unlike `__eq__`, this compares the job and plugin infos, wedges and
+        dependencies of both jobs.
 
         Args:
             other (BaseDeadlineJob): The job to compare it to.
 
         Returns:
-            bool: True if the two jobs are the same, False otherwise.
+            bool: True if the two jobs have the same settings, False otherwise.
 
         """
         if not isinstance(other, self.__class__):
@@ -0,0 +1,105 @@
+"""Insertion-ordered set of Deadline jobs, used to store their dependencies."""
+
+# Import built-in modules
+from collections import OrderedDict
+
+
+class JobSet(object):
+    """Jobs in the order they were added, each of them only once.
+
+    Jobs are looked up by their identity key (see `houdini_deadline_api_
+    submission.job.base.BaseDeadlineJob.key`), so adding a job and checking
+    if a job is part of this set never compares job or plugin infos.
+
+    Args:
+        jobs (iterable of BaseDeadlineJob, optional): Initial jobs.
+
+    Examples:
+        >>> dependencies = JobSet([cache_job])
+        >>> dependencies.add(cache_job)
+        False
+        >>> list(dependencies)
+        [cache_job]
+
+    """
+
+    def __init__(self, jobs=None):
+        """Initialize the set with the given jobs."""
+        self._jobs = OrderedDict()
+        if jobs:
+            self.update(jobs)
+
+    def __len__(self):
+        """Return the amount of jobs in this set.
+
+        Returns:
+            int: Amount of jobs.
+
+        """
+        return len(self._jobs)
+
+    def __iter__(self):
+        """Iterate over the jobs in the order they were added.
+
+        Returns:
+            iterator: Jobs of this set.
+
+        """
+        return iter(self._jobs.values())
+
+    def __contains__(self, job):
+        """Return True if a job with the same key is part of this set.
+
+        Args:
+            job (BaseDeadlineJob): Job to look up.
+
+        Returns:
+            bool: True if the job is part of this set.
+
+        """
+        return job.key in self._jobs
+
+    def __bool__(self):
+        """Return True if this set holds any job.
+
+        Returns:
+            bool: True if this set isn't empty.
+
+        """
+        return bool(self._jobs)
+
+    __nonzero__ = __bool__
+
+    def __repr__(self):
+        """Return a string representation of the jobs in this set.
+
+        Returns:
+            str: Representation of the list of jobs.
+
+        """
+        return repr(list(self))
+
+    def add(self, job):
+        """Add a job, unless a job with the same key is already part of this set.
+
+        Args:
+            job (BaseDeadlineJob): Job to add.
+
+        Returns:
+            bool: True if the job got added.
+
+        """
+        if job.key in self._jobs:
+            return False
+        self._jobs[job.key] = job
+        return True
+
+    def update(self, jobs):
+        """Add the given jobs, see `add`.
+
+        Args:
+            jobs (iterable of BaseDeadlineJob): Jobs to add.
+
+        """
+        for job in jobs:
+            self.add(job)
@@ -22,6 +22,7 @@ class CacheRenderDeadlineJob(BaseDeadlineJob):
     """Class for custom render ROP implementations."""
 
     __metaclass__ = ABCMeta
+    supports_wedge_tasks = False
 
     def pre_submit_all(self):
         """Adjust jobs to include the render and/or cache jobs.
@@ -37,17 +38,27 @@ class CacheRenderDeadlineJob(BaseDeadlineJob):
             self.jobs = self.get_cache_jobs(self.jobs)
         elif naming.is_only_render(self.node):
             self.jobs = self.jobs
+        elif naming.is_streamed(self.node):
+            self.jobs = self.split_into_cache_render_jobs(self.jobs, stream=True)
         else:
             raise IOError("Can't figure out what mode to choose.")
 
-    def split_into_cache_render_jobs(self, job_list, create_cleanup=True):
+    def split_into_cache_render_jobs(self, job_list, create_cleanup=True, stream=False):
         """Split each job into it's cache (.ifd, .ass, ...) and render job.
 
+        Render jobs are frame dependent on their cache job. When streaming,
+        the cache, render and cleanup job share one chunk size, see
+        `get_stream_chunk_size`, so each render task starts as soon as the
+        cache task of its frames finished, and the cleanup job deletes the
+        cache of each chunk as soon as it is rendered.
+
         Args:
             job_list (:obj:`list` of :obj:`houdini_deadline_api_submission.job.
                 base.BaseDeadlineJob`): List of currently stored jobs.
             create_cleanup (bool, optional): Create cleanup jobs for the render
                 caches. Defaults to True.
+            stream (bool, optional): Stream the frames from the cache job to
+                the render and cleanup job. Defaults to False.
 
         Returns:
             :obj:`list` of :obj:`BaseDeadlineJob`: Cache creation and render
@@ -60,7 +71,9 @@ class CacheRenderDeadlineJob(BaseDeadlineJob):
         # Create cleanup jobs if needed. Otherwise, we simply fill the list
         # with None, so the zip still works.
         if create_cleanup:
-            all_cleanup_jobs = [CleanUpJob.from_job(job) for job in all_ifd_jobs]
+            all_cleanup_jobs = [
+                CleanUpJob.from_job(job, per_frame=stream) for job in all_ifd_jobs
+            ]
         else:
             all_cleanup_jobs = [None for _ in all_ifd_jobs]
 
@@ -68,13 +81,46 @@ class CacheRenderDeadlineJob(BaseDeadlineJob):
             all_ifd_jobs, all_render_jobs, all_cleanup_jobs
         ):
             render_job.add_dependency(cache_job)
-            if cleanup_job:
+            chunk_size = None
+            if stream:
+                chunk_size = self.get_stream_chunk_size(cache_job, render_job)
+                cache_job.job_info["ChunkSize"] = chunk_size
+                render_job.job_info["ChunkSize"] = chunk_size
+            if cleanup_job and stream:
+                # Frame dependencies apply to every dependency, so the cleanup
+                # only waits for the frames of its render job.
+                cleanup_job.dependencies = [render_job]
+                cleanup_job.job_info["ChunkSize"] = chunk_size
+            elif cleanup_job:
                 cleanup_job.add_dependency(render_job)
 
         if create_cleanup:
             return all_ifd_jobs + all_render_jobs + all_cleanup_jobs
         return all_ifd_jobs + all_render_jobs
 
+    @staticmethod
+    def get_stream_chunk_size(cache_job, render_job):
+        """Return the chunk size shared by the streamed jobs of a ROP.
+
+        Chunk sizes picked by adaptive chunks take precedence, first the one
+        of the render job, since rendering takes most of the time, then the
+        one of the cache job. Otherwise the chunk size of the cache job is
+        used, which is at least 10 frames, so the scene isn't loaded for
+        every single frame.
+
+        Args:
+            cache_job (BaseDeadlineJob): Job creating the render caches.
+            render_job (BaseDeadlineJob): Job rendering the caches.
+
+        Returns:
+            int: Chunk size of the cache, render and cleanup job.
+
+        """
+        for job in (render_job, cache_job):
+            if job.adaptive_chunk_size is not None:
+                return job.adaptive_chunk_size
+        return cache_job.job_info["ChunkSize"]
+
     @abstractmethod
     def get_cache_jobs(self, job_list):  # pylint:disable=unused-argument
         """Return the render cache generation job for each job.
@@ -163,13 +209,14 @@ class MantraDeadlineJob(CacheRenderDeadlineJob):
             )
             new_job.job_info["LimitGroups"] = "hbatch_render"
             new_job.job_info["ChunkSize"] = max(10, new_job.job_info["ChunkSize"])
+            new_job.apply_adaptive_chunks(
+                max_concurrent_tasks=constants.MAX_CONCURRENT_CACHE_TASKS
+            )
 
             # if self.tracker:
             #     sgids = track_outputs(self.tracker, job.node, is_cache=True)
-            #     deadline_utils.append_to_deadline_env(
-            #         new_job.job_info,
-            #         "_HAL_PUBLISHED_FILE_IDS",
-            #         ",".join([str(int_) for int_ in sgids]),
+            #     new_job.set_environment(
+            #         {"_HAL_PUBLISHED_FILE_IDS": ",".join([str(int_) for int_ in sgids])}
             #     )
 
             cache_jobs.append(new_job)
@@ -215,6 +262,7 @@ class MantraDeadlineJob(CacheRenderDeadlineJob):
             )
             new_job.job_info["IsFrameDependent"] = True
             new_job.job_info["ChunkSize"] = 1
+            new_job.apply_adaptive_chunks()
             new_job.job_info["Name"] = "{} - Mantra Render".format(
                 new_job.job_info["Name"]
             )
@@ -222,10 +270,8 @@ class MantraDeadlineJob(CacheRenderDeadlineJob):
 
             # if self.tracker:
             #     sgids = track_outputs(self.tracker, job.node)
-            #     deadline_utils.append_to_deadline_env(
-            #         new_job.job_info,
-            #         "_HAL_PUBLISHED_FILE_IDS",
-            #         ",".join([str(int_) for int_ in sgids]),
+            #     new_job.set_environment(
+            #         {"_HAL_PUBLISHED_FILE_IDS": ",".join([str(int_) for int_ in sgids])}
             #     )
 
             new_jobs.append(new_job)
@@ -265,13 +311,14 @@ class ArnoldDeadlineJob(CacheRenderDeadlineJob):
             new_job.job_info["Name"] = "{} - ASS".format(new_job.job_info["Name"])
             new_job.job_info["LimitGroups"] = "hbatch_render"
             new_job.job_info["ChunkSize"] = max(10, new_job.job_info["ChunkSize"])
+            new_job.apply_adaptive_chunks(
+                max_concurrent_tasks=constants.MAX_CONCURRENT_CACHE_TASKS
+            )
 
             # if self.tracker:
             #     sgids = track_outputs(self.tracker, job.node, is_cache=True)
-            #     deadline_utils.append_to_deadline_env(
-            #         new_job.job_info,
-            #         "_HAL_PUBLISHED_FILE_IDS",
-            #         ",".join([str(int_) for int_ in sgids]),
+            #     new_job.set_environment(
+            #         {"_HAL_PUBLISHED_FILE_IDS": ",".join([str(int_) for int_ in sgids])}
             #     )
 
             cache_jobs.append(new_job)
@@ -317,6 +364,7 @@ class ArnoldDeadlineJob(CacheRenderDeadlineJob):
             )
             new_job.job_info["IsFrameDependent"] = True
             new_job.job_info["ChunkSize"] = 1
+            new_job.apply_adaptive_chunks()
             new_job.job_info["Name"] = "{} - Arnold Render".format(
                 new_job.job_info["Name"]
             )
@@ -324,10 +372,8 @@ class ArnoldDeadlineJob(CacheRenderDeadlineJob):
 
             # if self.tracker:
             #     sgids = track_outputs(self.tracker, job.node)
-            #     deadline_utils.append_to_deadline_env(
-            #         new_job.job_info,
-            #         "_HAL_PUBLISHED_FILE_IDS",
-            #         ",".join([str(int_) for int_ in sgids]),
+            #     new_job.set_environment(
+            #         {"_HAL_PUBLISHED_FILE_IDS": ",".join([str(int_) for int_ in sgids])}
             #     )
 
             new_jobs.append(new_job)
@@ -340,6 +386,8 @@ class FetchDeadlineJob(BaseDeadlineJob):
     This class handles fetch nodes and usdrender_rop nodes by analyzing their source to determine the
     appropriate submission method.
     """
+    supports_wedge_tasks = False
+
     def pre_submit_all(self):
         """Analyze the node's source and adjust jobs accordingly.
         
@@ -384,6 +432,7 @@ class FetchDeadlineJob(BaseDeadlineJob):
                 timestamp=job.timestamp,
                 tracker=job.tracker
             )
+            new_job.apply_adaptive_chunks()
 
             new_jobs.append(new_job)
 
@@ -6,6 +6,8 @@ import os
 # Import local modules
 from houdini_deadline_api_submission import cleanup
 from houdini_deadline_api_submission import constants
+from houdini_deadline_api_submission import frame_order
+from houdini_deadline_api_submission import incremental
 from houdini_deadline_api_submission import utils
 from houdini_deadline_api_submission.job.base import BaseDeadlineJob
 
@@ -13,6 +15,9 @@ from houdini_deadline_api_submission.job.base import BaseDeadlineJob
 class CleanUpJob(BaseDeadlineJob):
     """Special Deadline Job used to clean the output of another job."""
 
+    # The output parameter belongs to the job that gets cleaned up.
+    supports_skip_existing = False
+
     def __init__(
         self,
         folder,
@@ -28,13 +33,22 @@ class CleanUpJob(BaseDeadlineJob):
         output_parm_name=None,
         node_parm_overrides=None,
         timestamp=None,
+        per_frame=False,
     ):
         """Deadline job for deleting the output of another job.
 
+        The files to delete are the outputs of the given output parameter for
+        each frame of the ROP. They are listed in a manifest written on
+        submission, once the wedge of this job is applied. Per frame, each task
+        only deletes the outputs of its own frames, as soon as the same frames
+        of its dependency are finished. The last task deletes the outputs
+        shared between frames.
+
         Args:
-            folder (str): Path to the folder we want to clean up.
-            file_name_prefix (str): All files with this prefix in the folder
-                will be deleted.
+            folder (str): Folder of the outputs, the manifest is written into
+                it.
+            file_name_prefix (str): Prefix of the manifest name, usually the
+                name of the outputs up to their first dot.
             node (hou.Node): ROP Node in the Houdini scene, used to gather
                 overrides and job attributes.
             dependencies (:obj:`list` of :obj:`houdini_deadline_api_submission.
@@ -48,15 +62,16 @@ class CleanUpJob(BaseDeadlineJob):
             wedge_values (list, optional): Parameters to wedge and their wedged
                 value.
             wedge_index (int, optional): Index of the given wedge.
-            output_parm_name (str, optional): Name of the output parameter.
-                This is used to set the OutputDirectory0 and OutputFilename0
-                parameter on submission.
+            output_parm_name (str, optional): Name of the output parameter
+                whose files get deleted.
             node_parm_overrides (dict, optional): Overrides that will adjust
                 parameters on the node when submitting, and will reset these
                 parameters to their previous value after submitting this job.
             timestamp (str, optional): The timestamp that will be used for
                 various operations in this job. If no timestamp is given, a
                 timestamp with the current time will be used.
+            per_frame (bool, optional): Delete the outputs of each frame in a
+                task of its own, instead of all outputs in a single task.
 
         """
 
@@ -75,25 +90,88 @@ class CleanUpJob(BaseDeadlineJob):
             save_copy=False,
         )
 
-        # Write cleanup script.
-        cleanup_script = cleanup.create_cleanup_script(file_name_prefix, folder)
+        manifest_name = "{}__cleanup".format(file_name_prefix)
+        if self.is_wedge:
+            manifest_name = "{}_wedge{}".format(manifest_name, wedge_index)
+        self.manifest_path = os.path.join(folder, manifest_name + ".json")
 
         # Fill CommandLine arguments.
         self.plugin_info["Executable"] = "hal"
-        command = ["--run-by-tool", "+p", "python-2", "run", "python", cleanup_script]
+        # The Python version is resolved from the requirements of the package.
+        command = [
+            "--run-by-tool",
+            "+p",
+            constants.PACKAGE_NAME,
+            "run",
+            "python",
+            "-m",
+            constants.CLEANUP_MODULE,
+            '"{}"'.format(self.manifest_path),
+        ]
+        if utils.get_submitter_value(
+            self.submitter_node, constants.CLEANUP_DRY_RUN, default=False
+        ):
+            command.append("--dry-run")
+        if per_frame:
+            # Deadline replaces these tokens with the frames of each task.
+            command.extend(["--start", "<STARTFRAME>", "--end", "<ENDFRAME>"])
         self.plugin_info["Arguments"] = " ".join(command)
 
         # Adjust job info.
-        self.job_info["Frames"] = "1"
-        self.job_info["IsFrameDependent"] = False
+        self.per_frame = per_frame
+        if not per_frame:
+            self.job_info["Frames"] = "1"
+        self.job_info["IsFrameDependent"] = per_frame
         self.add_as_dependency = False
 
+    def get_frame_files(self):
+        """Return the file created by the output parameter for each frame.
+
+        Returns:
+            dict: Output path of each frame of the ROP, with the wedge of this
+                job applied.
+
+        """
+        if not self.output_parm:
+            return {}
+        frames = frame_order.get_frame_range(*utils.get_frames(self.node))
+        return incremental.get_output_paths(self.output_parm, frames)
+
+    def get_files(self):
+        """Return the files created by the output parameter of this job.
+
+        Returns:
+            list of str: Output path of each frame of the ROP, with the wedge
+                of this job applied.
+
+        """
+        return sorted(set(self.get_frame_files().values()))
+
+    def write_task_files(self):
+        """Write the manifest listing the files this job deletes."""
+        super(CleanUpJob, self).write_task_files()
+        if not self.dry_run:
+            frame_files = self.get_frame_files()
+            job_frames = None
+            if self.per_frame:
+                # The frames of the job tell each task which frames it cleans.
+                job_frames = frame_order.parse_framestring(self.job_info["Frames"])
+            cleanup.write_manifest(
+                self.manifest_path,
+                frame_files.values(),
+                node=self.node.path(),
+                frame_files=frame_files if self.per_frame else None,
+                job_frames=job_frames,
+            )
+
     @classmethod
-    def from_job(cls, job):
+    def from_job(cls, job, per_frame=False):
         """Return a CleanUpJob that will delete the output of the given job.
 
         Args:
             job (houdini_deadline_api_submission.job.base.BaseDeadlineJob):
+            per_frame (bool, optional): Delete the output of each frame as
+                soon as the same frame of the dependencies is finished.
 
         Returns:
             CleanUpJob: Job used to clean up the output of the given input job.
@@ -115,6 +193,7 @@ class CleanUpJob(BaseDeadlineJob):
             job.wedge_index,
             job.output_parm,
             timestamp=job.timestamp,
+            per_frame=per_frame,
         )
         new_job.job_info["Name"] = "{} - Cleanup".format(new_job.job_info["Name"])
 
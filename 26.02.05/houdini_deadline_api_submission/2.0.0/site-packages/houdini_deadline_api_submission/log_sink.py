@@ -0,0 +1,174 @@
+"""Buffered logging of a submission onto the submitted nodes.
+
+Writing every message straight into the logging parameter of a node means
+reading and rewriting the whole log for each line, and every change of the
+parameter can cause cooks and redraws in the middle of the submission.
+Inside of `buffered_log`, messages are collected in memory instead and each
+node's log is written only once at the end. The log of each node is capped
+to its latest lines, and all messages are also written to a JSON-lines file
+for tools reading the submission history.
+"""
+
+# Import built-in modules
+import collections
+import contextlib
+import json
+import logging
+import os
+import time
+
+# Import third-party modules
+import hou  # pylint: disable=import-error
+
+# Import local modules
+from houdini_deadline_api_submission import constants
+from houdini_deadline_api_submission import utils
+
+# Sink collecting the messages of the running submission, None if messages
+# are written right away.
+_ACTIVE_SINK = None
+
+
+class LogSink(object):
+    """Collect log messages and write them onto their nodes at once.
+
+    Args:
+        max_lines (int, optional): Maximum amount of lines kept in the log
+            of each node.
+        sidecar_path (str, optional): JSON-lines file all messages are
+            appended to when flushing.
+
+    """
+
+    def __init__(self, max_lines=constants.LOG_MAX_LINES, sidecar_path=None):
+        """Initialize an empty sink."""
+        self.max_lines = max_lines
+        self.sidecar_path = sidecar_path
+        # Nodes and their buffered lines, keyed by the node path and the name
+        # of the logging parameter.
+        self._nodes = collections.OrderedDict()
+        self._records = []
+
+    def add(self, node, message, indent=0, log_parm_name=constants.LOG_PARM):
+        """Buffer a message for the log of the given node.
+
+        Args:
+            node (hou.Node): Node to log on.
+            message (str): Log message.
+            indent (int, optional): Indentation of the logged message.
+            log_parm_name (str, optional): Name of the logging parameter.
+                Defaults to constants.LOG_PARM.
+
+        """
+        key = (node.path(), log_parm_name)
+        if key not in self._nodes:
+            lines = collections.deque(maxlen=self.max_lines)
+            self._nodes[key] = (node, lines)
+        lines = self._nodes[key][1]
+        lines.extend(utils.format_log_message(message, indent).split("\n"))
+        self._records.append(
+            {
+                "time": time.time(),
+                "node": node.path(),
+                "parm": log_parm_name,
+                "indent": indent,
+                "message": message,
+            }
+        )
+
+    def flush(self):
+        """Write all buffered messages onto their nodes and into the sidecar."""
+        logger = logging.getLogger(__name__)
+        nodes, self._nodes = self._nodes, collections.OrderedDict()
+        for (node_path, log_parm_name), (node, lines) in nodes.items():
+            try:
+                log_parm = utils.get_log_parm(node, log_parm_name)
+                old_log = log_parm.evalAsString()
+                log = collections.deque(
+                    old_log.split("\n") if old_log else (), maxlen=self.max_lines
+                )
+                log.extend(lines)
+                log_parm.set("\n".join(log))
+            except hou.PermissionError:
+                logger.debug(
+                    "Logging to node %s was not possible because it "
+                    "is inside a locked asset.",
+                    node_path,
+                )
+            except hou.ObjectWasDeleted:
+                logger.debug("Node %s was deleted before logging on it.", node_path)
+
+        records, self._records = self._records, []
+        if not self.sidecar_path or not records:
+            return
+        try:
+            folder = os.path.dirname(self.sidecar_path)
+            if not os.path.isdir(folder):
+                os.makedirs(folder)
+            with open(self.sidecar_path, "a") as sidecar:
+                sidecar.write(
+                    "".join(
+                        "{}\n".format(json.dumps(record, sort_keys=True))
+                        for record in records
+                    )
+                )
+        except (IOError, OSError):
+            logger.warning("Could not write the log to %s.", self.sidecar_path)
+
+
+def get_active_sink():
+    """Return the sink of the running submission.
+
+    Returns:
+        LogSink: Sink collecting the messages, None if they are written right
+            away.
+
+    """
+    return _ACTIVE_SINK
+
+
+@contextlib.contextmanager
+def buffered_log(sidecar_path=None, max_lines=constants.LOG_MAX_LINES):
+    """Collect all messages logged inside of this context and write them once.
+
+    Nested contexts use the sink of the outermost one, which writes the log
+    when it's finished.
+
+    Args:
+        sidecar_path (str, optional): JSON-lines file all messages are
+            appended to.
+        max_lines (int, optional): Maximum amount of lines kept in the log
+            of each node.
+
+    Yields:
+        LogSink: The sink collecting the messages.
+
+    """
+    global _ACTIVE_SINK
+    if _ACTIVE_SINK is not None:
+        yield _ACTIVE_SINK
+        return
+
+    _ACTIVE_SINK = LogSink(max_lines=max_lines, sidecar_path=sidecar_path)
+    try:
+        yield _ACTIVE_SINK
+    finally:
+        sink, _ACTIVE_SINK = _ACTIVE_SINK, None
+        sink.flush()
+
+
+def log_message(node, message, indent=0, log_parm_name=constants.LOG_PARM):
+    """Log a message onto a node, buffered if a submission is running.
+
+    Args:
+        node (hou.Node): Node to create the log on.
+        message (str): Log message.
+        indent (int, optional): Indentation of the logged message.
+        log_parm_name (str, optional): Name of the logging parameter. Defaults
+            to constants.LOG_PARM.
+
+    """
+    if _ACTIVE_SINK is None:
+        utils.log_message(node, message, indent=indent, log_parm_name=log_parm_name)
+    else:
+        _ACTIVE_SINK.add(node, message, indent=indent, log_parm_name=log_parm_name)
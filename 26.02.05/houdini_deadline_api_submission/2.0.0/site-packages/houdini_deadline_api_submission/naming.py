@@ -139,3 +139,22 @@ def is_only_render(node):
     if parm.eval() == constants.RENDER_MODE_RENDER_ONLY:
         return True
     return False
+
+
+def is_streamed(node):
+    """Return True if given node streams its frames from cache to render.
+
+    Args:
+        node (hou.Node): Node to get the information from.
+
+    Returns:
+        bool: True if each frame is rendered and cleaned up as soon as its
+            render cache exists.
+
+    """
+    parm = node.parm(constants.RENDER_MODE)
+    if not parm:
+        return False
+    if parm.eval() == constants.RENDER_MODE_STREAM:
+        return True
+    return False
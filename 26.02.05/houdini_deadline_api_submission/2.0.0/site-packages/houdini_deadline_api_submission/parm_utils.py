@@ -1,6 +1,7 @@
 """Collection of utility functions to manipulate node parameters."""
 
 # Import built-in modules
+import contextlib
 import copy
 
 # Import third-party modules
@@ -11,6 +12,109 @@ from houdini_deadline_api_submission import config
 from houdini_deadline_api_submission import constants
 from houdini_deadline_api_submission import deadline_utils
 
+# Parameter snapshots of the nodes passed to snapshot_parms, keyed by the node
+# and the prefix of the parameters. None while no snapshot context is active.
+_SNAPSHOTS = None
+
+
+class ParmSnapshot(object):
+    """Values of a set of parameters, evaluated once.
+
+    Parameters whose raw value uses $OS get expanded for each goal node, with
+    a single hou.cd for all of them. Parameters using any other variable,
+    expression or animation are evaluated each time, since they can change
+    during the submission (for example with $WEDGE). All other values are
+    only evaluated when the snapshot is taken.
+
+    Args:
+        parms (list of hou.Parm): Parameters to take the snapshot of.
+
+    """
+
+    def __init__(self, parms):
+        """Evaluate all static parameters."""
+        self.values = {}
+        self.os_raw_values = {}
+        self.dynamic_parms = []
+        for parm in parms:
+            raw_value = parm.rawValue()
+            if "$OS" in raw_value:
+                self.os_raw_values[parm.name()] = raw_value
+            elif "$" in raw_value or "`" in raw_value or parm.keyframes():
+                self.dynamic_parms.append(parm)
+            else:
+                self.values[parm.name()] = self.evaluate(parm)
+
+    @staticmethod
+    def evaluate(parm):
+        """Return the value of a parameter, with strings on a single line.
+
+        Args:
+            parm (hou.Parm): Parameter to evaluate.
+
+        Returns:
+            object: Evaluated value.
+
+        """
+        val = parm.eval()
+        if isinstance(val, str):
+            val = val.replace("\n", " ").replace("\r", "")
+        return val
+
+    def get_values(self, goal_node):
+        """Return the value of each parameter for the given goal node.
+
+        Args:
+            goal_node (hou.Node): Node that will be used to resolve any
+                occurrences of $OS.
+
+        Returns:
+            dict: Name of the parameters and their value.
+
+        """
+        values = dict(self.values)
+        for parm in self.dynamic_parms:
+            values[parm.name()] = self.evaluate(parm)
+
+        # Any parms that use $OS in their value need to be re-evaluated after
+        # cd'ing to the goal_node.
+        if self.os_raw_values:
+            hou.cd(goal_node.path())
+            for key, raw_value in self.os_raw_values.items():
+                values[key] = hou.expandString(raw_value)
+        return values
+
+
+@contextlib.contextmanager
+def snapshot_parms(*nodes):
+    """Evaluate the override parameters of the given nodes only once.
+
+    Inside of this context, get_parm_values takes a snapshot of all
+    parameters of the given nodes matching a prefix the first time they are
+    queried, and only re-evaluates the parameters which can differ between
+    goal nodes afterwards. This is meant for the submitter node, whose
+    overrides are queried for every job of a submission.
+
+    Args:
+        *nodes (hou.Node): Nodes whose parameters won't change inside of this
+            context. None entries are ignored.
+
+    Examples:
+        >>> with snapshot_parms(hou.node('/out/hal_deadline_submit1')):
+        ...     submit.submit(hou.node('/out/mantra1'))
+
+    """
+    global _SNAPSHOTS
+    previous_snapshots = _SNAPSHOTS
+    _SNAPSHOTS = dict(previous_snapshots or {})
+    for node in nodes:
+        if node is not None:
+            _SNAPSHOTS.setdefault(node, {})
+    try:
+        yield
+    finally:
+        _SNAPSHOTS = previous_snapshots
+
 
 def get_job_info(node, goal_node=None, extra_infos=None):
     """Return deadline job info of the given node.
@@ -88,6 +192,9 @@ def get_parm_values(
 ):
     """Return the value of each parameter of a node.
 
+    Parameters queried by prefix on a node passed to snapshot_parms are only
+    evaluated once per snapshot context.
+
     Args:
         node (hou.Node): Node whose parameter values will be returned.
         parm_names (:obj:`list` of :obj:`str`, optional): Name of the
@@ -125,33 +232,24 @@ def get_parm_values(
     if not any((parm_names, prefix)):
         raise ValueError("Either parm_name or prefix need to have a value.")
 
-    if prefix:
-        parms = [
-            parm
-            for parm in node.allParms()
-            if all((parm.name().startswith(prefix), get_checkbox_value(parm)))
-        ]
+    node_snapshots = _SNAPSHOTS.get(node) if _SNAPSHOTS is not None else None
+    if prefix and node_snapshots is not None and prefix in node_snapshots:
+        snapshot = node_snapshots[prefix]
     else:
-        parms = [node.parm(parm_name) for parm_name in parm_names]
-        parms = [parm for parm in parms if get_checkbox_value(parm)]
-
-    # values = {parm.name(): parm.eval() for parm in parms}
-    values = {}
-    for parm in parms:
-        val = parm.eval()
-        if isinstance(val, str):
-            val = val.replace('\n',' ').replace('\r','')
-        values[parm.name()] = val   
-
-    # Any parms that use $OS in their value need to be re-evaluated after
-    # cd'ing to the goal_node.
-    parms = [parm for parm in parms if "$OS" in parm.rawValue()]
-    re_eval_values = {parm.name(): parm.rawValue() for parm in parms}
-    hou.cd(goal_node.path())
-    for key, raw_value in re_eval_values.items():
-        re_eval_values[key] = hou.expandString(raw_value)
-
-    values.update(re_eval_values)
+        if prefix:
+            parms = [
+                parm
+                for parm in node.allParms()
+                if all((parm.name().startswith(prefix), get_checkbox_value(parm)))
+            ]
+        else:
+            parms = [node.parm(parm_name) for parm_name in parm_names]
+            parms = [parm for parm in parms if get_checkbox_value(parm)]
+        snapshot = ParmSnapshot(parms)
+        if prefix and node_snapshots is not None:
+            node_snapshots[prefix] = snapshot
+
+    values = snapshot.get_values(goal_node)
 
     # Remove prefix.
     if prefix and remove_prefix:
@@ -199,14 +297,27 @@ def add_plugin_info_parms(node):
     render_mode = hou.MenuParmTemplate(
         constants.RENDER_MODE,
         "Render Mode",
-        menu_items=("cache_render", "cache", "render"),
-        menu_labels=("Cache & Render", "Cache Only", "Render from Houdini"),
+        menu_items=("cache_render", "cache", "render", "stream"),
+        menu_labels=(
+            "Cache & Render",
+            "Cache Only",
+            "Render from Houdini",
+            "Cache & Render (Streamed)",
+        ),
         default_value=0,
     )
+    frame_order_menu = hou.MenuParmTemplate(
+        constants.FRAME_ORDER,
+        "Frame Order",
+        menu_items=("ascending", "first_last_middle"),
+        menu_labels=("Ascending", "First, Last, Middle"),
+        default_value=constants.FRAME_ORDER_ASCENDING,
+    )
 
     parm_template_group.appendToFolder(main_folder.label(), pre_pass_toggle)
     parm_template_group.appendToFolder(main_folder.label(), submit_separately_toggle)
     parm_template_group.appendToFolder(main_folder.label(), render_mode)
+    parm_template_group.appendToFolder(main_folder.label(), frame_order_menu)
     node.setParmTemplateGroup(parm_template_group)
 
 
@@ -0,0 +1,333 @@
+"""Submission plans holding the final Deadline information of all jobs.
+
+A plan is compiled from the jobs created in Houdini and stores the job info,
+plugin info, dependencies and wedges of every job that would be sent to
+Deadline, without referencing any Houdini objects. It is written as JSON, so
+it can be diffed between submissions and sent to Deadline by a separate
+process outside of Houdini.
+
+Examples:
+    $ python -m houdini_deadline_api_submission.plan plan.json --workers 8
+
+"""
+
+# Import built-in modules
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import json
+import logging
+import os
+import subprocess
+
+# Import local modules
+from houdini_deadline_api_submission import constants
+from houdini_deadline_api_submission import cost_model
+from houdini_deadline_api_submission import deadline_utils
+from houdini_deadline_api_submission import scheduling
+
+# Version of the plan format, increased on every incompatible change.
+PLAN_VERSION = 1
+
+
+def get_job_entry(job, job_indices):
+    """Return the plan entry of a single prepared job.
+
+    Args:
+        job (houdini_deadline_api_submission.job.base.BaseDeadlineJob):
+            Singular job whose submission was prepared.
+        job_indices (dict): Index of each job inside of the plan, keyed by the
+            id of the job.
+
+    Returns:
+        dict: Job info, plugin info, dependencies, wedge and cost key of the
+            job.
+
+    """
+    dependencies = []
+    external_dependencies = []
+    upstream_jobs = job.get_upstream_jobs()
+    for upstream_job in upstream_jobs:
+        if id(upstream_job) in job_indices:
+            dependencies.append(job_indices[id(upstream_job)])
+        elif upstream_job.deadline_id is not None:
+            external_dependencies.append(upstream_job.deadline_id)
+
+    # The baked dependencies are resolved again while submitting the plan.
+    job_info = dict(job.job_info)
+    for dependency_index in range(len(upstream_jobs)):
+        job_info.pop("JobDependency{}".format(dependency_index), None)
+
+    wedge = None
+    if job.is_wedge:
+        wedge = {
+            "index": job.wedge_index,
+            "values": [
+                [name, parm.path(), value] for name, parm, value in job.wedge_values
+            ],
+        }
+    return {
+        "node": job.node.path(),
+        "job_info": job_info,
+        "plugin_info": dict(job.plugin_info),
+        "dependencies": sorted(set(dependencies)),
+        "external_dependencies": sorted(set(external_dependencies)),
+        "wedge": wedge,
+        "task_wedges": len(job.task_wedges) if job.task_wedges else 0,
+        "cost_key": job.cost_key,
+    }
+
+
+def compile_plan(jobs):
+    """Prepare the given jobs and return their plan.
+
+    This runs the same steps as a submission (overrides, wedges, saving the
+    hip file, logs, ...), but doesn't send the jobs to Deadline.
+    PrePass jobs are run as usual and are not part of the plan, neither are
+    jobs whose outputs all exist if the submitter skips existing frames.
+
+    Args:
+        jobs (:obj:`list` of :obj:`houdini_deadline_api_submission.job.base.
+            BaseDeadlineJob`): Jobs as returned by
+            `houdini_deadline_api_submission.submit.get_jobs`.
+
+    Returns:
+        dict: Versioned plan of all jobs, sorted so each job only depends on
+            jobs in front of it.
+
+    """
+    jobs = [job for job in jobs if not job.is_submitted]
+    for job in jobs:
+        job.pre_submit_all()
+
+    flattened_jobs = []
+    for job in jobs:
+        flattened_jobs += job.get_flattened_jobs()
+
+    entries = []
+    job_indices = {}
+    for level in scheduling.get_job_levels(flattened_jobs):
+        for job in level:
+            job.prepare_submission()
+            if job.is_pre_pass or job.is_complete:
+                continue
+            job_indices[id(job)] = len(entries)
+            entries.append(get_job_entry(job, job_indices))
+
+    for job in jobs:
+        job.post_submit_all()
+        job.is_submitted = True
+
+    return {
+        "version": PLAN_VERSION,
+        "package": constants.PACKAGE_NAME,
+        "jobs": entries,
+    }
+
+
+def write_plan(path, plan):
+    """Write the given plan to disk.
+
+    Args:
+        path (str): Path of the plan file.
+        plan (dict): Plan as returned by `compile_plan`.
+
+    """
+    folder = os.path.dirname(path)
+    if folder and not os.path.isdir(folder):
+        os.makedirs(folder)
+    with open(path, "w") as plan_file:
+        # Any value JSON doesn't know is stored as its string representation.
+        json.dump(plan, plan_file, indent=4, sort_keys=True, default=str)
+
+
+def read_plan(path):
+    """Read a plan written by `write_plan`.
+
+    Args:
+        path (str): Path of the plan file.
+
+    Returns:
+        dict: The plan stored in the file.
+
+    Raises:
+        ValueError: If the plan was written in another version.
+
+    """
+    with open(path) as plan_file:
+        plan = json.load(plan_file)
+    if plan.get("version") != PLAN_VERSION:
+        raise ValueError(
+            "Plan {} has version {}, expected {}.".format(
+                path, plan.get("version"), PLAN_VERSION
+            )
+        )
+    return plan
+
+
+def get_plan_levels(plan):
+    """Group the jobs of the given plan by their level.
+
+    Args:
+        plan (dict): Plan as returned by `compile_plan`.
+
+    Returns:
+        list of list of int: Indices of the jobs per level, each job only
+            depends on jobs of previous levels.
+
+    Raises:
+        ValueError: If a job depends on a job that is not in front of it.
+
+    """
+    job_levels = []
+    levels = []
+    for index, entry in enumerate(plan["jobs"]):
+        level = 0
+        for dependency in entry["dependencies"]:
+            if dependency >= index:
+                raise ValueError(
+                    "Job {} ({}) depends on job {}, which is not in front of "
+                    "it.".format(index, entry["node"], dependency)
+                )
+            level = max(level, job_levels[dependency] + 1)
+        job_levels.append(level)
+        if level == len(levels):
+            levels.append([])
+        levels[level].append(index)
+    return levels
+
+
+def submit_plan(
+    plan, deadline_con=None, max_workers=constants.DEFAULT_SUBMISSION_WORKERS
+):
+    """Send all jobs of the given plan to Deadline, level by level.
+
+    Args:
+        plan (dict): Plan as returned by `compile_plan`.
+        deadline_con (houdini_deadline_api_submission.webservice.
+            WebServiceClient, optional):
+            Deadline connection object. If not given, a connection will
+            automatically be established.
+        max_workers (int, optional): Maximum amount of jobs sent to Deadline
+            at the same time. Defaults to
+            constants.DEFAULT_SUBMISSION_WORKERS.
+
+    Returns:
+        list of str: Deadline IDs of the submitted jobs, in the order of the
+            jobs in the plan.
+
+    """
+    logger = logging.getLogger(__name__)
+    entries = plan["jobs"]
+    deadline_ids = [None] * len(entries)
+    levels = get_plan_levels(plan)
+    if entries and deadline_con is None:
+        deadline_con = deadline_utils.get_deadline_connect()
+
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    try:
+        for level_index, level in enumerate(levels):
+            logger.debug("Submitting level %s with %s jobs.", level_index, len(level))
+            futures = []
+            for index in level:
+                entry = entries[index]
+                job_info = dict(entry["job_info"])
+                upstream_ids = [
+                    deadline_ids[dependency] for dependency in entry["dependencies"]
+                ]
+                upstream_ids += entry["external_dependencies"]
+                for dependency_index, upstream_id in enumerate(upstream_ids):
+                    job_info["JobDependency{}".format(dependency_index)] = upstream_id
+                futures.append(
+                    executor.submit(
+                        deadline_utils.submit_job,
+                        job_info,
+                        dict(entry["plugin_info"]),
+                        deadline_con,
+                    )
+                )
+            for index, future in zip(level, futures):
+                deadline_ids[index] = future.result()
+                logger.info(
+                    "Submitted %s: %s", entries[index]["node"], deadline_ids[index]
+                )
+    finally:
+        executor.shutdown(wait=True)
+    return deadline_ids
+
+
+def record_pending_jobs(plan, deadline_ids):
+    """Remember the submitted jobs using adaptive chunks in the job stats.
+
+    Args:
+        plan (dict): Plan as returned by `compile_plan`.
+        deadline_ids (list of str): Deadline IDs as returned by `submit_plan`.
+
+    """
+    cost_model.record_pending_jobs(
+        [
+            (deadline_id, entry["cost_key"])
+            for entry, deadline_id in zip(plan["jobs"], deadline_ids)
+            if entry.get("cost_key") and deadline_id
+        ]
+    )
+
+
+def start_submission(path, max_workers=constants.DEFAULT_SUBMISSION_WORKERS):
+    """Send the given plan to Deadline from a separate process.
+
+    The output of the process is written to a log file next to the plan.
+
+    Args:
+        path (str): Path of the plan file.
+        max_workers (int, optional): Maximum amount of jobs sent to Deadline
+            at the same time.
+
+    Returns:
+        subprocess.Popen: The started process.
+
+    """
+    command = [
+        "hal",
+        "--run-by-tool",
+        "+p",
+        constants.PACKAGE_NAME,
+        "run",
+        "python",
+        "-m",
+        constants.PLAN_MODULE,
+        path,
+        "--workers",
+        str(max_workers),
+    ]
+    log_path = "{}.log".format(os.path.splitext(path)[0])
+    with open(log_path, "w") as log_file:
+        return subprocess.Popen(
+            command, stdout=log_file, stderr=subprocess.STDOUT, close_fds=True
+        )
+
+
+def main(argv=None):
+    """Send the plan given on the command line to Deadline.
+
+    Args:
+        argv (list of str, optional): Command line arguments.
+
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("plan", help="Path of the plan file.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=constants.DEFAULT_SUBMISSION_WORKERS,
+        help="Maximum amount of jobs sent to Deadline at the same time.",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    job_plan = read_plan(args.plan)
+    deadline_ids = submit_plan(job_plan, max_workers=args.workers)
+    record_pending_jobs(job_plan, deadline_ids)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""Content addressed snapshots of the submitted Houdini scene.
+
+Instead of saving a copy of the hip file for every submitted job, the scene
+is saved once per submission into a snapshot store next to the hip file. The
+snapshot is named after the hash of its content, so submitting an unchanged
+scene again re-uses the existing snapshot. Parameters that a single job
+changes (overrides, frame ranges, wedges, ...) are passed in the environment
+of the job and applied on the farm once the scene is loaded, through the
+pythonrc.py of this package. Workers that don't load this package would
+render the unchanged scene, which is why snapshots are opt-in.
+
+Old snapshots are only deleted on request, see `collect_snapshots`.
+"""
+
+# Import built-in modules
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+
+# Import third-party modules
+import hou  # pylint: disable=import-error
+
+# Import local modules
+from houdini_deadline_api_submission import constants
+from houdini_deadline_api_submission import tracing
+from houdini_deadline_api_submission import utils
+
+# Store used by the currently running submission, None if snapshots are not
+# used.
+_ACTIVE_STORE = None
+
+
+class SceneSnapshotStore(object):
+    """Folder of content addressed hip file snapshots.
+
+    Args:
+        folder (str): Folder to store the snapshots in.
+        link (bool, optional): If True, snapshots are hardlinked into the
+            folder of each job that uses them.
+
+    """
+
+    def __init__(self, folder, link=False):
+        """Initialize the store, the scene is only saved when it's needed."""
+        self.folder = folder
+        self.link = link
+        self.snapshot = None
+
+    def get_snapshot(self):
+        """Return the snapshot of the current scene, saving it the first time.
+
+        Returns:
+            str: Path of the snapshot.
+
+        """
+        if self.snapshot is None:
+            self.snapshot = self.save()
+        return self.snapshot
+
+    @tracing.traced("save_snapshot")
+    def save(self):
+        """Save the current scene into the store.
+
+        Returns:
+            str: Path of the snapshot.
+
+        """
+        if not os.path.isdir(self.folder):
+            os.makedirs(self.folder)
+
+        orig_hip = hou.hipFile.path()
+        ext = os.path.splitext(orig_hip)[1]
+        handle, temp_path = tempfile.mkstemp(suffix=ext, dir=self.folder)
+        os.close(handle)
+        try:
+            hou.hipFile.save(temp_path, save_to_recent_files=False)
+        finally:
+            hou.hipFile.setName(orig_hip)
+        return self.add(temp_path, orig_hip)
+
+    def add(self, path, orig_hip):
+        """Move the given file into the store, named after its content.
+
+        If the store already holds a file with the same content, the given
+        file is deleted instead.
+
+        Args:
+            path (str): File to add, needs to be on the same drive as the
+                store.
+            orig_hip (str): Path of the scene the file is a snapshot of.
+
+        Returns:
+            str: Path of the snapshot.
+
+        """
+        hip, ext = os.path.splitext(os.path.basename(orig_hip))
+        snapshot = os.path.join(
+            self.folder, "{}__{}{}".format(hip, get_file_hash(path), ext)
+        )
+        if os.path.exists(snapshot):
+            os.remove(path)
+            # Mark the snapshot as used, so it doesn't get collected.
+            os.utime(snapshot, None)
+        else:
+            os.rename(path, snapshot)
+        return snapshot
+
+    def link_into(self, snapshot, folder):
+        """Hardlink the given snapshot into the given folder.
+
+        Args:
+            snapshot (str): Path of the snapshot.
+            folder (str): Folder to create the link in.
+
+        Returns:
+            str: Path of the link, or the snapshot itself if the link could
+                not be created (for example when the folder is on another
+                drive).
+
+        """
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+        link = os.path.join(folder, os.path.basename(snapshot))
+        if os.path.exists(link):
+            return link
+        try:
+            os.link(snapshot, link)
+        except (AttributeError, OSError):
+            logger = logging.getLogger(__name__)
+            logger.debug("Could not link %s into %s.", snapshot, folder)
+            return snapshot
+        return link
+
+    def collect_garbage(self, max_age_days):
+        """Delete all snapshots that were not used in the given amount of days.
+
+        Hardlinks in the output folders keep their scene file alive, so jobs
+        using them can still be re-queued.
+
+        Args:
+            max_age_days (int): Maximum age of the snapshots to keep.
+
+        Returns:
+            list of str: Paths of the deleted snapshots.
+
+        """
+        if not os.path.isdir(self.folder):
+            return []
+
+        deleted = []
+        min_mtime = time.time() - max_age_days * 24 * 60 * 60
+        for name in os.listdir(self.folder):
+            path = os.path.join(self.folder, name)
+            if path == self.snapshot or not os.path.isfile(path):
+                continue
+            try:
+                if os.path.getmtime(path) < min_mtime:
+                    os.remove(path)
+                    deleted.append(path)
+            except OSError:
+                continue
+        return deleted
+
+
+def get_file_hash(path, chunk_size=1024 * 1024):
+    """Return the SHA-1 hash of the content of the given file.
+
+    Args:
+        path (str): File to hash.
+        chunk_size (int, optional): Amount of bytes read at once.
+
+    Returns:
+        str: Hex digest of the file content.
+
+    """
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as hip_file:
+        for chunk in iter(lambda: hip_file.read(chunk_size), b""):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def get_store_folder(hip_path=None):
+    """Return the snapshot store folder of the given hip file.
+
+    Args:
+        hip_path (str, optional): Path of the hip file. Defaults to the
+            current scene.
+
+    Returns:
+        str: Folder holding the snapshots of the scene.
+
+    """
+    hip_path = hip_path or hou.hipFile.path()
+    return os.path.join(
+        os.path.dirname(hip_path), "_deadline", constants.SCENE_SNAPSHOT_FOLDER
+    )
+
+
+def get_active_store():
+    """Return the snapshot store of the running submission.
+
+    Returns:
+        SceneSnapshotStore: Store to save the scene in, None if every job
+            saves its own copy of the scene.
+
+    """
+    return _ACTIVE_STORE
+
+
+@contextlib.contextmanager
+def submission_snapshot(submitter_node):
+    """Save the scene only once for all jobs submitted inside of this context.
+
+    The settings are read from the submitter node.
+
+    Args:
+        submitter_node (hou.Node): HAL Deadline Submit ROP that is being used
+            to drive the submission.
+
+    """
+    global _ACTIVE_STORE
+    if not utils.get_submitter_value(
+        submitter_node, constants.SCENE_SNAPSHOT, default=False
+    ):
+        yield
+        return
+
+    previous_store = _ACTIVE_STORE
+    store = SceneSnapshotStore(
+        get_store_folder(),
+        link=bool(
+            utils.get_submitter_value(
+                submitter_node, constants.SCENE_SNAPSHOT_LINKS, default=False
+            )
+        ),
+    )
+    _ACTIVE_STORE = store
+    try:
+        yield
+    finally:
+        _ACTIVE_STORE = previous_store
+
+
+def collect_snapshots(submitter_node, hip_path=None):
+    """Delete the snapshots of a scene that were not used for a while.
+
+    Snapshots are not collected automatically, since queued jobs may still
+    render them. This is called by the "Delete Old Snapshots" button of the
+    submitter node.
+
+    Args:
+        submitter_node (hou.Node): HAL Deadline Submit ROP holding the maximum
+            age of the snapshots.
+        hip_path (str, optional): Path of the hip file. Defaults to the
+            current scene.
+
+    Returns:
+        list of str: Paths of the deleted snapshots.
+
+    """
+    max_age = utils.get_submitter_value(
+        submitter_node,
+        constants.SCENE_SNAPSHOT_MAX_AGE,
+        default=constants.DEFAULT_SCENE_SNAPSHOT_MAX_AGE,
+    )
+    if max_age <= 0:
+        return []
+    store = SceneSnapshotStore(get_store_folder(hip_path))
+    deleted = store.collect_garbage(max_age)
+    logger = logging.getLogger(__name__)
+    logger.info("Deleted %s old scene snapshots.", len(deleted))
+    return deleted
+
+
+def encode_scene_overrides(parm_values):
+    """Return the given parameter values as an environment variable value.
+
+    Args:
+        parm_values (dict): Values keyed by the path of their parameter.
+
+    Returns:
+        str: Values to store in constants.SCENE_OVERRIDES_ENV.
+
+    """
+    return json.dumps(parm_values, sort_keys=True, separators=(",", ":"))
+
+
+def apply_scene_overrides(overrides=None):
+    """Set the parameter values passed in the environment of a job.
+
+    Args:
+        overrides (str, optional): Encoded parameter values. Defaults to the
+            value of constants.SCENE_OVERRIDES_ENV.
+
+    """
+    overrides = overrides or os.environ.get(constants.SCENE_OVERRIDES_ENV)
+    if not overrides:
+        return
+
+    logger = logging.getLogger(__name__)
+    for parm_path, value in sorted(json.loads(overrides).items()):
+        parm = hou.parm(parm_path)
+        if parm is None:
+            logger.warning("Can't override missing parameter %s.", parm_path)
+            continue
+        parm.set(value)
+
+
+def _on_hip_file_event(event_type):
+    """Apply the scene overrides after a scene got loaded.
+
+    Args:
+        event_type (hou.hipFileEventType): Type of the event.
+
+    """
+    if event_type == hou.hipFileEventType.AfterLoad:
+        apply_scene_overrides()
+
+
+def register_scene_overrides():
+    """Apply the scene overrides of a job whenever a scene gets loaded.
+
+    This is called on startup of every Houdini session through pythonrc.py,
+    but only does something in sessions started by a Deadline job.
+
+    """
+    if os.environ.get(constants.SCENE_OVERRIDES_ENV):
+        hou.hipFile.addEventCallback(_on_hip_file_event)
+
@@ -0,0 +1,157 @@
+"""Functions to submit a graph of jobs concurrently, level by level."""
+
+# Import built-in modules
+from concurrent.futures import ThreadPoolExecutor
+import logging
+
+# Import local modules
+from houdini_deadline_api_submission import constants
+from houdini_deadline_api_submission import deadline_utils
+
+
+def get_job_levels(jobs):
+    """Sort the given singular jobs into topological levels.
+
+    Each job only depends on jobs of a previous level, so all jobs inside of
+    a single level can be sent to Deadline at the same time. Dependencies on
+    jobs that are not part of the given jobs (PrePass jobs, already submitted
+    jobs, ...) are ignored, since they can't block the submission.
+
+    Args:
+        jobs (:obj:`list` of :obj:`houdini_deadline_api_submission.job.base.
+            BaseDeadlineJob`): Flattened jobs to sort.
+
+    Returns:
+        :obj:`list` of :obj:`list` of :obj:`houdini_deadline_api_submission.
+            job.base.BaseDeadlineJob`: Jobs grouped by their level, in the
+            order the levels need to be submitted.
+
+    Raises:
+        ValueError: If the dependencies of the given jobs contain a cycle.
+
+    """
+    # Jobs implement a custom __eq__, so they are keyed by their id instead.
+    unique_jobs = []
+    downstream_jobs = {}
+    for job in jobs:
+        if id(job) not in downstream_jobs:
+            downstream_jobs[id(job)] = []
+            unique_jobs.append(job)
+
+    upstream_amount = {}
+    for job in unique_jobs:
+        upstream_ids = set(
+            id(upstream_job)
+            for upstream_job in job.get_upstream_jobs()
+            if id(upstream_job) in downstream_jobs
+        )
+        upstream_amount[id(job)] = len(upstream_ids)
+        for upstream_id in upstream_ids:
+            downstream_jobs[upstream_id].append(job)
+
+    levels = []
+    level = [job for job in unique_jobs if not upstream_amount[id(job)]]
+    sorted_amount = 0
+    while level:
+        levels.append(level)
+        sorted_amount += len(level)
+        next_level = []
+        for job in level:
+            for downstream_job in downstream_jobs[id(job)]:
+                upstream_amount[id(downstream_job)] -= 1
+                if not upstream_amount[id(downstream_job)]:
+                    next_level.append(downstream_job)
+        level = next_level
+
+    if sorted_amount != len(unique_jobs):
+        cyclic_nodes = sorted(
+            set(job.node.path() for job in unique_jobs if upstream_amount[id(job)])
+        )
+        raise ValueError(
+            "The dependencies of the following ROPs contain a cycle: {}".format(
+                ", ".join(cyclic_nodes)
+            )
+        )
+    return levels
+
+
+def submit_concurrently(jobs, max_workers=constants.DEFAULT_SUBMISSION_WORKERS):
+    """Submit the given jobs level by level through a bounded pool of workers.
+
+    Preparing a job changes the Houdini session (parameter overrides, wedges,
+    saving the hip file, ...), which is why this still happens one job after
+    another on the main thread. Only the round trips to the Deadline Web
+    Service of the independent jobs inside of a level happen at the same time.
+    Each level is finished before the next one is prepared, so the Deadline IDs
+    of all dependencies are known when they get baked into the job info.
+
+    Args:
+        jobs (:obj:`list` of :obj:`houdini_deadline_api_submission.job.base.
+            BaseDeadlineJob`): Jobs as returned by
+            `houdini_deadline_api_submission.submit.get_jobs`.
+        max_workers (int, optional): Maximum amount of jobs sent to Deadline
+            at the same time. Defaults to
+            constants.DEFAULT_SUBMISSION_WORKERS.
+
+    Raises:
+        Exception: The first error of the jobs of a level, once all other
+            jobs of the level are submitted.
+
+    """
+    logger = logging.getLogger(__name__)
+    jobs = [job for job in jobs if not job.is_submitted]
+    for job in jobs:
+        job.pre_submit_all()
+
+    flattened_jobs = []
+    for job in jobs:
+        flattened_jobs += job.get_flattened_jobs()
+    levels = get_job_levels(flattened_jobs)
+
+    deadline_con = None
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    try:
+        for level_index, level in enumerate(levels):
+            ready_jobs = [job for job in level if job.prepare_submission()]
+            if not ready_jobs:
+                continue
+            if deadline_con is None:
+                deadline_con = deadline_utils.get_deadline_connect()
+
+            logger.debug(
+                "Submitting level %s with %s jobs.", level_index, len(ready_jobs)
+            )
+            futures = [
+                executor.submit(
+                    deadline_utils.submit_job,
+                    job.job_info,
+                    job.plugin_info,
+                    deadline_con,
+                )
+                for job in ready_jobs
+            ]
+            # Wait for every job of the level, so the IDs of the jobs that got
+            # submitted are known even if another job of the level failed.
+            errors = []
+            for job, future in zip(ready_jobs, futures):
+                try:
+                    job.deadline_id = future.result()
+                except Exception as error:  # pylint: disable=broad-except
+                    errors.append(error)
+            if errors:
+                # Retrying the submission creates these jobs a second time.
+                for job in jobs:
+                    submitted_ids = job.post_submit_failed()
+                    if submitted_ids:
+                        logger.warning(
+                            "Submission of %s failed after submitting: %s",
+                            job.node.path(),
+                            ", ".join(submitted_ids),
+                        )
+                raise errors[0]
+    finally:
+        executor.shutdown(wait=True)
+
+    for job in jobs:
+        job.post_submit_all()
+        job.is_submitted = True
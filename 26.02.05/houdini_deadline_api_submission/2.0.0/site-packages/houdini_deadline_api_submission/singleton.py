@@ -1,13 +1,27 @@
 """Singleton class decorator."""
 
+# Import built-in modules
+import threading
+
 
 class Singleton(type):
     """Metaclass to define a class as a Singleton."""
 
     _instances = {}
+    _lock = threading.Lock()
 
     def __call__(cls, *args, **kwargs):
         """Overwrite magic method to implement singleton behaviour."""
         if cls not in cls._instances:
-            cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
+            # Threads submitting jobs concurrently may ask for the instance
+            # at the same time, but it must only be created once.
+            with cls._lock:
+                if cls not in cls._instances:
+                    cls._instances[cls] = super(Singleton, cls).__call__(
+                        *args, **kwargs
+                    )
         return cls._instances[cls]
+
+
+# Base class to define a class as a Singleton.
+SingletonBase = Singleton("SingletonBase", (object,), {})
@@ -1,10 +1,22 @@
 """Main submission functions."""
 
+# Import built-in modules
+import logging
+
 # Import third-party modules
 # from hal_ontrack import track_dependencies_in_houdini
 # from hal_ontrack.apps.houdini_funcs import track_dependencies
 
 # Import local modules
+from houdini_deadline_api_submission import constants
+from houdini_deadline_api_submission import cost_model
+from houdini_deadline_api_submission import deadline_utils
+from houdini_deadline_api_submission import log_sink
+from houdini_deadline_api_submission import parm_utils
+from houdini_deadline_api_submission import plan
+from houdini_deadline_api_submission import scene_snapshot
+from houdini_deadline_api_submission import scheduling
+from houdini_deadline_api_submission import tracing
 from houdini_deadline_api_submission import utils
 from houdini_deadline_api_submission.job.base import BaseDeadlineJob
 from houdini_deadline_api_submission.job.render import ArnoldDeadlineJob
@@ -17,6 +29,8 @@ _CLASS_LOOKUP = {
     "usdrender_rop": FetchDeadlineJob,
 }
 
+
+@tracing.traced("setup_fxcache_networks")
 def setup_fxcache_networks(nodes):
     """Re-Build any FXCache ROP Networks that are present in the given nodes.
 
@@ -24,6 +38,9 @@ def setup_fxcache_networks(nodes):
         nodes (:obj:`list` of :obj:`hou.Node`): Submitted nodes that will be
             checked for any FXCache parent.
 
+    Returns:
+        set of hou.Node: FXCache nodes whose ROP Network got re-built.
+
     """
     fxcache_nodes = set()
     for node in nodes:
@@ -34,8 +51,10 @@ def setup_fxcache_networks(nodes):
 
     for node in fxcache_nodes:
         node.parm("setup_rop").pressButton()
+    return fxcache_nodes
 
 
+@tracing.traced("get_jobs")
 def get_jobs(base_node, submitter_node=None):
     """Get jobs of the given node.
 
@@ -50,14 +69,40 @@ def get_jobs(base_node, submitter_node=None):
 
     """
     timestamp = utils.get_timestamp()
-    dependency_tree = utils.get_dependency_tree(base_node)
+    with tracing.span("dependency_tree"):
+        dependency_tree = utils.get_dependency_tree(base_node)
 
     # Set-Up all FXCache ROP Networks before retrieving the tree again, so we
-    # can be sure that all of them are up to date.
+    # can be sure that all of them are up to date. The tree is cached, so it
+    # only gets rebuilt if the set-up actually changed the network.
     nodes = [leaf["node"] for leaf in dependency_tree]
-    setup_fxcache_networks(nodes)
-    dependency_tree = utils.get_dependency_tree(base_node)
+    if setup_fxcache_networks(nodes):
+        with tracing.span("dependency_tree"):
+            dependency_tree = utils.get_dependency_tree(base_node)
+    logger = logging.getLogger(__name__)
+    logger.debug("Dependency tree cache: %s", utils.get_dependency_tree_cache_stats())
+
+    with utils.frame_range_cache():
+        with tracing.span("resolve_frames"):
+            utils.resolve_frames([leaf["node"] for leaf in dependency_tree])
+        return _create_jobs(dependency_tree, submitter_node, timestamp)
+
+
+def _create_jobs(dependency_tree, submitter_node, timestamp):
+    """Create a job for each node of the given dependency tree.
 
+    Args:
+        dependency_tree (list of dict): Tree as returned by
+            `utils.get_dependency_tree`.
+        submitter_node (hou.Node): HAL Deadline Submit ROP that is being used
+            to drive the submission.
+        timestamp (str): Timestamp shared by all jobs.
+
+    Returns:
+        :obj:`list` of :obj:`houdini_deadline_api_submission.deadline_job.BaseDeadlineJob`:
+            Jobs in the order of the dependency tree.
+
+    """
     # Track the jobs outputs as Published Files in Shotgun.
     tracker = None
     # if track_dependencies_in_houdini():
@@ -87,9 +132,46 @@ def get_jobs(base_node, submitter_node=None):
     return jobs
 
 
+def submit_plan(jobs, submitter_node=None, start=True):
+    """Write the plan of the given jobs and send it to Deadline in background.
+
+    Args:
+        jobs (:obj:`list` of :obj:`houdini_deadline_api_submission.deadline_job.BaseDeadlineJob`):
+            Jobs to write the plan of.
+        submitter_node (hou.Node): HAL Deadline Submit ROP that is being used
+            to drive the submission.
+        start (bool, optional): If False, the plan is only written.
+
+    Returns:
+        list: Always empty, because the Deadline IDs are only known once the
+            separate process submitted the plan.
+
+    """
+    logger = logging.getLogger(__name__)
+    job_plan = plan.compile_plan(jobs)
+    path = utils.get_plan_path()
+    plan.write_plan(path, job_plan)
+    for job in jobs:
+        job.log("Submission plan written: {}".format(path))
+    logger.info("Wrote plan of %s jobs to %s", len(job_plan["jobs"]), path)
+
+    if start:
+        plan.start_submission(
+            path, max_workers=utils.get_submission_workers(submitter_node)
+        )
+    return []
+
+
 def submit(base_node, submitter_node=None):
     """Submit all of the nodes connected to the base_node.
 
+    If tracing is turned on for the submitter node, a summary of how long
+    each phase of the submission took is logged onto the submitter node and
+    all timings are written into a Chrome trace file.
+
+    The log messages of the submission are also written into a JSON-lines
+    file, unless it's a dry run, which doesn't submit anything.
+
     Args:
         base_node (hou.Node): Node to submit.
         submitter_node (hou.Node): HAL Deadline Submit ROP that is being used
@@ -99,13 +181,82 @@ def submit(base_node, submitter_node=None):
         list of int: Deadline IDs of submitted jobs.
 
     """
-    jobs = get_jobs(base_node, submitter_node)
-    for job in jobs:
-        job.submit_all()
+    sidecar_path = None
+    if not utils.get_submitter_value(submitter_node, "dry_run", default=False):
+        sidecar_path = utils.get_submission_file_path(
+            constants.LOG_SIDECAR_FOLDER, ".jsonl"
+        )
+    use_tracing = utils.use_tracing(submitter_node)
+    trace_path = None
+    if use_tracing:
+        trace_path = utils.get_submission_file_path(constants.TRACE_FOLDER, ".json")
+
+    # Log messages are written onto the nodes once the submission is finished.
+    with log_sink.buffered_log(sidecar_path), tracing.tracing(
+        trace_path, enabled=use_tracing
+    ) as tracer:
+        with tracing.span("submit", node=base_node):
+            submitted_ids = _submit_nodes(base_node, submitter_node)
+        if tracer is not None:
+            summary = "{}\nTrace: {}".format(tracer.get_summary(), trace_path)
+            logger = logging.getLogger(__name__)
+            logger.info(summary)
+            if submitter_node:
+                log_sink.log_message(submitter_node, summary)
+    return submitted_ids
+
+
+def _submit_nodes(base_node, submitter_node=None):
+    """Create the jobs of the given node and send them to Deadline.
+
+    Args:
+        base_node (hou.Node): Node to submit.
+        submitter_node (hou.Node): HAL Deadline Submit ROP that is being used
+            to drive the submission.
+
+    Returns:
+        list of int: Deadline IDs of submitted jobs.
+
+    """
+    if utils.get_chunk_target_seconds(submitter_node) is not None:
+        # The durations of finished jobs are only used by later submissions.
+        cost_model.get_store().refresh_in_background()
+
+    # The overrides of the submitter node are the same for every job, so they
+    # only get evaluated once per submission. The same goes for the farm
+    # environment and the scene, which only gets saved once if the submitter
+    # uses scene snapshots. Frame ranges are resolved once per node.
+    with parm_utils.snapshot_parms(
+        submitter_node
+    ), deadline_utils.environment_block(), scene_snapshot.submission_snapshot(
+        submitter_node
+    ), utils.frame_range_cache():
+        jobs = get_jobs(base_node, submitter_node)
+        dry_run = utils.get_submitter_value(submitter_node, "dry_run", default=False)
+        in_background = utils.get_submitter_value(
+            submitter_node, constants.SUBMIT_IN_BACKGROUND, default=False
+        )
+        if in_background and not dry_run:
+            with tracing.span("submit_plan"):
+                return submit_plan(jobs, submitter_node)
+
+        mode = utils.get_submission_mode(submitter_node)
+        with tracing.span("submit_jobs"):
+            if mode == constants.SUBMISSION_MODE_CONCURRENT:
+                scheduling.submit_concurrently(
+                    jobs, max_workers=utils.get_submission_workers(submitter_node)
+                )
+            else:
+                for job in jobs:
+                    job.submit_all()
 
     submitted_ids = []
+    submitted_jobs = []
     for base_job in jobs:
         for job in base_job.get_flattened_jobs():
-            submitted_ids.append(job.deadline_id)
+            if not job.is_complete:
+                submitted_ids.append(job.deadline_id)
+                submitted_jobs.append(job)
+    cost_model.record_submitted_jobs(submitted_jobs)
 
     return submitted_ids
@@ -0,0 +1,6 @@
+"""Tests and benchmarks running outside of Houdini with a fake hou and Deadline.
+
+Examples:
+    $ python -m pytest houdini_deadline_api_submission/test
+
+"""
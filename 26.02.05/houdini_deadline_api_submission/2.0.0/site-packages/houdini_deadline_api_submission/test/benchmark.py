@@ -0,0 +1,132 @@
+"""Command line, timing and results shared by the benchmarks of this package.
+
+Each benchmark only builds its scenarios and measures a single case of them.
+This module runs the cases, prints one line per result and writes all
+results to a JSON file.
+
+Examples:
+    >>> parser = create_parser(__doc__, sizes=(10, 100))
+    >>> main("example", run_example, parser)
+
+"""
+
+# Import built-in modules
+import argparse
+import json
+import timeit
+
+# Import local modules
+from houdini_deadline_api_submission import constants
+
+DEFAULT_REPEAT = 3
+
+
+def create_parser(description, sizes, repeat=True, json_required=False):
+    """Return the parser of the arguments all benchmarks share.
+
+    Args:
+        description (str): Docstring of the benchmark, its first line is used
+            as the description.
+        sizes (list of int): Default sizes of the benchmark.
+        repeat (bool, optional): If False, the benchmark doesn't have a
+            --repeat argument.
+        json_required (bool, optional): If True, the JSON file of the results
+            must be given.
+
+    Returns:
+        argparse.ArgumentParser: Parser with the --sizes, --repeat and --json
+            arguments.
+
+    """
+    parser = argparse.ArgumentParser(description=description.split("\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=sizes)
+    if repeat:
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=DEFAULT_REPEAT,
+            help="Amount of runs, the fastest one is reported.",
+        )
+    parser.add_argument(
+        "--json", required=json_required, help="Write the results to this file."
+    )
+    return parser
+
+
+def time_call(func, repeat=DEFAULT_REPEAT):
+    """Return how long the fastest of the given amount of calls took.
+
+    Args:
+        func (callable): Function to call without arguments.
+        repeat (int, optional): Amount of calls.
+
+    Returns:
+        float: Seconds of the fastest call.
+
+    """
+    return min(timeit.Timer(func).repeat(repeat=repeat, number=1))
+
+
+def run(cases, measure, line):
+    """Measure each case and print its result.
+
+    Args:
+        cases (iterable of tuple): Arguments of `measure` for each case.
+        measure (callable): Returns the result of a single case as a dict.
+        line (str or callable): Format string of the printed result, or a
+            function returning the printed line of a result.
+
+    Returns:
+        list of dict: Results of all cases.
+
+    """
+    results = []
+    for case in cases:
+        result = measure(*case)
+        results.append(result)
+        print(line(result) if callable(line) else line.format(**result))
+    return results
+
+
+def write_results(path, benchmark, results, **info):
+    """Write the results of a benchmark to a JSON file.
+
+    Args:
+        path (str): Path of the JSON file.
+        benchmark (str): Name of the benchmark.
+        results (list of dict): Results of all cases.
+        **info: Additional information about the run.
+
+    """
+    data = {
+        "benchmark": benchmark,
+        "package": constants.PACKAGE_NAME,
+        "results": results,
+    }
+    data.update(info)
+    with open(path, "w") as json_file:
+        json.dump(data, json_file, indent=4)
+
+
+def main(benchmark, run_benchmark, parser, argv=None):
+    """Run a benchmark with the arguments given on the command line.
+
+    Every argument but --json is passed on to the run function by its name.
+
+    Args:
+        benchmark (str): Name of the benchmark.
+        run_benchmark (callable): Runs the benchmark and returns its results.
+        parser (argparse.ArgumentParser): Parser as returned by
+            `create_parser`, including the arguments of the benchmark.
+        argv (list of str, optional): Command line arguments.
+
+    Returns:
+        list of dict: Results of all cases.
+
+    """
+    args = vars(parser.parse_args(argv))
+    json_path = args.pop("json")
+    results = run_benchmark(**args)
+    if json_path:
+        write_results(json_path, benchmark, results)
+    return results
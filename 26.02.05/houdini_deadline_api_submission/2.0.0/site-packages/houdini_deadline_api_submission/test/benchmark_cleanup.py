@@ -0,0 +1,146 @@
+"""Benchmark deleting the render caches of a job.
+
+Fills a temporary cache folder with the caches of the benchmarked job and of
+other jobs, spread over subfolders, then deletes the caches of the job once
+by walking the whole folder and matching file names (the way the generated
+cleanup scripts used to work) and once from a cleanup manifest. It makes
+sure both delete the same files.
+
+Examples:
+    $ python -m houdini_deadline_api_submission.test.benchmark_cleanup
+
+"""
+
+# Import built-in modules
+import os
+import shutil
+import tempfile
+import time
+
+# Import local modules
+from houdini_deadline_api_submission import cleanup
+from houdini_deadline_api_submission.test import benchmark
+
+DEFAULT_SIZES = (100, 1000, 5000)
+OTHER_JOBS = 20
+SUBFOLDERS = 10
+
+
+def create_caches(folder, frames):
+    """Write the caches of the benchmarked job and of other jobs.
+
+    Args:
+        folder (str): Cache folder.
+        frames (int): Amount of frames of each job.
+
+    Returns:
+        list of str: Paths of the caches of the benchmarked job.
+
+    """
+    files = []
+    for job_index in range(OTHER_JOBS + 1):
+        job_folder = os.path.join(folder, "shot{}".format(job_index % SUBFOLDERS))
+        if not os.path.isdir(job_folder):
+            os.makedirs(job_folder)
+        for frame in range(1, frames + 1):
+            path = os.path.join(job_folder, "job{}.{:04d}.ifd".format(job_index, frame))
+            with open(path, "w") as cache_file:
+                cache_file.write("ifd")
+            if not job_index:
+                files.append(path)
+    return files
+
+
+def delete_legacy(folder, identifier):
+    """Delete all files containing the identifier inside of a folder.
+
+    Args:
+        folder (str): Folder to walk.
+        identifier (str): Identifier of the files to delete.
+
+    Returns:
+        set of str: Paths of the deleted files.
+
+    """
+    deleted = set()
+    for root, _, files in os.walk(folder):
+        for file_name in files:
+            if file_name.endswith(".hip"):
+                continue
+            if identifier in file_name:
+                path = os.path.join(root, file_name)
+                os.remove(path)
+                deleted.add(path)
+    return deleted
+
+
+def measure(size):
+    """Delete the caches of a job with the given amount of frames both ways.
+
+    Args:
+        size (int): Amount of frames of each job.
+
+    Returns:
+        dict: Timings of both ways.
+
+    Raises:
+        AssertionError: If both ways delete different files.
+
+    """
+    folder = tempfile.mkdtemp()
+    try:
+        files = create_caches(folder, size)
+        start = time.time()
+        legacy = delete_legacy(folder, "job0.")
+        legacy_time = time.time() - start
+
+        create_caches(folder, size)
+        manifest_path = os.path.join(folder, "job0__cleanup.json")
+        cleanup.write_manifest(manifest_path, files)
+        start = time.time()
+        cleanup.run_cleanup(manifest_path)
+        manifest_time = time.time() - start
+        manifest = set(path for path in files if not os.path.exists(path))
+    finally:
+        shutil.rmtree(folder)
+
+    assert legacy == manifest, "Deleted files differ for {}".format(size)
+    return {
+        "frames": size,
+        "files": size * (OTHER_JOBS + 1),
+        "manifest": manifest_time,
+        "legacy": legacy_time,
+    }
+
+
+def run(sizes=DEFAULT_SIZES):
+    """Run the benchmark for each of the given amount of frames.
+
+    Args:
+        sizes (list of int, optional): Amount of frames of each job.
+
+    Returns:
+        list of dict: Timings per amount of frames.
+
+    """
+    return benchmark.run(
+        [(size,) for size in sizes],
+        measure,
+        "{frames:>6} frames  {files:>7} files  manifest: {manifest:8.4f}s  "
+        "legacy: {legacy:8.4f}s",
+    )
+
+
+def main(argv=None):
+    """Run the benchmark from the command line.
+
+    Args:
+        argv (list of str, optional): Command line arguments.
+
+    """
+    parser = benchmark.create_parser(__doc__, DEFAULT_SIZES, repeat=False)
+    benchmark.main("cleanup", run, parser, argv)
+
+
+if __name__ == "__main__":
+    main()
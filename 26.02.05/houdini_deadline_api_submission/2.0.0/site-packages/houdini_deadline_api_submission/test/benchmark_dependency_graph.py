@@ -0,0 +1,236 @@
+"""Benchmark the collapse of synthetic ROP graphs in `utils.reduce_to_parents`.
+
+Compares the previous list based implementation with the indexed
+`DependencyGraph` on synthetic 1k, 5k and 20k ROP networks and makes sure
+both return the same tree.
+
+The legacy implementation takes a while on 20k ROPs, use
+`--skip-legacy-above 5000` to only time the indexed graph on those.
+
+Examples:
+    $ python -m houdini_deadline_api_submission.test.benchmark_dependency_graph
+
+"""
+
+# Import built-in modules
+import random
+
+# Import local modules
+from houdini_deadline_api_submission.test import fake_hou
+
+fake_hou.install()
+
+from houdini_deadline_api_submission import utils  # noqa: E402
+from houdini_deadline_api_submission.test import benchmark  # noqa: E402
+
+DEFAULT_SIZES = (1000, 5000, 20000)
+
+
+def build_network(
+    size, seed=0, subnet_ratio=0.1, subnet_size=5, stack_size=25, max_inputs=3
+):
+    """Return a synthetic `get_dependencies` result with the given ROP count.
+
+    The ROPs are split into stacks, where each ROP depends on random ROPs
+    created before it in the same stack.
+
+    Args:
+        size (int): Amount of ROPs in the network.
+        seed (int, optional): Seed of the random generator.
+        subnet_ratio (float, optional): Ratio of ROPs that start a collapsing
+            subnetwork ROP.
+        subnet_size (int, optional): Amount of children per subnetwork.
+        stack_size (int, optional): Amount of ROPs per stack.
+        max_inputs (int, optional): Maximum amount of dependencies per ROP.
+
+    Returns:
+        list of dict: Tasks in the format returned by `get_dependencies`.
+
+    """
+    fake_hou.clear()
+    rand = random.Random(seed)
+    nodes = []
+    stack = []
+    subnet_path = None
+    subnet_children = 0
+    for index in range(size):
+        if index % stack_size == 0:
+            stack = []
+        if subnet_path is None and rand.random() < subnet_ratio:
+            subnet_path = "/out/subnet{}".format(index)
+            subnet_children = 0
+        node = fake_hou.create_node(
+            "{}/rop{}".format(subnet_path or "/out", index), "geometry"
+        )
+        if subnet_path is not None:
+            subnet_children += 1
+            if subnet_children >= subnet_size:
+                subnet_path = None
+        amount = min(len(stack), rand.randint(0, max_inputs))
+        for input_index, input_node in enumerate(rand.sample(stack, amount)):
+            node.setInput(input_index, input_node)
+        stack.append(node)
+        nodes.append(node)
+
+    return [{"node": node, "dependencies": list(node.inputs())} for node in nodes]
+
+
+def legacy_reduce_to_parents(dependencies):
+    """Previous list based implementation of `utils.reduce_to_parents`.
+
+    Args:
+        dependencies (list of dict): Information gathered by
+            `get_dependencies`.
+
+    Returns:
+        list of dict: Dependency entries reduced to their parents.
+
+    """
+    for task_info in dependencies:
+        task_info["orig_node"] = task_info["node"]
+
+    fetches = utils.get_fetches(dependencies)
+    dependencies = utils.correct_fetches(dependencies, fetches)
+
+    for task_info in dependencies:
+        node = task_info["node"]
+        parent = utils.find_parent(node)
+        if parent:
+            task_info["node"] = parent
+
+        this_dependencies = task_info["dependencies"]
+        this_dependencies = [
+            utils.find_parent(node) or node for node in this_dependencies
+        ]
+        this_dependencies = list(set(this_dependencies))
+        task_info["dependencies"] = this_dependencies
+
+    all_nodes = [task_info["node"] for task_info in dependencies]
+    for task_info in dependencies:
+        node = task_info["node"]
+        if all_nodes.count(node) > 1:
+            last_index = utils.get_last_index(all_nodes, node)
+            dependencies[last_index]["dependencies"] += task_info["dependencies"]
+            dependencies[last_index]["dependencies"] = list(
+                set(dependencies[last_index]["dependencies"])
+            )
+
+    indices_to_use = [
+        i
+        for i, node in enumerate(all_nodes)
+        if all_nodes.count(node) == 1 or i == utils.get_last_index(all_nodes, node)
+    ]
+    dependencies = [dependencies[i] for i in indices_to_use]
+
+    all_nodes = [task_info["node"] for task_info in dependencies]
+    for task_info in dependencies:
+        task_info["dependencies"] = [
+            n
+            for n in task_info["dependencies"]
+            if n != task_info["node"] and n in all_nodes
+        ]
+
+    for task_info in dependencies:
+        task_info["dependency_ids"] = [
+            all_nodes.index(node) for node in task_info["dependencies"]
+        ]
+
+    return dependencies
+
+
+def _copy_tasks(tasks):
+    return [dict(task, dependencies=list(task["dependencies"])) for task in tasks]
+
+
+def _normalize(tree):
+    return [(leaf["node"].path(), sorted(leaf["dependency_ids"])) for leaf in tree]
+
+
+def measure(size, repeat, skip_legacy_above):
+    """Reduce a network of the given size with both implementations.
+
+    Args:
+        size (int): ROP count of the synthetic network.
+        repeat (int): Amount of runs, the fastest one is reported.
+        skip_legacy_above (int): Don't time the legacy implementation for
+            networks bigger than this.
+
+    Returns:
+        dict: Timings in seconds of both implementations.
+
+    Raises:
+        AssertionError: If both implementations return different trees.
+
+    """
+    tasks = build_network(size)
+    result = {
+        "rops": size,
+        "edges": sum(len(task["dependencies"]) for task in tasks),
+        "indexed": benchmark.time_call(
+            lambda: utils.reduce_to_parents(_copy_tasks(tasks)), repeat
+        ),
+        "legacy": None,
+    }
+    if skip_legacy_above is None or size <= skip_legacy_above:
+        new_tree = _normalize(utils.reduce_to_parents(_copy_tasks(tasks)))
+        old_tree = _normalize(legacy_reduce_to_parents(_copy_tasks(tasks)))
+        assert new_tree == old_tree, "Reduced trees differ for {} ROPs".format(size)
+        result["legacy"] = benchmark.time_call(
+            lambda: legacy_reduce_to_parents(_copy_tasks(tasks)), repeat
+        )
+    return result
+
+
+def format_result(result):
+    """Return the printed line of a result, which may skip the legacy timing.
+
+    Args:
+        result (dict): Result as returned by `measure`.
+
+    Returns:
+        str: The line of the result.
+
+    """
+    return (
+        "{rops:>7} ROPs {edges:>7} edges  indexed: {indexed:8.4f}s  "
+        "legacy: {legacy}".format(
+            legacy="skipped"
+            if result["legacy"] is None
+            else "{:8.4f}s".format(result["legacy"]),
+            **{key: result[key] for key in ("rops", "edges", "indexed")}
+        )
+    )
+
+
+def run(sizes=DEFAULT_SIZES, repeat=benchmark.DEFAULT_REPEAT, skip_legacy_above=None):
+    """Run the benchmark for each of the given network sizes.
+
+    Args:
+        sizes (list of int, optional): ROP counts of the synthetic networks.
+        repeat (int, optional): Amount of runs, the fastest one is reported.
+        skip_legacy_above (int, optional): Don't time the legacy
+            implementation for networks bigger than this.
+
+    Returns:
+        list of dict: Timings in seconds per network size.
+
+    """
+    return benchmark.run(
+        [(size, repeat, skip_legacy_above) for size in sizes], measure, format_result
+    )
+
+
+def main(argv=None):
+    """Run the benchmark from the command line.
+
+    Args:
+        argv (list of str, optional): Command line arguments.
+
+    """
+    parser = benchmark.create_parser(__doc__, DEFAULT_SIZES)
+    parser.add_argument("--skip-legacy-above", type=int, default=None)
+    benchmark.main("reduce_to_parents", run, parser, argv)
+
+
+if __name__ == "__main__":
+    main()
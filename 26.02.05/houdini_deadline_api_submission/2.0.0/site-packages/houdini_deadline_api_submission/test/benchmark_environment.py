@@ -0,0 +1,181 @@
+"""Benchmark adding environment variables to the job info of wedge jobs.
+
+Builds the job info of a wedge job with the given amount of farm environment
+variables and job info entries, then adds the WEDGE, WEDGENUM and scene
+override variables, once by scanning the job info for every variable (the
+way `append_to_deadline_env` used to work) and once with an
+`EnvironmentBlock`. It makes sure both create the same job info.
+
+Examples:
+    $ python -m houdini_deadline_api_submission.test.benchmark_environment
+
+"""
+
+# Import local modules
+from houdini_deadline_api_submission import constants
+from houdini_deadline_api_submission import deadline_utils
+from houdini_deadline_api_submission.test import benchmark
+
+DEFAULT_SIZES = (10, 100, 1000)
+JOB_INFO_ENTRIES = 40
+
+
+def build_job_info(size):
+    """Create the job info of a job with the given amount of variables.
+
+    Args:
+        size (int): Amount of farm environment variables.
+
+    Returns:
+        dict: Job info with its environment and other entries.
+
+    """
+    job_info = deadline_utils.convert_to_deadline_env(
+        dict(("HAL_VARIABLE_{}".format(index), index) for index in range(size))
+    )
+    for index in range(JOB_INFO_ENTRIES):
+        job_info["Entry{}".format(index)] = index
+    return job_info
+
+
+def get_job_variables(wedge_index):
+    """Return the variables added to the job of a wedge.
+
+    Args:
+        wedge_index (int): Index of the wedge.
+
+    Returns:
+        list of tuple: Names and values of the variables.
+
+    """
+    return [
+        ("WEDGE", "_seed_{}".format(wedge_index)),
+        ("WEDGENUM", wedge_index),
+        (constants.SCENE_OVERRIDES_ENV, '{"/obj/geo1/seed": %d}' % wedge_index),
+    ]
+
+
+def legacy_append(deadline_dict, key, value):
+    """Append a variable after counting all environment entries.
+
+    Args:
+        deadline_dict (dict): Deadline compatible dictionary.
+        key (str): Name of the variable.
+        value (object): Value of the variable.
+
+    """
+    index = 0
+    for dl_key in deadline_dict.keys():
+        if dl_key.startswith("EnvironmentKeyValue"):
+            index += 1
+    deadline_dict["EnvironmentKeyValue{}".format(index)] = "{}={}".format(key, value)
+
+
+def add_legacy(base_job_info, wedges):
+    """Add the variables of each wedge by scanning the job info.
+
+    Args:
+        base_job_info (dict): Job info shared by all wedges.
+        wedges (int): Amount of wedge jobs.
+
+    Returns:
+        list of dict: Job info of each wedge.
+
+    """
+    job_infos = []
+    for wedge_index in range(wedges):
+        job_info = dict(base_job_info)
+        for key, value in get_job_variables(wedge_index):
+            legacy_append(job_info, key, value)
+        job_infos.append(job_info)
+    return job_infos
+
+
+def add_block(base_job_info, wedges):
+    """Add the variables of each wedge to a copy of a shared block.
+
+    Args:
+        base_job_info (dict): Job info shared by all wedges.
+        wedges (int): Amount of wedge jobs.
+
+    Returns:
+        list of dict: Job info of each wedge.
+
+    """
+    block = deadline_utils.EnvironmentBlock.from_deadline_dict(base_job_info)
+    job_infos = []
+    for wedge_index in range(wedges):
+        job_info = dict(base_job_info)
+        environment = block.copy()
+        for key, value in get_job_variables(wedge_index):
+            index = environment.set(key, value)
+            job_info[deadline_utils.get_environment_key(index)] = "{}={}".format(
+                key, value
+            )
+        job_infos.append(job_info)
+    return job_infos
+
+
+def measure(size, wedges, repeat):
+    """Add the wedge environments to a job info with the given variables.
+
+    Args:
+        size (int): Amount of farm environment variables.
+        wedges (int): Amount of wedge jobs.
+        repeat (int): Amount of runs, the fastest one is reported.
+
+    Returns:
+        dict: Timings of both ways.
+
+    Raises:
+        AssertionError: If both ways create different job infos.
+
+    """
+    base_job_info = build_job_info(size)
+    legacy = add_legacy(base_job_info, wedges)
+    block = add_block(base_job_info, wedges)
+    assert legacy == block, "Job infos differ for {} variables".format(size)
+    return {
+        "variables": size,
+        "wedges": wedges,
+        "block": benchmark.time_call(lambda: add_block(base_job_info, wedges), repeat),
+        "legacy": benchmark.time_call(
+            lambda: add_legacy(base_job_info, wedges), repeat
+        ),
+    }
+
+
+def run(sizes=DEFAULT_SIZES, wedges=100, repeat=benchmark.DEFAULT_REPEAT):
+    """Run the benchmark for each of the given amount of variables.
+
+    Args:
+        sizes (list of int, optional): Amount of farm environment variables.
+        wedges (int, optional): Amount of wedge jobs.
+        repeat (int, optional): Amount of runs, the fastest one is reported.
+
+    Returns:
+        list of dict: Timings per amount of variables.
+
+    """
+    return benchmark.run(
+        [(size, wedges, repeat) for size in sizes],
+        measure,
+        "{variables:>6} variables  {wedges:>5} wedges  block: {block:8.4f}s  "
+        "legacy: {legacy:8.4f}s",
+    )
+
+
+def main(argv=None):
+    """Run the benchmark from the command line.
+
+    Args:
+        argv (list of str, optional): Command line arguments.
+
+    """
+    parser = benchmark.create_parser(__doc__, DEFAULT_SIZES)
+    parser.add_argument("--wedges", type=int, default=100)
+    benchmark.main("environment", run, parser, argv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Benchmark the lookup of fetched ROPs in `utils.get_fetches`.
+
+Compares the previous implementation, which queries the input ancestors for
+every dependency, with the one-pass `FetchIndex` on synthetic networks of
+varying size and input depth, and makes sure both find the same fetches.
+
+Examples:
+    $ python -m houdini_deadline_api_submission.test.benchmark_fetch_index
+
+"""
+
+# Import built-in modules
+import random
+
+# Import local modules
+from houdini_deadline_api_submission.test import fake_hou
+
+fake_hou.install()
+
+from houdini_deadline_api_submission import utils  # noqa: E402
+from houdini_deadline_api_submission.test import benchmark  # noqa: E402
+
+DEFAULT_SIZES = (1000, 5000, 20000)
+DEFAULT_DEPTHS = (10, 50)
+
+
+def build_network(size, depth, seed=0, fetch_ratio=0.3, max_inputs=3):
+    """Return a synthetic dependency tree with Fetch ROPs.
+
+    The ROPs are split into chains of the given depth, each inside of its own
+    subnetwork. Every ROP depends on the previous ROP of its chain and on
+    random earlier ones, while the chain starts with a Fetch ROP. With the
+    given ratio the fetch points to a ROP of an earlier chain, otherwise it
+    points to a cache ROP that isn't connected to anything.
+
+    Args:
+        size (int): Amount of ROPs in the network, not counting Fetch ROPs.
+        depth (int): Amount of ROPs per chain.
+        seed (int, optional): Seed of the random generator.
+        fetch_ratio (float, optional): Ratio of fetches pointing to another
+            chain.
+        max_inputs (int, optional): Maximum amount of inputs per ROP.
+
+    Returns:
+        list of dict: Tasks in the format used by `utils.get_fetches`.
+
+    """
+    fake_hou.clear()
+    rand = random.Random(seed)
+    tasks = []
+    chains = []
+    for chain_index in range(max(1, size // depth)):
+        chain = []
+        if chains and rand.random() < fetch_ratio:
+            source = rand.choice(rand.choice(chains))
+        else:
+            source = fake_hou.create_node("/out/sources/cache{}".format(chain_index))
+            tasks.append({"node": source, "dependencies": []})
+        fetch = fake_hou.create_node("/out/chain{}/fetch".format(chain_index), "fetch")
+        fetch.setParms({"source": source.path()})
+
+        upstream = [fetch]
+        for index in range(depth):
+            node = fake_hou.create_node("/out/chain{}/rop{}".format(chain_index, index))
+            amount = min(len(upstream) - 1, rand.randint(0, max_inputs - 1))
+            inputs = [upstream[-1]] + rand.sample(upstream[:-1], amount)
+            for input_index, input_node in enumerate(inputs):
+                node.setInput(input_index, input_node)
+            # hscript reports the source of a fetch as the dependency.
+            dependencies = [source if dep is fetch else dep for dep in inputs]
+            tasks.append({"node": node, "dependencies": dependencies})
+            chain.append(node)
+            upstream.append(node)
+        chains.append(chain)
+
+    for task in tasks:
+        task["orig_node"] = task["node"]
+    return tasks
+
+
+def legacy_get_fetches(dependency_tree):
+    """Previous implementation of `utils.get_fetches`.
+
+    Args:
+        dependency_tree (list of dict):
+
+    Returns:
+        dict: All fetched nodes and their respective Fetch ROP.
+
+    """
+    dept_dict = {leaf["orig_node"]: leaf["dependencies"] for leaf in dependency_tree}
+
+    fetched_nodes_dict = {}
+    for node, dependencies in dept_dict.items():
+        for dep in dependencies:
+            inputs = node.inputAncestors(follow_subnets=True)
+            if dep not in inputs:
+                orig_dep = dep
+                while dep.parent():
+                    dep = dep.parent()
+                    if dep in inputs:
+                        break
+                else:
+                    fetched_nodes_dict[orig_dep] = inputs
+
+    fetched_dict = {}
+    for fetched_node, node_inputs in fetched_nodes_dict.items():
+        fetches = [
+            parm.node()
+            for parm in fetched_node.parmsReferencingThis()
+            if parm.node().type().name() == "fetch" and parm.name() == "source"
+        ]
+        for fetch in fetches:
+            if fetch in node_inputs:
+                fetched_dict[fetched_node.path()] = fetch
+
+    return fetched_dict
+
+
+def _normalize(fetches):
+    return sorted((path, fetch.path()) for path, fetch in fetches.items())
+
+
+def measure(size, depth, repeat):
+    """Find the fetches of a network with both implementations.
+
+    Args:
+        size (int): ROP count of the synthetic network.
+        depth (int): Length of the ROP chains.
+        repeat (int): Amount of runs, the fastest one is reported.
+
+    Returns:
+        dict: Timings in seconds of both implementations.
+
+    Raises:
+        AssertionError: If both implementations find different fetches.
+
+    """
+    tasks = build_network(size, depth)
+    new_fetches = _normalize(utils.get_fetches(tasks))
+    old_fetches = _normalize(legacy_get_fetches(tasks))
+    assert new_fetches == old_fetches, (
+        "Fetches differ for {} ROPs with a depth of {}".format(size, depth)
+    )
+    return {
+        "rops": size,
+        "depth": depth,
+        "fetches": len(new_fetches),
+        "indexed": benchmark.time_call(lambda: utils.get_fetches(tasks), repeat),
+        "legacy": benchmark.time_call(lambda: legacy_get_fetches(tasks), repeat),
+    }
+
+
+def run(sizes=DEFAULT_SIZES, depths=DEFAULT_DEPTHS, repeat=benchmark.DEFAULT_REPEAT):
+    """Run the benchmark for each combination of network size and depth.
+
+    Args:
+        sizes (list of int, optional): ROP counts of the synthetic networks.
+        depths (list of int, optional): Lengths of the ROP chains.
+        repeat (int, optional): Amount of runs, the fastest one is reported.
+
+    Returns:
+        list of dict: Timings in seconds per network.
+
+    """
+    return benchmark.run(
+        [(size, depth, repeat) for size in sizes for depth in depths],
+        measure,
+        "{rops:>7} ROPs depth {depth:>4} {fetches:>6} fetches  "
+        "indexed: {indexed:8.4f}s  legacy: {legacy:8.4f}s",
+    )
+
+
+def main(argv=None):
+    """Run the benchmark from the command line.
+
+    Args:
+        argv (list of str, optional): Command line arguments.
+
+    """
+    parser = benchmark.create_parser(__doc__, DEFAULT_SIZES)
+    parser.add_argument("--depths", type=int, nargs="+", default=DEFAULT_DEPTHS)
+    benchmark.main("get_fetches", run, parser, argv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Benchmark finding the missing frames of a partially rendered job.
+
+Writes the output files of a frame range into a temporary folder, leaving out
+every n-th frame, then finds the missing frames once by checking one file
+after another and once through a pool of threads. It makes sure both find the
+same frames. The gain of the threads depends on the latency of the storage,
+so point --folder to the network storage of the farm for meaningful numbers.
+
+Examples:
+    $ python -m houdini_deadline_api_submission.test.benchmark_incremental
+
+"""
+
+# Import built-in modules
+import os
+import shutil
+import tempfile
+
+# Import local modules
+from houdini_deadline_api_submission.test import fake_hou
+
+fake_hou.install()
+
+# Import local modules
+from houdini_deadline_api_submission import constants  # noqa: E402
+from houdini_deadline_api_submission import incremental  # noqa: E402
+from houdini_deadline_api_submission.test import benchmark  # noqa: E402
+
+DEFAULT_SIZES = (100, 1000, 10000)
+MISSING_EVERY = 7
+
+
+def write_outputs(folder, frames):
+    """Write the output files of the given frames, leaving some out.
+
+    Args:
+        folder (str): Folder to write the files into.
+        frames (int): Amount of frames of the range.
+
+    Returns:
+        dict: Output path of each frame.
+
+    """
+    paths = {}
+    for frame in range(1, frames + 1):
+        path = os.path.join(folder, "geo.{:04d}.bgeo.sc".format(frame))
+        paths[frame] = path
+        if frame % MISSING_EVERY:
+            with open(path, "w") as output_file:
+                output_file.write("frame {}".format(frame))
+    return paths
+
+
+def _time(paths, max_workers, repeat):
+    return benchmark.time_call(
+        lambda: incremental.get_missing_frames(paths, max_workers=max_workers), repeat
+    )
+
+
+def measure(size, folder, repeat):
+    """Find the missing frames of the given amount of frames both ways.
+
+    Args:
+        size (int): Amount of frames.
+        folder (str): Folder to write the outputs into, a temporary folder is
+            used if not given.
+        repeat (int): Amount of runs, the fastest one is reported.
+
+    Returns:
+        dict: Timings of the serial and threaded ways.
+
+    Raises:
+        AssertionError: If both ways find different frames.
+
+    """
+    size_folder = tempfile.mkdtemp(dir=folder)
+    try:
+        paths = write_outputs(size_folder, size)
+        serial = incremental.get_missing_frames(paths, max_workers=1)
+        threaded = incremental.get_missing_frames(
+            paths, max_workers=constants.DEFAULT_STAT_WORKERS
+        )
+        assert serial == threaded, "Missing frames differ for {}".format(size)
+        return {
+            "frames": size,
+            "missing": len(serial),
+            "network": incremental.is_network_path(size_folder),
+            "threaded": _time(paths, constants.DEFAULT_STAT_WORKERS, repeat),
+            "serial": _time(paths, 1, repeat),
+            "default": _time(paths, None, repeat),
+        }
+    finally:
+        shutil.rmtree(size_folder)
+
+
+def run(sizes=DEFAULT_SIZES, folder=None, repeat=benchmark.DEFAULT_REPEAT):
+    """Run the benchmark for each of the given amount of frames.
+
+    Args:
+        sizes (list of int, optional): Amount of frames.
+        folder (str, optional): Folder to write the outputs into, a temporary
+            folder is used if not given.
+        repeat (int, optional): Amount of runs, the fastest one is reported.
+
+    Returns:
+        list of dict: Timings per amount of frames.
+
+    """
+    return benchmark.run(
+        [(size, folder, repeat) for size in sizes],
+        measure,
+        "{frames:>6} frames  {missing:>5} missing  network: {network!s:5}  "
+        "threaded: {threaded:8.4f}s  serial: {serial:8.4f}s  "
+        "default: {default:8.4f}s",
+    )
+
+
+def main(argv=None):
+    """Run the benchmark from the command line.
+
+    Args:
+        argv (list of str, optional): Command line arguments.
+
+    """
+    parser = benchmark.create_parser(__doc__, DEFAULT_SIZES)
+    parser.add_argument("--folder", help="Write the outputs into this folder.")
+    benchmark.main("incremental", run, parser, argv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Benchmark logging a submission onto the submitted nodes.
+
+Logs the messages of a submission (start, one entry per job, finish) onto a
+few nodes, once straight into the logging parameters with
+`utils.log_message` and once inside of `log_sink.buffered_log`. It counts
+the changes of the logging parameters and makes sure both logs are the same.
+
+Examples:
+    $ python -m houdini_deadline_api_submission.test.benchmark_log_sink
+
+"""
+
+# Import local modules
+from houdini_deadline_api_submission.test import fake_hou
+
+fake_hou.install()
+
+from houdini_deadline_api_submission import constants  # noqa: E402
+from houdini_deadline_api_submission import log_sink  # noqa: E402
+from houdini_deadline_api_submission import utils  # noqa: E402
+from houdini_deadline_api_submission.test import benchmark  # noqa: E402
+
+DEFAULT_SIZES = (100, 1000, 5000)
+
+
+def build_network(node_amount=5):
+    """Create the nodes to log on, each with an empty logging parameter.
+
+    Args:
+        node_amount (int, optional): Amount of nodes.
+
+    Returns:
+        list of hou.Node: Created nodes.
+
+    """
+    fake_hou.clear()
+    nodes = []
+    for index in range(node_amount):
+        node = fake_hou.create_node("/out/rop{}".format(index))
+        node.setParms({constants.LOG_PARM: ""})
+        nodes.append(node)
+    return nodes
+
+
+def log_submission(nodes, size, log_func):
+    """Log the messages of a submission with the given amount of jobs.
+
+    Args:
+        nodes (list of hou.Node): Nodes to log on.
+        size (int): Amount of submitted jobs.
+        log_func (callable): Function logging a single message.
+
+    Returns:
+        list of str: Logs of the nodes.
+
+    """
+    for node in nodes:
+        log_func(node, "Started submission: 2024 01 01 12 00")
+    for index in range(size):
+        node = nodes[index % len(nodes)]
+        log_func(node, "Submitted job {}\nDeadline ID: {:024x}".format(index, index), 1)
+    for node in nodes:
+        log_func(node, "Submission successfully finished: 2024 01 01 12 01")
+    return [node.parm(constants.LOG_PARM).eval() for node in nodes]
+
+
+def log_legacy(nodes, size):
+    """Log every message straight into the logging parameters.
+
+    Args:
+        nodes (list of hou.Node): Nodes to log on.
+        size (int): Amount of submitted jobs.
+
+    Returns:
+        list of str: Logs of the nodes.
+
+    """
+    return log_submission(nodes, size, utils.log_message)
+
+
+def log_buffered(nodes, size):
+    """Log all messages inside of a buffered log.
+
+    Args:
+        nodes (list of hou.Node): Nodes to log on.
+        size (int): Amount of submitted jobs.
+
+    Returns:
+        list of str: Logs of the nodes.
+
+    """
+    # The limit is raised, so both logs hold the same lines.
+    with log_sink.buffered_log(max_lines=size * 3):
+        log_submission(nodes, size, log_sink.log_message)
+    return [node.parm(constants.LOG_PARM).eval() for node in nodes]
+
+
+def _run(func, size):
+    nodes = build_network()
+    start = fake_hou.get_change_count()
+    result = func(nodes, size)
+    return result, fake_hou.get_change_count() - start
+
+
+def measure(size, repeat):
+    """Log a submission with the given amount of jobs both ways.
+
+    Args:
+        size (int): Amount of submitted jobs.
+        repeat (int): Amount of runs, the fastest one is reported.
+
+    Returns:
+        dict: Parameter changes and timings of both ways.
+
+    Raises:
+        AssertionError: If both ways create different logs.
+
+    """
+    legacy, legacy_changes = _run(log_legacy, size)
+    buffered, buffered_changes = _run(log_buffered, size)
+    assert legacy == buffered, "Logs differ for {} jobs".format(size)
+    return {
+        "jobs": size,
+        "changes_buffered": buffered_changes,
+        "changes_legacy": legacy_changes,
+        "buffered": benchmark.time_call(
+            lambda: log_buffered(build_network(), size), repeat
+        ),
+        "legacy": benchmark.time_call(
+            lambda: log_legacy(build_network(), size), repeat
+        ),
+    }
+
+
+def run(sizes=DEFAULT_SIZES, repeat=benchmark.DEFAULT_REPEAT):
+    """Run the benchmark for each of the given amount of jobs.
+
+    Args:
+        sizes (list of int, optional): Amount of submitted jobs.
+        repeat (int, optional): Amount of runs, the fastest one is reported.
+
+    Returns:
+        list of dict: Parameter changes and timings per amount of jobs.
+
+    """
+    return benchmark.run(
+        [(size, repeat) for size in sizes],
+        measure,
+        "{jobs:>7} jobs  parm changes: {changes_buffered:>6} vs "
+        "{changes_legacy:>6}  buffered: {buffered:8.4f}s  "
+        "legacy: {legacy:8.4f}s",
+    )
+
+
+def main(argv=None):
+    """Run the benchmark from the command line.
+
+    Args:
+        argv (list of str, optional): Command line arguments.
+
+    """
+    parser = benchmark.create_parser(__doc__, DEFAULT_SIZES)
+    benchmark.main("log_sink", run, parser, argv)
+
+
+if __name__ == "__main__":
+    main()
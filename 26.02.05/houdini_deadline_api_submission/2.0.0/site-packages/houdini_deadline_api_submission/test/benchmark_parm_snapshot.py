@@ -0,0 +1,179 @@
+"""Benchmark the parameter evaluations of the submitter overrides.
+
+Simulates the override queries each job does on the submitter node (job info
+and plugin info while creating the job, job info again while applying its
+wedge) with and without `parm_utils.snapshot_parms`. It counts the evaluated
+parameter values and makes sure both return the same overrides.
+
+Examples:
+    $ python -m houdini_deadline_api_submission.test.benchmark_parm_snapshot
+
+"""
+
+# Import local modules
+from houdini_deadline_api_submission.test import fake_hou
+
+fake_hou.install()
+
+from houdini_deadline_api_submission import constants  # noqa: E402
+from houdini_deadline_api_submission import parm_utils  # noqa: E402
+from houdini_deadline_api_submission.test import benchmark  # noqa: E402
+
+DEFAULT_SIZES = (100, 1000, 5000)
+
+
+def build_network(size, override_amount=20):
+    """Create a submitter node with overrides and the given amount of ROPs.
+
+    Args:
+        size (int): Amount of submitted ROPs.
+        override_amount (int, optional): Amount of job and plugin info
+            overrides on the submitter node.
+
+    Returns:
+        tuple: Submitter node and the submitted ROPs.
+
+    """
+    fake_hou.clear()
+    submitter = fake_hou.create_node("/out/hal_deadline_submit1", "deadline_submit")
+    values = {
+        "{}Name".format(constants.JOB_OVERRIDE_PARM_PREFIX): "$OS",
+        "{}Comment".format(constants.JOB_OVERRIDE_PARM_PREFIX): "Wedge $WEDGE",
+    }
+    for prefix in (
+        constants.JOB_OVERRIDE_PARM_PREFIX,
+        constants.PLUGIN_OVERRIDE_PARM_PREFIX,
+    ):
+        for index in range(override_amount):
+            values["{}Value{}".format(prefix, index)] = index
+    # Turn off every third override.
+    for position, name in enumerate(list(values)):
+        check_name = "{}{}".format(constants.OVERRIDE_CHECK_PREFIX, name)
+        values[check_name] = position % 3 != 0
+    submitter.setParms(values)
+
+    nodes = [fake_hou.create_node("/out/rop{}".format(index)) for index in range(size)]
+    return submitter, nodes
+
+
+def query_overrides(submitter, nodes):
+    """Query the overrides of the submitter node like the jobs would.
+
+    Args:
+        submitter (hou.Node): Submitter node.
+        nodes (list of hou.Node): Submitted ROPs.
+
+    Returns:
+        list of tuple: Job info and plugin info overrides per ROP.
+
+    """
+    overrides = []
+    for node in nodes:
+        job_info = parm_utils.get_parm_values(
+            submitter,
+            prefix=constants.JOB_OVERRIDE_PARM_PREFIX,
+            remove_prefix=True,
+            goal_node=node,
+        )
+        plugin_info = parm_utils.get_parm_values(
+            submitter,
+            prefix=constants.PLUGIN_OVERRIDE_PARM_PREFIX,
+            remove_prefix=True,
+            goal_node=node,
+        )
+        # The job info gets queried again when applying the wedge.
+        parm_utils.get_parm_values(
+            submitter,
+            prefix=constants.JOB_OVERRIDE_PARM_PREFIX,
+            remove_prefix=True,
+            goal_node=node,
+        )
+        overrides.append((job_info, plugin_info))
+    return overrides
+
+
+def query_overrides_with_snapshot(submitter, nodes):
+    """Query the overrides inside of a snapshot context.
+
+    Args:
+        submitter (hou.Node): Submitter node.
+        nodes (list of hou.Node): Submitted ROPs.
+
+    Returns:
+        list of tuple: Job info and plugin info overrides per ROP.
+
+    """
+    with parm_utils.snapshot_parms(submitter):
+        return query_overrides(submitter, nodes)
+
+
+def _count(func, submitter, nodes):
+    start = fake_hou.get_evaluation_count()
+    result = func(submitter, nodes)
+    return result, fake_hou.get_evaluation_count() - start
+
+
+def measure(size, repeat):
+    """Query the overrides of the given amount of ROPs both ways.
+
+    Args:
+        size (int): Amount of submitted ROPs.
+        repeat (int): Amount of runs, the fastest one is reported.
+
+    Returns:
+        dict: Parameter evaluations and timings of both ways.
+
+    Raises:
+        AssertionError: If both ways return different overrides.
+
+    """
+    submitter, nodes = build_network(size)
+    legacy, legacy_count = _count(query_overrides, submitter, nodes)
+    snapshot, snapshot_count = _count(query_overrides_with_snapshot, submitter, nodes)
+    assert legacy == snapshot, "Overrides differ for {} ROPs".format(size)
+    return {
+        "rops": size,
+        "evaluations_snapshot": snapshot_count,
+        "evaluations_legacy": legacy_count,
+        "snapshot": benchmark.time_call(
+            lambda: query_overrides_with_snapshot(submitter, nodes), repeat
+        ),
+        "legacy": benchmark.time_call(
+            lambda: query_overrides(submitter, nodes), repeat
+        ),
+    }
+
+
+def run(sizes=DEFAULT_SIZES, repeat=benchmark.DEFAULT_REPEAT):
+    """Run the benchmark for each of the given amount of ROPs.
+
+    Args:
+        sizes (list of int, optional): Amount of submitted ROPs.
+        repeat (int, optional): Amount of runs, the fastest one is reported.
+
+    Returns:
+        list of dict: Parameter evaluations and timings per amount of ROPs.
+
+    """
+    return benchmark.run(
+        [(size, repeat) for size in sizes],
+        measure,
+        "{rops:>7} ROPs  evaluations: {evaluations_snapshot:>8} vs "
+        "{evaluations_legacy:>8}  snapshot: {snapshot:8.4f}s  "
+        "legacy: {legacy:8.4f}s",
+    )
+
+
+def main(argv=None):
+    """Run the benchmark from the command line.
+
+    Args:
+        argv (list of str, optional): Command line arguments.
+
+    """
+    parser = benchmark.create_parser(__doc__, DEFAULT_SIZES)
+    benchmark.main("parm_snapshot", run, parser, argv)
+
+
+if __name__ == "__main__":
+    main()
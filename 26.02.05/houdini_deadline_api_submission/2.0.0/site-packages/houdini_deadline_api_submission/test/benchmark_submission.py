@@ -0,0 +1,494 @@
+"""Benchmark creating and submitting the jobs of synthetic ROP networks.
+
+Builds networks in the fake `hou` module and times `submit.get_jobs` and a
+full `submit.submit` with a fake Deadline connection recording the jobs:
+
+- stacks: ROPs depending on random ROPs of their stack, merged at the end.
+- subnets: ROPs inside of nested subnetworks, each collapsed into one job.
+- fetch_chains: chains of ROPs depending on each other through Fetch ROPs.
+- wedges: a single ROP with a product of wedge parameters.
+- wedge_chains: a chain of ROPs with the same wedges, each wedge depending
+  on the same wedge of the ROP before it.
+
+The results are written to the JSON file given with `--json`, along with
+the version of this package, so runs of different versions (1.0.0, 2.0.0,
+...) can be compared with `--compare`.
+
+Examples:
+    $ python -m houdini_deadline_api_submission.test.benchmark_submission \
+        --json /tmp/submission_2.0.0.json
+    $ python -m houdini_deadline_api_submission.test.benchmark_submission \
+        --scenarios stacks --sizes 10 100 1000 10000 --json results.json \
+        --compare /tmp/submission_1.0.0.json
+
+"""
+
+# Import built-in modules
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+# Import local modules
+from houdini_deadline_api_submission.test import fake_hou
+
+fake_hou.install()
+
+from houdini_deadline_api_submission import constants  # noqa: E402
+from houdini_deadline_api_submission import submit  # noqa: E402
+from houdini_deadline_api_submission import utils  # noqa: E402
+from houdini_deadline_api_submission.test import benchmark  # noqa: E402
+from houdini_deadline_api_submission.test import fake_deadline  # noqa: E402
+
+DEFAULT_SCENARIOS = ("stacks", "subnets", "fetch_chains", "wedges", "wedge_chains")
+DEFAULT_SIZES = (10, 100, 1000)
+SUBMITTER_PATH = "/out/hal_deadline_submit1"
+FRAMES = 10
+
+
+def get_package_version():
+    """Return the version of this package.
+
+    Returns:
+        str: Version set by rez, or the name of the folder of the version.
+
+    """
+    version = os.environ.get(
+        "REZ_{}_VERSION".format(constants.PACKAGE_NAME.upper())
+    )
+    if version:
+        return version
+    package_folder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.basename(os.path.dirname(os.path.dirname(package_folder)))
+
+
+def create_rop(path, node_type="geometry"):
+    """Create a ROP with a frame range, an output and a log.
+
+    Args:
+        path (str): Absolute path of the ROP.
+        node_type (str, optional): Name of the node type.
+
+    Returns:
+        hou.Node: Created ROP.
+
+    """
+    node = fake_hou.create_node(path, node_type)
+    node.setParms(
+        {
+            "trange": 1,
+            "f1": 1,
+            "f2": FRAMES,
+            "f3": 1,
+            "sopoutput": "$HIP/geo/{}.$F4.bgeo.sc".format(node.name()),
+            constants.LOG_PARM: "",
+        }
+    )
+    return node
+
+
+def create_submitter(mode=constants.SUBMISSION_MODE_SEQUENTIAL):
+    """Create the submitter node of the HDA, saving the scene only once.
+
+    Args:
+        mode (int, optional): Submission mode.
+
+    Returns:
+        hou.Node: Created submitter node.
+
+    """
+    node = fake_hou.create_node(SUBMITTER_PATH, "hal::deadline_submit::0.1")
+    node.setParms(
+        {
+            "dry_run": 0,
+            "render_local": 0,
+            "save_submit_file": 0,
+            constants.SUBMISSION_MODE: mode,
+            constants.SUBMISSION_WORKERS: constants.DEFAULT_SUBMISSION_WORKERS,
+            constants.SCENE_SNAPSHOT: 1,
+            "hal_job_override_Name": "benchmark - $OS",
+            "hal_job_override_Pool": "sim",
+            "hal_job_override_Group": "render",
+            "hal_job_override_Priority": 50,
+            "hal_job_override_ChunkSize": 5,
+            "hal_job_override_MachineLimit": 20,
+            "hal_job_override_InitialStatus": "Active",
+            constants.LOG_PARM: "",
+        }
+    )
+    return node
+
+
+def build_stacks(size, seed=0, stack_size=25, max_inputs=3):
+    """Create ROPs depending on random ROPs created before in their stack.
+
+    Each ROP depends on the ROP created before it, so all ROPs of a stack get
+    rendered.
+
+    Args:
+        size (int): Amount of ROPs.
+        seed (int, optional): Seed of the random generator.
+        stack_size (int, optional): Amount of ROPs per stack.
+        max_inputs (int, optional): Maximum amount of inputs per ROP.
+
+    Returns:
+        hou.Node: Merge ROP depending on the last ROP of each stack.
+
+    """
+    rand = random.Random(seed)
+    merge = create_rop("/out/merge", "merge")
+    stack = []
+    for index in range(size - 1):
+        if index % stack_size == 0:
+            if stack:
+                merge.setInput(len(merge.inputs()), stack[-1])
+            stack = []
+        node = create_rop("/out/rop{}".format(index))
+        if stack:
+            amount = min(len(stack) - 1, rand.randint(0, max_inputs - 1))
+            inputs = [stack[-1]] + rand.sample(stack[:-1], amount)
+            for input_index, input_node in enumerate(inputs):
+                node.setInput(input_index, input_node)
+        stack.append(node)
+    if stack:
+        merge.setInput(len(merge.inputs()), stack[-1])
+    return merge
+
+
+def build_subnets(size, depth=3, children=4):
+    """Create chains of ROPs inside of nested subnetworks.
+
+    Args:
+        size (int): Amount of ROPs, including the subnetworks.
+        depth (int, optional): Amount of nested subnetworks.
+        children (int, optional): Amount of ROPs per subnetwork.
+
+    Returns:
+        hou.Node: Merge ROP depending on each outermost subnetwork.
+
+    """
+    merge = create_rop("/out/merge", "merge")
+    created = 1
+    index = 0
+    while created < size:
+        path = "/out/subnet{}".format(index)
+        create_rop(path, "subnet")
+        merge.setInput(len(merge.inputs()), fake_hou.node(path))
+        created += 1
+        for level in range(depth):
+            previous = None
+            for child in range(children):
+                if created >= size:
+                    break
+                node = create_rop("{}/rop{}".format(path, child))
+                created += 1
+                if previous is not None:
+                    node.setInput(0, previous)
+                previous = node
+            if level < depth - 1 and created < size:
+                subnet = create_rop("{}/subnet".format(path), "subnet")
+                created += 1
+                if previous is not None:
+                    subnet.setInput(0, previous)
+                path = subnet.path()
+        index += 1
+    return merge
+
+
+def build_fetch_chains(size, chain_length=10):
+    """Create chains of ROPs depending on each other through Fetch ROPs.
+
+    Each ROP lives in its own subnetwork, together with the Fetch ROP of
+    the ROP it depends on.
+
+    Args:
+        size (int): Amount of ROPs, including the Fetch ROPs.
+        chain_length (int, optional): Amount of ROPs per chain.
+
+    Returns:
+        hou.Node: Merge ROP depending on the last ROP of each chain.
+
+    """
+    merge = create_rop("/out/merge", "merge")
+    created = 1
+    chain = 0
+    while created < size:
+        previous = None
+        for index in range(chain_length):
+            if created >= size:
+                break
+            create_rop("/out/chain{}_{}".format(chain, index), "subnet")
+            node = create_rop("/out/chain{}_{}/rop".format(chain, index))
+            created += 1
+            if previous is not None and created < size:
+                fetch = fake_hou.create_node(
+                    "/out/chain{}_{}/fetch".format(chain, index), "fetch"
+                )
+                fetch.setParms({"source": previous.path(), constants.LOG_PARM: ""})
+                node.setInput(0, fetch)
+                created += 1
+            previous = node
+        merge.setInput(len(merge.inputs()), previous)
+        chain += 1
+    return merge
+
+
+def set_wedges(node, size, parms=3):
+    """Wedge parameters of /obj/geo1 on the given ROP.
+
+    Args:
+        node (hou.Node): ROP to wedge.
+        size (int): Amount of wedges, split into a product of wedge
+            parameters.
+        parms (int, optional): Maximum amount of wedge parameters.
+
+    """
+    steps = []
+    remaining = size
+    for _ in range(parms - 1):
+        step = max(1, int(round(remaining ** (1.0 / (parms - len(steps))))))
+        while remaining % step:
+            step -= 1
+        steps.append(step)
+        remaining //= step
+    steps.append(remaining)
+
+    target = fake_hou.node("/obj/geo1") or fake_hou.create_node(
+        "/obj/geo1", "geo", "Object"
+    )
+    node.setParms(
+        {constants.WEDGE_PARMS: len(steps), constants.WEDGE_USE_WEDGE: 1}
+    )
+    for wedge_id, step in enumerate(steps):
+        target.setParms({"p{}".format(wedge_id): 0.0})
+        node.setParms(
+            {
+                constants.WEDGE_NAME.format(id=wedge_id): "p{}".format(wedge_id),
+                constants.WEDGE_CHANNEL.format(id=wedge_id): "/obj/geo1/p{}".format(
+                    wedge_id
+                ),
+                constants.WEDGE_RANGE.format(id=wedge_id): (0.0, 1.0),
+                constants.WEDGE_STEPS.format(id=wedge_id): step,
+            }
+        )
+
+
+def build_wedges(size, parms=3):
+    """Create a single ROP with the given amount of wedges.
+
+    Args:
+        size (int): Amount of wedges, split into a product of wedge
+            parameters.
+        parms (int, optional): Maximum amount of wedge parameters.
+
+    Returns:
+        hou.Node: The wedged ROP.
+
+    """
+    node = create_rop("/out/wedged")
+    set_wedges(node, size, parms)
+    return node
+
+
+def build_wedge_chains(size, chain_length=4):
+    """Create a chain of ROPs with the same wedges.
+
+    Args:
+        size (int): Amount of wedges of each ROP.
+        chain_length (int, optional): Amount of ROPs in the chain.
+
+    Returns:
+        hou.Node: Last ROP of the chain.
+
+    """
+    node = None
+    for index in range(chain_length):
+        previous_node = node
+        node = create_rop("/out/wedged{}".format(index))
+        set_wedges(node, size)
+        if previous_node is not None:
+            node.setInput(0, previous_node)
+    return node
+
+
+_BUILDERS = {
+    "stacks": build_stacks,
+    "subnets": build_subnets,
+    "fetch_chains": build_fetch_chains,
+    "wedges": build_wedges,
+    "wedge_chains": build_wedge_chains,
+}
+
+
+def build_network(scenario, size, mode=constants.SUBMISSION_MODE_SEQUENTIAL):
+    """Create a new network of the given scenario.
+
+    Args:
+        scenario (str): Name of the scenario.
+        size (int): Amount of ROPs, or wedges of the wedge scenarios.
+        mode (int, optional): Submission mode of the submitter.
+
+    Returns:
+        tuple of hou.Node: Node to submit and the submitter node.
+
+    """
+    hip_path = fake_hou.hipFile.path()
+    fake_hou.clear()
+    fake_hou.hipFile.setName(hip_path)
+    utils.clear_dependency_tree_cache()
+    submitter_node = create_submitter(mode)
+    return _BUILDERS[scenario](size), submitter_node
+
+
+def measure(scenario, size, repeat, mode, deadline_con):
+    """Create and submit the jobs of a new network.
+
+    Args:
+        scenario (str): Name of the scenario.
+        size (int): Amount of ROPs, or wedges of the wedge scenarios.
+        repeat (int): Amount of runs, the fastest one is reported.
+        mode (int): Submission mode of the submitter.
+        deadline_con (fake_deadline.FakeDeadlineCon): Fake connection
+            recording the submitted jobs.
+
+    Returns:
+        dict: Amount of jobs and timings of the network.
+
+    Raises:
+        AssertionError: If a submission doesn't submit every job.
+
+    """
+    base_node, submitter_node = build_network(scenario, size, mode)
+    jobs = submit.get_jobs(base_node, submitter_node)
+    deadline_con.clear()
+    submitted_ids = submit.submit(base_node, submitter_node)
+    assert len(deadline_con.jobs) == len(submitted_ids), (
+        "{} of {} jobs submitted in {} ({})".format(
+            len(deadline_con.jobs), len(submitted_ids), scenario, size
+        )
+    )
+
+    def time_get_jobs():
+        utils.clear_dependency_tree_cache()
+        submit.get_jobs(base_node, submitter_node)
+
+    def time_submit():
+        utils.clear_dependency_tree_cache()
+        submit.submit(base_node, submitter_node)
+
+    return {
+        "scenario": scenario,
+        "size": size,
+        "jobs": len(jobs),
+        "submitted": len(submitted_ids),
+        "get_jobs": benchmark.time_call(time_get_jobs, repeat),
+        "submit": benchmark.time_call(time_submit, repeat),
+    }
+
+
+def run(
+    scenarios=DEFAULT_SCENARIOS,
+    sizes=DEFAULT_SIZES,
+    repeat=benchmark.DEFAULT_REPEAT,
+    mode=constants.SUBMISSION_MODE_SEQUENTIAL,
+):
+    """Run the benchmark for each scenario and size.
+
+    Args:
+        scenarios (list of str, optional): Names of the scenarios.
+        sizes (list of int, optional): Amount of ROPs, or wedges of the
+            wedge scenarios.
+        repeat (int, optional): Amount of runs, the fastest one is reported.
+        mode (int, optional): Submission mode of the submitter.
+
+    Returns:
+        list of dict: Amount of jobs and timings per scenario and size.
+
+    """
+    deadline_con = fake_deadline.install()
+    hip_folder = tempfile.mkdtemp(prefix="benchmark_submission_")
+    fake_hou.hipFile.setName(os.path.join(hip_folder, "benchmark.hip"))
+    try:
+        return benchmark.run(
+            [
+                (scenario, size, repeat, mode, deadline_con)
+                for scenario in scenarios
+                for size in sizes
+            ],
+            measure,
+            "{scenario:>12} {size:>6}  jobs: {jobs:>6}  submitted: "
+            "{submitted:>6}  get_jobs: {get_jobs:8.4f}s  "
+            "submit: {submit:8.4f}s",
+        )
+    finally:
+        fake_deadline.uninstall()
+        shutil.rmtree(hip_folder, ignore_errors=True)
+
+
+def compare(results, other_path):
+    """Print the timings of another run next to the given results.
+
+    Args:
+        results (list of dict): Results of this run.
+        other_path (str): JSON file written by another run.
+
+    """
+    with open(other_path) as other_file:
+        other = json.load(other_file)
+    other_results = dict(
+        ((result["scenario"], result["size"]), result) for result in other["results"]
+    )
+    print("Compared to version {}:".format(other.get("version")))
+    for result in results:
+        other_result = other_results.get((result["scenario"], result["size"]))
+        if not other_result:
+            continue
+        print(
+            "{:>12} {:>6}  get_jobs: {:6.2f}x  submit: {:6.2f}x".format(
+                result["scenario"],
+                result["size"],
+                other_result["get_jobs"] / max(result["get_jobs"], 1e-9),
+                other_result["submit"] / max(result["submit"], 1e-9),
+            )
+        )
+
+
+def main(argv=None):
+    """Run the benchmark from the command line.
+
+    Args:
+        argv (list of str, optional): Command line arguments.
+
+    """
+    parser = benchmark.create_parser(__doc__, DEFAULT_SIZES, json_required=True)
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=sorted(_BUILDERS), default=DEFAULT_SCENARIOS
+    )
+    parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Use the concurrent submission mode.",
+    )
+    parser.add_argument("--compare", help="JSON file of another run to compare to.")
+    args = parser.parse_args(argv)
+
+    mode = constants.SUBMISSION_MODE_SEQUENTIAL
+    if args.concurrent:
+        mode = constants.SUBMISSION_MODE_CONCURRENT
+    results = run(args.scenarios, args.sizes, args.repeat, mode)
+    benchmark.write_results(
+        args.json,
+        "submission",
+        results,
+        version=get_package_version(),
+        python=sys.version.split()[0],
+        mode=mode,
+    )
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
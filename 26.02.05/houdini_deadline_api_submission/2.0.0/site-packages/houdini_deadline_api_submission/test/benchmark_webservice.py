@@ -0,0 +1,169 @@
+"""Benchmark the requests sent to the Deadline Web Service.
+
+Submits jobs and queries the pools and groups like the submitter menus do,
+through a local stand-in Web Service that takes some time to open a
+connection. Compares the pooled keep-alive client with a client that opens a
+new connection for every request, like the previous `DeadlineCon` did.
+
+Examples:
+    $ python -m houdini_deadline_api_submission.test.benchmark_webservice
+
+"""
+
+# Import built-in modules
+from concurrent.futures import ThreadPoolExecutor
+
+# Import local modules
+from houdini_deadline_api_submission import constants
+from houdini_deadline_api_submission import webservice
+from houdini_deadline_api_submission.test import benchmark
+from houdini_deadline_api_submission.test.fake_webservice import FakeWebService
+
+DEFAULT_SIZES = (50, 200)
+
+
+def submit_jobs(client, size, max_workers):
+    """Submit the given amount of jobs through the given client.
+
+    Args:
+        client (webservice.WebServiceClient): Client to send the jobs with.
+        size (int): Amount of jobs to submit.
+        max_workers (int): Amount of jobs sent at the same time.
+
+    Returns:
+        list of str: Deadline IDs of the submitted jobs.
+
+    """
+    def submit(index):
+        job_info = {"Name": "job{}".format(index), "Plugin": "Houdini"}
+        return client.Jobs.SubmitJob(job_info, {}, idOnly=True)["_id"]
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        return list(executor.map(submit, range(size)))
+    finally:
+        executor.shutdown(wait=True)
+
+
+def query_menus(client, size):
+    """Query the pools and groups the given amount of times.
+
+    Args:
+        client (webservice.WebServiceClient): Client to send the requests with.
+        size (int): Amount of times the menus are queried.
+
+    Returns:
+        tuple: Pools and groups of the last query.
+
+    """
+    result = None
+    for _ in range(size):
+        result = (client.Pools.GetPoolNames(), client.Groups.GetGroupNames())
+    return result
+
+
+def measure(service, pooled, legacy, size, repeat, max_workers):
+    """Send the given amount of jobs and menu queries through both clients.
+
+    Args:
+        service (FakeWebService): The running stand-in Web Service.
+        pooled (webservice.WebServiceClient): Client keeping its connections.
+        legacy (webservice.WebServiceClient): Client opening a connection per
+            request.
+        size (int): Amount of submitted jobs and menu queries.
+        repeat (int): Amount of runs, the fastest one is reported.
+        max_workers (int): Amount of jobs sent at the same time.
+
+    Returns:
+        dict: Opened connections and timings of both clients.
+
+    Raises:
+        AssertionError: If a job got lost or submitted twice.
+
+    """
+    del service.jobs[:]
+    ids = submit_jobs(pooled, size, max_workers)
+    assert len(set(ids)) == len(service.jobs) == size, "Lost jobs"
+
+    connections = service.connections
+    submit_jobs(legacy, size, max_workers)
+    legacy_connections = service.connections - connections
+
+    connections = service.connections
+    submit_jobs(pooled, size, max_workers)
+    pooled_connections = service.connections - connections
+
+    return {
+        "jobs": size,
+        "connections_pooled": pooled_connections,
+        "connections_legacy": legacy_connections,
+        "submit_pooled": benchmark.time_call(
+            lambda: submit_jobs(pooled, size, max_workers), repeat
+        ),
+        "submit_legacy": benchmark.time_call(
+            lambda: submit_jobs(legacy, size, max_workers), repeat
+        ),
+        "menus_pooled": benchmark.time_call(lambda: query_menus(pooled, size), repeat),
+        "menus_legacy": benchmark.time_call(lambda: query_menus(legacy, size), repeat),
+    }
+
+
+def run(
+    sizes=DEFAULT_SIZES,
+    repeat=benchmark.DEFAULT_REPEAT,
+    max_workers=constants.DEFAULT_SUBMISSION_WORKERS,
+    connect_latency=0.005,
+):
+    """Run the benchmark for each of the given amount of jobs.
+
+    Args:
+        sizes (list of int, optional): Amount of submitted jobs.
+        repeat (int, optional): Amount of runs, the fastest one is reported.
+        max_workers (int, optional): Amount of jobs sent at the same time.
+        connect_latency (float, optional): Seconds the stand-in Web Service
+            takes to open a connection.
+
+    Returns:
+        list of dict: Timings per amount of jobs.
+
+    """
+    service = FakeWebService(connect_latency=connect_latency, failures=2)
+    hostname, port = service.start()
+    pooled = webservice.WebServiceClient(hostname, port, backoff=0.01)
+    legacy = webservice.WebServiceClient(hostname, port, backoff=0.01, pool_size=0)
+    try:
+        # The stand-in fails the first requests, which need to be retried.
+        assert query_menus(pooled, 1) == (service.pools, service.groups)
+        return benchmark.run(
+            [(service, pooled, legacy, size, repeat, max_workers) for size in sizes],
+            measure,
+            "{jobs:>6} jobs  connections: {connections_pooled:>4} vs "
+            "{connections_legacy:>4}  submit: {submit_pooled:7.4f}s vs "
+            "{submit_legacy:7.4f}s  menus: {menus_pooled:7.4f}s vs "
+            "{menus_legacy:7.4f}s",
+        )
+    finally:
+        pooled.close()
+        service.stop()
+
+
+def main(argv=None):
+    """Run the benchmark from the command line.
+
+    Args:
+        argv (list of str, optional): Command line arguments.
+
+    """
+    parser = benchmark.create_parser(__doc__, DEFAULT_SIZES)
+    parser.add_argument(
+        "--workers",
+        dest="max_workers",
+        type=int,
+        default=constants.DEFAULT_SUBMISSION_WORKERS,
+    )
+    parser.add_argument("--connect-latency", type=float, default=0.005)
+    benchmark.main("webservice", run, parser, argv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""Make the fake hou importable for all tests, unless Houdini is available."""
+
+# Import local modules
+from houdini_deadline_api_submission.test import fake_hou
+
+fake_hou.install()
@@ -0,0 +1,141 @@
+"""Recording stand-in for the Deadline connection used by this package.
+
+`FakeDeadlineCon` answers the same calls as the Web Service client returned
+by `deadline_utils.get_deadline_connect` (job submission, tasks, pools and
+groups) without any network, and records every submitted job. Install it as
+the connection of the process to submit jobs in the benchmarks.
+
+Examples:
+    >>> deadline_con = install()
+    >>> submit.submit(hou.node('/out/geometry1'), submitter_node)
+    >>> len(deadline_con.jobs)
+    1
+    >>> uninstall()
+
+"""
+
+# Import built-in modules
+import itertools
+import threading
+import time
+
+# Import local modules
+from houdini_deadline_api_submission import deadline_utils
+
+
+class _Jobs(object):
+    """Job calls of the fake connection."""
+
+    def __init__(self, deadline_con):
+        self._deadline_con = deadline_con
+
+    def SubmitJob(  # noqa: N802 pylint: disable=invalid-name
+        self, info, plugin_info, aux=None, idOnly=False  # noqa: N803
+    ):
+        """Record the job and return its new id."""
+        del aux
+        deadline_con = self._deadline_con
+        time.sleep(deadline_con.latency)
+        with deadline_con.lock:
+            job_id = "{:024x}".format(next(deadline_con.ids))
+            deadline_con.jobs.append((job_id, dict(info), dict(plugin_info)))
+        if idOnly:
+            return {"_id": job_id}
+        return {"_id": job_id, "Props": dict(info)}
+
+
+class _Pools(object):
+    """Pool calls of the fake connection."""
+
+    def __init__(self, deadline_con):
+        self._deadline_con = deadline_con
+
+    def GetPoolNames(self):  # noqa: N802 pylint: disable=invalid-name
+        """Return the names of the pools."""
+        time.sleep(self._deadline_con.latency)
+        return list(self._deadline_con.pools)
+
+
+class _Groups(object):
+    """Group calls of the fake connection."""
+
+    def __init__(self, deadline_con):
+        self._deadline_con = deadline_con
+
+    def GetGroupNames(self):  # noqa: N802 pylint: disable=invalid-name
+        """Return the names of the groups."""
+        time.sleep(self._deadline_con.latency)
+        return list(self._deadline_con.groups)
+
+
+class _Tasks(object):
+    """Task calls of the fake connection."""
+
+    def __init__(self, deadline_con):
+        self._deadline_con = deadline_con
+
+    def GetJobTasks(  # noqa: N802 pylint: disable=invalid-name
+        self, id  # pylint: disable=redefined-builtin
+    ):
+        """Return the tasks stored for the job."""
+        time.sleep(self._deadline_con.latency)
+        return {"ID": id, "Tasks": list(self._deadline_con.tasks.get(id, []))}
+
+
+class FakeDeadlineCon(object):
+    """Deadline connection recording the submitted jobs.
+
+    Args:
+        latency (float, optional): Seconds each call takes.
+        pools (list of str, optional): Names of the available pools.
+        groups (list of str, optional): Names of the available groups.
+
+    """
+
+    def __init__(self, latency=0.0, pools=None, groups=None):
+        """Initialize a connection without any submitted jobs."""
+        self.latency = latency
+        self.pools = pools if pools is not None else ["none", "sim"]
+        self.groups = groups if groups is not None else ["none", "render"]
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.jobs = []
+        self.tasks = {}
+        self.Jobs = _Jobs(self)  # pylint: disable=invalid-name
+        self.Pools = _Pools(self)  # pylint: disable=invalid-name
+        self.Groups = _Groups(self)  # pylint: disable=invalid-name
+        self.Tasks = _Tasks(self)  # pylint: disable=invalid-name
+
+    def clear(self):
+        """Forget all submitted jobs."""
+        with self.lock:
+            self.jobs = []
+
+
+def install(deadline_con=None):
+    """Use the given connection for all Deadline calls of this process.
+
+    Args:
+        deadline_con (FakeDeadlineCon, optional): Connection to use. A new one
+            is created if not given.
+
+    Returns:
+        FakeDeadlineCon: The installed connection.
+
+    """
+    deadline_con = deadline_con or FakeDeadlineCon()
+    # The connection is a singleton, so the instance can be created without
+    # reading the Web Service configuration.
+    connection = object.__new__(deadline_utils.DeadlineConnection)
+    connection.connection = deadline_con
+    deadline_utils.DeadlineConnection._instances[  # pylint: disable=protected-access
+        deadline_utils.DeadlineConnection
+    ] = connection
+    return deadline_con
+
+
+def uninstall():
+    """Connect to the configured Web Service again on the next Deadline call."""
+    deadline_utils.DeadlineConnection._instances.pop(  # pylint: disable=protected-access
+        deadline_utils.DeadlineConnection, None
+    )
@@ -0,0 +1,581 @@
+"""In-memory stand-in for the parts of `hou` used by this package.
+
+This is only meant for the benchmarks in this folder, which need to run
+outside of Houdini. Networks are built with `create_node` and live in a
+module level registry until `clear` is called. The render order printed by
+`hscript("render -p ...")` is created from the inputs of the nodes, the
+children of subnetworks and the source of Fetch ROPs, and `hipFile` saves
+small placeholder files.
+
+Examples:
+    >>> from houdini_deadline_api_submission.test import fake_hou
+    >>> hou = fake_hou.install()
+    >>> geo = fake_hou.create_node("/out/geometry1", "geometry")
+    >>> fetch = fake_hou.create_node("/out/fetch1", "fetch")
+    >>> fetch.setParms({"source": geo.path()})
+    >>> hou.node("/out/fetch1").parm("source").evalAsNode() == geo
+    True
+
+"""
+
+# Import built-in modules
+import itertools
+import os
+import re
+import sys
+import types
+
+# All created nodes, keyed by their path.
+_NODES = {}
+# Paths of the children of each node, in the order they were created.
+_CHILDREN = {}
+# String parameters referencing a node path, keyed by the referenced path.
+_REFERENCES = {}
+# Counter used for the session ids of the created nodes.
+_SESSION_IDS = itertools.count(1)
+# Amount of evaluated parameter values, see get_evaluation_count.
+_EVALUATIONS = [0]
+# Amount of changed parameter values, see get_change_count.
+_CHANGES = [0]
+# Path of the current node, changed by cd.
+_CURRENT_PATH = ["/"]
+# Variables set with putenv.
+_ENVIRONMENT = {}
+# Current frame, changed by setFrame.
+_FRAME = [1.0]
+# Houdini version returned by applicationVersionString.
+APPLICATION_VERSION = "20.0.547"
+
+
+class PermissionError(Exception):  # pylint: disable=redefined-builtin
+    """Raised when changing a node inside of a locked asset."""
+
+
+class ObjectWasDeleted(Exception):
+    """Raised when accessing a deleted node."""
+
+
+class OperationFailed(Exception):
+    """Raised when an operation on a node failed."""
+
+
+class NodeTypeCategory(object):
+    """Stand-in for hou.NodeTypeCategory."""
+
+    def __init__(self, name):
+        self._name = name
+
+    def name(self):
+        return self._name
+
+
+class NodeType(object):
+    """Stand-in for hou.NodeType."""
+
+    def __init__(self, name, category="Driver"):
+        self._name = name
+        self._category = NodeTypeCategory(category)
+
+    def name(self):
+        return self._name
+
+    def nameComponents(self):  # pylint: disable=invalid-name
+        return ("", "", self._name, "")
+
+    def category(self):
+        return self._category
+
+
+class Parm(object):
+    """Stand-in for hou.Parm."""
+
+    def __init__(self, node, name, value):
+        self._node = node
+        self._name = name
+        self._value = None
+        self.set(value)
+
+    def node(self):
+        return self._node
+
+    def name(self):
+        return self._name
+
+    def path(self):
+        return "{}/{}".format(self._node.path(), self._name)
+
+    def eval(self):
+        _EVALUATIONS[0] += 1
+        return self._value
+
+    def evalAsString(self):  # pylint: disable=invalid-name
+        _EVALUATIONS[0] += 1
+        return str(self._value)
+
+    def evalAtFrame(self, frame):  # pylint: disable=invalid-name
+        _EVALUATIONS[0] += 1
+        value = self._value
+        if isinstance(value, str):
+            value = re.sub(
+                r"\$F(\d?)",
+                lambda match: str(int(frame)).zfill(int(match.group(1) or 0)),
+                value,
+            )
+        return value
+
+    def evalAsNode(self):  # pylint: disable=invalid-name
+        return _NODES.get(self._value) if self._value else None
+
+    def rawValue(self):  # pylint: disable=invalid-name
+        _EVALUATIONS[0] += 1
+        return str(self._value)
+
+    def evalAsInt(self):  # pylint: disable=invalid-name
+        return int(self.eval())
+
+    def evalAsFloat(self):  # pylint: disable=invalid-name
+        return float(self.eval())
+
+    def getReferencedParm(self):  # pylint: disable=invalid-name
+        return self
+
+    def keyframes(self):
+        return ()
+
+    def pressButton(self):  # pylint: disable=invalid-name
+        pass
+
+    def set(self, value):
+        _CHANGES[0] += 1
+        if isinstance(self._value, str) and self._value in _REFERENCES:
+            _REFERENCES[self._value].discard(self)
+        self._value = value
+        if isinstance(value, str) and value.startswith("/"):
+            _REFERENCES.setdefault(value, set()).add(self)
+
+
+class Node(object):
+    """Stand-in for hou.Node, used for ROPs and their networks."""
+
+    def __init__(self, path, node_type, category="Driver"):
+        self._path = path
+        self._type = NodeType(node_type, category)
+        self._parms = {}
+        self._session_id = next(_SESSION_IDS)
+        self.inputs_list = []
+
+    def path(self):
+        return self._path
+
+    def name(self):
+        return self._path.rsplit("/", 1)[-1]
+
+    def sessionId(self):  # pylint: disable=invalid-name
+        return self._session_id
+
+    def type(self):
+        return self._type
+
+    def parent(self):
+        if self._path == "/":
+            return None
+        return _NODES.get(self._path.rsplit("/", 1)[0] or "/")
+
+    def children(self):
+        return tuple(_NODES[path] for path in _CHILDREN.get(self._path, ()))
+
+    def parm(self, name):
+        return self._parms.get(name)
+
+    def parms(self):
+        return tuple(self._parms.values())
+
+    def allParms(self):  # pylint: disable=invalid-name
+        return self.parms()
+
+    def evalParm(self, name):  # pylint: disable=invalid-name
+        return self._parms[name].eval()
+
+    def evalParmTuple(self, name):  # pylint: disable=invalid-name
+        if name not in self._parms:
+            # Tuples like "f" are stored as their components "f1", "f2", ...
+            return tuple(
+                self._parms["{}{}".format(name, index)].eval() for index in (1, 2, 3)
+            )
+        return tuple(self._parms[name].eval())
+
+    def setParms(self, values):  # pylint: disable=invalid-name
+        for name, value in values.items():
+            if name in self._parms:
+                self._parms[name].set(value)
+            else:
+                self._parms[name] = Parm(self, name, value)
+
+    def inputs(self):
+        return tuple(self.inputs_list)
+
+    def setInput(self, index, node):  # pylint: disable=invalid-name
+        while len(self.inputs_list) <= index:
+            self.inputs_list.append(None)
+        self.inputs_list[index] = node
+
+    def inputAncestors(self, follow_subnets=True):  # pylint: disable=invalid-name
+        """Return all nodes upstream of this node, like hou.Node does."""
+        del follow_subnets
+        ancestors = []
+        visited = set()
+        stack = list(reversed(self.inputs_list))
+        while stack:
+            node = stack.pop()
+            if node is None or node.path() in visited:
+                continue
+            visited.add(node.path())
+            ancestors.append(node)
+            stack.extend(reversed(node.inputs_list))
+        return tuple(ancestors)
+
+    def parmsReferencingThis(self):  # pylint: disable=invalid-name
+        return tuple(_REFERENCES.get(self._path, ()))
+
+    def render(self, *args, **kwargs):
+        """Rendering doesn't do anything."""
+        del args, kwargs
+
+    def __repr__(self):
+        return "<hou.Node of type {} at {}>".format(self._type.name(), self._path)
+
+
+def create_node(path, node_type="geometry", category="Driver"):
+    """Create a node at the given path, creating missing parents as needed.
+
+    Parents that don't exist yet are created as Managers ('/out') or as
+    'subnet' ROPs.
+
+    Args:
+        path (str): Absolute path of the node.
+        node_type (str, optional): Name of the node type.
+        category (str, optional): Name of the node type category.
+
+    Returns:
+        Node: Created node.
+
+    """
+    parent_path = path.rsplit("/", 1)[0] or "/"
+    if path != "/" and parent_path not in _NODES:
+        if parent_path == "/":
+            create_node("/", "root", "Director")
+        elif parent_path.count("/") == 1:
+            create_node(parent_path, "ropnet", "Manager")
+        else:
+            create_node(parent_path, "subnet")
+    node = Node(path, node_type, category)
+    if path not in _NODES and path != "/":
+        _CHILDREN.setdefault(parent_path, []).append(path)
+    _NODES[path] = node
+    return node
+
+
+class _HipFile(object):
+    """Stand-in for hou.hipFile, saving placeholder files."""
+
+    def __init__(self):
+        self._path = os.path.join(os.getcwd(), "untitled.hip")
+        self.saved = []
+
+    def path(self):
+        return self._path
+
+    def basename(self):
+        return os.path.basename(self._path)
+
+    def setName(self, path):  # pylint: disable=invalid-name
+        self._path = path
+
+    def hasUnsavedChanges(self):  # pylint: disable=invalid-name
+        return False
+
+    def save(self, file_name=None, save_to_recent_files=True):
+        """Write a placeholder file holding the path of the scene."""
+        del save_to_recent_files
+        if file_name:
+            self._path = file_name
+        with open(self._path, "w") as hip_file:
+            hip_file.write(self._path)
+        self.saved.append(self._path)
+
+    def load(self, file_name, *args, **kwargs):
+        del args, kwargs
+        self._path = file_name
+
+    def addEventCallback(self, callback):  # pylint: disable=invalid-name
+        pass
+
+
+hipFile = _HipFile()  # pylint: disable=invalid-name
+
+
+class _Ui(object):
+    """Stand-in for hou.ui, without any user to answer."""
+
+    @staticmethod
+    def displayMessage(text, *args, **kwargs):  # pylint: disable=invalid-name
+        del text, args, kwargs
+        return 0
+
+
+ui = _Ui()  # pylint: disable=invalid-name
+
+
+def node(path):
+    """Return the node at the given path, like hou.node().
+
+    Args:
+        path (str): Absolute path of the node.
+
+    Returns:
+        Node: Found node or None.
+
+    """
+    return _NODES.get(path)
+
+
+def parm(path):
+    """Return the parameter at the given path, like hou.parm().
+
+    Args:
+        path (str): Absolute path of the parameter.
+
+    Returns:
+        Parm: Found parameter or None.
+
+    """
+    node_path, _, name = path.rpartition("/")
+    found_node = _NODES.get(node_path)
+    return found_node.parm(name) if found_node else None
+
+
+def pwd():
+    """Return the current node, like hou.pwd().
+
+    Returns:
+        Node: Node set with cd.
+
+    """
+    return _NODES.get(_CURRENT_PATH[0])
+
+
+def getenv(name, default_value=None):  # pylint: disable=invalid-name
+    """Return a variable set with putenv, like hou.getenv()."""
+    return _ENVIRONMENT.get(name, default_value)
+
+
+def putenv(name, value):  # pylint: disable=invalid-name
+    """Set a variable, like hou.putenv()."""
+    _ENVIRONMENT[name] = value
+
+
+def unsetenv(name):  # pylint: disable=invalid-name
+    """Remove a variable, like hou.unsetenv()."""
+    _ENVIRONMENT.pop(name, None)
+
+
+def frame():
+    """Return the current frame, like hou.frame()."""
+    return _FRAME[0]
+
+
+def setFrame(value):  # pylint: disable=invalid-name
+    """Change the current frame, like hou.setFrame()."""
+    _FRAME[0] = value
+
+
+def applicationVersionString():  # pylint: disable=invalid-name
+    """Return the Houdini version, like hou.applicationVersionString()."""
+    return APPLICATION_VERSION
+
+
+def get_render_order(base_node):
+    """Return the tasks needed to render the given node.
+
+    Inputs are rendered before the nodes using them, Fetch ROPs are replaced
+    by their source and subnetworks by their children. Children without any
+    input of the same subnetwork depend on the inputs of the subnetwork.
+
+    Args:
+        base_node (Node): Node to render.
+
+    Returns:
+        list of tuple: Node and 1-based ids of the tasks it depends on, in
+            render order.
+
+    """
+    tasks = []
+    outputs = {}
+
+    def visit(node, extra_ids=()):
+        if node.type().name() == "fetch":
+            source = node.parm("source").evalAsNode() if node.parm("source") else None
+            return visit(source, extra_ids) if source else list(extra_ids)
+        if node.path() in outputs:
+            return outputs[node.path()]
+        outputs[node.path()] = []
+        input_ids = list(extra_ids)
+        for input_node in node.inputs():
+            if input_node is not None:
+                input_ids.extend(visit(input_node))
+        input_ids = sorted(set(input_ids))
+
+        children = node.children()
+        if not children:
+            tasks.append((node, input_ids))
+            outputs[node.path()] = [len(tasks)]
+            return outputs[node.path()]
+
+        used_children = set()
+        for child in children:
+            used_children.update(
+                input_node.path() for input_node in child.inputs() if input_node
+            )
+        ids = []
+        for child in children:
+            siblings = [input_node for input_node in child.inputs() if input_node]
+            child_ids = visit(child, () if siblings else input_ids)
+            if child.path() not in used_children:
+                ids.extend(child_ids)
+        outputs[node.path()] = sorted(set(ids))
+        return outputs[node.path()]
+
+    visit(base_node)
+    return tasks
+
+
+def hscript(command):
+    """Run an hscript command, only `render -p` is supported.
+
+    Args:
+        command (str): Command to run.
+
+    Returns:
+        tuple of str: Output and error of the command.
+
+    """
+    match = re.match(r"render\s+-p\b.*\s(/\S*)\s*$", command)
+    if not match or match.group(1) not in _NODES:
+        return "", "Unsupported command: {}\n".format(command)
+    lines = []
+    for index, (task_node, dependency_ids) in enumerate(
+        get_render_order(_NODES[match.group(1)]), 1
+    ):
+        start = end = int(_FRAME[0])
+        if task_node.parm("f1") and task_node.parm("f2"):
+            start = int(task_node.parm("f1").eval())
+            end = int(task_node.parm("f2").eval())
+        lines.append(
+            "{} [ {}] {} {}\n".format(
+                index,
+                "".join("{} ".format(id_) for id_ in dependency_ids),
+                task_node.path(),
+                " ".join(str(frame_) for frame_ in range(start, end + 1)),
+            )
+        )
+    return "".join(lines), ""
+
+
+def cd(path):
+    """Change the current node, like hou.cd().
+
+    Args:
+        path (str): Absolute path of the node.
+
+    """
+    _CURRENT_PATH[0] = path
+
+
+def expandString(value):  # pylint: disable=invalid-name
+    """Expand $OS to the name of the current node, like hou.expandString().
+
+    Args:
+        value (str): String to expand.
+
+    Returns:
+        str: Expanded string.
+
+    """
+    return value.replace("$OS", _CURRENT_PATH[0].rsplit("/", 1)[-1])
+
+
+def get_evaluation_count():
+    """Return how many parameter values were evaluated since the last clear.
+
+    Returns:
+        int: Amount of calls to eval, evalAsString and rawValue.
+
+    """
+    return _EVALUATIONS[0]
+
+
+def get_change_count():
+    """Return how many parameter values were changed since the last clear.
+
+    Returns:
+        int: Amount of calls to Parm.set, including the ones of setParms.
+
+    """
+    return _CHANGES[0]
+
+
+def clear():
+    """Remove all created nodes."""
+    _NODES.clear()
+    _CHILDREN.clear()
+    _REFERENCES.clear()
+    _EVALUATIONS[0] = 0
+    _CHANGES[0] = 0
+    _CURRENT_PATH[0] = "/"
+    _ENVIRONMENT.clear()
+    _FRAME[0] = 1.0
+    hipFile.saved = []
+
+
+def install():
+    """Make this module importable as `hou`, unless Houdini is available.
+
+    Returns:
+        module: The module that is now importable as `hou`.
+
+    """
+    try:
+        import hou  # pylint: disable=import-error,import-outside-toplevel
+
+        return hou
+    except ImportError:
+        pass
+
+    module = types.ModuleType("hou")
+    for name in (
+        "Node",
+        "Parm",
+        "NodeType",
+        "NodeTypeCategory",
+        "ObjectWasDeleted",
+        "OperationFailed",
+        "PermissionError",
+        "applicationVersionString",
+        "cd",
+        "expandString",
+        "frame",
+        "getenv",
+        "hipFile",
+        "hscript",
+        "node",
+        "parm",
+        "putenv",
+        "pwd",
+        "setFrame",
+        "ui",
+        "unsetenv",
+    ):
+        setattr(module, name, getattr(sys.modules[__name__], name))
+    module.RopNode = Node
+    sys.modules["hou"] = module
+    return module
@@ -0,0 +1,202 @@
+"""Local stand-in for the Deadline Web Service.
+
+Serves the requests used by this package (pools, groups and job submission)
+from a background thread, so the Web Service client can be tested and
+benchmarked without a Deadline repository. Opening a connection and
+answering a request can be slowed down to resemble a Web Service on the
+network, and requests can be set to fail or to drop their connection to test
+the retries.
+
+Examples:
+    >>> service = FakeWebService(latency=0.01)
+    >>> hostname, port = service.start()
+    >>> client = WebServiceClient(hostname, port)
+    >>> client.Pools.GetPoolNames()
+    ['none', 'sim']
+    >>> service.stop()
+
+"""
+
+# Import built-in modules
+import base64
+import itertools
+import json
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler
+    from http.server import HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler  # pylint: disable=import-error
+    from BaseHTTPServer import HTTPServer  # pylint: disable=import-error
+    from SocketServer import ThreadingMixIn  # pylint: disable=import-error
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    """HTTP server handling each connection in its own thread."""
+
+    daemon_threads = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answer the requests of a single connection."""
+
+    # Keep the connection open between requests.
+    protocol_version = "HTTP/1.1"
+    # Send each response right away instead of waiting for more data.
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        """Count the new connection and simulate the time to open it."""
+        BaseHTTPRequestHandler.setup(self)
+        service = self.server.service
+        with service.lock:
+            service.connections += 1
+        time.sleep(service.connect_latency)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Don't log every request."""
+
+    def _respond(self, status, data):
+        content = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _is_authorized(self):
+        credentials = self.server.service.credentials
+        if not credentials:
+            return True
+        token = base64.b64encode(":".join(credentials).encode("utf-8"))
+        expected = "Basic {}".format(token.decode("ascii"))
+        return self.headers.get("Authorization") == expected
+
+    def _handle(self, method):
+        service = self.server.service
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else None
+        if not service.keep_alive:
+            self.close_connection = True
+        time.sleep(service.latency)
+        with service.lock:
+            service.requests += 1
+            if service.failures:
+                service.failures -= 1
+                self._respond(503, "Service Unavailable")
+                return
+        if not self._is_authorized():
+            self._respond(401, "Unauthorized")
+            return
+
+        if method == "GET" and self.path == "/api/pools":
+            status, data = 200, service.pools
+        elif method == "GET" and self.path == "/api/groups":
+            status, data = 200, service.groups
+        elif method == "POST" and self.path == "/api/jobs":
+            data = json.loads(body.decode("utf-8"))
+            with service.lock:
+                job_id = "{:024x}".format(next(service.ids))
+                service.jobs.append((job_id, data["JobInfo"], data["PluginInfo"]))
+            status, data = 200, {"_id": job_id} if data.get("IdOnly") else data
+        else:
+            status, data = 404, "Not Found"
+
+        with service.lock:
+            drop = service.drops > 0
+            service.drops -= int(drop)
+        if drop:
+            # The request was processed, but the connection breaks before the
+            # response is sent.
+            self.close_connection = True
+            return
+        self._respond(status, data)
+
+    def do_GET(self):  # noqa: N802
+        """Answer a GET request."""
+        self._handle("GET")
+
+    def do_POST(self):  # noqa: N802
+        """Answer a POST request."""
+        self._handle("POST")
+
+
+class FakeWebService(object):
+    """Deadline Web Service running in a background thread.
+
+    Args:
+        latency (float, optional): Seconds it takes to answer a request.
+        connect_latency (float, optional): Seconds it takes to open a new
+            connection.
+        failures (int, optional): Amount of requests answered with an
+            internal error before the Web Service works.
+        drops (int, optional): Amount of processed requests whose connection
+            is closed without sending a response.
+        keep_alive (bool, optional): If False, each connection is closed
+            after its first response, like an idle connection timing out.
+        credentials (tuple, optional): User and password each request needs
+            to authenticate with.
+        pools (list of str, optional): Names of the available pools.
+        groups (list of str, optional): Names of the available groups.
+
+    """
+
+    def __init__(
+        self,
+        latency=0.0,
+        connect_latency=0.0,
+        failures=0,
+        pools=None,
+        groups=None,
+        drops=0,
+        keep_alive=True,
+        credentials=None,
+    ):
+        """Initialize the Web Service, it only answers once it's started."""
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self.failures = failures
+        self.drops = drops
+        self.keep_alive = keep_alive
+        self.credentials = credentials
+        self.pools = pools if pools is not None else ["none", "sim"]
+        self.groups = groups if groups is not None else ["none", "render"]
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.jobs = []
+        self.connections = 0
+        self.requests = 0
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        """Start answering requests on a free local port.
+
+        Returns:
+            tuple: Hostname and port of the Web Service.
+
+        """
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.service = self
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self._server.server_address
+
+    @property
+    def address(self):
+        """tuple: Hostname and port of the started Web Service."""
+        return self._server.server_address
+
+    def stop(self):
+        """Stop answering requests."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
@@ -0,0 +1,151 @@
+"""Tests of the cleanup manifests in `houdini_deadline_api_submission.cleanup`.
+
+Examples:
+    $ python -m pytest houdini_deadline_api_submission/test/test_cleanup.py
+
+"""
+
+# Import built-in modules
+import json
+import os
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from houdini_deadline_api_submission import cleanup
+
+
+@pytest.fixture
+def cache_files(tmpdir):
+    """Create the files of a cache job rendering frames 1 to 4.
+
+    Frames 1 and 2 write their own file, frames 3 and 4 share one file. The
+    manifest also lists the hip file, which must never be deleted.
+
+    Returns:
+        tuple: Path of the manifest, the file of each frame and the hip file.
+
+    """
+    frame_files = {}
+    for frame in range(1, 5):
+        name = "cache.{}.ifd".format(frame) if frame < 3 else "cache.ifd"
+        path = tmpdir.join("ifd", name)
+        path.write("x" * frame, ensure=True)
+        frame_files[frame] = str(path)
+    hip_file = tmpdir.join("scene.hip")
+    hip_file.write("")
+    files = list(frame_files.values()) + [str(hip_file)]
+    manifest_path = str(tmpdir.join("manifest", "cache__cleanup.json"))
+    cleanup.write_manifest(
+        manifest_path, files, node="/out/cache", frame_files=frame_files
+    )
+    return manifest_path, frame_files, str(hip_file)
+
+
+def test_manifest_round_trip(cache_files):
+    """The manifest lists each file once and the file of each frame."""
+    manifest_path, frame_files, hip_file = cache_files
+    manifest = cleanup.read_manifest(manifest_path)
+    assert manifest["node"] == "/out/cache"
+    assert manifest["files"] == sorted(set(frame_files.values()) | {hip_file})
+    assert manifest["frames"] == dict(
+        (str(frame), path) for frame, path in frame_files.items()
+    )
+
+
+def test_read_manifest_rejects_other_versions(tmpdir):
+    """Manifests of another version can't be read."""
+    path = tmpdir.join("manifest.json")
+    path.write(json.dumps({"version": cleanup.MANIFEST_VERSION + 1, "files": []}))
+    with pytest.raises(ValueError):
+        cleanup.read_manifest(str(path))
+
+
+def test_get_frame_files_leaves_out_shared_files():
+    """Files used by other frames are kept, unless shared files are included."""
+    manifest = {
+        "frames": {"1": "a.1.ifd", "2": "a.2.ifd", "3": "b.ifd", "4": "b.ifd"}
+    }
+    assert cleanup.get_frame_files(manifest, [1]) == ["a.1.ifd"]
+    assert cleanup.get_frame_files(manifest, [1, 2, 3]) == ["a.1.ifd", "a.2.ifd"]
+    assert cleanup.get_frame_files(manifest, [3, 4]) == ["b.ifd"]
+    assert cleanup.get_frame_files(manifest, [3], include_shared=True) == ["b.ifd"]
+    assert cleanup.get_frame_files({}, [1, 2, 3, 4]) == []
+
+
+def test_get_task_frames_skips_frames_outside_of_job():
+    """Tasks only clean up the frames of the job inside of their range."""
+    manifest = {"frames": {"1": "a.1.ifd", "2": "a.2.ifd", "3": "a.3.ifd"}}
+    assert cleanup.get_task_frames(manifest, 1, 3) == [1, 2, 3]
+    manifest["job_frames"] = [3, 1]
+    assert cleanup.get_job_frames(manifest) == [1, 3]
+    assert cleanup.get_task_frames(manifest, 1, 3) == [1, 3]
+    assert cleanup.get_task_frames(manifest, 2) == []
+
+
+def test_run_cleanup_dry_run(cache_files):
+    """A dry run only reports the files."""
+    manifest_path, frame_files, hip_file = cache_files
+    report = cleanup.run_cleanup(manifest_path, dry_run=True)
+    assert (report["listed"], report["existing"], report["deleted"]) == (4, 3, 0)
+    assert all(os.path.exists(path) for path in frame_files.values())
+    assert os.path.exists(manifest_path)
+
+
+def test_run_cleanup_single_frames(cache_files):
+    """The last task deletes the shared files and the manifest."""
+    manifest_path, frame_files, hip_file = cache_files
+    report = cleanup.run_cleanup(manifest_path, start=3)
+    assert report["deleted"] == 0
+    assert os.path.exists(frame_files[3])
+
+    report = cleanup.run_cleanup(manifest_path, start=1, end=2)
+    assert (report["deleted"], report["bytes"]) == (2, 3)
+    assert not os.path.exists(frame_files[1])
+    assert not os.path.exists(frame_files[2])
+    assert os.path.exists(frame_files[3])
+    assert os.path.exists(manifest_path)
+
+    report = cleanup.run_cleanup(manifest_path, start=4)
+    assert (report["deleted"], report["failed"]) == (1, 0)
+    assert not os.path.exists(frame_files[3])
+    assert not os.path.exists(manifest_path)
+    assert not os.path.exists(cleanup.get_task_folder(manifest_path))
+    assert os.path.exists(hip_file)
+
+
+def test_run_cleanup_keeps_frames_of_other_jobs(cache_files):
+    """Frames inside of a task range that the job doesn't render are kept."""
+    manifest_path, frame_files, hip_file = cache_files
+    manifest = cleanup.read_manifest(manifest_path)
+    cleanup.write_manifest(
+        manifest_path,
+        manifest["files"],
+        frame_files=frame_files,
+        job_frames=[1, 3, 4],
+    )
+    report = cleanup.run_cleanup(manifest_path, start=1, end=3)
+    assert report["deleted"] == 1
+    assert not os.path.exists(frame_files[1])
+    assert os.path.exists(frame_files[2])
+
+    report = cleanup.run_cleanup(manifest_path, start=4, dry_run=True)
+    assert report["existing"] == 0
+    assert os.path.exists(frame_files[3])
+
+    report = cleanup.run_cleanup(manifest_path, start=4)
+    assert report["deleted"] == 1
+    assert not os.path.exists(frame_files[3])
+    assert os.path.exists(frame_files[2])
+    assert not os.path.exists(manifest_path)
+
+
+def test_run_cleanup_deletes_manifest(cache_files):
+    """Cleaning up all files deletes the manifest, but never the hip file."""
+    manifest_path, frame_files, hip_file = cache_files
+    report = cleanup.run_cleanup(manifest_path, max_workers=2)
+    assert (report["deleted"], report["failed"]) == (3, 0)
+    assert not any(os.path.exists(path) for path in frame_files.values())
+    assert not os.path.exists(manifest_path)
+    assert os.path.exists(hip_file)
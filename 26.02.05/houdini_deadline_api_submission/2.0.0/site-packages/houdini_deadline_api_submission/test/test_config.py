@@ -0,0 +1,107 @@
+"""Tests of the cached configuration in `houdini_deadline_api_submission.config`.
+
+Examples:
+    $ python -m pytest houdini_deadline_api_submission/test/test_config.py
+
+"""
+
+# Import built-in modules
+import os
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from houdini_deadline_api_submission import config
+from houdini_deadline_api_submission import constants
+
+
+class FakeConfiguration(object):
+    """Stand-in for `hal_config.Configuration` counting the loaded configs."""
+
+    loaded = 0
+
+    def __init__(self):
+        """Count the new configuration, like hal_config parsing its files."""
+        FakeConfiguration.loaded += 1
+        self.version = FakeConfiguration.loaded
+
+    def query(self, package, value, **kwargs):
+        """Return the queried value together with the configuration version.
+
+        Args:
+            package (str): Name of the configured package.
+            value (str): Name of the queried value.
+            **kwargs: Query arguments.
+
+        Returns:
+            dict: The query and the version of this configuration.
+
+        """
+        return {"package": package, "value": value, "version": self.version}
+
+
+@pytest.fixture(autouse=True)
+def fake_configuration(monkeypatch):
+    """Replace hal_config with FakeConfiguration."""
+    FakeConfiguration.loaded = 0
+    monkeypatch.setattr(config.hal_config, "Configuration", FakeConfiguration)
+    monkeypatch.delenv(constants.CONFIG_FILES_ENV, raising=False)
+
+
+def test_values_are_cached():
+    """Values are only queried once and returned as copies."""
+    cache = config.ConfigCache(files=[], ttl=None)
+    first = cache.query("job_info")
+    first["value"] = "changed by caller"
+    assert cache.query("job_info")["value"] == "job_info"
+    cache.query("plugin_info")
+    assert FakeConfiguration.loaded == 1
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_changed_file_invalidates(tmpdir):
+    """Modifying a watched file loads the configuration again."""
+    config_file = tmpdir.join("houdini_deadline_api_submission.yaml")
+    config_file.write("job_info: {}")
+    cache = config.ConfigCache(files=[str(config_file)])
+    assert cache.query("job_info")["version"] == 1
+    assert cache.query("job_info")["version"] == 1
+
+    mtime = os.path.getmtime(str(config_file))
+    os.utime(str(config_file), (mtime + 10, mtime + 10))
+    assert cache.query("job_info")["version"] == 2
+
+
+def test_files_are_read_from_environment(monkeypatch, tmpdir):
+    """Files listed in the environment are watched, even once removed."""
+    config_file = tmpdir.join("houdini_deadline_api_submission.yaml")
+    config_file.write("job_info: {}")
+    monkeypatch.setenv(
+        constants.CONFIG_FILES_ENV, os.pathsep.join([str(config_file), ""])
+    )
+    cache = config.ConfigCache()
+    assert cache.files == [str(config_file)]
+    cache.query("job_info")
+    config_file.remove()
+    assert cache.query("job_info")["version"] == 2
+
+
+def test_ttl_invalidates_without_files(monkeypatch):
+    """Without watched files, values expire after the ttl."""
+    now = [1000.0]
+    monkeypatch.setattr(config.time, "time", lambda: now[0])
+    cache = config.ConfigCache(files=[], ttl=60)
+    assert cache.query("job_info")["version"] == 1
+    now[0] += 59
+    assert cache.query("job_info")["version"] == 1
+    now[0] += 2
+    assert cache.query("job_info")["version"] == 2
+
+
+def test_clear_invalidates():
+    """Clearing the cache loads the configuration again."""
+    cache = config.ConfigCache(files=[], ttl=None)
+    cache.query("job_info")
+    cache.clear()
+    assert cache.query("job_info")["version"] == 2
@@ -0,0 +1,190 @@
+"""Tests of the adaptive chunks in `houdini_deadline_api_submission.cost_model`.
+
+Examples:
+    $ python -m pytest houdini_deadline_api_submission/test/test_cost_model.py
+
+"""
+
+# Import built-in modules
+import json
+import os
+import time
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from houdini_deadline_api_submission import constants
+from houdini_deadline_api_submission import cost_model
+from houdini_deadline_api_submission.test import benchmark_submission
+from houdini_deadline_api_submission.test import fake_hou
+from houdini_deadline_api_submission.test.fake_deadline import FakeDeadlineCon
+
+KEY = "shot:/out/geo:sopoutput"
+
+
+@pytest.fixture
+def store(tmpdir):
+    """Return an empty store writing its stats into a temporary folder."""
+    return cost_model.JobStatsStore(str(tmpdir.join("stats", "job_stats.json")))
+
+
+def create_task(frames, startup, render, status=cost_model.TASK_COMPLETED):
+    """Return a task as returned by the Deadline Web Service.
+
+    Args:
+        frames (str): Frame string of the task.
+        startup (int): Seconds before the task started rendering.
+        render (int): Seconds the task rendered.
+        status (int, optional): Status of the task.
+
+    Returns:
+        dict: The task.
+
+    """
+    return {
+        "Frames": frames,
+        "Stat": status,
+        "Start": "2026-10-18T12:00:00.000Z",
+        "StartRen": "2026-10-18T12:{:02d}:{:02d}.000Z".format(*divmod(startup, 60)),
+        "Comp": "2026-10-18T12:{:02d}:{:02d}.000Z".format(
+            *divmod(startup + render, 60)
+        ),
+    }
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("2026-10-18T12:00:30.1234567-05:00", 1792324830.0),
+        ("1970-01-01T00:00:00Z", 0.0),
+        ("0001-01-01T00:00:00Z", None),
+        ("", None),
+        (None, None),
+        ("Oct 18 2026", None),
+    ],
+)
+def test_parse_date(value, expected):
+    """Dates are parsed without fractions, tasks that didn't start are None."""
+    assert cost_model._parse_date(value) == expected  # pylint: disable=protected-access
+
+
+def test_get_task_durations():
+    """Only completed tasks with valid dates and frames are measured."""
+    tasks = [
+        create_task("1-10", 30, 100),
+        create_task("11", 20, 5),
+        create_task("12-20", 30, 90, status=4),
+        create_task("", 30, 100),
+        dict(create_task("21-30", 30, 100), StartRen="0001-01-01T00:00:00Z"),
+        dict(create_task("31-40", 30, 100), Comp="2026-10-18T11:00:00.000Z"),
+        create_task("41-a", 30, 100),
+    ]
+    assert cost_model.get_task_durations(tasks) == ([10.0, 5.0], [30.0, 20.0])
+
+
+@pytest.mark.parametrize(
+    "cost, frames, target_seconds, max_concurrent_tasks, expected",
+    [
+        (cost_model.Cost(100.0, 60.0, 10), 100, 600, 1, (5, 1)),
+        # A target below the startup still renders a frame per task.
+        (cost_model.Cost(100.0, 60.0, 10), 100, 30, 1, (1, 1)),
+        # The chunk size never exceeds the frames of the job.
+        (cost_model.Cost(1.0, 10.0, 10), 20, 600, 1, (20, 1)),
+        (cost_model.Cost(0.0, 10.0, 10), 20, 600, 1, (20, 1)),
+        # Slow startups run multiple tasks on a worker at the same time.
+        (cost_model.Cost(10.0, 300.0, 10), 10, 120, 4, (1, 4)),
+        (cost_model.Cost(10.0, 300.0, 10), 10, 120, 2, (1, 2)),
+        (cost_model.Cost(10.0, 30.0, 10), 10, 120, 4, (9, 1)),
+        (cost_model.Cost(10.0, 0.0, 10), 0, 600, 4, (1, 1)),
+    ],
+)
+def test_get_chunk_settings(
+    cost, frames, target_seconds, max_concurrent_tasks, expected
+):
+    """Tasks take about the target duration, including their startup."""
+    assert (
+        cost_model.get_chunk_settings(
+            cost, frames, target_seconds, max_concurrent_tasks=max_concurrent_tasks
+        )
+        == expected
+    )
+
+
+def test_get_cost_key():
+    """The version of the scene is left out of the key."""
+    fake_hou.clear()
+    node = benchmark_submission.create_rop("/out/geo")
+    output_parm = node.parm("sopoutput")
+    assert cost_model.get_cost_key(node, output_parm, "shot_v012.hip") == KEY
+    assert cost_model.get_cost_key(node, None, "shot.v3.hip") == "shot:/out/geo:"
+
+
+def test_store_records_median_cost(store):
+    """Costs are the median of the latest recorded tasks."""
+    assert store.get_cost(KEY) is None
+    store.record(KEY, [10.0, 30.0, 20.0], [5.0, 1.0, 3.0])
+    cost = store.get_cost(KEY)
+    assert (cost.frame_seconds, cost.startup_seconds, cost.samples) == (20.0, 3.0, 3)
+
+    store.record(KEY, [], [])
+    store.record(KEY, [40.0], [7.0])
+    assert store.get_cost(KEY).frame_seconds == 25.0
+
+    store.record(KEY, [100.0] * constants.JOB_STATS_SAMPLES, [0.0] * 20)
+    cost = store.get_cost(KEY)
+    assert cost.samples == constants.JOB_STATS_SAMPLES
+    assert cost.frame_seconds == 100.0
+
+
+def test_store_round_trip(store):
+    """Saved stats are read by other sessions, replacing the previous ones."""
+    store.record(KEY, [10.0], [5.0])
+    store.add_pending("64f0c0de", KEY)
+    store.save()
+    store.record(KEY, [30.0], [5.0])
+    store.save()
+    assert os.listdir(os.path.dirname(store.path)) == ["job_stats.json"]
+
+    other = cost_model.JobStatsStore(store.path)
+    assert other.get_cost(KEY).frame_seconds == 20.0
+    assert list(other.pending) == ["64f0c0de"]
+
+
+@pytest.mark.parametrize(
+    "content", ["not json", json.dumps({"version": cost_model.STATS_VERSION + 1})]
+)
+def test_store_ignores_invalid_stats(store, content):
+    """Unreadable stats or stats of other versions start without stats."""
+    os.makedirs(os.path.dirname(store.path))
+    with open(store.path, "w") as stats_file:
+        stats_file.write(content)
+    assert store.get_cost(KEY) is None
+    assert store.pending == {}
+
+
+def test_refresh_records_finished_jobs(store):
+    """Finished jobs are recorded, rendering ones stay pending until they expire."""
+    deadline_con = FakeDeadlineCon()
+    deadline_con.tasks["finished"] = [
+        create_task("1-10", 30, 100),
+        create_task("11-20", 10, 100),
+    ]
+    deadline_con.tasks["rendering"] = [
+        create_task("1-10", 30, 100),
+        create_task("11-20", 30, 100, status=4),
+    ]
+    deadline_con.tasks["expired"] = [create_task("1-10", 30, 50, status=4)]
+    for deadline_id in ("finished", "rendering", "expired"):
+        store.add_pending(deadline_id, KEY)
+    store.pending["expired"]["submitted"] = (
+        time.time() - constants.JOB_STATS_PENDING_TTL - 1
+    )
+
+    assert store.refresh(deadline_con) == 1
+    assert list(store.pending) == ["rendering"]
+    cost = store.get_cost(KEY)
+    assert (cost.frame_seconds, cost.startup_seconds, cost.samples) == (10.0, 20.0, 2)
+    other = cost_model.JobStatsStore(store.path)
+    other.load()
+    assert list(other.pending) == ["rendering"]
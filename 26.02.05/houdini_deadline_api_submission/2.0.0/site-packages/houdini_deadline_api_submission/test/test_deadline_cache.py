@@ -0,0 +1,152 @@
+"""Tests of the Deadline lists in `houdini_deadline_api_submission.deadline_cache`.
+
+Examples:
+    $ python -m pytest houdini_deadline_api_submission/test/test_deadline_cache.py
+
+"""
+
+# Import built-in modules
+import json
+import os
+import time
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from houdini_deadline_api_submission import constants
+from houdini_deadline_api_submission import deadline_cache
+
+
+class FakeFetch(object):
+    """Function returning the list of Deadline, counting its calls.
+
+    Args:
+        values (list of str): The list of Deadline.
+
+    """
+
+    def __init__(self, values):
+        """Initialize the function."""
+        self.values = values
+        self.calls = 0
+
+    def __call__(self):
+        """Return the list, raise an error if Deadline is unreachable."""
+        self.calls += 1
+        if self.values is None:
+            raise RuntimeError("The Web Service is unreachable.")
+        return list(self.values)
+
+
+@pytest.fixture
+def fetch():
+    """Return the fetch function of a Deadline with two pools."""
+    return FakeFetch(["cpu", "gpu"])
+
+
+@pytest.fixture
+def cache(tmpdir, fetch):
+    """Return an empty cache storing its file in a temporary folder."""
+    return deadline_cache.DeadlineListCache(
+        "pools", fetch, folder=str(tmpdir.join("cache"))
+    )
+
+
+def wait_for_refresh(cache):
+    """Wait for the background refresh of the given cache to finish."""
+    if cache._refresh_thread:  # pylint: disable=protected-access
+        cache._refresh_thread.join(5)  # pylint: disable=protected-access
+
+
+def test_get_queries_missing_list(cache, fetch):
+    """Without a list in memory or on disk, Deadline is queried right away."""
+    assert cache.get() == ["cpu", "gpu"]
+    assert fetch.calls == 1
+    with open(cache.path) as cache_file:
+        assert json.load(cache_file)["values"] == ["cpu", "gpu"]
+
+    assert cache.get() == ["cpu", "gpu"]
+    assert fetch.calls == 1
+
+
+def test_get_falls_back_to_disk(cache, fetch):
+    """A new session uses the list on disk without querying Deadline."""
+    cache.get()
+    other = deadline_cache.DeadlineListCache("pools", fetch, folder=cache.folder)
+    assert other.get() == ["cpu", "gpu"]
+    assert fetch.calls == 1
+
+
+def test_save_replaces_list(cache, fetch):
+    """Saving overwrites the list on disk without leaving temporary files."""
+    cache.get()
+    fetch.values = ["cpu"]
+    cache.refresh()
+    assert os.listdir(cache.folder) == ["pools.json"]
+    other = deadline_cache.DeadlineListCache("pools", fetch, folder=cache.folder)
+    assert other.get() == ["cpu"]
+
+
+def test_outdated_list_is_refreshed_in_background(cache, fetch):
+    """Lists older than their time to live are returned and refreshed."""
+    cache.get()
+    fetch.values = ["cpu"]
+    cache.updated = time.time() - cache.ttl - 1
+    cache.last_attempt = 0.0
+    assert cache.get() == ["cpu", "gpu"]
+    wait_for_refresh(cache)
+    assert fetch.calls == 2
+    assert cache.get() == ["cpu"]
+    assert not cache.is_outdated()
+
+
+def test_failed_query_keeps_last_list(cache, fetch):
+    """The last known list is kept while Deadline is unreachable."""
+    cache.get()
+    fetch.values = None
+    assert cache.refresh() == ["cpu", "gpu"]
+    assert cache.get() == ["cpu", "gpu"]
+
+
+def test_failed_query_is_retried_later(cache, fetch, monkeypatch):
+    """An unreachable Deadline is only asked again after the retry delay."""
+    fetch.values = None
+    assert cache.get() == []
+    assert cache.get() == []
+    assert fetch.calls == 1
+
+    monkeypatch.setattr(
+        deadline_cache.time,
+        "time",
+        lambda: cache.last_attempt + constants.DEADLINE_LIST_RETRY + 1,
+    )
+    fetch.values = ["cpu"]
+    assert cache.get() == ["cpu"]
+    assert fetch.calls == 2
+
+
+def test_background_refresh_is_throttled(cache, fetch):
+    """Outdated lists aren't queried again right after a failed attempt."""
+    cache.get()
+    fetch.values = None
+    cache.updated = 0.0
+    cache.last_attempt = 0.0
+    cache.get()
+    wait_for_refresh(cache)
+    assert fetch.calls == 2
+    cache.get()
+    wait_for_refresh(cache)
+    assert fetch.calls == 2
+
+
+def test_invalidate(cache, fetch):
+    """Invalidated lists are kept until the next refresh succeeded."""
+    cache.get()
+    fetch.values = ["cpu"]
+    cache.invalidate()
+    assert cache.is_outdated()
+    assert cache.get() == ["cpu", "gpu"]
+    wait_for_refresh(cache)
+    assert fetch.calls == 2
+    assert cache.get() == ["cpu"]
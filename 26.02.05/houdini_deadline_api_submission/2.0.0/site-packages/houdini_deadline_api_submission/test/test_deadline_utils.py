@@ -0,0 +1,95 @@
+"""Tests of the job environment in `houdini_deadline_api_submission.deadline_utils`.
+
+Examples:
+    $ python -m pytest houdini_deadline_api_submission/test/test_deadline_utils.py
+
+"""
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from houdini_deadline_api_submission import deadline_utils
+from houdini_deadline_api_submission.deadline_utils import EnvironmentBlock
+
+
+def test_variables_are_added_sorted_by_name():
+    """Initial variables get their index in the order of their names."""
+    block = EnvironmentBlock({"HAL_ROOT": "U:/", "HAL_DEADLINE_USE_HAL": True})
+    assert list(block) == ["HAL_DEADLINE_USE_HAL", "HAL_ROOT"]
+    assert block.to_deadline_dict() == {
+        "EnvironmentKeyValue0": "HAL_DEADLINE_USE_HAL=True",
+        "EnvironmentKeyValue1": "HAL_ROOT=U:/",
+    }
+
+
+def test_setting_a_variable_again_keeps_its_index():
+    """The last value wins, new variables are appended."""
+    block = EnvironmentBlock({"HAL_ROOT": "U:/"})
+    assert block.set("WEDGE", "_seed_1") == 1
+    assert block.set("HAL_ROOT", "V:/") == 0
+    assert len(block) == 2
+    assert block.index("WEDGE") == 1
+    assert block.get("HAL_ROOT") == "V:/"
+    assert "WEDGE" in block
+    assert block.get("MISSING", "default") == "default"
+
+
+def test_index_of_missing_variable():
+    """Looking up the index of a missing variable raises a ValueError."""
+    with pytest.raises(ValueError):
+        EnvironmentBlock().index("HAL_ROOT")
+
+
+def test_overlay_leaves_the_block_unchanged():
+    """An overlay is an independent copy with the given variables on top."""
+    block = EnvironmentBlock({"HAL_ROOT": "U:/"})
+    overlay = block.overlay({"HAL_ROOT": "V:/", "WEDGE": "_seed_1"})
+    assert overlay.to_deadline_dict() == {
+        "EnvironmentKeyValue0": "HAL_ROOT=V:/",
+        "EnvironmentKeyValue1": "WEDGE=_seed_1",
+    }
+    assert block.to_deadline_dict() == {"EnvironmentKeyValue0": "HAL_ROOT=U:/"}
+    assert block.overlay(None).to_deadline_dict() == block.to_deadline_dict()
+
+
+def test_update_from_block_keeps_its_order():
+    """Variables of another block are added in the order of their index."""
+    other = EnvironmentBlock()
+    other.set("B", 1)
+    other.set("A", 2)
+    block = EnvironmentBlock()
+    block.update(other)
+    assert list(block) == ["B", "A"]
+
+
+def test_from_deadline_dict():
+    """Variables are read in the order of their index, other keys ignored."""
+    deadline_dict = {
+        "EnvironmentKeyValue10": "LAST=a=b",
+        "EnvironmentKeyValue2": "FIRST=1",
+        "EnvironmentKeyValueX": "IGNORED=1",
+        "Name": "job",
+    }
+    block = EnvironmentBlock.from_deadline_dict(deadline_dict)
+    assert list(block) == ["FIRST", "LAST"]
+    assert block.get("LAST") == "a=b"
+
+
+def test_round_trip():
+    """Converting a block to a Deadline dict and back keeps all variables."""
+    block = EnvironmentBlock({"HAL_ROOT": "U:/", "HAL_TASK": "fx"})
+    block.set("WEDGE", "_seed_1")
+    restored = EnvironmentBlock.from_deadline_dict(block.to_deadline_dict())
+    assert restored.to_deadline_dict() == block.to_deadline_dict()
+
+
+def test_append_to_deadline_env():
+    """Appending a set variable replaces its value instead of adding it."""
+    deadline_dict = deadline_utils.convert_to_deadline_env({"HAL_ROOT": "U:/"})
+    deadline_utils.append_to_deadline_env(deadline_dict, "WEDGE", "_seed_1")
+    deadline_utils.append_to_deadline_env(deadline_dict, "HAL_ROOT", "V:/")
+    assert deadline_dict == {
+        "EnvironmentKeyValue0": "HAL_ROOT=V:/",
+        "EnvironmentKeyValue1": "WEDGE=_seed_1",
+    }
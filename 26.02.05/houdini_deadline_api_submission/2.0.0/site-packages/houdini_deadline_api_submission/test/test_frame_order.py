@@ -0,0 +1,128 @@
+"""Tests of `houdini_deadline_api_submission.frame_order`.
+
+Examples:
+    $ python -m pytest houdini_deadline_api_submission/test/test_frame_order.py
+
+"""
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from houdini_deadline_api_submission import frame_order
+
+
+def test_get_frame_range():
+    """The end frame is included if the increment reaches it."""
+    assert frame_order.get_frame_range(1, 5) == [1, 2, 3, 4, 5]
+    assert frame_order.get_frame_range(1, 10, 4) == [1, 5, 9]
+    assert frame_order.get_frame_range(1, 3, 0) == [1, 2, 3]
+
+
+def test_order_first_last_middle():
+    """First, last and middle frame come first, then the bisected segments."""
+    assert frame_order.order_first_last_middle(range(1, 10), min_gap=2) == [
+        1,
+        9,
+        5,
+        3,
+        7,
+        2,
+        4,
+        6,
+        8,
+    ]
+
+
+def test_order_first_last_middle_keeps_every_frame_once():
+    """Each frame is ordered once, including duplicates and gaps."""
+    frames = [1, 2, 2, 7, 30, 31, 55, 100, 100]
+    ordered = frame_order.order_first_last_middle(frames)
+    assert ordered[:2] == [1, 100]
+    assert sorted(ordered) == sorted(set(frames))
+
+
+def test_order_first_last_middle_short_lists():
+    """Up to two frames are simply sorted."""
+    assert frame_order.order_first_last_middle([]) == []
+    assert frame_order.order_first_last_middle([5, 1]) == [1, 5]
+
+
+def get_tasks(frames, chunk_size):
+    """Split frames into tasks the way Deadline does.
+
+    Args:
+        frames (list of int): Frames in render order.
+        chunk_size (int): Amount of frames per task.
+
+    Returns:
+        list of list of int: Frames of each task.
+
+    """
+    return [
+        frames[index : index + chunk_size]
+        for index in range(0, len(frames), chunk_size)
+    ]
+
+
+@pytest.mark.parametrize("frames", [range(1001, 1101), range(1, 24), range(1, 3)])
+def test_order_first_last_middle_chunks(frames):
+    """Chunks are ordered as a whole, so tasks are the same as in ascending order."""
+    ordered = frame_order.order_first_last_middle(frames, chunk_size=10)
+    tasks = get_tasks(ordered, 10)
+    assert sorted(tasks) == get_tasks(list(frames), 10)
+    for task in tasks:
+        assert task == list(range(task[0], task[-1] + 1))
+    assert tasks[0][0] == frames[0]
+
+
+def test_order_first_last_middle_chunks_keeps_shorter_chunk_last():
+    """The first and last full chunk come first, the shorter chunk last."""
+    ordered = frame_order.order_first_last_middle(range(1001, 1106), chunk_size=10)
+    assert frame_order.compress_frames(ordered).split(",")[:3] == [
+        "1001-1010",
+        "1091-1100",
+        "1041-1050",
+    ]
+    assert ordered[-5:] == [1101, 1102, 1103, 1104, 1105]
+
+
+def test_compress_frames():
+    """Runs of at least three frames with the same increment are combined."""
+    assert frame_order.compress_frames([1, 9, 5, 3, 7, 2, 4, 6, 8]) == (
+        "1,9,5,3,7,2-8x2"
+    )
+    assert frame_order.compress_frames([1, 2, 3, 4]) == "1-4"
+    assert frame_order.compress_frames([1, 2, 10, 11]) == "1,2,10,11"
+    assert frame_order.compress_frames([]) == ""
+
+
+@pytest.mark.parametrize(
+    "frames",
+    [
+        list(range(1001, 1101)),
+        frame_order.order_first_last_middle(range(1001, 1241)),
+        [5, 4, 3, 2, 1],
+        [-3, -2, -1, 0, 1],
+    ],
+)
+def test_compress_frames_round_trip(frames):
+    """Parsing a compressed frame string returns the frames in order."""
+    assert frame_order.parse_framestring(frame_order.compress_frames(frames)) == (
+        frames
+    )
+
+
+def test_parse_framestring():
+    """Ranges can be reversed, have an increment and overlap."""
+    assert frame_order.parse_framestring("1-3, 10") == [1, 2, 3, 10]
+    assert frame_order.parse_framestring("5-1") == [5, 4, 3, 2, 1]
+    assert frame_order.parse_framestring("1-9x4,1-3") == [1, 5, 9, 2, 3]
+    assert frame_order.parse_framestring("") == []
+
+
+@pytest.mark.parametrize("framestring", ["1-", "a", "1-5x0", "1-5y2"])
+def test_parse_framestring_invalid(framestring):
+    """Invalid tokens raise a ValueError."""
+    with pytest.raises(ValueError):
+        frame_order.parse_framestring(framestring)
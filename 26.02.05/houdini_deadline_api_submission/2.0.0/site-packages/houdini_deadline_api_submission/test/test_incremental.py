@@ -0,0 +1,92 @@
+"""Tests of skipping existing frames in `houdini_deadline_api_submission.incremental`.
+
+Examples:
+    $ python -m pytest houdini_deadline_api_submission/test/test_incremental.py
+
+"""
+
+# Import built-in modules
+import os
+import sys
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from houdini_deadline_api_submission import constants
+from houdini_deadline_api_submission import incremental
+
+
+@pytest.fixture
+def mounts(monkeypatch):
+    """Replace the mounts of this machine with a local disk and a NFS share."""
+    monkeypatch.setattr(sys, "platform", "linux")
+    monkeypatch.setattr(
+        incremental, "_MOUNTS", [("/mnt/projects", "nfs4"), ("/", "ext4")]
+    )
+
+
+@pytest.fixture
+def used_workers(monkeypatch):
+    """Record the amount of threads each check of the outputs started."""
+    workers = []
+
+    class RecordingExecutor(incremental.ThreadPoolExecutor):
+        def __init__(self, max_workers=None):
+            workers.append(max_workers)
+            super(RecordingExecutor, self).__init__(max_workers=max_workers)
+
+    monkeypatch.setattr(incremental, "ThreadPoolExecutor", RecordingExecutor)
+    return workers
+
+
+def test_is_network_path(mounts):
+    """UNC paths and paths on network file systems are network paths."""
+    assert incremental.is_network_path("//server/share/render.exr")
+    assert incremental.is_network_path("\\\\server\\share\\render.exr")
+    assert incremental.is_network_path("/mnt/projects/show/render.exr")
+    assert incremental.is_network_path("/mnt/projects")
+    assert not incremental.is_network_path("/mnt/projects_local/render.exr")
+    assert not incremental.is_network_path("/tmp/render.exr")
+
+
+def test_get_missing_frames(tmpdir):
+    """Missing, too small and outdated files are rendered again."""
+    paths = {}
+    for frame in range(1, 6):
+        path = tmpdir.join("render.{}.exr".format(frame))
+        paths[frame] = str(path)
+        if frame != 2:
+            path.write("x" * frame)
+    os.utime(paths[5], (1000, 1000))
+    # Frames without $F share their output, which is only checked once.
+    paths[6] = paths[1]
+
+    validation = incremental.OutputValidation(min_size=2, newer_than=2000)
+    assert incremental.get_missing_frames(paths, validation) == [1, 2, 5, 6]
+    assert incremental.get_missing_frames(paths) == [2]
+
+
+def test_local_files_are_checked_serially(mounts, used_workers):
+    """Files on local disks are checked without any threads."""
+    paths = dict((frame, "/tmp/render.{}.exr".format(frame)) for frame in range(500))
+    assert incremental.get_missing_frames(paths) == list(range(500))
+    assert used_workers == []
+
+
+def test_network_files_are_checked_by_threads(mounts, used_workers):
+    """Many files on network storage are checked through threads."""
+    paths = dict(
+        (frame, "/mnt/projects/render.{}.exr".format(frame)) for frame in range(500)
+    )
+    assert incremental.get_missing_frames(paths) == list(range(500))
+    assert used_workers == [-(-500 // incremental.MIN_CHUNK_SIZE)]
+
+    # A few files are always checked by a single thread.
+    incremental.get_missing_frames(dict(list(paths.items())[:10]))
+    assert len(used_workers) == 1
+
+    incremental.get_missing_frames(
+        paths, max_workers=constants.DEFAULT_STAT_WORKERS
+    )
+    assert len(used_workers) == 2
@@ -0,0 +1,218 @@
+"""Tests of the jobs in `houdini_deadline_api_submission.job.base`.
+
+Examples:
+    $ python -m pytest houdini_deadline_api_submission/test/test_job.py
+
+"""
+
+# Import built-in modules
+import itertools
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from houdini_deadline_api_submission import constants
+from houdini_deadline_api_submission import frame_order
+from houdini_deadline_api_submission import utils
+from houdini_deadline_api_submission.job.base import BaseDeadlineJob
+from houdini_deadline_api_submission.job.job_set import JobSet
+from houdini_deadline_api_submission.job.utility import CleanUpJob
+from houdini_deadline_api_submission.test import benchmark_submission
+from houdini_deadline_api_submission.test import fake_hou
+
+
+@pytest.fixture
+def submitter():
+    """Create the submitter node in an empty scene."""
+    fake_hou.clear()
+    yield benchmark_submission.create_submitter()
+    fake_hou.clear()
+
+
+def create_job(submitter, path, **kwargs):
+    """Create a ROP and its job.
+
+    Args:
+        submitter (hou.Node): The submitter node.
+        path (str): Absolute path of the ROP.
+        **kwargs: Arguments of the job.
+
+    Returns:
+        BaseDeadlineJob: The job of the ROP.
+
+    """
+    node = fake_hou.node(path) or benchmark_submission.create_rop(path)
+    kwargs.setdefault("output_parm_name", "sopoutput")
+    kwargs.setdefault("timestamp", "2026-10-18 12:00:00")
+    return BaseDeadlineJob(node, kwargs.pop("dependencies", []), submitter, **kwargs)
+
+
+def test_submit_parm_overrides_update_frame_range_cache(submitter):
+    """Frame ranges resolved before the overrides are set aren't reused."""
+    job = create_job(submitter, "/out/geo1", node_parm_overrides={"f2": 20})
+    with utils.frame_range_cache():
+        assert utils.get_frames(job.node)[:2] == (1, 10)
+        job.pre_submit()
+        assert utils.get_frames(job.node)[:2] == (1, 20)
+        job.post_submit()
+        assert utils.get_frames(job.node)[:2] == (1, 10)
+
+
+def previous_eq(job, other):
+    """Compare two jobs like `BaseDeadlineJob.__eq__` did before it used keys.
+
+    Args:
+        job (BaseDeadlineJob): The job to compare.
+        other (BaseDeadlineJob): The job to compare it to.
+
+    Returns:
+        bool: True if the two jobs have the same settings, False otherwise.
+
+    """
+    if not isinstance(other, job.__class__):
+        return False
+
+    same_parms = all(
+        (
+            job.node == other.node,
+            job.job_info == other.job_info,
+            job.plugin_info == other.plugin_info,
+            job.wedge_values == other.wedge_values,
+            job.wedge_index == other.wedge_index,
+            job.output_parm == other.output_parm,
+            job.submitter_node == other.submitter_node,
+        )
+    )
+    if not same_parms:
+        return False
+    for this_dependency, other_dependency in zip(job.dependencies, other.dependencies):
+        if this_dependency.node != other_dependency.node:
+            return False
+    for this_job, other_job in zip(job.jobs, other.jobs):
+        if this_job.wedge_index != other_job.wedge_index:
+            return False
+        if this_job.wedge_values != other_job.wedge_values:
+            return False
+    return True
+
+
+def create_distinct_jobs(submitter):
+    """Create jobs of which no two may share their identity.
+
+    Args:
+        submitter (hou.Node): The submitter node.
+
+    Returns:
+        list of BaseDeadlineJob: Jobs of different ROPs, wedges, classes,
+            plugins and outputs.
+
+    """
+    render = benchmark_submission.create_rop("/out/render", "ifd")
+    render.setParms(
+        {"soho_diskfile": "$HIP/ifd/render.$F4.ifd", "vm_picture": "$HIP/render.exr"}
+    )
+    wedged = benchmark_submission.create_rop("/out/wedged")
+    benchmark_submission.set_wedges(wedged, 4)
+
+    geo = create_job(submitter, "/out/geo")
+    jobs = [geo, create_job(submitter, "/out/other")]
+    jobs.extend(create_job(submitter, "/out/wedged").jobs)
+    # The jobs a render ROP is split into.
+    jobs.append(create_job(submitter, "/out/render", output_parm_name="soho_diskfile"))
+    jobs.append(
+        create_job(
+            submitter,
+            "/out/render",
+            plugin_name=constants.MANTRA_PLUGIN,
+            output_parm_name="vm_picture",
+        )
+    )
+    jobs.append(
+        CleanUpJob(
+            "/tmp",
+            "geo",
+            geo.node,
+            [geo],
+            submitter,
+            output_parm_name="sopoutput",
+            timestamp=geo.timestamp,
+        )
+    )
+    return jobs
+
+
+def test_distinct_jobs_never_collide(submitter):
+    """Jobs of different ROPs, wedges or roles have different identities."""
+    jobs = create_distinct_jobs(submitter)
+    assert len(jobs) == 9
+    assert len({job.key for job in jobs}) == len(jobs)
+    assert len({hash(job) for job in jobs}) == len(jobs)
+    for job, other in itertools.permutations(jobs, 2):
+        assert job != other
+        assert not job.is_equivalent(other)
+    assert list(JobSet(jobs)) == jobs
+
+
+def test_same_job_shares_identity(submitter):
+    """Creating the job of the same ROP again results in the same identity."""
+    job = create_job(submitter, "/out/geo")
+    other = create_job(submitter, "/out/geo", job_info_overrides={"Priority": 99})
+    assert job == other
+    assert hash(job) == hash(other)
+    assert not job.is_equivalent(other)
+
+    dependencies = JobSet([job])
+    assert not dependencies.add(other)
+    assert other in dependencies
+    assert list(dependencies) == [job]
+
+
+def test_is_equivalent_matches_previous_eq(submitter):
+    """`is_equivalent` compares jobs like `__eq__` did before."""
+    jobs = create_distinct_jobs(submitter)
+    geo = jobs[0]
+    jobs.extend(
+        [
+            create_job(submitter, "/out/geo"),
+            create_job(submitter, "/out/geo", job_info_overrides={"Priority": 99}),
+            create_job(submitter, "/out/geo", dependencies=[jobs[1]]),
+            create_job(submitter, "/out/geo", node_parm_overrides={"f2": 20}),
+        ]
+    )
+    for job, other in itertools.product(jobs, repeat=2):
+        assert job.is_equivalent(other) == previous_eq(job, other)
+    assert geo.is_equivalent(jobs[-4])
+    assert geo.is_equivalent(jobs[-1])
+    assert not geo.is_equivalent(jobs[-3])
+
+
+def test_post_submit_failed_logs_submitted_jobs(submitter):
+    """The IDs of the jobs submitted before the failure are logged."""
+    job = create_job(submitter, "/out/geo")
+    assert job.post_submit_failed() == []
+    job.deadline_id = "64f0c0de"
+    assert job.post_submit_failed() == ["64f0c0de"]
+    log = job.node.evalParm(constants.LOG_PARM)
+    assert "Submission failed" in log
+    assert "Submitted jobs: 64f0c0de" in log
+
+
+@pytest.mark.parametrize("chunk_size", [1, 10])
+def test_order_frames_keeps_tasks_contiguous(submitter, chunk_size):
+    """First-last-middle orders single frames or whole chunks of a job."""
+    job = create_job(submitter, "/out/geo")
+    job.node.setParms(
+        {"f2": 100, constants.FRAME_ORDER: constants.FRAME_ORDER_FIRST_LAST_MIDDLE}
+    )
+    job.get_frames()
+    assert job.job_info["Frames"] == "1-100"
+    job.job_info["ChunkSize"] = chunk_size
+    job.order_frames()
+
+    frames = frame_order.parse_framestring(job.job_info["Frames"])
+    assert frames[:chunk_size] == list(range(1, chunk_size + 1))
+    assert frames[chunk_size : chunk_size * 2] == list(range(101 - chunk_size, 101))
+    for index in range(0, len(frames), chunk_size):
+        task = frames[index : index + chunk_size]
+        assert task == list(range(task[0], task[0] + chunk_size))
@@ -0,0 +1,111 @@
+"""Tests of the buffered logging in `houdini_deadline_api_submission.log_sink`.
+
+Examples:
+    $ python -m pytest houdini_deadline_api_submission/test/test_log_sink.py
+
+"""
+
+# Import built-in modules
+import json
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from houdini_deadline_api_submission import constants
+from houdini_deadline_api_submission import log_sink
+from houdini_deadline_api_submission.test import benchmark_submission
+from houdini_deadline_api_submission.test import fake_hou
+
+
+@pytest.fixture
+def node():
+    """Create a ROP with an empty log in an empty scene."""
+    fake_hou.clear()
+    yield benchmark_submission.create_rop("/out/geo")
+    fake_hou.clear()
+
+
+def get_log(node):
+    """Return the lines of the log of the given node."""
+    return node.evalParm(constants.LOG_PARM).split("\n")
+
+
+def test_messages_are_written_once(node):
+    """Buffered messages are only written onto the node when flushing."""
+    with log_sink.buffered_log():
+        log_sink.log_message(node, "Started submission")
+        log_sink.log_message(node, "Frames: 1-10\nChunk Size: 1", indent=1)
+        assert node.evalParm(constants.LOG_PARM) == ""
+        changes = fake_hou.get_change_count()
+    assert fake_hou.get_change_count() == changes + 1
+    assert get_log(node) == [
+        "Started submission",
+        "> Frames: 1-10",
+        "> Chunk Size: 1",
+    ]
+
+
+def test_log_is_merged_with_existing_log(node):
+    """Flushing appends the messages to the log of previous submissions."""
+    log_sink.log_message(node, "First submission")
+    with log_sink.buffered_log():
+        log_sink.log_message(node, "Second submission")
+    assert get_log(node) == ["First submission", "Second submission"]
+
+
+def test_log_keeps_latest_lines(node):
+    """The log of a node is capped to its latest lines, old ones included."""
+    node.setParms({constants.LOG_PARM: "old 0\nold 1\nold 2"})
+    with log_sink.buffered_log(max_lines=4):
+        for index in range(3):
+            log_sink.log_message(node, "new {}".format(index))
+    assert get_log(node) == ["old 2", "new 0", "new 1", "new 2"]
+
+    sink = log_sink.LogSink(max_lines=2)
+    for index in range(5):
+        sink.add(node, "line {}".format(index))
+    sink.flush()
+    assert get_log(node) == ["line 3", "line 4"]
+
+
+def test_nested_contexts_share_sink(node):
+    """Only the outermost context writes the log."""
+    with log_sink.buffered_log() as sink:
+        with log_sink.buffered_log() as nested_sink:
+            log_sink.log_message(node, "Nested")
+        assert nested_sink is sink
+        assert node.evalParm(constants.LOG_PARM) == ""
+    assert log_sink.get_active_sink() is None
+    assert get_log(node) == ["Nested"]
+
+
+def test_sidecar(node, tmpdir):
+    """All messages are appended to the JSON-lines sidecar."""
+    path = str(tmpdir.join("logs", "submission.jsonl"))
+    other = benchmark_submission.create_rop("/out/other")
+    with log_sink.buffered_log(sidecar_path=path):
+        log_sink.log_message(node, "Started submission")
+        log_sink.log_message(other, "Frames: 1-10", indent=1)
+    with log_sink.buffered_log(sidecar_path=path):
+        log_sink.log_message(node, "Second submission")
+
+    with open(path) as sidecar:
+        records = [json.loads(line) for line in sidecar]
+    assert [
+        (record["node"], record["parm"], record["indent"], record["message"])
+        for record in records
+    ] == [
+        ("/out/geo", constants.LOG_PARM, 0, "Started submission"),
+        ("/out/other", constants.LOG_PARM, 1, "Frames: 1-10"),
+        ("/out/geo", constants.LOG_PARM, 0, "Second submission"),
+    ]
+    assert records[0]["time"] <= records[1]["time"]
+
+
+def test_empty_sink_writes_no_sidecar(tmpdir):
+    """Submissions without messages don't create a sidecar."""
+    path = tmpdir.join("submission.jsonl")
+    with log_sink.buffered_log(sidecar_path=str(path)):
+        pass
+    assert not path.exists()
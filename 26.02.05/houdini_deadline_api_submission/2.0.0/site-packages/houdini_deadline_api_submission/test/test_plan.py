@@ -0,0 +1,123 @@
+"""Tests of the submission plans in `houdini_deadline_api_submission.plan`.
+
+Examples:
+    $ python -m pytest houdini_deadline_api_submission/test/test_plan.py
+
+"""
+
+# Import built-in modules
+import json
+import os
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from houdini_deadline_api_submission import constants
+from houdini_deadline_api_submission import cost_model
+from houdini_deadline_api_submission import plan
+from houdini_deadline_api_submission import submit
+from houdini_deadline_api_submission.test import benchmark_submission
+from houdini_deadline_api_submission.test import fake_hou
+
+
+@pytest.fixture
+def scene(tmpdir, monkeypatch):
+    """Return the folder of an empty scene saved into a temporary folder."""
+    # The fake parameters don't expand $HIP, outputs are relative to it.
+    monkeypatch.chdir(tmpdir)
+    fake_hou.clear()
+    orig_hip = fake_hou.hipFile.path()
+    fake_hou.hipFile.setName(str(tmpdir.join("shot.hip")))
+    yield str(tmpdir)
+    fake_hou.hipFile.setName(orig_hip)
+    fake_hou.clear()
+
+
+def create_plan(*dependencies):
+    """Return a plan whose jobs have the given dependencies.
+
+    Args:
+        *dependencies (list of int): Indices of the jobs each job depends on.
+
+    Returns:
+        dict: The plan.
+
+    """
+    return {
+        "version": plan.PLAN_VERSION,
+        "jobs": [
+            {"node": "/out/rop{}".format(index), "dependencies": job_dependencies}
+            for index, job_dependencies in enumerate(dependencies)
+        ],
+    }
+
+
+def test_get_plan_levels():
+    """Each job is placed one level after its deepest dependency."""
+    job_plan = create_plan([], [], [0], [0, 2], [1])
+    assert plan.get_plan_levels(job_plan) == [[0, 1], [2, 4], [3]]
+
+
+def test_get_plan_levels_without_jobs():
+    """An empty plan has no levels."""
+    assert plan.get_plan_levels(create_plan()) == []
+
+
+@pytest.mark.parametrize("dependency", [1, 2])
+def test_get_plan_levels_rejects_later_dependencies(dependency):
+    """Jobs may only depend on jobs in front of them."""
+    with pytest.raises(ValueError):
+        plan.get_plan_levels(create_plan([], [dependency], []))
+
+
+def test_plan_round_trip(tmpdir):
+    """A written plan is read back unchanged."""
+    path = str(tmpdir.join("plans", "scene.json"))
+    job_plan = create_plan([], [0])
+    plan.write_plan(path, job_plan)
+    assert plan.read_plan(path) == job_plan
+
+
+def test_read_plan_rejects_other_versions(tmpdir):
+    """Plans of another version can't be read."""
+    path = tmpdir.join("scene.json")
+    path.write(json.dumps({"version": plan.PLAN_VERSION + 1, "jobs": []}))
+    with pytest.raises(ValueError):
+        plan.read_plan(str(path))
+
+
+def test_compile_plan_logs_submission(scene):
+    """Compiling a plan logs the submission onto the nodes like submitting."""
+    base_node, submitter_node = benchmark_submission.build_network("stacks", 2)
+    jobs = submit.get_jobs(base_node, submitter_node)
+    job_plan = plan.compile_plan(jobs)
+    assert [entry["node"] for entry in job_plan["jobs"]] == ["/out/rop0", "/out/merge"]
+    assert all(entry["cost_key"] is None for entry in job_plan["jobs"])
+    for job in jobs:
+        assert job.is_submitted
+        assert "Submission successfully finished" in job.node.evalParm(
+            constants.LOG_PARM
+        )
+
+
+def test_dry_run_doesnt_write_plan(scene):
+    """Dry runs never write a plan, even if the submitter submits in background."""
+    base_node, submitter_node = benchmark_submission.build_network("stacks", 2)
+    submitter_node.setParms({"dry_run": 1, constants.SUBMIT_IN_BACKGROUND: 1})
+    assert submit.submit(base_node, submitter_node) == [None, None]
+    assert not os.path.exists(os.path.join(scene, "_deadline", constants.PLAN_FOLDER))
+
+
+def test_record_pending_jobs(tmpdir, monkeypatch):
+    """Submitted jobs of a plan using adaptive chunks are stored as pending."""
+    store = cost_model.JobStatsStore(str(tmpdir.join("job_stats.json")))
+    monkeypatch.setattr(cost_model, "_STORE", store)
+    job_plan = create_plan([], [], [])
+    job_plan["jobs"][0]["cost_key"] = "shot:/out/rop0:sopoutput"
+    job_plan["jobs"][1]["cost_key"] = "shot:/out/rop1:sopoutput"
+    job_plan["jobs"][2]["cost_key"] = None
+    plan.record_pending_jobs(job_plan, ["64f0c0de", None, "64f0c0df"])
+    assert list(store.pending) == ["64f0c0de"]
+    assert store.pending["64f0c0de"]["key"] == "shot:/out/rop0:sopoutput"
+    assert os.path.exists(store.path)
@@ -0,0 +1,44 @@
+"""Tests of the cache and render jobs in `houdini_deadline_api_submission.job.render`.
+
+Examples:
+    $ python -m pytest houdini_deadline_api_submission/test/test_render.py
+
+"""
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from houdini_deadline_api_submission.job.render import CacheRenderDeadlineJob
+
+
+class FakeJob(object):
+    """Job with the parts `get_stream_chunk_size` uses.
+
+    Args:
+        chunk_size (int): Chunk size of the job info.
+        adaptive_chunk_size (int, optional): Chunk size picked by adaptive
+            chunks.
+
+    """
+
+    def __init__(self, chunk_size, adaptive_chunk_size=None):
+        """Initialize the job."""
+        self.job_info = {"ChunkSize": chunk_size}
+        self.adaptive_chunk_size = adaptive_chunk_size
+
+
+@pytest.mark.parametrize(
+    "cache_job, render_job, expected",
+    [
+        (FakeJob(10), FakeJob(1), 10),
+        (FakeJob(10, 25), FakeJob(1), 25),
+        (FakeJob(10, 25), FakeJob(4, 4), 4),
+        (FakeJob(10), FakeJob(4, 4), 4),
+    ],
+)
+def test_stream_chunk_size(cache_job, render_job, expected):
+    """Adaptive chunk sizes take precedence, render job first."""
+    assert CacheRenderDeadlineJob.get_stream_chunk_size(cache_job, render_job) == (
+        expected
+    )
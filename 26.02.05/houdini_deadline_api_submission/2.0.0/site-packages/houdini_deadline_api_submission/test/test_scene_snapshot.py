@@ -0,0 +1,177 @@
+"""Tests of the scene snapshots in `houdini_deadline_api_submission.scene_snapshot`.
+
+Examples:
+    $ python -m pytest houdini_deadline_api_submission/test/test_scene_snapshot.py
+
+"""
+
+# Import built-in modules
+import os
+import time
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from houdini_deadline_api_submission import constants
+from houdini_deadline_api_submission import scene_snapshot
+from houdini_deadline_api_submission.test import fake_hou
+
+DAY = 24 * 60 * 60
+
+
+@pytest.fixture
+def store(tmpdir):
+    """Return an empty store inside of the _deadline folder of a scene."""
+    fake_hou.clear()
+    orig_hip = fake_hou.hipFile.path()
+    fake_hou.hipFile.setName(str(tmpdir.join("shot.hip")))
+    yield scene_snapshot.SceneSnapshotStore(scene_snapshot.get_store_folder())
+    fake_hou.hipFile.setName(orig_hip)
+
+
+def add_file(store, content, name="temp.hip"):
+    """Add a new file with the given content to the store.
+
+    Args:
+        store (scene_snapshot.SceneSnapshotStore): The store.
+        content (str): Content of the file.
+        name (str, optional): Name of the added file.
+
+    Returns:
+        str: Path of the snapshot.
+
+    """
+    if not os.path.isdir(store.folder):
+        os.makedirs(store.folder)
+    path = os.path.join(store.folder, name)
+    with open(path, "w") as temp_file:
+        temp_file.write(content)
+    return store.add(path, fake_hou.hipFile.path())
+
+
+def set_age(path, days):
+    """Set the modification time of a file to the given amount of days ago."""
+    mtime = time.time() - days * DAY
+    os.utime(path, (mtime, mtime))
+
+
+def test_add_names_snapshot_after_content(store):
+    """Files with the same content share one snapshot."""
+    snapshot = add_file(store, "scene")
+    assert os.path.basename(snapshot) == "shot__{}.hip".format(
+        scene_snapshot.get_file_hash(snapshot)
+    )
+    assert add_file(store, "changed") != snapshot
+
+    set_age(snapshot, 30)
+    assert add_file(store, "scene", "other.hip") == snapshot
+    assert sorted(os.listdir(store.folder)) == sorted(
+        [os.path.basename(snapshot), os.path.basename(add_file(store, "changed"))]
+    )
+    # Re-using the snapshot marks it as used.
+    assert os.path.getmtime(snapshot) > time.time() - DAY
+
+
+def test_save_keeps_scene_name(store):
+    """Saving a snapshot doesn't rename the current scene."""
+    snapshot = store.get_snapshot()
+    assert fake_hou.hipFile.path().endswith("shot.hip")
+    assert os.path.dirname(snapshot) == store.folder
+    assert store.get_snapshot() == snapshot
+    assert len(fake_hou.hipFile.saved) == 1
+
+
+def test_link_into(store, tmpdir):
+    """Snapshots are hardlinked into other folders once."""
+    snapshot = add_file(store, "scene")
+    folder = str(tmpdir.join("render", "_deadline"))
+    link = store.link_into(snapshot, folder)
+    assert link == os.path.join(folder, os.path.basename(snapshot))
+    assert os.path.samefile(link, snapshot)
+    assert store.link_into(snapshot, folder) == link
+
+
+def test_link_into_falls_back_to_snapshot(store, tmpdir, monkeypatch):
+    """The snapshot itself is used if it can't be linked."""
+
+    def link(source, target):
+        raise OSError("Invalid cross-device link")
+
+    monkeypatch.setattr(scene_snapshot.os, "link", link)
+    snapshot = add_file(store, "scene")
+    assert store.link_into(snapshot, str(tmpdir.join("other_drive"))) == snapshot
+
+
+def test_collect_garbage(store):
+    """Only snapshots unused for longer than the maximum age are deleted."""
+    old = add_file(store, "old")
+    recent = add_file(store, "recent")
+    current = add_file(store, "current")
+    os.makedirs(os.path.join(store.folder, "folder"))
+    for path in (old, current):
+        set_age(path, 30)
+    set_age(recent, 10)
+    store.snapshot = current
+
+    assert store.collect_garbage(14) == [old]
+    assert sorted(os.listdir(store.folder)) == sorted(
+        ["folder", os.path.basename(recent), os.path.basename(current)]
+    )
+
+
+def test_collect_garbage_without_folder(tmpdir):
+    """A store that was never used has nothing to collect."""
+    store = scene_snapshot.SceneSnapshotStore(str(tmpdir.join("missing")))
+    assert store.collect_garbage(14) == []
+
+
+def test_submission_keeps_old_snapshots(store):
+    """Submitting never deletes snapshots, queued jobs may still use them."""
+    old = add_file(store, "old")
+    set_age(old, 30)
+    submitter = fake_hou.create_node("/out/submit", "hal::deadline_submit::0.1")
+    submitter.setParms(
+        {constants.SCENE_SNAPSHOT: 1, constants.SCENE_SNAPSHOT_MAX_AGE: 14}
+    )
+    with scene_snapshot.submission_snapshot(submitter):
+        scene_snapshot.get_active_store().get_snapshot()
+    assert scene_snapshot.get_active_store() is None
+    assert os.path.exists(old)
+
+
+@pytest.mark.parametrize("max_age, deleted", [(14, True), (0, False)])
+def test_collect_snapshots(store, max_age, deleted):
+    """The maximum age of the submitter node is used, 0 keeps all snapshots."""
+    old = add_file(store, "old")
+    set_age(old, 30)
+    submitter = fake_hou.create_node("/out/submit", "hal::deadline_submit::0.1")
+    submitter.setParms({constants.SCENE_SNAPSHOT_MAX_AGE: max_age})
+    assert scene_snapshot.collect_snapshots(submitter) == ([old] if deleted else [])
+    assert os.path.exists(old) != deleted
+
+
+def test_scene_overrides_round_trip(monkeypatch):
+    """Encoded overrides are set on their parameters, missing ones skipped."""
+    fake_hou.clear()
+    node = fake_hou.create_node("/out/mantra1", "ifd")
+    node.setParms({"trange": 0, "f1": 1, "soho_outputmode": 0})
+    overrides = scene_snapshot.encode_scene_overrides(
+        {
+            "/out/mantra1/trange": 1,
+            "/out/mantra1/soho_outputmode": 1,
+            "/out/missing/f1": 5,
+        }
+    )
+    assert " " not in overrides
+    monkeypatch.setenv(constants.SCENE_OVERRIDES_ENV, overrides)
+    scene_snapshot.apply_scene_overrides()
+    assert node.evalParm("trange") == 1
+    assert node.evalParm("soho_outputmode") == 1
+    assert node.evalParm("f1") == 1
+
+
+def test_apply_scene_overrides_without_overrides(monkeypatch):
+    """Sessions not started by a snapshot job are left unchanged."""
+    monkeypatch.delenv(constants.SCENE_OVERRIDES_ENV, raising=False)
+    scene_snapshot.apply_scene_overrides()
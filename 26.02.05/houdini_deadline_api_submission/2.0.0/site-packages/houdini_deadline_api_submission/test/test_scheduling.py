@@ -0,0 +1,160 @@
+"""Tests of the job levels in `houdini_deadline_api_submission.scheduling`.
+
+Examples:
+    $ python -m pytest houdini_deadline_api_submission/test/test_scheduling.py
+
+"""
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from houdini_deadline_api_submission import scheduling
+from houdini_deadline_api_submission.test import fake_hou
+
+
+class FakeJob(object):
+    """Singular job with the parts `get_job_levels` uses.
+
+    Args:
+        name (str): Name of the ROP of the job.
+        upstream_jobs (list of FakeJob, optional): Jobs this job depends on.
+
+    """
+
+    def __init__(self, name, upstream_jobs=None):
+        """Initialize the job."""
+        self.node = fake_hou.create_node("/out/{}".format(name))
+        self.upstream_jobs = list(upstream_jobs or [])
+
+    def get_upstream_jobs(self):
+        """Return the jobs this job depends on."""
+        return self.upstream_jobs
+
+    def __eq__(self, other):
+        """All jobs compare equal, levels must not rely on equality."""
+        return True
+
+    __hash__ = object.__hash__
+
+
+@pytest.fixture(autouse=True)
+def clear_scene():
+    """Start each test with an empty scene."""
+    fake_hou.clear()
+
+
+def get_names(levels):
+    """Return the ROP names of the jobs of each level."""
+    return [[job.node.name() for job in level] for level in levels]
+
+
+def test_get_job_levels():
+    """Jobs are placed one level after their deepest upstream job."""
+    cache = FakeJob("cache")
+    sim = FakeJob("sim")
+    mesh = FakeJob("mesh", [cache, sim])
+    render = FakeJob("render", [mesh, cache])
+    levels = scheduling.get_job_levels([render, mesh, sim, cache, render])
+    assert get_names(levels) == [["sim", "cache"], ["mesh"], ["render"]]
+
+
+def test_get_job_levels_ignores_other_jobs():
+    """Upstream jobs that are not sorted don't block their downstream jobs."""
+    pre_pass = FakeJob("pre_pass")
+    render = FakeJob("render", [pre_pass])
+    assert get_names(scheduling.get_job_levels([render])) == [["render"]]
+
+
+def test_get_job_levels_rejects_cycles():
+    """A cycle raises a ValueError naming the ROPs in and after the cycle."""
+    source = FakeJob("source")
+    first = FakeJob("first", [source])
+    second = FakeJob("second", [first])
+    first.upstream_jobs.append(second)
+    render = FakeJob("render", [second])
+    with pytest.raises(ValueError) as error:
+        scheduling.get_job_levels([source, first, second, render])
+    message = str(error.value)
+    assert "/out/first, /out/render, /out/second" in message
+    assert "/out/source" not in message
+
+
+def test_get_job_levels_rejects_self_dependencies():
+    """A job depending on itself is a cycle as well."""
+    job = FakeJob("loop")
+    job.upstream_jobs.append(job)
+    with pytest.raises(ValueError):
+        scheduling.get_job_levels([job])
+
+
+class FakeSubmitJob(FakeJob):
+    """Job with the parts `submit_concurrently` uses.
+
+    Args:
+        name (str): Name of the ROP of the job, also used as its job info.
+        upstream_jobs (list of FakeSubmitJob, optional): Jobs this job depends
+            on.
+
+    """
+
+    def __init__(self, name, upstream_jobs=None):
+        """Initialize the job."""
+        super(FakeSubmitJob, self).__init__(name, upstream_jobs)
+        self.job_info = {"Name": name}
+        self.plugin_info = {}
+        self.deadline_id = None
+        self.is_pre_pass = False
+        self.is_submitted = False
+        self.messages = []
+
+    def get_flattened_jobs(self):
+        """Return this job, it holds no other jobs."""
+        return [self]
+
+    def pre_submit_all(self):
+        """Nothing to prepare."""
+
+    def prepare_submission(self):
+        """Every job needs to be sent to Deadline."""
+        return True
+
+    def post_submit_all(self):
+        """Log the successful submission."""
+        self.log("finished")
+
+    def post_submit_failed(self):
+        """Log the failed submission and return the ID of this job."""
+        self.log("failed")
+        return [self.deadline_id] if self.deadline_id else []
+
+    def log(self, message, indent=0):
+        """Store the logged message."""
+        self.messages.append(message)
+
+
+def test_submit_concurrently_records_ids_of_failed_level(monkeypatch):
+    """Jobs submitted next to a failing job keep their ID and get logged."""
+
+    def submit_job(job_info, plugin_info, deadline_con):
+        if job_info["Name"] == "broken":
+            raise IOError("Connection reset")
+        return "id_{}".format(job_info["Name"])
+
+    monkeypatch.setattr(scheduling.deadline_utils, "get_deadline_connect", object)
+    monkeypatch.setattr(scheduling.deadline_utils, "submit_job", submit_job)
+    cache = FakeSubmitJob("cache")
+    broken = FakeSubmitJob("broken")
+    sim = FakeSubmitJob("sim")
+    render = FakeSubmitJob("render", [cache])
+    with pytest.raises(IOError):
+        scheduling.submit_concurrently([broken, cache, sim, render], max_workers=1)
+    assert [job.deadline_id for job in (broken, cache, sim, render)] == [
+        None,
+        "id_cache",
+        "id_sim",
+        None,
+    ]
+    assert cache.messages == ["failed"]
+    assert render.messages == ["failed"]
+    assert not any(job.is_submitted for job in (broken, cache, sim, render))
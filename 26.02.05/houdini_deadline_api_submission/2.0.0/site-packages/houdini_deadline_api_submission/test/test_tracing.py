@@ -0,0 +1,110 @@
+"""Tests of the submission timings in `houdini_deadline_api_submission.tracing`.
+
+Examples:
+    $ python -m pytest houdini_deadline_api_submission/test/test_tracing.py
+
+"""
+
+# Import built-in modules
+import json
+
+# Import local modules
+from houdini_deadline_api_submission import tracing
+from houdini_deadline_api_submission.test import fake_hou
+
+
+def create_tracer():
+    """Return a tracer with recorded spans of two phases.
+
+    Returns:
+        tracing.Tracer: Tracer with three jobs created inside of get_jobs.
+
+    """
+    tracer = tracing.Tracer()
+    start = tracer.start
+    tracer.record("get_jobs", "submission", start, 6.0)
+    for index, duration in enumerate([1.0, 3.0, 2.0]):
+        tracer.record(
+            "create_job",
+            "submission",
+            start + index,
+            duration,
+            {"node": fake_hou.Node("/out/rop{}".format(index), "geometry")},
+        )
+    return tracer
+
+
+def test_get_phases():
+    """Spans are summed up per phase, in the order they were first finished."""
+    phases = create_tracer().get_phases()
+    assert list(phases) == ["get_jobs", "create_job"]
+    assert phases["get_jobs"] == {"count": 1, "total": 6.0, "max": 6.0}
+    assert phases["create_job"] == {"count": 3, "total": 6.0, "max": 3.0}
+
+
+def test_get_summary():
+    """The summary lists each phase, followed by the slowest jobs."""
+    assert create_tracer().get_summary().split("\n") == [
+        "Submission timings (total including nested phases):",
+        "get_jobs: 1 x, 6.000s total, 6.000s mean, 6.000s max",
+        "create_job: 3 x, 6.000s total, 2.000s mean, 3.000s max",
+        "Slowest jobs to create:",
+        "    /out/rop1: 3.000s",
+        "    /out/rop2: 2.000s",
+        "    /out/rop0: 1.000s",
+    ]
+
+
+def test_write(tmpdir):
+    """Spans are written as a Chrome trace file, nodes by their path."""
+    path = str(tmpdir.join("traces", "submission.json"))
+    create_tracer().write(path)
+    with open(path) as trace_file:
+        events = json.load(trace_file)["traceEvents"]
+    assert [event["name"] for event in events] == ["get_jobs"] + ["create_job"] * 3
+    assert events[0]["ts"] == 0.0
+    assert events[0]["dur"] == 6e6
+    assert events[0]["ph"] == "X"
+    assert "args" not in events[0]
+    assert events[2]["args"] == {"node": "/out/rop1"}
+
+
+def test_tracing_writes_spans(tmpdir):
+    """Spans and traced functions are recorded inside of `tracing`."""
+
+    @tracing.traced("create_job", get_args=lambda node: {"node": node})
+    def create_job(node):
+        return node
+
+    path = str(tmpdir.join("submission.json"))
+    with tracing.tracing(path) as tracer:
+        with tracing.tracing() as nested_tracer:
+            with tracing.span("get_jobs"):
+                assert create_job("/out/geo") == "/out/geo"
+        assert nested_tracer is tracer
+    assert tracing.get_active_tracer() is None
+    assert list(tracer.get_phases()) == ["create_job", "get_jobs"]
+    with open(path) as trace_file:
+        assert len(json.load(trace_file)["traceEvents"]) == 2
+
+
+def test_disabled_tracing_does_nothing():
+    """Outside of `tracing`, spans and traced functions record nothing."""
+    calls = []
+
+    def get_args(value):
+        calls.append(value)
+        return {}
+
+    @tracing.traced("create_job", get_args=get_args)
+    def create_job(value):
+        return value * 2
+
+    assert create_job(2) == 4
+    assert calls == []
+    assert tracing.span("get_jobs") is tracing.span("submit")
+    with tracing.tracing(enabled=False) as tracer:
+        assert tracer is None
+        assert create_job(3) == 6
+    assert calls == []
+    assert tracing.get_active_tracer() is None
@@ -0,0 +1,97 @@
+"""Tests of the Web Service client in `houdini_deadline_api_submission.webservice`.
+
+Examples:
+    $ python -m pytest houdini_deadline_api_submission/test/test_webservice.py
+
+"""
+
+# Import built-in modules
+import time
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from houdini_deadline_api_submission import webservice
+from houdini_deadline_api_submission.test.fake_webservice import FakeWebService
+
+
+@pytest.fixture
+def service():
+    """Start a stand-in Web Service for a single test."""
+    fake_service = FakeWebService()
+    fake_service.start()
+    yield fake_service
+    fake_service.stop()
+
+
+def create_client(service, **kwargs):
+    """Return a client of the given stand-in Web Service.
+
+    Args:
+        service (FakeWebService): The started Web Service.
+        **kwargs: Arguments of the client.
+
+    Returns:
+        webservice.WebServiceClient: The client.
+
+    """
+    hostname, port = service.address
+    kwargs.setdefault("backoff", 0.0)
+    return webservice.WebServiceClient(hostname, port, **kwargs)
+
+
+def submit(client, name="job"):
+    """Submit a job and return its ID."""
+    return client.Jobs.SubmitJob({"Name": name}, {}, idOnly=True)["_id"]
+
+
+def test_submission_is_not_sent_twice_after_response_failed(service):
+    """A job whose response got lost is never submitted a second time."""
+    client = create_client(service)
+    submit(client)
+    service.drops = 1
+    with pytest.raises(webservice.WebServiceError):
+        submit(client)
+    assert len(service.jobs) == 2
+    assert submit(client) == service.jobs[-1][0]
+
+
+def test_idempotent_request_is_sent_again_after_response_failed(service):
+    """A pool query whose response got lost is sent again."""
+    client = create_client(service)
+    client.Pools.GetPoolNames()
+    service.drops = 1
+    assert client.Pools.GetPoolNames() == service.pools
+    assert service.requests == 3
+
+
+def test_connection_closed_while_idle_is_replaced(service):
+    """Idle connections closed by the Web Service are not used anymore."""
+    service.keep_alive = False
+    client = create_client(service)
+    ids = []
+    for index in range(3):
+        ids.append(submit(client, "job{}".format(index)))
+        time.sleep(0.05)
+    assert ids == [job[0] for job in service.jobs]
+    assert service.connections == 3
+
+
+def test_authentication(service):
+    """Credentials are sent like DeadlineCon does, once enabled."""
+    service.credentials = ("artist", "secret")
+    with pytest.raises(webservice.WebServiceError) as error:
+        create_client(service).Pools.GetPoolNames()
+    assert error.value.status == 401
+
+    client = create_client(service, username="artist", password="secret")
+    assert client.AuthenticationModeEnabled()
+    assert client.Pools.GetPoolNames() == service.pools
+
+    client.EnableAuthentication(False)
+    with pytest.raises(webservice.WebServiceError):
+        client.Pools.GetPoolNames()
+
+    client.SetAuthenticationCredentials("artist", "secret")
+    assert submit(client) == service.jobs[-1][0]
@@ -0,0 +1,83 @@
+"""Tests of the wedge lookups in `houdini_deadline_api_submission.wedging`.
+
+Examples:
+    $ python -m pytest houdini_deadline_api_submission/test/test_wedging.py
+
+"""
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from houdini_deadline_api_submission import wedging
+from houdini_deadline_api_submission.test import fake_hou
+
+
+@pytest.fixture
+def parms():
+    """Return the parameters wedged by the tests, keyed by their name."""
+    fake_hou.clear()
+    node = fake_hou.create_node("/obj/box", "box", "Sop")
+    node.setParms({"sizex": 1.0, "sizey": 1.0, "seed": 0})
+    return dict((parm.name(), parm) for parm in node.parms())
+
+
+def test_get_wedge_signature(parms):
+    """Wedge names and the order of the parameters don't matter."""
+    wedge = [["width", parms["sizex"], 2.0], ["seed", parms["seed"], 3]]
+    renamed = [["s", parms["seed"], 3], ["w", parms["sizex"], 2.0]]
+    assert wedging.get_wedge_signature(wedge) == wedging.get_wedge_signature(renamed)
+    assert wedging.get_wedge_signature(wedge, {"/obj/box/seed"}) == (
+        ("/obj/box/seed", 3),
+    )
+
+
+def test_find_same_parameters(parms):
+    """Items of a wedge with the same values are found."""
+    index = wedging.WedgeIndex()
+    for seed in range(3):
+        index.add([["seed", parms["seed"], seed]], "job{}".format(seed))
+    assert len(index) == 3
+    assert index.find([["other_name", parms["seed"], 1]]) == ["job1"]
+    assert index.find([["seed", parms["seed"], 5]]) == []
+
+
+def test_find_shared_parameters(parms):
+    """Only the parameters shared with the indexed wedges are compared."""
+    index = wedging.WedgeIndex()
+    for width in (1.0, 2.0):
+        index.add([["width", parms["sizex"], width]], width)
+    wedge = [["width", parms["sizex"], 2.0], ["seed", parms["seed"], 7]]
+    assert index.find(wedge) == [2.0]
+
+
+def test_find_returns_all_matches_in_order(parms):
+    """Items wedging more parameters are all found by the shared ones."""
+    index = wedging.WedgeIndex()
+    for width in (1.0, 2.0):
+        for height in (1.0, 2.0):
+            index.add(
+                [["width", parms["sizex"], width], ["height", parms["sizey"], height]],
+                (width, height),
+            )
+    assert index.find([["width", parms["sizex"], 2.0]]) == [(2.0, 1.0), (2.0, 2.0)]
+    assert index.find(
+        [["height", parms["sizey"], 1.0], ["width", parms["sizex"], 1.0]]
+    ) == [(1.0, 1.0)]
+
+
+def test_find_without_shared_parameters(parms):
+    """Wedges sharing no parameter with the index find nothing."""
+    index = wedging.WedgeIndex()
+    index.add([["width", parms["sizex"], 1.0]], "job")
+    assert index.find([["seed", parms["seed"], 1]]) == []
+    assert index.find([]) == []
+
+
+def test_adding_items_updates_lookups(parms):
+    """Items added after a lookup are found by the next lookup."""
+    index = wedging.WedgeIndex()
+    index.add([["seed", parms["seed"], 1]], "first")
+    assert index.find([["seed", parms["seed"], 1]]) == ["first"]
+    index.add([["seed", parms["seed"], 1]], "second")
+    assert index.find([["seed", parms["seed"], 1]]) == ["first", "second"]
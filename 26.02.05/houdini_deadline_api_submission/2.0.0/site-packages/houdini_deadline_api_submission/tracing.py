@@ -0,0 +1,341 @@
+"""Timing of the phases of a submission.
+
+Inside of `tracing`, every span records how long a phase of the submission
+took (building the dependency tree, creating the jobs, saving the scene,
+sending the jobs to the Deadline Web Service, ...). The spans are summed up
+per phase for the log of the submitter and can be written as a trace file,
+which can be opened in chrome://tracing or https://ui.perfetto.dev.
+
+Outside of `tracing`, spans don't record anything: `span` returns a shared
+context doing nothing and functions decorated with `traced` are called
+right away.
+
+Examples:
+    >>> with tracing("/tmp/submission.json") as tracer:
+    ...     with span("get_jobs"):
+    ...         get_jobs(node)
+    >>> print(tracer.get_summary())
+
+"""
+
+# Import built-in modules
+import collections
+import contextlib
+import functools
+import json
+import logging
+import os
+import threading
+import time
+
+# Tracer recording the spans of the running submission, None if tracing is
+# disabled.
+_ACTIVE_TRACER = None
+
+# Default category of spans.
+DEFAULT_CATEGORY = "submission"
+
+# Amount of the slowest jobs listed in the summary.
+SLOWEST_JOBS = 5
+
+
+class _NullSpan(object):
+    """Span that doesn't record anything, used while tracing is disabled."""
+
+    def __enter__(self):
+        """Do nothing."""
+        return self
+
+    def __exit__(self, *args):
+        """Do nothing."""
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span(object):
+    """Measure the duration of a phase and record it when it's finished.
+
+    Args:
+        tracer (Tracer): Tracer recording the span.
+        name (str): Name of the phase.
+        category (str): Category of the phase.
+        args (dict): Additional information about the phase, for example the
+            node of a job.
+
+    """
+
+    def __init__(self, tracer, name, category, args):
+        """Initialize the span, the time is measured once it's entered."""
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = None
+
+    def __enter__(self):
+        """Start measuring the time."""
+        self.start = time.time()
+        return self
+
+    def __exit__(self, *args):
+        """Stop measuring the time and record the span."""
+        self.tracer.record(
+            self.name, self.category, self.start, time.time() - self.start, self.args
+        )
+        return False
+
+
+class Tracer(object):
+    """Collect the spans of a submission.
+
+    Spans can be recorded by multiple threads at the same time.
+
+    """
+
+    def __init__(self):
+        """Initialize a tracer without any spans."""
+        self.start = time.time()
+        self.events = []
+        self._lock = threading.Lock()
+
+    def record(self, name, category, start, duration, args=None):
+        """Record a finished span.
+
+        Args:
+            name (str): Name of the phase.
+            category (str): Category of the phase.
+            start (float): Time the span started, in seconds since the epoch.
+            duration (float): Duration of the span in seconds.
+            args (dict, optional): Additional information about the phase.
+
+        """
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start - self.start) * 1e6,
+            "dur": duration * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.current_thread().ident,
+        }
+        if args:
+            event["args"] = dict(
+                (key, _format_arg(value)) for key, value in args.items()
+            )
+        with self._lock:
+            self.events.append(event)
+
+    def get_phases(self):
+        """Sum up the recorded spans per phase.
+
+        Returns:
+            collections.OrderedDict: Count, total and maximum duration in
+                seconds of each phase, in the order they were first finished.
+
+        """
+        phases = collections.OrderedDict()
+        with self._lock:
+            events = list(self.events)
+        for event in events:
+            phase = phases.setdefault(
+                event["name"], {"count": 0, "total": 0.0, "max": 0.0}
+            )
+            duration = event["dur"] / 1e6
+            phase["count"] += 1
+            phase["total"] += duration
+            phase["max"] = max(phase["max"], duration)
+        return phases
+
+    def get_slowest(self, name, amount=SLOWEST_JOBS):
+        """Return the slowest spans of a phase.
+
+        Args:
+            name (str): Name of the phase.
+            amount (int, optional): Maximum amount of spans.
+
+        Returns:
+            list of dict: Trace events of the spans, slowest first.
+
+        """
+        with self._lock:
+            events = [event for event in self.events if event["name"] == name]
+        return sorted(events, key=lambda event: -event["dur"])[:amount]
+
+    def get_summary(self):
+        """Return a readable summary of the recorded spans.
+
+        Durations of a phase include any phase that happened inside of it.
+
+        Returns:
+            str: One line per phase, followed by the slowest jobs.
+
+        """
+        lines = ["Submission timings (total including nested phases):"]
+        for name, phase in self.get_phases().items():
+            lines.append(
+                "{}: {} x, {:.3f}s total, {:.3f}s mean, {:.3f}s max".format(
+                    name,
+                    phase["count"],
+                    phase["total"],
+                    phase["total"] / phase["count"],
+                    phase["max"],
+                )
+            )
+        slowest = self.get_slowest("create_job")
+        if slowest:
+            lines.append("Slowest jobs to create:")
+            for event in slowest:
+                lines.append(
+                    "    {}: {:.3f}s".format(
+                        event.get("args", {}).get("node", "?"), event["dur"] / 1e6
+                    )
+                )
+        return "\n".join(lines)
+
+    def write(self, path):
+        """Write the recorded spans as a Chrome trace file.
+
+        Args:
+            path (str): Path of the JSON file.
+
+        """
+        with self._lock:
+            events = list(self.events)
+        folder = os.path.dirname(path)
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder)
+        with open(path, "w") as trace_file:
+            json.dump(
+                {"traceEvents": events, "displayTimeUnit": "ms"},
+                trace_file,
+                sort_keys=True,
+            )
+
+
+def _format_arg(value):
+    """Return a value that can be written to a trace file.
+
+    Args:
+        value (object): Value of a span argument. Nodes are stored by their
+            path.
+
+    Returns:
+        object: The value, or its path or string representation.
+
+    """
+    if isinstance(value, (bool, int, float, str)) or value is None:
+        return value
+    path = getattr(value, "path", None)
+    if callable(path):
+        return path()
+    return str(value)
+
+
+def get_active_tracer():
+    """Return the tracer of the running submission.
+
+    Returns:
+        Tracer: Tracer recording the spans, None if tracing is disabled.
+
+    """
+    return _ACTIVE_TRACER
+
+
+def span(name, category=DEFAULT_CATEGORY, **args):
+    """Measure the duration of the code inside of the returned context.
+
+    Args:
+        name (str): Name of the phase.
+        category (str, optional): Category of the phase.
+        **args: Additional information about the phase. Values are only
+            converted for the trace file, so nodes can be passed as they are.
+
+    Returns:
+        object: Context recording the span, or doing nothing if tracing is
+            disabled.
+
+    """
+    tracer = _ACTIVE_TRACER
+    if tracer is None:
+        return _NULL_SPAN
+    return Span(tracer, name, category, args)
+
+
+def traced(name, category=DEFAULT_CATEGORY, get_args=None):
+    """Decorate a function to record a span each time it's called.
+
+    Args:
+        name (str): Name of the phase.
+        category (str, optional): Category of the phase.
+        get_args (callable, optional): Called with the arguments of the
+            decorated function, returns the additional information of the
+            span. Only called while tracing is enabled.
+
+    Returns:
+        callable: The decorator.
+
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*func_args, **func_kwargs):
+            tracer = _ACTIVE_TRACER
+            if tracer is None:
+                return func(*func_args, **func_kwargs)
+            args = get_args(*func_args, **func_kwargs) if get_args else None
+            with Span(tracer, name, category, args):
+                return func(*func_args, **func_kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def get_job_args(job, *args, **kwargs):  # pylint: disable=unused-argument
+    """Return the information of spans of job methods.
+
+    Args:
+        job (houdini_deadline_api_submission.job.base.BaseDeadlineJob): Job
+            the method is called on.
+
+    Returns:
+        dict: The node of the job.
+
+    """
+    return {"node": job.node}
+
+
+@contextlib.contextmanager
+def tracing(trace_path=None, enabled=True):
+    """Record the spans of everything running inside of this context.
+
+    Nested contexts use the tracer of the outermost one, which writes the
+    trace file when it's finished.
+
+    Args:
+        trace_path (str, optional): Chrome trace file the spans are written
+            to.
+        enabled (bool, optional): If False, nothing is recorded.
+
+    Yields:
+        Tracer: The tracer recording the spans, None if tracing is disabled.
+
+    """
+    global _ACTIVE_TRACER
+    if _ACTIVE_TRACER is not None or not enabled:
+        yield _ACTIVE_TRACER
+        return
+
+    _ACTIVE_TRACER = Tracer()
+    try:
+        yield _ACTIVE_TRACER
+    finally:
+        tracer, _ACTIVE_TRACER = _ACTIVE_TRACER, None
+        if trace_path:
+            try:
+                tracer.write(trace_path)
+            except (IOError, OSError):
+                logger = logging.getLogger(__name__)
+                logger.warning("Could not write the trace to %s.", trace_path)
@@ -1,6 +1,7 @@
 """Utility functions."""
 
 # Import built-in modules
+import contextlib
 import copy
 import logging
 import os
@@ -12,6 +13,18 @@ import hou  # pylint: disable=import-error
 
 # Import local modules
 from houdini_deadline_api_submission import constants
+from houdini_deadline_api_submission.dependency_graph import DependencyGraph
+from houdini_deadline_api_submission.dependency_graph import FetchIndex
+
+# Dependency trees of previous submissions, keyed by the path of the base
+# node. Each entry stores the network token the tree was created with and the
+# reduced tree itself.
+_DEPENDENCY_TREE_CACHE = {}
+# Hit and miss counters of _DEPENDENCY_TREE_CACHE.
+_DEPENDENCY_TREE_CACHE_STATS = {"hits": 0, "misses": 0}
+# Frame ranges of the running submission, keyed by the session id of the node.
+# Only set inside of frame_range_cache.
+_ACTIVE_FRAME_RANGES = None
 
 
 def get_last_index(array, item):
@@ -32,39 +45,164 @@ def get_last_index(array, item):
     return index
 
 
-def get_frames(node):
-    """Get the start, end and frame increment of a node.
+def _eval_frame_range(node, mode, current_frame):
+    """Evaluate the frame range parameters of a ROP.
+
+    Args:
+        node (hou.Node): ROP with a `trange` parameter.
+        mode (hou.Parm): The `trange` parameter of the node.
+        current_frame (int): Frame used if the ROP renders a single frame.
+
+    Returns:
+        int, int, int: Start frame, end frame and frame increment.
+
+    """
+    if mode.eval() == 0:  # Single Frame, use current frame.
+        return current_frame, current_frame, 1
+    start, end, inc = node.evalParmTuple("f")
+    return int(start), int(end), max(float(inc), 1.0)
+
+
+def _get_frames(node, frame_ranges, visiting):
+    """Get the frame range of a node, storing it and all ranges it needs.
 
     Args:
         node (hou.Node): Configured frames of this node will be returned.
+        frame_ranges (dict): Already known frame ranges, keyed by the session
+            id of their node. The range of the node is added to it.
+        visiting (tuple of hou.Node): Fetch ROPs and subnets whose range
+            depends on this node.
 
     Returns:
         int, int, int: Start frame, end frame and frame increment.
 
+    Raises:
+        ValueError: If the node is a Fetch ROP fetching itself, directly or
+            through other Fetch ROPs.
+
     """
+    session_id = node.sessionId()
+    if session_id in frame_ranges:
+        return frame_ranges[session_id]
+    if any(other.sessionId() == session_id for other in visiting):
+        raise ValueError(
+            "Can't get the frame range of fetch loop: {}".format(
+                " -> ".join(other.path() for other in visiting + (node,))
+            )
+        )
+
     mode = node.parm("trange")
-    node_type = node.type().name()
     if mode:
-        if mode.eval() == 0:  # Single Frame, use current frame.
-            start, end, inc = (int(hou.frame()), int(hou.frame()), 1)
-        else:
-            start, end, inc = (
-                int(node.evalParm("f1")),
-                int(node.evalParm("f2")),
-                max(float(node.evalParm("f3")), 1.0),
-            )
-    elif node_type == "fetch":
-        start, end, inc = get_frames(node.parm("source").evalAsNode())
+        frame_range = _eval_frame_range(node, mode, int(hou.frame()))
+    elif node.type().name() == "fetch":
+        frame_range = _get_frames(
+            node.parm("source").evalAsNode(), frame_ranges, visiting + (node,)
+        )
     else:
-        children = node.children()
         start, end, inc = float("inf"), None, float("inf")
-        for child in children:
-            this_start, this_end, this_inc = get_frames(child)
+        for child in node.children():
+            this_start, this_end, this_inc = _get_frames(
+                child, frame_ranges, visiting + (node,)
+            )
             start = min(start, this_start)
-            end = max(end, this_end)
+            end = this_end if end is None else max(end, this_end)
             inc = min(inc, this_inc)
+        frame_range = start, end, inc
+
+    frame_ranges[session_id] = frame_range
+    return frame_range
+
+
+def get_frames(node):
+    """Get the start, end and frame increment of a node.
+
+    ROPs without a frame range use the range of their Fetch source or the
+    combined range of their children. Inside of `frame_range_cache`, the
+    range of each node is only resolved once.
+
+    Args:
+        node (hou.Node): Configured frames of this node will be returned.
+
+    Returns:
+        int, int, int: Start frame, end frame and frame increment.
+
+    Raises:
+        ValueError: If the node depends on a Fetch ROP fetching itself.
+
+    """
+    frame_ranges = {} if _ACTIVE_FRAME_RANGES is None else _ACTIVE_FRAME_RANGES
+    return _get_frames(node, frame_ranges, ())
+
+
+def resolve_frames(nodes):
+    """Get the frame ranges of many nodes in one pass.
+
+    The frame range parameters of all ROPs having one are evaluated first,
+    as a single parameter tuple each, so Fetch ROPs and subnets only combine
+    ranges that are already known. Inside of `frame_range_cache`, the ranges
+    are kept for later calls of `get_frames`.
+
+    Args:
+        nodes (list of hou.Node): Nodes to get the frame ranges of.
+
+    Returns:
+        list of tuple: Start frame, end frame and frame increment of each
+            node, in the order of the given nodes.
+
+    Raises:
+        ValueError: If a node depends on a Fetch ROP fetching itself.
+
+    """
+    frame_ranges = {} if _ACTIVE_FRAME_RANGES is None else _ACTIVE_FRAME_RANGES
+    current_frame = int(hou.frame())
+    remaining_nodes = []
+    for node in nodes:
+        session_id = node.sessionId()
+        if session_id in frame_ranges:
+            continue
+        mode = node.parm("trange")
+        if mode:
+            frame_ranges[session_id] = _eval_frame_range(node, mode, current_frame)
+        else:
+            remaining_nodes.append(node)
+
+    for node in remaining_nodes:
+        _get_frames(node, frame_ranges, ())
+    return [frame_ranges[node.sessionId()] for node in nodes]
+
+
+@contextlib.contextmanager
+def frame_range_cache():
+    """Resolve the frame range of each node only once inside of this context.
+
+    Nested contexts share the cache of the outermost one. Parameters can
+    change while a wedge is applied, so `clear_frame_range_cache` has to be
+    called whenever wedges are applied or reset and whenever parameters are
+    set, like the overrides of `BaseDeadlineJob.pre_submit`.
+
+    Examples:
+        >>> with frame_range_cache():
+        ...     resolve_frames([hou.node('/out/subnet1'), hou.node('/out/fetch1')])
+        ...     get_frames(hou.node('/out/fetch1'))
+        (1, 240, 1.0)
+
+    """
+    global _ACTIVE_FRAME_RANGES
+    if _ACTIVE_FRAME_RANGES is not None:
+        yield
+        return
+
+    _ACTIVE_FRAME_RANGES = {}
+    try:
+        yield
+    finally:
+        _ACTIVE_FRAME_RANGES = None
 
-    return start, end, inc
+
+def clear_frame_range_cache():
+    """Forget the frame ranges resolved inside of `frame_range_cache`."""
+    if _ACTIVE_FRAME_RANGES is not None:
+        _ACTIVE_FRAME_RANGES.clear()
 
 
 def get_timestamp(delim=" "):
@@ -77,12 +215,28 @@ def get_timestamp(delim=" "):
     return time.strftime("%Y{delim}%m{delim}%d{delim}%H{delim}%M".format(delim=delim))
 
 
-def get_dependencies(base_node):
+def get_render_info(base_node):
+    """Return the render order of the given node as given by hscript.
+
+    Args:
+        base_node (hou.Node): Node to get the render order of.
+
+    Returns:
+        str: Output of the hscript `render -p -c -F` command. Each line has
+            this format: <<id>> [ <<dependencies>> ] <<node>> <<frames>>
+
+    """
+    return hou.hscript("render -p -c -F {}".format(base_node.path()))[0]
+
+
+def get_dependencies(base_node, render_info=None):
     """Return all dependencies node needed for the given node to render.
 
     Args:
         base_node (hou.Node): Node to get all the dependencies of. (Including
             itself)
+        render_info (str, optional): Output of `get_render_info`, if it was
+            already queried.
 
     Returns:
         list of dict: Dependencies for the given node, in order. (Including
@@ -122,7 +276,8 @@ def get_dependencies(base_node):
     # returned from this function.
     # Returned value has this format:
     # <<id>> [ <<dependencies>> ] <<node>> <<frames>>
-    render_info = hou.hscript("render -p -c -F {}".format(base_node.path()))[0]
+    if render_info is None:
+        render_info = get_render_info(base_node)
 
     tasks = render_info.split("\n")[:-1]
     dependencies = []
@@ -168,71 +323,63 @@ def reduce_to_parents(dependencies):
     dependencies = correct_fetches(dependencies, fetches)
 
     # First update all the node and dependency information to their parent,
-    # if valid.
-    for task_info in dependencies:
-        node = task_info["node"]
-        parent = find_parent(node)
-        if parent:
-            task_info["node"] = parent
+    # if valid. Looking up the parent walks up the whole hierarchy, so every
+    # node is only resolved once.
+    parents = {}
+
+    def get_reduced_node(node):
+        if node not in parents:
+            parents[node] = find_parent(node) or node
+        return parents[node]
 
-        this_dependencies = task_info["dependencies"]
-        this_dependencies = [find_parent(node) or node for node in this_dependencies]
-        this_dependencies = list(set(this_dependencies))
-        task_info["dependencies"] = this_dependencies
+    reduced_nodes = [get_reduced_node(task_info["node"]) for task_info in dependencies]
 
     # Since we're merging different ROPs which could have different
-    # dependencies, we need to merge the dependencies together. We're using a
-    # list of the ROPs to get the first index, which will then gather all the
+    # dependencies, we need to merge the dependencies together. We only want
+    # to keep the last occurrence of each node, which will then gather all the
     # dependencies.
-    all_nodes = [task_info["node"] for task_info in dependencies]
-    for task_info in dependencies:
-        node = task_info["node"]
-        if all_nodes.count(node) > 1:
-            last_index = get_last_index(all_nodes, node)
-            dependencies[last_index]["dependencies"] += task_info["dependencies"]
-            dependencies[last_index]["dependencies"] = list(
-                set(dependencies[last_index]["dependencies"])
-            )
+    last_indices = {node: index for index, node in enumerate(reduced_nodes)}
+    graph = DependencyGraph()
+    for index, node in enumerate(reduced_nodes):
+        if last_indices[node] == index:
+            graph.add_node(node)
 
-    # We only want to keep the first occurrence of each node, since we gathered
-    # all the dependencies on this one.
-    indices_to_use = [
-        i
-        for i, node in enumerate(all_nodes)
-        if all_nodes.count(node) == 1 or i == get_last_index(all_nodes, node)
-    ]
-    dependencies = [dependencies[i] for i in indices_to_use]
+    # We also make sure we only have dependencies that still exist, because
+    # they might have been deleted while correcting the fetch nodes.
+    for node, task_info in zip(reduced_nodes, dependencies):
+        for dependency in task_info["dependencies"]:
+            dependency = get_reduced_node(dependency)
+            if dependency in graph:
+                graph.add_dependency(node, dependency)
 
     # In the first step, we converted all dependencies to their parent node.
     # This means as soon as there is one dependency in the children of this
     # parent, we will have it be dependent on itself, which can never work.
     # Therefore, we need to remove any self dependency.
-    # We also make sure we only have dependencies that still exist, because
-    # they might have been deleted while correcting the fetch nodes.
-    all_nodes = [task_info["node"] for task_info in dependencies]
-    for task_info in dependencies:
-        task_info["dependencies"] = [
-            n
-            for n in task_info["dependencies"]
-            if n != task_info["node"] and n in all_nodes
-        ]
+    graph.remove_self_dependencies()
 
     # It's important to return the dependency_ids entry as well, since this
     # will be used to make sure the created job objects are dependent on each
     # other.
-    for task_info in dependencies:
-        task_info["dependency_ids"] = [
-            all_nodes.index(node) for node in task_info["dependencies"]
-        ]
+    reduced_dependencies = []
+    for node in graph.nodes:
+        task_info = dependencies[last_indices[node]]
+        task_info["node"] = node
+        task_info["dependencies"] = graph.dependencies(node)
+        task_info["dependency_ids"] = graph.dependency_ids(node)
+        reduced_dependencies.append(task_info)
 
-    return dependencies
+    return reduced_dependencies
 
 
-def get_fetches(dependency_tree):
+def get_fetches(dependency_tree, fetch_index=None):
     """Return all fetches inside the dependency tree.
 
     Args:
         dependency_tree (list of dict):
+        fetch_index (houdini_deadline_api_submission.dependency_graph.
+            FetchIndex, optional): Index of the inputs of the nodes in the
+            tree. Will be created if not given.
 
     Returns:
         dict: All fetched nodes and their respective Fetch ROP.
@@ -240,33 +387,22 @@ def get_fetches(dependency_tree):
     """
     logger = logging.getLogger(__name__)
     dept_dict = {leaf["orig_node"]: leaf["dependencies"] for leaf in dependency_tree}
+    if fetch_index is None:
+        fetch_index = FetchIndex(dept_dict)
 
-    # Get the fetched ROP.
+    # Get the fetched ROP, together with the node fetching it.
     fetched_nodes_dict = {}
     for node, dependencies in dept_dict.items():
         for dep in dependencies:
-            inputs = node.inputAncestors(follow_subnets=True)
-            if dep not in inputs:
-                orig_dep = dep
-                while dep.parent():
-                    dep = dep.parent()
-                    if dep in inputs:
-                        break
-                else:
-                    fetched_nodes_dict[orig_dep] = inputs
-                    logger.debug(
-                        "Input of %s is getting fetched: %s", node.path(), orig_dep
-                    )
+            if not fetch_index.is_input(node, dep):
+                fetched_nodes_dict[dep] = node
+                logger.debug("Input of %s is getting fetched: %s", node.path(), dep)
 
     # Get the fetch, that fetches the ROP.
     fetched_dict = {}
-    for fetched_node, node_inputs in fetched_nodes_dict.items():
-        fetches = [
-            parm.node()
-            for parm in fetched_node.parmsReferencingThis()
-            if parm.node().type().name() == "fetch" and parm.name() == "source"
-        ]
-        for fetch in fetches:
+    for fetched_node, node in fetched_nodes_dict.items():
+        node_inputs = fetch_index.ancestors(node)
+        for fetch in fetch_index.fetches(fetched_node):
             if fetch in node_inputs:
                 fetched_dict[fetched_node.path()] = fetch
 
@@ -296,15 +432,22 @@ def correct_fetches(dependencies, fetches):
     return dependencies
 
 
-def get_dependency_tree(base_node):
+def get_dependency_tree(base_node, use_cache=True):
     """Return the dependency tree going up from the given base_node.
 
     This also collapses Subnetwork ROPs and any other kind of ROP with children
     ROPs to one single entry, if it's configured to behave like this.
 
+    Parsing and reducing the tree is only done if the network changed since
+    the last call with the same base_node, see `get_network_token`. The render
+    order is still queried from Houdini on every call, since the token is
+    derived from it.
+
     Args:
         base_node (hou.Node): Node to get all the dependencies of. (Including
             itself)
+        use_cache (bool, optional): Reuse the tree of a previous call if the
+            network didn't change. Defaults to True.
 
     Returns:
         list of dict: Dependencies for the given node, in order. (Including
@@ -334,11 +477,104 @@ def get_dependency_tree(base_node):
         ]
 
     """
-    dependencies = get_dependencies(base_node)
+    logger = logging.getLogger(__name__)
+    render_info = get_render_info(base_node)
+    token = None
+    if use_cache:
+        token = get_network_token(render_info)
+        cached = _DEPENDENCY_TREE_CACHE.get(base_node.path())
+        if cached and cached[0] == token:
+            _DEPENDENCY_TREE_CACHE_STATS["hits"] += 1
+            logger.debug("Reusing cached dependency tree of %s.", base_node.path())
+            return _copy_dependency_tree(cached[1])
+        _DEPENDENCY_TREE_CACHE_STATS["misses"] += 1
+
+    dependencies = get_dependencies(base_node, render_info)
     dependencies = reduce_to_parents(dependencies)
+    if use_cache:
+        _DEPENDENCY_TREE_CACHE[base_node.path()] = (
+            token,
+            _copy_dependency_tree(dependencies),
+        )
     return dependencies
 
 
+def _copy_dependency_tree(dependency_tree):
+    """Return a copy of a dependency tree that can be changed safely.
+
+    The nodes are shared, but each entry and its lists of dependencies are
+    copied, so changes of the caller never leak into the cache.
+
+    Args:
+        dependency_tree (list of dict): Tree of `get_dependency_tree`.
+
+    Returns:
+        list of dict: The copied tree.
+
+    """
+    copied_tree = []
+    for leaf in dependency_tree:
+        copied_leaf = dict(leaf)
+        for key in ("dependencies", "dependency_ids"):
+            if key in copied_leaf:
+                copied_leaf[key] = list(copied_leaf[key])
+        copied_tree.append(copied_leaf)
+    return copied_tree
+
+
+def get_network_token(render_info):
+    """Return a token that changes whenever the dependency tree would change.
+
+    The token consists of the dependencies and nodes listed in the render
+    order (ignoring the frame ranges) and, for each of these nodes and their
+    parents, the session id and the parameters that decide how they get
+    collapsed by `reduce_to_parents`.
+
+    Args:
+        render_info (str): Output of `get_render_info`.
+
+    Returns:
+        tuple: Hashable token describing the current network.
+
+    """
+    tasks = re.findall(r"\[ ([0-9 ]*) ?\] (/\S+)", render_info)
+    token = [hou.hipFile.path(), tuple(tasks)]
+    visited = set()
+    for _, path in tasks:
+        node = hou.node(path)
+        while node and node.path() not in visited:
+            visited.add(node.path())
+            token.append(
+                (
+                    node.path(),
+                    node.sessionId(),
+                    is_pre_pass(node),
+                    get_run_as_one(node),
+                )
+            )
+            node = node.parent()
+    return tuple(token)
+
+
+def get_dependency_tree_cache_stats():
+    """Return the hit and miss counters of the dependency tree cache.
+
+    Returns:
+        dict: Amount of 'hits', 'misses' and cached 'entries'.
+
+    """
+    stats = dict(_DEPENDENCY_TREE_CACHE_STATS)
+    stats["entries"] = len(_DEPENDENCY_TREE_CACHE)
+    return stats
+
+
+def clear_dependency_tree_cache():
+    """Remove all cached dependency trees and reset the counters."""
+    _DEPENDENCY_TREE_CACHE.clear()
+    _DEPENDENCY_TREE_CACHE_STATS["hits"] = 0
+    _DEPENDENCY_TREE_CACHE_STATS["misses"] = 0
+
+
 def log_message(node, message, indent=0, log_parm_name=constants.LOG_PARM):
     """Log a message onto a node.
 
@@ -350,11 +586,30 @@ def log_message(node, message, indent=0, log_parm_name=constants.LOG_PARM):
             to constants.LOG_PARM.
 
     """
-    log_parm = node.parm(log_parm_name)
-    if not log_parm:
-        add_log_parms(node, log_parm_name)
-        log_parm = node.parm(log_parm_name)
+    log_parm = get_log_parm(node, log_parm_name)
+    message = format_log_message(message, indent)
+
+    # If there is no entry yet, we don't need a line break between entries.
+    if log_parm.evalAsString():
+        message = "\n{}".format(message)
+
+    log_parm.set("{}{}".format(log_parm.evalAsString(), message))
+
+
+def format_log_message(message, indent=0):
+    """Return the given message as it is shown in the log.
+
+    Args:
+        message (str): Log message.
+        indent (int, optional): Indentation of the logged message.
+
+    Returns:
+        str: The message with each line prefixed by the indentation.
+
+    Raises:
+        ValueError: If the indent is smaller than 0.
 
+    """
     if indent < 0:
         raise ValueError(
             "Indent can not be smaller than 0.\n" "Provided indent: {}".format(indent)
@@ -364,12 +619,26 @@ def log_message(node, message, indent=0, log_parm_name=constants.LOG_PARM):
         message_lines = message.split("\n")
         message_lines = ["{}{}".format(str_indent, msg) for msg in message_lines]
         message = "\n".join(message_lines)
+    return message
 
-    # If there is no entry yet, we don't need a line break between entries.
-    if log_parm.evalAsString():
-        message = "\n{}".format(message)
 
-    log_parm.set("{}{}".format(log_parm.evalAsString(), message))
+def get_log_parm(node, log_parm_name=constants.LOG_PARM):
+    """Return the logging parameter of a node, adding it if it doesn't exist.
+
+    Args:
+        node (hou.Node): Node to log on.
+        log_parm_name (str, optional): Name of the logging parameter. Defaults
+            to constants.LOG_PARM.
+
+    Returns:
+        hou.Parm: The logging parameter.
+
+    """
+    log_parm = node.parm(log_parm_name)
+    if not log_parm:
+        add_log_parms(node, log_parm_name)
+        log_parm = node.parm(log_parm_name)
+    return log_parm
 
 
 def add_log_parms(node, log_parm_name=constants.LOG_PARM):
@@ -425,6 +694,35 @@ def save_copy(folder):
     return path
 
 
+def get_submission_file_path(folder, ext):
+    """Return a new path for a file written during a submission.
+
+    Args:
+        folder (str): Name of the folder inside of the _deadline folder next
+            to the hip file.
+        ext (str): Extension of the file, including the dot.
+
+    Returns:
+        str: Path of the file, which includes a timestamp in it's name.
+
+    """
+    orig_hip = hou.hipFile.path()
+    hip = os.path.splitext(os.path.basename(orig_hip))[0]
+    name = "{}_{}__{}{}".format(get_timestamp("_"), time.strftime("%S"), hip, ext)
+    return os.path.join(os.path.dirname(orig_hip), "_deadline", folder, name)
+
+
+def get_plan_path():
+    """Return a new path for the submission plan of the current hip file.
+
+    Returns:
+        str: Path inside of the _deadline folder next to the hip file, which
+            includes a timestamp in it's name.
+
+    """
+    return get_submission_file_path(constants.PLAN_FOLDER, ".json")
+
+
 def is_pre_pass(node):
     """Return if the given node should be rendered as a PrePass.
 
@@ -441,6 +739,24 @@ def is_pre_pass(node):
     return parm.eval()
 
 
+def use_first_last_middle(node):
+    """Return if the frames of the given node are rendered first-last-middle.
+
+    Args:
+        node (hou.Node): Node to query the parm from.
+
+    Returns:
+        bool: True if `constants.FRAME_ORDER` of this node is set to
+            `constants.FRAME_ORDER_FIRST_LAST_MIDDLE`. False if the node
+            doesn't have this parameter.
+
+    """
+    parm = node.parm(constants.FRAME_ORDER)
+    if not parm:
+        return False
+    return parm.eval() == constants.FRAME_ORDER_FIRST_LAST_MIDDLE
+
+
 def get_run_as_one(node):
     """Return the value of `constants.SUBMIT_CHILDREN_SEPARATELY` of this node.
 
@@ -466,6 +782,113 @@ def get_run_as_one(node):
     return node_type == "Driver"
 
 
+def get_submission_mode(submitter_node):
+    """Return the value of `constants.SUBMISSION_MODE` of the submitter node.
+
+    If there is no submitter node or it doesn't have this parameter, the jobs
+    will be submitted sequentially.
+
+    Args:
+        submitter_node (hou.Node): HAL Deadline Submit ROP that is being used
+            to drive the submission.
+
+    Returns:
+        int: Index of the configured submission mode.
+
+    """
+    if not submitter_node:
+        return constants.SUBMISSION_MODE_SEQUENTIAL
+    parm = submitter_node.parm(constants.SUBMISSION_MODE)
+    if not parm:
+        return constants.SUBMISSION_MODE_SEQUENTIAL
+    return parm.eval()
+
+
+def get_submission_workers(submitter_node):
+    """Return the amount of jobs that can be sent to Deadline at once.
+
+    Args:
+        submitter_node (hou.Node): HAL Deadline Submit ROP that is being used
+            to drive the submission.
+
+    Returns:
+        int: Value of `constants.SUBMISSION_WORKERS`, or
+            `constants.DEFAULT_SUBMISSION_WORKERS` if it doesn't exist.
+
+    """
+    if not submitter_node:
+        return constants.DEFAULT_SUBMISSION_WORKERS
+    parm = submitter_node.parm(constants.SUBMISSION_WORKERS)
+    if not parm:
+        return constants.DEFAULT_SUBMISSION_WORKERS
+    return max(1, parm.eval())
+
+
+def get_submitter_value(submitter_node, parm_name, default=None):
+    """Return the value of the given parameter of the submitter node.
+
+    Args:
+        submitter_node (hou.Node): HAL Deadline Submit ROP that is being used
+            to drive the submission.
+        parm_name (str): Name of the parameter to evaluate.
+        default (object, optional): Value returned if there is no submitter
+            node or it doesn't have this parameter.
+
+    Returns:
+        object: Value of the parameter.
+
+    """
+    if not submitter_node:
+        return default
+    parm = submitter_node.parm(parm_name)
+    if not parm:
+        return default
+    return parm.eval()
+
+
+def get_chunk_target_seconds(submitter_node):
+    """Return the duration the tasks of a submission should take.
+
+    Args:
+        submitter_node (hou.Node): HAL Deadline Submit ROP that is being used
+            to drive the submission.
+
+    Returns:
+        float: Target duration of a task in seconds, None if
+            `constants.ADAPTIVE_CHUNKS` is turned off.
+
+    """
+    if not get_submitter_value(
+        submitter_node, constants.ADAPTIVE_CHUNKS, default=False
+    ):
+        return None
+    minutes = get_submitter_value(
+        submitter_node,
+        constants.CHUNK_TARGET_DURATION,
+        default=constants.DEFAULT_CHUNK_TARGET_DURATION,
+    )
+    return max(1.0, float(minutes) * 60.0)
+
+
+def use_tracing(submitter_node):
+    """Return if the timings of the submission should be recorded.
+
+    Args:
+        submitter_node (hou.Node): HAL Deadline Submit ROP that is being used
+            to drive the submission.
+
+    Returns:
+        bool: True if `constants.TRACE_SUBMISSION_ENV` is set or the submitter
+            node has `constants.TRACE_SUBMISSION` turned on.
+
+    """
+    if os.environ.get(constants.TRACE_SUBMISSION_ENV, "0") not in ("", "0"):
+        return True
+    return bool(
+        get_submitter_value(submitter_node, constants.TRACE_SUBMISSION, default=False)
+    )
+
+
 def find_parent(node):
     """Return the parent node of a ROP that is set to run a combined job.
 
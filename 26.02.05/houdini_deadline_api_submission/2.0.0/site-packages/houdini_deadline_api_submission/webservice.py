@@ -0,0 +1,537 @@
+"""Thread-safe client for the Deadline Web Service.
+
+The client keeps a pool of keep-alive HTTP connections, so consecutive
+requests don't need to open a new connection, and can be shared between the
+threads submitting jobs concurrently. Idempotent requests are retried with an
+exponential backoff if the Web Service can't be reached or has an internal
+error.
+
+It implements the part of `Deadline.DeadlineConnect.DeadlineCon` used by this
+package, including its authentication and TLS options, so both can be used
+interchangeably. Unlike `DeadlineCon`, which returns the error message of a
+failed request as its result, failed requests raise a `WebServiceError`.
+"""
+
+# Import built-in modules
+import base64
+import contextlib
+import json
+import logging
+import select
+import socket
+import ssl
+import time
+
+try:
+    import http.client as httplib
+except ImportError:
+    import httplib  # pylint: disable=import-error
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue  # pylint: disable=import-error
+
+# Import local modules
+from houdini_deadline_api_submission import constants
+
+# Requests that can be sent again without changing the result.
+IDEMPOTENT_METHODS = ("GET", "HEAD", "PUT", "DELETE", "OPTIONS")
+# Errors raised while sending a request through a pooled connection the Web
+# Service closed while it was idle. The Web Service can't have received the
+# whole request in this case.
+_SEND_ERRORS = (httplib.CannotSendRequest, socket.error)
+# Errors raised while reading the response through a pooled connection the Web
+# Service closed while it was idle. The Web Service might have received and
+# processed the request, so only idempotent requests may be sent again.
+_RESPONSE_ERRORS = (httplib.BadStatusLine, socket.error)
+# Message of DeadlineCon if the Web Service rejected the credentials.
+AUTHENTICATION_ERROR = (
+    "Authentication with the Web Service failed. Please ensure that the "
+    "authentication credentials are set, are correct, and that authentication "
+    "mode is enabled."
+)
+
+
+class WebServiceError(Exception):
+    """Raised if a request to the Deadline Web Service failed."""
+
+    def __init__(self, message, status=None):
+        """Initialize the error.
+
+        Args:
+            message (str): Description of the error.
+            status (int, optional): HTTP status returned by the Web Service.
+
+        """
+        super(WebServiceError, self).__init__(message)
+        self.status = status
+
+
+class _StaleConnection(Exception):
+    """Raised if a request can be sent again after a reused connection failed."""
+
+
+def is_connection_dropped(connection):
+    """Return True if the Web Service closed an idle connection.
+
+    An idle keep-alive connection only becomes readable if the Web Service
+    closed it (or sent unexpected data), so it must not be used anymore.
+
+    Args:
+        connection (httplib.HTTPConnection): Idle connection of a pool.
+
+    Returns:
+        bool: True if the connection can't be used anymore.
+
+    """
+    sock = connection.sock
+    if sock is None:
+        # Not connected yet, it connects on the next request.
+        return False
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+    except (ValueError, socket.error):
+        return True
+    return bool(readable)
+
+
+class ConnectionPool(object):
+    """Pool of keep-alive HTTP connections to a single host.
+
+    Args:
+        hostname (str): Host of the Deadline Web Service.
+        port (int): Port of the Deadline Web Service.
+        size (int, optional): Maximum amount of idle connections kept open.
+            Set to 0 to open a new connection for every request.
+        timeout (float, optional): Timeout of each connection in seconds.
+        use_ssl (bool, optional): If True, HTTPS is used.
+        ca_cert (str, optional): Certificate authority file used to verify the
+            certificate of the Web Service, like `DeadlineCon(caCert=...)`.
+        insecure (bool, optional): If True, the certificate of the Web
+            Service isn't verified, like `DeadlineCon(insecure=True)`.
+
+    """
+
+    def __init__(
+        self,
+        hostname,
+        port,
+        size=constants.DEFAULT_WEBSERVICE_POOL_SIZE,
+        timeout=constants.DEFAULT_WEBSERVICE_TIMEOUT,
+        use_ssl=False,
+        ca_cert=None,
+        insecure=False,
+    ):
+        """Initialize an empty pool, connections are opened on demand."""
+        self.hostname = hostname
+        self.port = port
+        self.size = size
+        self.timeout = timeout
+        self.use_ssl = use_ssl
+        self.ca_cert = ca_cert
+        self.insecure = insecure
+        self.created = 0
+        self._idle = queue.LifoQueue(maxsize=max(0, size))
+        self._ssl_context = None
+
+    def new_connection(self):
+        """Return a new connection to the host of this pool.
+
+        Returns:
+            httplib.HTTPConnection: The unconnected connection.
+
+        """
+        self.created += 1
+        if not self.use_ssl:
+            return httplib.HTTPConnection(
+                self.hostname, self.port, timeout=self.timeout
+            )
+        return httplib.HTTPSConnection(
+            self.hostname,
+            self.port,
+            timeout=self.timeout,
+            context=self.get_ssl_context(),
+        )
+
+    def get_ssl_context(self):
+        """Return the SSL context shared by all HTTPS connections of this pool.
+
+        Returns:
+            ssl.SSLContext: Context verifying the Web Service certificate,
+                unless the pool is insecure.
+
+        """
+        if self._ssl_context is None:
+            context = ssl.create_default_context(cafile=self.ca_cert)
+            if self.insecure:
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            self._ssl_context = context
+        return self._ssl_context
+
+    @contextlib.contextmanager
+    def connection(self, reuse=True):
+        """Borrow a connection of this pool.
+
+        The connection is returned to the pool if the block finished without
+        an error, otherwise it gets closed.
+
+        Args:
+            reuse (bool, optional): If False, a new connection is opened even
+                if there is an idle one.
+
+        Yields:
+            tuple: The connection and True if it was already used before.
+
+        """
+        connection = None
+        while reuse and self.size and connection is None:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if is_connection_dropped(connection):
+                connection.close()
+                connection = None
+        reused = connection is not None
+        if connection is None:
+            connection = self.new_connection()
+
+        try:
+            yield connection, reused
+        except BaseException:
+            connection.close()
+            raise
+
+        if not self.size:
+            connection.close()
+            return
+        try:
+            self._idle.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def clear(self):
+        """Close all idle connections."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class WebServiceClient(object):
+    """Client of the Deadline Web Service.
+
+    Args:
+        hostname (str): Host of the Deadline Web Service.
+        port (int): Port of the Deadline Web Service.
+        timeout (float, optional): Timeout of each request in seconds.
+        retries (int, optional): Amount of times a failed idempotent request
+            is sent again.
+        backoff (float, optional): Seconds to wait before the first retry,
+            doubled for each further retry.
+        pool_size (int, optional): Maximum amount of idle connections kept
+            open.
+        use_ssl (bool, optional): If True, HTTPS is used.
+        ca_cert (str, optional): Certificate authority file used to verify the
+            certificate of the Web Service.
+        insecure (bool, optional): If True, the certificate of the Web
+            Service isn't verified.
+        username (str, optional): User to authenticate with. If given,
+            authentication is enabled, see `SetAuthenticationCredentials`.
+        password (str, optional): Password of the user.
+
+    """
+
+    def __init__(
+        self,
+        hostname,
+        port,
+        timeout=constants.DEFAULT_WEBSERVICE_TIMEOUT,
+        retries=constants.DEFAULT_WEBSERVICE_RETRIES,
+        backoff=constants.DEFAULT_WEBSERVICE_BACKOFF,
+        pool_size=constants.DEFAULT_WEBSERVICE_POOL_SIZE,
+        use_ssl=False,
+        ca_cert=None,
+        insecure=False,
+        username=None,
+        password=None,
+    ):
+        """Initialize the client, connections are opened on demand."""
+        self.pool = ConnectionPool(
+            hostname,
+            port,
+            size=pool_size,
+            timeout=timeout,
+            use_ssl=use_ssl,
+            ca_cert=ca_cert,
+            insecure=insecure,
+        )
+        self.retries = retries
+        self.backoff = backoff
+        self._use_authentication = False
+        self._authorization = None
+        if username:
+            self.SetAuthenticationCredentials(username, password or "")
+        # Mirror the interface of Deadline.DeadlineConnect.DeadlineCon.
+        self.Jobs = Jobs(self)  # pylint: disable=invalid-name
+        self.Pools = Pools(self)  # pylint: disable=invalid-name
+        self.Groups = Groups(self)  # pylint: disable=invalid-name
+        self.Tasks = Tasks(self)  # pylint: disable=invalid-name
+
+    def EnableAuthentication(self, enable=True):  # noqa: N802
+        """Enable or disable sending the credentials with each request.
+
+        Args:
+            enable (bool, optional): If True, the credentials are sent.
+
+        """
+        self._use_authentication = enable
+
+    def SetAuthenticationCredentials(  # noqa: N802
+        self, username, password, enable=True
+    ):
+        """Set the credentials used to authenticate with the Web Service.
+
+        Args:
+            username (str): User to authenticate with.
+            password (str): Password of the user.
+            enable (bool, optional): If True, authentication is enabled.
+
+        """
+        credentials = "{}:{}".format(username, password).encode("utf-8")
+        self._authorization = "Basic {}".format(
+            base64.b64encode(credentials).decode("ascii")
+        )
+        self.EnableAuthentication(enable)
+
+    def AuthenticationModeEnabled(self):  # noqa: N802
+        """Return True if the credentials are sent with each request.
+
+        Returns:
+            bool: True if authentication is enabled.
+
+        """
+        return self._use_authentication
+
+    def _send(self, method, path, body, reuse, idempotent):
+        """Send a single request through a pooled connection.
+
+        Args:
+            method (str): HTTP method of the request.
+            path (str): Path of the requested resource.
+            body (bytes): Encoded body of the request.
+            reuse (bool): If False, a new connection is used.
+            idempotent (bool): If the request can be sent again safely.
+
+        Returns:
+            tuple: Status and content of the response.
+
+        Raises:
+            _StaleConnection: If a reused connection failed and the request
+                can be sent again through a new connection.
+
+        """
+        headers = {"Connection": "keep-alive"}
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        if self._use_authentication and self._authorization:
+            headers["Authorization"] = self._authorization
+        with self.pool.connection(reuse=reuse) as (connection, reused):
+            # A timeout means the Web Service might still be processing the
+            # request, so it never counts as a stale connection.
+            try:
+                connection.request(method, path, body=body, headers=headers)
+            except _SEND_ERRORS as error:
+                if reused and not isinstance(error, socket.timeout):
+                    raise _StaleConnection(error)
+                raise
+            try:
+                response = connection.getresponse()
+            except _RESPONSE_ERRORS as error:
+                # The request was sent, so it might have been processed
+                # already. Only idempotent requests are safe to send again.
+                if reused and idempotent and not isinstance(error, socket.timeout):
+                    raise _StaleConnection(error)
+                raise
+            return response.status, response.read()
+
+    def request(self, method, path, data=None, idempotent=None):
+        """Send a request to the Web Service and return its decoded response.
+
+        Args:
+            method (str): HTTP method of the request.
+            path (str): Path of the requested resource, like "/api/pools".
+            data (object, optional): Body of the request, encoded as JSON.
+            idempotent (bool, optional): If the request can be retried safely.
+                Defaults to True for methods in IDEMPOTENT_METHODS.
+
+        Returns:
+            object: Decoded JSON response, or the plain text if the response
+                is no JSON.
+
+        Raises:
+            WebServiceError: If the request failed after all retries.
+
+        """
+        logger = logging.getLogger(__name__)
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        # Encoded bodies are sent together with the headers in one packet.
+        body = None if data is None else json.dumps(data).encode("utf-8")
+        attempts = self.retries + 1 if idempotent else 1
+
+        attempt = 0
+        reuse = True
+        while True:
+            try:
+                status, content = self._send(method, path, body, reuse, idempotent)
+            except _StaleConnection:
+                # The Web Service closed the idle connection, either before
+                # the request was sent or the request is idempotent. Send it
+                # again right away through a new connection.
+                reuse = False
+                continue
+            except (socket.error, httplib.HTTPException) as error:
+                status, content = None, error
+            if status is not None and status < 500:
+                break
+            attempt += 1
+            if attempt >= attempts:
+                break
+            delay = self.backoff * 2 ** (attempt - 1)
+            logger.debug(
+                "%s %s failed (%s), retrying in %ss.", method, path, content, delay
+            )
+            time.sleep(delay)
+
+        if status is None:
+            raise WebServiceError("{} {} failed: {}".format(method, path, content))
+        if isinstance(content, bytes):
+            content = content.decode("utf-8")
+        if status == 401:
+            raise WebServiceError(
+                "{} {} failed with status 401: {}".format(
+                    method, path, AUTHENTICATION_ERROR
+                ),
+                status=status,
+            )
+        if status >= 400:
+            raise WebServiceError(
+                "{} {} failed with status {}: {}".format(method, path, status, content),
+                status=status,
+            )
+        try:
+            return json.loads(content)
+        except ValueError:
+            return content
+
+    def close(self):
+        """Close all idle connections of this client."""
+        self.pool.clear()
+
+
+class Jobs(object):
+    """Job related requests of the Deadline Web Service."""
+
+    def __init__(self, client):
+        """Initialize the requests.
+
+        Args:
+            client (WebServiceClient): Client used to send the requests.
+
+        """
+        self.client = client
+
+    def SubmitJob(self, info, plugininfo, aux=None, idOnly=False):  # noqa: N802,N803
+        """Submit a new job.
+
+        Args:
+            info (dict): Job info of the job.
+            plugininfo (dict): Plugin info of the job.
+            aux (list of str, optional): Auxiliary files of the job.
+            idOnly (bool, optional): If True, only the ID of the job is
+                returned.
+
+        Returns:
+            dict: The submitted job, containing its ID as "_id".
+
+        """
+        data = {
+            "JobInfo": info,
+            "PluginInfo": plugininfo,
+            "AuxFiles": aux or [],
+            "IdOnly": idOnly,
+        }
+        return self.client.request("POST", "/api/jobs", data)
+
+
+class Tasks(object):
+    """Task related requests of the Deadline Web Service."""
+
+    def __init__(self, client):
+        """Initialize the requests.
+
+        Args:
+            client (WebServiceClient): Client used to send the requests.
+
+        """
+        self.client = client
+
+    def GetJobTasks(self, id):  # noqa: N802 pylint: disable=redefined-builtin
+        """Return the tasks of a job.
+
+        Args:
+            id (str): Deadline ID of the job.
+
+        Returns:
+            dict: The ID of the job as "ID" and its tasks as "Tasks".
+
+        """
+        return self.client.request("GET", "/api/tasks?JobID={}".format(id))
+
+
+class Pools(object):
+    """Pool related requests of the Deadline Web Service."""
+
+    def __init__(self, client):
+        """Initialize the requests.
+
+        Args:
+            client (WebServiceClient): Client used to send the requests.
+
+        """
+        self.client = client
+
+    def GetPoolNames(self):  # noqa: N802
+        """Return the names of all pools.
+
+        Returns:
+            list of str: Name of each pool.
+
+        """
+        return self.client.request("GET", "/api/pools")
+
+
+class Groups(object):
+    """Group related requests of the Deadline Web Service."""
+
+    def __init__(self, client):
+        """Initialize the requests.
+
+        Args:
+            client (WebServiceClient): Client used to send the requests.
+
+        """
+        self.client = client
+
+    def GetGroupNames(self):  # noqa: N802
+        """Return the names of all groups.
+
+        Returns:
+            list of str: Name of each group.
+
+        """
+        return self.client.request("GET", "/api/groups")
@@ -0,0 +1,70 @@
+"""Render a single wedge of a ROP, selected by the index of a Deadline task.
+
+This module is run via hython by each task of a job whose wedges are
+submitted as tasks. The wedge table written during the submission holds the
+scene file, the ROP and all wedge values, so a task only needs to know its
+own index.
+
+Examples:
+    $ hython -m houdini_deadline_api_submission.wedge_task table.json 3
+
+"""
+
+# Import built-in modules
+import argparse
+import logging
+
+# Import third-party modules
+import hou  # pylint: disable=import-error
+
+# Import local modules
+from houdini_deadline_api_submission import wedging
+
+
+def render_wedge(table_path, wedgenum):
+    """Load the scene of the given wedge table and render a single wedge.
+
+    Args:
+        table_path (str): Path of the wedge table written during submission.
+        wedgenum (int): Running number of the wedge to render.
+
+    """
+    logger = logging.getLogger(__name__)
+    table = wedging.read_wedge_table(table_path)
+    hou.hipFile.load(
+        table["scene_file"], suppress_save_prompt=True, ignore_load_warnings=True
+    )
+
+    # The wedged parameters can only be resolved once the scene is loaded.
+    wedges = wedging.Wedges(
+        [
+            (name, hou.parm(parm_path), values)
+            for name, parm_path, values in table["wedges"]
+        ]
+    )
+    node = hou.node(table["node"])
+    wedge = wedges[wedgenum]
+    wedging.apply_wedge(wedge, wedgenum)
+    logger.info("Rendering wedge %s of %s: %s", wedgenum, node.path(), wedge)
+
+    node.render(frame_range=tuple(table["frame_range"]), ignore_inputs=True)
+
+
+def main(argv=None):
+    """Render the wedge given on the command line.
+
+    Args:
+        argv (list of str, optional): Command line arguments.
+
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("table", help="Path of the wedge table.")
+    parser.add_argument("wedgenum", type=int, help="Number of the wedge.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    render_wedge(args.table, args.wedgenum)
+
+
+if __name__ == "__main__":
+    main()
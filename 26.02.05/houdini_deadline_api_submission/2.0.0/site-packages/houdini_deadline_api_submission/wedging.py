@@ -2,6 +2,8 @@
 
 # Import build-in modules
 # Import built-in modules
+import itertools
+import json
 import os
 
 # Import third-party modules
@@ -13,6 +15,8 @@ from houdini_deadline_api_submission import math_utils
 
 # Global variable used to store wedged parms and their original values.
 _ORIG_WEDGED_VALUES = {}
+# Version of the wedge table written by write_wedge_table.
+WEDGE_TABLE_VERSION = 1
 
 
 def get_wedge_value(node, wedge_id, step):
@@ -37,6 +41,29 @@ def get_wedge_value(node, wedge_id, step):
     )
 
 
+def get_wedge_values(node, wedge_id):
+    """Return the values of all steps of the given wedge_id.
+
+    Args:
+        node (hou.Node): Node to get the wedge info from.
+        wedge_id (int): ID of the wedge parameter. Starts at 0.
+
+    Returns:
+        tuple of float: Value of each step.
+
+    """
+    min_, max_ = node.evalParmTuple(constants.WEDGE_RANGE.format(id=wedge_id))
+    max_steps = node.evalParm(constants.WEDGE_STEPS.format(id=wedge_id))
+    if max_steps == 1:
+        return (min_,)
+    return tuple(
+        math_utils.refit_value(
+            float(step), 1.0, float(max_steps), float(min_), float(max_)
+        )
+        for step in range(1, max_steps + 1)
+    )
+
+
 def get_wedge_info(node, wedge_id, step, strict=True):
     """Return wedge info for the given wedge_id on the given node.
 
@@ -104,14 +131,15 @@ def get_wedges(node, strict=True):
         node (hou.Node): Node whose wedges will be returned.
         strict (bool, optional): If True, display a message and raise an
             AttributeError on a faulty wedge. If False, such a faulty wedge
-            will be added as an empty wedge. Defaults to True.
+            parameter will be skipped. Defaults to True.
 
     Returns:
-        list: Wedged channels and their wedged value.
+        Wedges: Wedged channels and their wedged value. Each wedge is only
+            created when it's accessed.
 
     Examples:
         >>> # Two Wedged Parameters: sizex: 1-2, sizey: 1-2
-        >>> get_wedges(hou.Node('/out/geometry1'))
+        >>> list(get_wedges(hou.Node('/out/geometry1')))
         [
             [
                 [
@@ -164,36 +192,7 @@ def get_wedges(node, strict=True):
         ]
 
     """
-    try:
-        amount_of_parms = node.parm(constants.WEDGE_PARMS).eval()
-        # If no wedges are configured, return empty list.
-        if not amount_of_parms:
-            return []
-    except AttributeError:
-        return []
-
-    # Return empty list if checkbox to use wedges is turned off.
-    if not node.evalParm(constants.WEDGE_USE_WEDGE):
-        return []
-
-    # Needs to be initialized with a list inside a list so the merging works
-    # properly.
-    all_wedges = [[]]
-
-    # We have to match up each step of the wedge with each other step of each
-    # other wedge parameter. To do this, we need to merge every newly created
-    # wedge step with the previous ones.
-    for id_ in range(amount_of_parms):
-        this_wedge = []
-        steps_amount = node.evalParm(constants.WEDGE_STEPS.format(id=id_))
-        # Incrementing the step value by 1 because the range in the HDA starts
-        # at 1, so the fitting of the values can work properly.
-        for step in range(1, steps_amount + 1):
-            wedge_info = get_wedge_info(node, id_, step, strict=strict)
-            this_wedge.append(wedge_info)
-        all_wedges = merge_wedges(all_wedges, this_wedge)
-
-    return all_wedges
+    return Wedges.from_node(node, strict=strict)
 
 
 def merge_wedges(other_wedges, add_wedges):
@@ -216,6 +215,386 @@ def merge_wedges(other_wedges, add_wedges):
     return all_wedges
 
 
+def use_wedge_tasks(node):
+    """Return True if the wedges of the given node are submitted as tasks.
+
+    Args:
+        node (hou.Node): Node to check.
+
+    Returns:
+        bool: True if all wedges should be rendered by a single job, with one
+            task per wedge.
+
+    """
+    parm = node.parm(constants.WEDGE_AS_TASKS)
+    return bool(parm and parm.eval())
+
+
+class Wedges(object):
+    """All wedges created by multiplying the steps of wedge parameters.
+
+    Only the values of each wedge parameter are stored, so the memory used
+    grows with the sum of all steps instead of the amount of wedges. Single
+    wedges are created when iterating over this object or when accessing a
+    wedge by its running number. They use the same order merge_wedges would
+    create them in, where the first wedge parameter changes the fastest.
+
+    Args:
+        dimensions (list, optional): Name, wedged parameter and list of values
+            of each wedge parameter.
+
+    Examples:
+        >>> wedges = Wedges(
+        ...     [
+        ...         ['width', hou.parm('/obj/source/box1/sizex'), [1, 2]],
+        ...         ['height', hou.parm('/obj/source/box1/sizey'), [1, 2, 3]],
+        ...     ]
+        ... )
+        >>> len(wedges)
+        6
+        >>> wedges[3]
+        [
+            ['width', hou.Parm('/obj/source/box1/sizex'), 2],
+            ['height', hou.Parm('/obj/source/box1/sizey'), 2]
+        ]
+
+    """
+
+    def __init__(self, dimensions=None):
+        """Store the values of each wedge parameter."""
+        self.dimensions = [
+            (name, parm, tuple(values)) for name, parm, values in dimensions or ()
+        ]
+        self._amount = 1 if self.dimensions else 0
+        for _, _, values in self.dimensions:
+            self._amount *= len(values)
+
+    @classmethod
+    def from_node(cls, node, strict=True):
+        """Return the wedges configured on the given node.
+
+        The name and channel of each wedge parameter are only resolved once.
+
+        Args:
+            node (hou.Node): Node whose wedges will be returned.
+            strict (bool, optional): If True, display a message and raise an
+                AttributeError on a faulty wedge. If False, such a faulty
+                wedge parameter will be skipped. Defaults to True.
+
+        Returns:
+            Wedges: Wedges of the node, empty if the node doesn't use wedges.
+
+        """
+        try:
+            amount_of_parms = node.parm(constants.WEDGE_PARMS).eval()
+            # If no wedges are configured, return no wedges.
+            if not amount_of_parms:
+                return cls()
+        except AttributeError:
+            return cls()
+
+        # Return no wedges if checkbox to use wedges is turned off.
+        if not node.evalParm(constants.WEDGE_USE_WEDGE):
+            return cls()
+
+        dimensions = []
+        for id_ in range(amount_of_parms):
+            wedge_info = get_wedge_info(node, id_, 1, strict=strict)
+            if wedge_info:
+                dimensions.append(
+                    (wedge_info[0], wedge_info[1], get_wedge_values(node, id_))
+                )
+        return cls(dimensions)
+
+    def __len__(self):
+        """Return the amount of wedges.
+
+        Returns:
+            int: Amount of wedges.
+
+        """
+        return self._amount
+
+    def __bool__(self):
+        """Return True if there is at least one wedge.
+
+        Returns:
+            bool: True if there are wedges.
+
+        """
+        return bool(self._amount)
+
+    __nonzero__ = __bool__
+
+    def __iter__(self):
+        """Yield each wedge, one after another.
+
+        Yields:
+            list: A single wedge configuration, usable by apply_wedge.
+
+        """
+        if not self._amount:
+            return
+        # itertools.product changes the last entry the fastest, so the
+        # dimensions are reversed to have the first wedge parameter change
+        # the fastest.
+        reversed_dimensions = self.dimensions[::-1]
+        for values in itertools.product(
+            *(values for _, _, values in reversed_dimensions)
+        ):
+            yield [
+                [name, parm, value]
+                for (name, parm, _), value in zip(self.dimensions, values[::-1])
+            ]
+
+    def __getitem__(self, wedgenum):
+        """Return a single wedge by its running number.
+
+        Args:
+            wedgenum (int): Running number of the wedge. Negative numbers count
+                from the end.
+
+        Returns:
+            list: A single wedge configuration, usable by apply_wedge.
+
+        Raises:
+            IndexError: If there is no wedge with the given number.
+
+        """
+        if wedgenum < 0:
+            wedgenum += self._amount
+        if not 0 <= wedgenum < self._amount:
+            raise IndexError("There is no wedge number {}.".format(wedgenum))
+
+        wedge = []
+        for name, parm, values in self.dimensions:
+            wedgenum, step = divmod(wedgenum, len(values))
+            wedge.append([name, parm, values[step]])
+        return wedge
+
+    def __eq__(self, other):
+        """Compare the wedge parameters and their values to each other.
+
+        Args:
+            other (Wedges): The wedges to compare them to.
+
+        Returns:
+            bool: True if both create the same wedges.
+
+        """
+        if not isinstance(other, Wedges):
+            return False
+        return self.dimensions == other.dimensions
+
+    def __ne__(self, other):
+        """Compare the wedge parameters and their values to each other.
+
+        Args:
+            other (Wedges): The wedges to compare them to.
+
+        Returns:
+            bool: True if both create different wedges.
+
+        """
+        return not self.__eq__(other)
+
+    def __str__(self):
+        """Return the wedge parameters and their values.
+
+        Returns:
+            str: Readable representation of all wedge parameters.
+
+        """
+        return " - ".join(
+            "{}({}): {}".format(name, parm, list(values))
+            for name, parm, values in self.dimensions
+        )
+
+    def __repr__(self):
+        """Return a string that can be used to recreate the wedges.
+
+        Returns:
+            str: Executable string that can be used to recreate the wedges.
+
+        """
+        return "{}.{}({!r})".format(
+            __name__, self.__class__.__name__, self.dimensions
+        )
+
+
+def get_wedge_description(wedge):
+    """Return a readable description of a single wedge configuration.
+
+    Args:
+        wedge (list): A single wedge configuration.
+
+    Returns:
+        str: Name, parameter and value of each wedged parameter.
+
+    """
+    return " - ".join(
+        "{}({}): {}".format(name, parm, value) for name, parm, value in wedge
+    )
+
+
+def get_wedge_signature(wedge, channels=None):
+    """Return a hashable signature of a single wedge configuration.
+
+    Two wedges have the same signature if they set the same wedged
+    parameters to the same values, no matter the names or the order of
+    their wedge parameters.
+
+    Args:
+        wedge (list): A single wedge configuration.
+        channels (set of str, optional): Only include the parameters with
+            these paths.
+
+    Returns:
+        tuple: Path and value of each wedged parameter, sorted by path.
+
+    Examples:
+        >>> get_wedge_signature(
+        ...     [['width', hou.parm('/obj/source/box1/sizex'), 1]]
+        ... )
+        (('/obj/source/box1/sizex', 1),)
+
+    """
+    signature = []
+    for _, parm, value in wedge:
+        parm_path = parm.path()
+        if channels is None or parm_path in channels:
+            signature.append((parm_path, value))
+    return tuple(sorted(signature))
+
+
+class WedgeIndex(object):
+    """Items looked up by the wedge they were created with.
+
+    Items are found by the wedge signature (see `get_wedge_signature`) of the
+    wedged parameters they share with the wedge they are looked up with. So a
+    wedge of `width` and `height` finds the items of the same `width` and
+    `height`, but also the items of the same `width` if they only wedge
+    `width`. Each set of shared parameters is indexed the first time it is
+    looked up.
+
+    Examples:
+        >>> index = WedgeIndex()
+        >>> for wedge_index, wedge in enumerate(get_wedges(upstream_node)):
+        ...     index.add(wedge, wedge_index)
+        >>> index.find(downstream_wedge)
+        [3]
+
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.channels = frozenset()
+        self._items = []
+        self._indices = {}
+
+    def __len__(self):
+        """Return the amount of items in this index.
+
+        Returns:
+            int: Amount of items.
+
+        """
+        return len(self._items)
+
+    def add(self, wedge, item):
+        """Add an item created with the given wedge.
+
+        Args:
+            wedge (list): A single wedge configuration.
+            item (object): Item to find by this wedge.
+
+        """
+        self.channels = self.channels.union(parm.path() for _, parm, _ in wedge)
+        self._items.append((wedge, item))
+        self._indices.clear()
+
+    def find(self, wedge):
+        """Return the items whose wedge matches the given wedge.
+
+        Args:
+            wedge (list): A single wedge configuration.
+
+        Returns:
+            list: Items in the order they were added. Empty if the given wedge
+                doesn't share any wedged parameter with the items.
+
+        """
+        channels = self.channels.intersection(parm.path() for _, parm, _ in wedge)
+        if not channels:
+            return []
+        index = self._indices.get(channels)
+        if index is None:
+            index = {}
+            for item_wedge, item in self._items:
+                index.setdefault(
+                    get_wedge_signature(item_wedge, channels), []
+                ).append(item)
+            self._indices[channels] = index
+        return index.get(get_wedge_signature(wedge, channels), [])
+
+
+def write_wedge_table(path, node, wedges, scene_file, frame_range):
+    """Write the wedges of a node into a file read by the render tasks.
+
+    Args:
+        path (str): Path of the JSON file to write.
+        node (hou.Node): Wedged node.
+        wedges (Wedges): Wedges of the node.
+        scene_file (str): Houdini file the tasks will load.
+        frame_range (tuple): Start, end and increment of the frames to render
+            for each wedge.
+
+    """
+    folder = os.path.dirname(path)
+    if folder and not os.path.isdir(folder):
+        os.makedirs(folder)
+
+    table = {
+        "version": WEDGE_TABLE_VERSION,
+        "scene_file": scene_file,
+        "node": node.path(),
+        "frame_range": list(frame_range),
+        "wedges": [
+            [name, parm.path(), list(values)]
+            for name, parm, values in wedges.dimensions
+        ],
+    }
+    with open(path, "w") as table_file:
+        json.dump(table, table_file, separators=(",", ":"))
+
+
+def read_wedge_table(path):
+    """Read a wedge table written by write_wedge_table.
+
+    Args:
+        path (str): Path of the JSON file to read.
+
+    Returns:
+        dict: Content of the table. The name, parameter path and values of
+            each wedge parameter are stored in 'wedges', since the wedged
+            parameters can only be resolved once the scene file is loaded.
+
+    Raises:
+        ValueError: If the table was written by an unsupported version.
+
+    """
+    with open(path, "r") as table_file:
+        table = json.load(table_file)
+
+    if table.get("version") != WEDGE_TABLE_VERSION:
+        raise ValueError(
+            "Unsupported wedge table version in {}: {}".format(
+                path, table.get("version")
+            )
+        )
+    return table
+
+
 def apply_wedge(wedge, wedgenum):
     """Applies all values configured in the given wedge.
 
@@ -321,7 +700,18 @@ def add_wedging_parms(node):
         default_expression_language=(hou.scriptLanguage.Python,),
     )
     total_wedges.hide(True)
+    wedges_as_tasks = hou.ToggleParmTemplate(
+        constants.WEDGE_AS_TASKS,
+        "Submit Wedges as Tasks",
+        default_value=False,
+        conditionals={
+            hou.parmCondType.DisableWhen: "{{ {} == 0 }}".format(
+                constants.WEDGE_USE_WEDGE
+            )
+        },
+    )
     wedge_main_folder.addParmTemplate(use_wedges)
+    wedge_main_folder.addParmTemplate(wedges_as_tasks)
     wedge_main_folder.addParmTemplate(total_wedges_label)
     wedge_main_folder.addParmTemplate(total_wedges)
 